@@ -7,18 +7,21 @@ which would enable grinding attacks.
 Defense mechanism:
 1. Epoch salt binds commitment to (parent_hash, block_index)
 2. Cache tracks (commitment, epoch) tuples with TTL
-3. Persisted to disk for restart recovery
+3. Persisted to an append-only log for restart recovery
 4. Nonce sequence validation per address
 """
 
+import atexit
 import hashlib
 import json
 import logging
 import os
+import struct
+import threading
 import time
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Optional, Set, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -28,24 +31,336 @@ Epoch = int  # Block index
 Address = bytes  # 32-byte address
 
 
+# ==================== APPEND-ONLY LOG ====================
+
+_LOG_MAGIC = b"CJAL"
+_LOG_VERSION = 1
+_LOG_HEADER = struct.Struct("<4s4sHH")  # magic, kind, version, record size
+
+DEFAULT_FLUSH_EVERY = 256  # records per fsync
+DEFAULT_FLUSH_INTERVAL = 1.0  # seconds a record may wait for its fsync
+DEFAULT_COMPACT_MIN_RECORDS = 100_000  # never compact smaller logs
+DEFAULT_COMPACT_RATIO = 2.0  # compact once records > ratio * live entries
+
+
+class _AppendLog:
+    """
+    Append-only file of fixed-size records with batched fsync.
+
+    Layout: a 12-byte header (magic, kind, version, record size) followed
+    by packed records. A torn tail left by a crash is truncated on open.
+
+    Appends are buffered and written with a single write + fsync once
+    flush_every records are pending, or flush_interval seconds after the
+    oldest pending record (a timer covers idle periods), so each append is
+    O(1) and one fsync is amortised over a batch.
+
+    Compaction rewrites live records into a temporary file that atomically
+    replaces the log. The snapshot is written outside the owner's lock;
+    records appended meanwhile are carried over before the swap.
+
+    All methods except write_snapshot() must be called with `lock` held.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        kind: bytes,
+        record: struct.Struct,
+        lock: threading.RLock,
+        flush_every: int = DEFAULT_FLUSH_EVERY,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    ):
+        self.path = path
+        self.kind = kind
+        self.record = record
+        self.lock = lock
+        self.flush_every = max(1, flush_every)
+        self.flush_interval = flush_interval
+        self.records = 0  # records in the file, including pending ones
+        self.fsyncs = 0
+        self._header = _LOG_HEADER.pack(_LOG_MAGIC, kind, _LOG_VERSION, record.size)
+        self._pending: List[bytes] = []
+        self._pending_since = 0.0
+        self._timer: Optional[threading.Timer] = None
+        self._carry: Optional[List[bytes]] = None
+        self._file = None
+
+    def open(self) -> Iterator[tuple]:
+        """
+        Open the log for appending.
+
+        Returns:
+            Iterator over the records already in the log, oldest first
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = self.path.read_bytes() if self.path.exists() else b""
+        if data[: len(self._header)] != self._header:
+            if data:
+                raise ValueError(f"{self.path} is not a {self.kind.decode()} log")
+            self._write_file(self.path, [self._header])
+            data = self._header
+
+        body = len(data) - len(self._header)
+        usable = body - body % self.record.size
+        if usable != body:
+            logger.warning(f"Truncating torn record at end of {self.path}")
+            with open(self.path, "r+b") as f:
+                f.truncate(len(self._header) + usable)
+
+        self._file = open(self.path, "ab")
+        self.records = usable // self.record.size
+        view = memoryview(data)[len(self._header) : len(self._header) + usable]
+        return self.record.iter_unpack(view)
+
+    def append(self, *values) -> None:
+        """Queue one record; flushes when the batch is full or old enough."""
+        packed = self.record.pack(*values)
+        self._pending.append(packed)
+        if self._carry is not None:
+            self._carry.append(packed)
+        self.records += 1
+
+        if len(self._pending) == 1:
+            self._pending_since = time.monotonic()
+        if (
+            len(self._pending) >= self.flush_every
+            or time.monotonic() - self._pending_since >= self.flush_interval
+        ):
+            self.flush()
+        elif self._timer is None and self.flush_interval > 0:
+            self._timer = threading.Timer(self.flush_interval, self._timed_flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self) -> None:
+        """Write and fsync pending records."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending or self._file is None:
+            return
+        try:
+            self._file.write(b"".join(self._pending))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except OSError as e:
+            logger.error(f"Failed to flush {self.path}: {e}")
+            return
+        self._pending.clear()
+        self.fsyncs += 1
+
+    def _timed_flush(self) -> None:
+        with self.lock:
+            self._timer = None
+            self.flush()
+
+    def begin_rewrite(self) -> None:
+        """Start collecting appends that the rewritten log must carry over."""
+        self.flush()
+        self._carry = []
+
+    def write_snapshot(self, records: Iterable[tuple]) -> Tuple[Path, int]:
+        """
+        Write a compacted copy of the log (safe to call without the lock).
+
+        Args:
+            records: Live records as tuples for the record struct
+
+        Returns:
+            (temporary path, number of records written)
+        """
+        pack = self.record.pack
+        packed = [pack(*values) for values in records]
+        tmp_path = self.path.with_name(self.path.name + ".compact")
+        self._write_file(tmp_path, [self._header] + packed, replace=False)
+        return tmp_path, len(packed)
+
+    def finish_rewrite(self, tmp_path: Path, count: int) -> None:
+        """Carry over concurrent appends and swap the compacted log in."""
+        carry, self._carry = self._carry or [], None
+        self.flush()
+        with open(tmp_path, "ab") as f:
+            f.write(b"".join(carry))
+            f.flush()
+            os.fsync(f.fileno())
+        if self._file is not None:
+            self._file.close()
+        os.replace(tmp_path, self.path)
+        self._fsync_dir()
+        self._file = open(self.path, "ab")
+        self.records = count + len(carry)
+
+    def abort_rewrite(self, tmp_path: Optional[Path] = None) -> None:
+        self._carry = None
+        if tmp_path is not None and tmp_path.exists():
+            tmp_path.unlink()
+
+    def close(self) -> None:
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write_file(self, path: Path, chunks: List[bytes], replace: bool = True) -> None:
+        tmp_path = path.with_name(path.name + ".tmp") if replace else path
+        with open(tmp_path, "wb") as f:
+            f.write(b"".join(chunks))
+            f.flush()
+            os.fsync(f.fileno())
+        if replace:
+            os.replace(tmp_path, path)
+            self._fsync_dir()
+
+    def _fsync_dir(self) -> None:
+        try:
+            fd = os.open(self.path.parent, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+class _CompactingLogMixin:
+    """Background compaction shared by the log-backed trackers."""
+
+    def _live_count(self) -> int:
+        raise NotImplementedError
+
+    def _snapshot(self) -> List[tuple]:
+        """Live records to keep, oldest first (called with the lock held)."""
+        raise NotImplementedError
+
+    def _maybe_compact(self) -> None:
+        log = self._log
+        if (
+            log is None
+            or self._compacting
+            or log.records < self.compact_min_records
+            or log.records <= self.compact_ratio * self._live_count()
+        ):
+            return
+        self._compacting = True
+        log.begin_rewrite()
+        snapshot = self._snapshot()
+        thread = threading.Thread(
+            target=self._compact_worker, args=(snapshot,), name="admission-compact", daemon=True
+        )
+        self._compact_thread = thread
+        thread.start()
+
+    def _compact_worker(self, snapshot: List[tuple]) -> None:
+        log = self._log
+        tmp_path = None
+        try:
+            tmp_path, count = log.write_snapshot(snapshot)
+            with self._lock:
+                before = log.records
+                log.finish_rewrite(tmp_path, count)
+            logger.info(f"Compacted {log.path}: {before} -> {log.records} records")
+        except Exception as e:
+            logger.error(f"Failed to compact {log.path}: {e}")
+            with self._lock:
+                log.abort_rewrite(tmp_path)
+        finally:
+            with self._lock:
+                self._compacting = False
+
+    def compact(self) -> None:
+        """Compact the log now, regardless of thresholds (blocks until done)."""
+        with self._lock:
+            if self._log is None or self._compacting:
+                thread = self._compact_thread
+            else:
+                self._compacting = True
+                self._log.begin_rewrite()
+                snapshot = self._snapshot()
+                thread = None
+        if thread is not None:
+            thread.join()
+            return
+        self._compact_worker(snapshot)
+
+    def flush(self) -> None:
+        """Force pending log records to disk."""
+        with self._lock:
+            if self._log is not None:
+                self._log.flush()
+
+    def close(self) -> None:
+        """Wait for compaction, flush and close the log."""
+        thread = self._compact_thread
+        if thread is not None:
+            thread.join()
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+
+
+# ==================== EPOCH REPLAY CACHE ====================
+
+# commitment length (0xFF marks an epoch floor), commitment, epoch, timestamp
+_REPLAY_RECORD = struct.Struct("<B32sQd")
+_EPOCH_FLOOR_MARKER = 0xFF
+
+
 @dataclass
-class EpochReplayCache:
+class EpochReplayCache(_CompactingLogMixin):
     """
     Cache for tracking (commitment, epoch) pairs to prevent replay attacks.
 
+    Persistence is an append-only log of fixed-size records: add() appends
+    one record (fsynced in batches) instead of rewriting the whole cache,
+    startup replays the log with struct.iter_unpack, and the log is
+    compacted in the background once dead (expired or pruned) records
+    outnumber live ones. A version 1 JSON file found at persist_path is
+    migrated in place.
+
+    Entries expire after ttl_seconds, or when expire_epochs_before() moves
+    the epoch floor past them.
+
     Attributes:
         ttl_seconds: Time-to-live for cache entries (default: 7 days)
-        cache: In-memory cache of (commitment_hex, epoch) -> timestamp
-        persist_path: Optional path to persist cache to disk
+        cache: In-memory cache of (commitment_hex, epoch) -> timestamp,
+            in insertion (and therefore expiry) order
+        persist_path: Optional path of the append-only log
+        min_epoch: Entries for epochs below this are discarded
+        flush_every: Records per fsync batch
+        flush_interval: Max seconds a record waits for its fsync
+        compact_min_records: Logs smaller than this are never compacted
+        compact_ratio: Compact once log records > ratio * live entries
     """
 
     ttl_seconds: int = 7 * 24 * 3600  # 7 days
     cache: Dict[Tuple[str, Epoch], float] = field(default_factory=dict)
     persist_path: Optional[Path] = None
+    min_epoch: Epoch = 0
+    flush_every: int = DEFAULT_FLUSH_EVERY
+    flush_interval: float = DEFAULT_FLUSH_INTERVAL
+    compact_min_records: int = DEFAULT_COMPACT_MIN_RECORDS
+    compact_ratio: float = DEFAULT_COMPACT_RATIO
 
     def __post_init__(self) -> None:
-        """Load persisted cache if available"""
-        if self.persist_path and self.persist_path.exists():
+        """Replay the persisted log if available"""
+        self._lock = threading.RLock()
+        self._log: Optional[_AppendLog] = None
+        self._compacting = False
+        self._compact_thread: Optional[threading.Thread] = None
+
+        if self.persist_path:
+            self.persist_path = Path(self.persist_path)
+            self._log = _AppendLog(
+                self.persist_path,
+                b"RPLY",
+                _REPLAY_RECORD,
+                self._lock,
+                flush_every=self.flush_every,
+                flush_interval=self.flush_interval,
+            )
             self._load_from_disk()
 
     def check_replay(self, commitment: Commitment, epoch: Epoch) -> bool:
@@ -62,9 +377,10 @@ class EpochReplayCache:
         commitment_hex = commitment.hex()
         key = (commitment_hex, epoch)
 
-        # Check if in cache
-        if key in self.cache:
-            entry_time = self.cache[key]
+        with self._lock:
+            entry_time = self.cache.get(key)
+            if entry_time is None:
+                return False  # Novel commitment-epoch pair
 
             # Check if expired
             if time.time() - entry_time > self.ttl_seconds:
@@ -72,12 +388,8 @@ class EpochReplayCache:
                 logger.debug(f"Expired cache entry: commitment={commitment_hex[:8]}..., epoch={epoch}")
                 return False  # Expired, not a replay
 
-            logger.warning(
-                f"EPOCH REPLAY DETECTED: commitment={commitment_hex[:8]}..., epoch={epoch}"
-            )
-            return True  # Replay attack!
-
-        return False  # Novel commitment-epoch pair
+        logger.warning(f"EPOCH REPLAY DETECTED: commitment={commitment_hex[:8]}..., epoch={epoch}")
+        return True  # Replay attack!
 
     def add(self, commitment: Commitment, epoch: Epoch) -> None:
         """
@@ -87,71 +399,134 @@ class EpochReplayCache:
             commitment: 32-byte commitment hash
             epoch: Block index
         """
+        if len(commitment) > 32:
+            raise ValueError(f"Commitment too long: {len(commitment)} bytes")
+
         commitment_hex = commitment.hex()
         key = (commitment_hex, epoch)
-        self.cache[key] = time.time()
+        now = time.time()
 
-        logger.debug(f"Added to replay cache: commitment={commitment_hex[:8]}..., epoch={epoch}")
+        with self._lock:
+            # Re-insert so dict order stays the expiry order
+            self.cache.pop(key, None)
+            self.cache[key] = now
+            if self._log is not None:
+                self._log.append(len(commitment), commitment, epoch, now)
+                self._maybe_compact()
 
-        # Persist if configured
-        if self.persist_path:
-            self._persist_to_disk()
+        logger.debug(f"Added to replay cache: commitment={commitment_hex[:8]}..., epoch={epoch}")
 
     def cleanup_expired(self) -> int:
         """
         Remove expired entries from cache.
 
+        Entries are kept in insertion order, so this stops at the first
+        live entry: O(expired), not O(cache size).
+
         Returns:
             Number of entries removed
         """
-        now = time.time()
-        expired_keys = [
-            key for key, timestamp in self.cache.items() if now - timestamp > self.ttl_seconds
-        ]
+        cutoff = time.time() - self.ttl_seconds
+        removed = 0
 
-        for key in expired_keys:
-            del self.cache[key]
+        with self._lock:
+            for key, timestamp in list(self._iter_oldest(cutoff)):
+                del self.cache[key]
+                removed += 1
+            self._maybe_compact()
 
-        if expired_keys:
-            logger.info(f"Cleaned up {len(expired_keys)} expired cache entries")
+        if removed:
+            logger.info(f"Cleaned up {removed} expired cache entries")
 
-        return len(expired_keys)
+        return removed
 
-    def _persist_to_disk(self) -> None:
-        """Persist cache to disk (JSON format)"""
-        if not self.persist_path:
-            return
+    def _iter_oldest(self, cutoff: float) -> Iterator[Tuple[Tuple[str, Epoch], float]]:
+        for key, timestamp in self.cache.items():
+            if timestamp > cutoff:
+                return
+            yield key, timestamp
+
+    def expire_epochs_before(self, epoch: Epoch) -> int:
+        """
+        Drop every entry for an epoch below `epoch` (e.g. once finalized).
 
-        # Ensure parent directory exists
-        self.persist_path.parent.mkdir(parents=True, exist_ok=True)
-
-        # Convert to JSON-serializable format
-        data = {
-            "version": 1,
-            "ttl_seconds": self.ttl_seconds,
-            "entries": [
-                {
-                    "commitment": commitment_hex,
-                    "epoch": epoch,
-                    "timestamp": timestamp,
-                }
-                for (commitment_hex, epoch), timestamp in self.cache.items()
-            ],
-        }
-
-        # Write atomically
-        temp_path = self.persist_path.with_suffix(".tmp")
-        with open(temp_path, "w") as f:
-            json.dump(data, f, indent=2)
-
-        temp_path.replace(self.persist_path)
-        logger.debug(f"Persisted replay cache to {self.persist_path}")
+        The new floor is logged, so pruned entries stay pruned across a
+        restart even before the next compaction.
+
+        Args:
+            epoch: New minimum epoch
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            if epoch <= self.min_epoch:
+                return 0
+            self.min_epoch = epoch
+            stale = [key for key in self.cache if key[1] < epoch]
+            for key in stale:
+                del self.cache[key]
+            if self._log is not None:
+                self._log.append(_EPOCH_FLOOR_MARKER, b"", epoch, time.time())
+                self._maybe_compact()
+
+        if stale:
+            logger.info(f"Pruned {len(stale)} cache entries below epoch {epoch}")
+        return len(stale)
+
+    def _live_count(self) -> int:
+        return len(self.cache) + 1  # +1 for the epoch floor record
+
+    def _snapshot(self) -> List[tuple]:
+        records = [(_EPOCH_FLOOR_MARKER, b"", self.min_epoch, time.time())]
+        records.extend(
+            (len(commitment_hex) // 2, bytes.fromhex(commitment_hex), epoch, timestamp)
+            for (commitment_hex, epoch), timestamp in self.cache.items()
+        )
+        return records
 
     def _load_from_disk(self) -> None:
-        """Load cache from disk"""
-        if not self.persist_path or not self.persist_path.exists():
+        """Replay the log (migrating a legacy JSON cache first)"""
+        if self.persist_path.exists():
+            with open(self.persist_path, "rb") as f:
+                legacy = f.read(1) == b"{"
+            if legacy:
+                self._load_legacy_json()
+                return
+
+        start = time.monotonic()
+        cutoff = time.time() - self.ttl_seconds
+        cache = self.cache
+        records = 0
+
+        try:
+            for length, commitment, epoch, timestamp in self._log.open():
+                records += 1
+                if length == _EPOCH_FLOOR_MARKER:
+                    if epoch > self.min_epoch:
+                        self.min_epoch = epoch
+                        for key in [key for key in cache if key[1] < epoch]:
+                            del cache[key]
+                    continue
+                if timestamp <= cutoff or epoch < self.min_epoch:
+                    continue
+                key = (commitment[:length].hex(), epoch)
+                cache.pop(key, None)
+                cache[key] = timestamp
+        except Exception as e:
+            logger.error(f"Failed to load replay cache: {e}")
+            self._log = None
             return
 
+        logger.info(
+            f"Loaded replay cache from disk: {len(cache)} entries from {records} records "
+            f"in {time.monotonic() - start:.2f}s"
+        )
+        with self._lock:
+            self._maybe_compact()
+
+    def _load_legacy_json(self) -> None:
+        """Import a version 1 JSON cache and rewrite it as a log"""
         try:
             with open(self.persist_path, "r") as f:
                 data = json.load(f)
@@ -159,40 +534,46 @@ class EpochReplayCache:
             # Validate version
             if data.get("version") != 1:
                 logger.warning(f"Unknown cache version: {data.get('version')}, ignoring")
+                self._log = None
                 return
 
-            # Load entries
             now = time.time()
             loaded = 0
             expired = 0
 
-            for entry in data.get("entries", []):
-                commitment_hex = entry["commitment"]
-                epoch = entry["epoch"]
-                timestamp = entry["timestamp"]
-
+            for entry in sorted(data.get("entries", []), key=lambda e: e["timestamp"]):
                 # Skip expired entries
-                if now - timestamp > self.ttl_seconds:
+                if now - entry["timestamp"] > self.ttl_seconds:
                     expired += 1
                     continue
-
-                self.cache[(commitment_hex, epoch)] = timestamp
+                self.cache[(entry["commitment"], entry["epoch"])] = entry["timestamp"]
                 loaded += 1
 
+            # Replace the JSON file with an equivalent log
+            tmp_path, count = self._log.write_snapshot(self._snapshot())
+            os.replace(tmp_path, self.persist_path)
+            self._log.open()
+
             logger.info(
-                f"Loaded replay cache from disk: {loaded} entries loaded, {expired} expired"
+                f"Migrated JSON replay cache to log: {loaded} entries loaded, {expired} expired"
             )
 
         except Exception as e:
             logger.error(f"Failed to load replay cache: {e}")
+            self._log = None
 
     def stats(self) -> dict:
         """Get cache statistics"""
-        return {
-            "total_entries": len(self.cache),
-            "ttl_seconds": self.ttl_seconds,
-            "persist_path": str(self.persist_path) if self.persist_path else None,
-        }
+        with self._lock:
+            return {
+                "total_entries": len(self.cache),
+                "ttl_seconds": self.ttl_seconds,
+                "min_epoch": self.min_epoch,
+                "persist_path": str(self.persist_path) if self.persist_path else None,
+                "log_records": self._log.records if self._log else 0,
+                "log_fsyncs": self._log.fsyncs if self._log else 0,
+                "compacting": self._compacting,
+            }
 
 
 # Global cache instance (created on first import)
@@ -219,12 +600,17 @@ def get_replay_cache(
         # Default persist path
         if persist_path is None:
             data_dir = Path(os.getenv("COINJECTURE_DATA_DIR", "data"))
-            persist_path = data_dir / "cache" / "epoch_replay.json"
+            persist_path = data_dir / "cache" / "epoch_replay.log"
+            legacy_path = persist_path.with_suffix(".json")
+            if legacy_path.exists() and not persist_path.exists():
+                # Migrated in place by EpochReplayCache
+                legacy_path.replace(persist_path)
 
         _replay_cache = EpochReplayCache(
             ttl_seconds=ttl_seconds,
             persist_path=persist_path,
         )
+        atexit.register(_replay_cache.close)
 
         logger.info(f"Initialized epoch replay cache (TTL={ttl_seconds}s)")
 
@@ -260,16 +646,46 @@ def register_commitment(commitment: Commitment, epoch: Epoch) -> None:
 
 # ==================== NONCE SEQUENCE VALIDATION ====================
 
+# address length, address, next expected nonce
+_NONCE_RECORD = struct.Struct("<B32sQ")
+
 
 @dataclass
-class NonceTracker:
+class NonceTracker(_CompactingLogMixin):
     """
     Track nonce sequences per address to prevent replay attacks.
 
-    Nonces must be strictly increasing per address.
+    Nonces must be strictly increasing per address. With persist_path set,
+    every increment appends one (address, nonce) record to the same kind
+    of batched append-only log as EpochReplayCache; replay keeps the last
+    record per address and compaction rewrites one record per address.
     """
 
     nonces: Dict[str, int] = field(default_factory=dict)  # address_hex -> expected_nonce
+    persist_path: Optional[Path] = None
+    flush_every: int = DEFAULT_FLUSH_EVERY
+    flush_interval: float = DEFAULT_FLUSH_INTERVAL
+    compact_min_records: int = DEFAULT_COMPACT_MIN_RECORDS
+    compact_ratio: float = DEFAULT_COMPACT_RATIO
+
+    def __post_init__(self) -> None:
+        """Replay the persisted log if available"""
+        self._lock = threading.RLock()
+        self._log: Optional[_AppendLog] = None
+        self._compacting = False
+        self._compact_thread: Optional[threading.Thread] = None
+
+        if self.persist_path:
+            self.persist_path = Path(self.persist_path)
+            self._log = _AppendLog(
+                self.persist_path,
+                b"NONC",
+                _NONCE_RECORD,
+                self._lock,
+                flush_every=self.flush_every,
+                flush_interval=self.flush_interval,
+            )
+            self._load_from_disk()
 
     def validate_nonce(self, address: Address, nonce: int) -> bool:
         """
@@ -300,8 +716,16 @@ class NonceTracker:
         Args:
             address: 32-byte address
         """
+        if len(address) > 32:
+            raise ValueError(f"Address too long: {len(address)} bytes")
+
         address_hex = address.hex()
-        self.nonces[address_hex] = self.nonces.get(address_hex, 0) + 1
+        with self._lock:
+            nonce = self.nonces.get(address_hex, 0) + 1
+            self.nonces[address_hex] = nonce
+            if self._log is not None:
+                self._log.append(len(address), address, nonce)
+                self._maybe_compact()
 
     def get_nonce(self, address: Address) -> int:
         """
@@ -316,16 +740,66 @@ class NonceTracker:
         address_hex = address.hex()
         return self.nonces.get(address_hex, 0)
 
+    def _live_count(self) -> int:
+        return len(self.nonces)
+
+    def _snapshot(self) -> List[tuple]:
+        return [
+            (len(address_hex) // 2, bytes.fromhex(address_hex), nonce)
+            for address_hex, nonce in self.nonces.items()
+        ]
+
+    def _load_from_disk(self) -> None:
+        """Replay the log; the last record per address wins"""
+        nonces = self.nonces
+        records = 0
+        try:
+            for length, address, nonce in self._log.open():
+                nonces[address[:length].hex()] = nonce
+                records += 1
+        except Exception as e:
+            logger.error(f"Failed to load nonce log: {e}")
+            self._log = None
+            return
+
+        logger.info(f"Loaded nonce tracker from disk: {len(nonces)} addresses from {records} records")
+        with self._lock:
+            self._maybe_compact()
+
+    def stats(self) -> dict:
+        """Get tracker statistics"""
+        with self._lock:
+            return {
+                "addresses": len(self.nonces),
+                "persist_path": str(self.persist_path) if self.persist_path else None,
+                "log_records": self._log.records if self._log else 0,
+                "log_fsyncs": self._log.fsyncs if self._log else 0,
+                "compacting": self._compacting,
+            }
+
 
 # Global nonce tracker
 _nonce_tracker: Optional[NonceTracker] = None
 
 
-def get_nonce_tracker() -> NonceTracker:
-    """Get or create global nonce tracker"""
+def get_nonce_tracker(persist_path: Optional[Path] = None) -> NonceTracker:
+    """
+    Get or create global nonce tracker.
+
+    Args:
+        persist_path: Optional path of the nonce log
+            (default: $COINJECTURE_DATA_DIR/cache/nonces.log)
+
+    Returns:
+        Global NonceTracker instance
+    """
     global _nonce_tracker
     if _nonce_tracker is None:
-        _nonce_tracker = NonceTracker()
+        if persist_path is None:
+            data_dir = Path(os.getenv("COINJECTURE_DATA_DIR", "data"))
+            persist_path = data_dir / "cache" / "nonces.log"
+        _nonce_tracker = NonceTracker(persist_path=persist_path)
+        atexit.register(_nonce_tracker.close)
     return _nonce_tracker
 
 
@@ -0,0 +1,155 @@
+"""
+Tests for the log-backed admission caches
+
+These tests verify EpochReplayCache and NonceTracker:
+1. Detect replays / nonce mismatches as before
+2. Survive a restart by replaying the append-only log
+3. Expire entries by TTL and by epoch floor
+4. Compact the log without losing concurrent appends
+5. Migrate the legacy JSON replay cache
+"""
+
+import hashlib
+import json
+import time
+
+from coinjecture.consensus.admission import EpochReplayCache, NonceTracker
+
+
+def commitment(i: int) -> bytes:
+    return hashlib.sha256(f"commitment-{i}".encode()).digest()
+
+
+class TestEpochReplayCache:
+    """Replay detection backed by the append-only log"""
+
+    def test_replay_survives_restart(self, tmp_path):
+        path = tmp_path / "replay.log"
+        cache = EpochReplayCache(persist_path=path, flush_every=1000)
+        for i in range(100):
+            assert not cache.check_replay(commitment(i), i)
+            cache.add(commitment(i), i)
+        assert cache.check_replay(commitment(5), 5)
+        assert not cache.check_replay(commitment(5), 6)
+        cache.close()
+
+        # 100 appends, one batched fsync on close
+        assert cache.stats()["log_fsyncs"] == 1
+
+        reopened = EpochReplayCache(persist_path=path)
+        assert len(reopened.cache) == 100
+        assert reopened.check_replay(commitment(42), 42)
+        reopened.close()
+
+    def test_torn_tail_is_truncated(self, tmp_path):
+        path = tmp_path / "replay.log"
+        cache = EpochReplayCache(persist_path=path)
+        cache.add(commitment(1), 1)
+        cache.add(commitment(2), 2)
+        cache.close()
+        with open(path, "ab") as f:
+            f.write(b"\x20partial")
+
+        reopened = EpochReplayCache(persist_path=path)
+        assert reopened.stats()["log_records"] == 2
+        reopened.add(commitment(3), 3)
+        reopened.close()
+        assert len(EpochReplayCache(persist_path=path).cache) == 3
+
+    def test_ttl_expiry(self, tmp_path):
+        path = tmp_path / "replay.log"
+        cache = EpochReplayCache(ttl_seconds=60, persist_path=path)
+        cache.add(commitment(1), 1)
+        cache.add(commitment(2), 2)
+        cache.cache[(commitment(1).hex(), 1)] = time.time() - 120
+        assert cache.cleanup_expired() == 1
+        assert not cache.check_replay(commitment(1), 1)
+        assert cache.check_replay(commitment(2), 2)
+
+    def test_epoch_floor_persists(self, tmp_path):
+        path = tmp_path / "replay.log"
+        cache = EpochReplayCache(persist_path=path)
+        for i in range(10):
+            cache.add(commitment(i), i)
+        assert cache.expire_epochs_before(7) == 7
+        assert not cache.check_replay(commitment(3), 3)
+        cache.close()
+
+        reopened = EpochReplayCache(persist_path=path)
+        assert reopened.min_epoch == 7
+        assert sorted(epoch for _, epoch in reopened.cache) == [7, 8, 9]
+
+    def test_compaction(self, tmp_path):
+        path = tmp_path / "replay.log"
+        cache = EpochReplayCache(persist_path=path, compact_min_records=50)
+        for i in range(40):
+            cache.add(commitment(i), i)
+        cache.expire_epochs_before(35)
+        for i in range(40, 60):
+            cache.add(commitment(i), i)
+        cache.compact()
+        stats = cache.stats()
+        assert stats["log_records"] == stats["total_entries"] + 1
+        cache.close()
+
+        reopened = EpochReplayCache(persist_path=path)
+        assert sorted(epoch for _, epoch in reopened.cache) == list(range(35, 60))
+
+    def test_background_compaction_keeps_concurrent_appends(self, tmp_path):
+        path = tmp_path / "replay.log"
+        cache = EpochReplayCache(persist_path=path, compact_min_records=200, compact_ratio=1.5)
+        for i in range(300):
+            cache.add(commitment(i), i)
+            if i == 150:
+                cache.expire_epochs_before(150)  # dead records trigger compaction
+        cache.close()
+
+        reopened = EpochReplayCache(persist_path=path)
+        assert sorted(epoch for _, epoch in reopened.cache) == list(range(150, 300))
+        assert reopened.stats()["log_records"] < 300
+
+    def test_legacy_json_migration(self, tmp_path):
+        path = tmp_path / "epoch_replay.json"
+        path.write_text(json.dumps({
+            "version": 1,
+            "ttl_seconds": 3600,
+            "entries": [
+                {"commitment": commitment(1).hex(), "epoch": 1, "timestamp": time.time()},
+                {"commitment": commitment(2).hex(), "epoch": 2, "timestamp": 0.0},
+            ],
+        }))
+        cache = EpochReplayCache(persist_path=path)
+        assert cache.check_replay(commitment(1), 1)
+        assert not cache.check_replay(commitment(2), 2)
+        cache.add(commitment(3), 3)
+        cache.close()
+
+        assert path.read_bytes()[:4] == b"CJAL"
+        reopened = EpochReplayCache(persist_path=path)
+        assert reopened.check_replay(commitment(3), 3)
+
+
+class TestNonceTracker:
+    """Nonce sequences backed by the append-only log"""
+
+    def test_in_memory_default(self):
+        tracker = NonceTracker()
+        address = b"\x01" * 32
+        assert tracker.validate_nonce(address, 0)
+        tracker.increment_nonce(address)
+        assert not tracker.validate_nonce(address, 0)
+        assert tracker.get_nonce(address) == 1
+
+    def test_nonces_survive_restart_and_compaction(self, tmp_path):
+        path = tmp_path / "nonces.log"
+        tracker = NonceTracker(persist_path=path, compact_min_records=20)
+        addresses = [bytes([i]) * 32 for i in range(3)]
+        for _ in range(30):
+            for address in addresses:
+                tracker.increment_nonce(address)
+        tracker.close()
+        assert tracker.stats()["log_records"] < 90
+
+        reopened = NonceTracker(persist_path=path)
+        assert [reopened.get_nonce(a) for a in addresses] == [30, 30, 30]
+        assert reopened.validate_nonce(addresses[0], 30)
@@ -305,6 +305,69 @@ class TestRustVerifyFunctions:
         assert result is False, "Out-of-bounds indices must be rejected"
 
 
+class TestRustBatchFunctions:
+    """Test batch entry points match the single-item functions"""
+
+    def test_compute_header_hashes_matches_single(self):
+        """Test compute_header_hashes_py returns per-header results"""
+        from coinjecture._core import compute_header_hash_py, compute_header_hashes_py
+
+        headers = [
+            {
+                "codec_version": 1,
+                "block_index": index,
+                "timestamp": 1609459200 + index,
+                "parent_hash": b"\x00" * 32,
+                "merkle_root": b"\x00" * 32,
+                "miner_address": b"\x00" * 32,
+                "commitment": b"\x00" * 32,
+                "difficulty_target": 1000,
+                "nonce": index,
+                "extra_data": b"",
+            }
+            for index in range(5)
+        ]
+        headers.append({"codec_version": 1})  # Malformed entry
+
+        results = compute_header_hashes_py(headers)
+
+        assert len(results) == 6
+        for header, (hash_bytes, error) in zip(headers[:5], results[:5]):
+            assert error is None
+            assert hash_bytes == compute_header_hash_py(header)
+        assert results[5][0] is None
+        assert results[5][1]
+
+    def test_verify_subset_sum_batch(self):
+        """Test verify_subset_sum_batch_py returns per-item verdicts"""
+        from coinjecture._core import verify_subset_sum_batch_py
+
+        problem = {
+            "problem_type": 0,
+            "tier": 1,
+            "elements": [1, 2, 3, 4, 5],
+            "target": 9,
+            "timestamp": 1000,
+        }
+        solutions = [
+            {"indices": [0, 2, 4], "timestamp": 1001},  # 1+3+5 = 9
+            {"indices": [0, 1], "timestamp": 1001},  # 1+2 = 3
+        ]
+        budget_dict = {
+            "max_ops": 100000,
+            "max_duration_ms": 10000,
+            "max_memory_bytes": 100_000_000,
+        }
+
+        results = verify_subset_sum_batch_py([problem, problem], solutions, budget_dict)
+
+        assert results[0] == (True, None)
+        assert results[1][0] is False
+
+        with pytest.raises(Exception):
+            verify_subset_sum_batch_py([problem], solutions, budget_dict)
+
+
 class TestRustBindingErrorHandling:
     """Test that Rust functions handle errors gracefully"""
 
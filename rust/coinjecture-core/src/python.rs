@@ -142,6 +142,87 @@ fn verify_subset_sum_py(
     Ok(result.valid)
 }
 
+// ==================== BATCH FUNCTIONS ====================
+//
+// Dicts are converted while holding the GIL, then the whole batch is
+// processed with the GIL released. Each item gets its own (result, error)
+// pair, so one malformed entry does not fail the batch.
+
+/// Compute header hashes for a list of header dicts
+///
+/// Returns one (hash, error) tuple per header.
+#[pyfunction]
+fn compute_header_hashes_py(
+    py: Python,
+    header_dicts: Vec<&PyDict>,
+) -> PyResult<Vec<(Option<PyObject>, Option<String>)>> {
+    let headers: Vec<Result<BlockHeader, String>> = header_dicts
+        .iter()
+        .map(|dict| dict_to_header(dict).map_err(|e| e.to_string()))
+        .collect();
+
+    let hashes: Vec<Result<[u8; 32], String>> = py.allow_threads(|| {
+        headers
+            .iter()
+            .map(|header| match header {
+                Ok(header) => compute_header_hash(header).map_err(|e| e.to_string()),
+                Err(e) => Err(e.clone()),
+            })
+            .collect()
+    });
+
+    Ok(hashes
+        .into_iter()
+        .map(|hash| match hash {
+            Ok(hash) => (Some(PyBytes::new(py, &hash).into()), None),
+            Err(e) => (None, Some(e)),
+        })
+        .collect())
+}
+
+/// Verify a list of subset sum solutions against one budget
+///
+/// Returns one (valid, error) tuple per problem/solution pair.
+#[pyfunction]
+fn verify_subset_sum_batch_py(
+    py: Python,
+    problem_dicts: Vec<&PyDict>,
+    solution_dicts: Vec<&PyDict>,
+    budget_dict: &PyDict,
+) -> PyResult<Vec<(bool, Option<String>)>> {
+    if problem_dicts.len() != solution_dicts.len() {
+        return Err(PyValueError::new_err(
+            "problems and solutions must have the same length",
+        ));
+    }
+    let budget = dict_to_budget(budget_dict)?;
+
+    let items: Vec<Result<(Problem, Solution), String>> = problem_dicts
+        .iter()
+        .zip(solution_dicts.iter())
+        .map(|(problem, solution)| {
+            let problem = dict_to_problem(problem).map_err(|e| e.to_string())?;
+            let solution = dict_to_solution(solution).map_err(|e| e.to_string())?;
+            Ok((problem, solution))
+        })
+        .collect();
+
+    let results: Vec<(bool, Option<String>)> = py.allow_threads(|| {
+        items
+            .iter()
+            .map(|item| match item {
+                Ok((problem, solution)) => match verify_solution(problem, solution, &budget) {
+                    Ok(result) => (result.valid, None),
+                    Err(e) => (false, Some(e.to_string())),
+                },
+                Err(e) => (false, Some(e.clone())),
+            })
+            .collect()
+    });
+
+    Ok(results)
+}
+
 // ==================== COMMITMENT FUNCTIONS ====================
 
 /// Compute miner salt
@@ -179,25 +260,21 @@ fn compute_miner_salt_py(
 
 fn dict_to_header(dict: &PyDict) -> PyResult<BlockHeader> {
     Ok(BlockHeader {
-        codec_version: dict.get_item("codec_version")?.unwrap().extract()?,
-        block_index: dict.get_item("block_index")?.unwrap().extract()?,
-        timestamp: dict.get_item("timestamp")?.unwrap().extract()?,
+        codec_version: required(dict, "codec_version")?.extract()?,
+        block_index: required(dict, "block_index")?.extract()?,
+        timestamp: required(dict, "timestamp")?.extract()?,
         parent_hash: extract_hash(dict, "parent_hash")?,
         merkle_root: extract_hash(dict, "merkle_root")?,
         miner_address: extract_hash(dict, "miner_address")?,
         commitment: extract_hash(dict, "commitment")?,
-        difficulty_target: dict.get_item("difficulty_target")?.unwrap().extract()?,
-        nonce: dict.get_item("nonce")?.unwrap().extract()?,
-        extra_data: dict
-            .get_item("extra_data")?
-            .unwrap()
-            .extract::<&[u8]>()?
-            .to_vec(),
+        difficulty_target: required(dict, "difficulty_target")?.extract()?,
+        nonce: required(dict, "nonce")?.extract()?,
+        extra_data: required(dict, "extra_data")?.extract::<&[u8]>()?.to_vec(),
     })
 }
 
 fn dict_to_transaction(dict: &PyDict) -> PyResult<Transaction> {
-    let tx_type_val: u8 = dict.get_item("tx_type")?.unwrap().extract()?;
+    let tx_type_val: u8 = required(dict, "tx_type")?.extract()?;
     let tx_type = match tx_type_val {
         1 => TxType::Transfer,
         2 => TxType::ProblemSubmission,
@@ -206,50 +283,50 @@ fn dict_to_transaction(dict: &PyDict) -> PyResult<Transaction> {
     };
 
     Ok(Transaction {
-        codec_version: dict.get_item("codec_version")?.unwrap().extract()?,
+        codec_version: required(dict, "codec_version")?.extract()?,
         tx_type,
         from: extract_hash(dict, "from")?,
         to: extract_hash(dict, "to")?,
-        amount: dict.get_item("amount")?.unwrap().extract()?,
-        nonce: dict.get_item("nonce")?.unwrap().extract()?,
-        gas_limit: dict.get_item("gas_limit")?.unwrap().extract()?,
-        gas_price: dict.get_item("gas_price")?.unwrap().extract()?,
+        amount: required(dict, "amount")?.extract()?,
+        nonce: required(dict, "nonce")?.extract()?,
+        gas_limit: required(dict, "gas_limit")?.extract()?,
+        gas_price: required(dict, "gas_price")?.extract()?,
         signature: extract_signature(dict, "signature")?,
-        data: dict.get_item("data")?.unwrap().extract::<&[u8]>()?.to_vec(),
-        timestamp: dict.get_item("timestamp")?.unwrap().extract()?,
+        data: required(dict, "data")?.extract::<&[u8]>()?.to_vec(),
+        timestamp: required(dict, "timestamp")?.extract()?,
     })
 }
 
 fn dict_to_problem(dict: &PyDict) -> PyResult<Problem> {
-    let problem_type_val: u8 = dict.get_item("problem_type")?.unwrap().extract()?;
+    let problem_type_val: u8 = required(dict, "problem_type")?.extract()?;
     let problem_type = ProblemType::from_u8(problem_type_val)
         .ok_or_else(|| PyValueError::new_err("Invalid problem_type"))?;
 
-    let tier_val: u8 = dict.get_item("tier")?.unwrap().extract()?;
+    let tier_val: u8 = required(dict, "tier")?.extract()?;
     let tier = HardwareTier::from_u8(tier_val)
         .ok_or_else(|| PyValueError::new_err("Invalid tier"))?;
 
     Ok(Problem {
         problem_type,
         tier,
-        elements: dict.get_item("elements")?.unwrap().extract()?,
-        target: dict.get_item("target")?.unwrap().extract()?,
-        timestamp: dict.get_item("timestamp")?.unwrap().extract()?,
+        elements: required(dict, "elements")?.extract()?,
+        target: required(dict, "target")?.extract()?,
+        timestamp: required(dict, "timestamp")?.extract()?,
     })
 }
 
 fn dict_to_solution(dict: &PyDict) -> PyResult<Solution> {
     Ok(Solution {
-        indices: dict.get_item("indices")?.unwrap().extract()?,
-        timestamp: dict.get_item("timestamp")?.unwrap().extract()?,
+        indices: required(dict, "indices")?.extract()?,
+        timestamp: required(dict, "timestamp")?.extract()?,
     })
 }
 
 fn dict_to_budget(dict: &PyDict) -> PyResult<VerifyBudget> {
     Ok(VerifyBudget {
-        max_ops: dict.get_item("max_ops")?.unwrap().extract()?,
-        max_duration_ms: dict.get_item("max_duration_ms")?.unwrap().extract()?,
-        max_memory_bytes: dict.get_item("max_memory_bytes")?.unwrap().extract()?,
+        max_ops: required(dict, "max_ops")?.extract()?,
+        max_duration_ms: required(dict, "max_duration_ms")?.extract()?,
+        max_memory_bytes: required(dict, "max_memory_bytes")?.extract()?,
     })
 }
 
@@ -263,8 +340,13 @@ fn block_to_dict(_py: Python, _block: &Block) -> PyResult<PyObject> {
     Err(PyValueError::new_err("Not implemented yet"))
 }
 
+fn required<'a>(dict: &'a PyDict, key: &str) -> PyResult<&'a PyAny> {
+    dict.get_item(key)?
+        .ok_or_else(|| PyValueError::new_err(format!("missing field: {}", key)))
+}
+
 fn extract_hash(dict: &PyDict, key: &str) -> PyResult<[u8; 32]> {
-    let bytes: &[u8] = dict.get_item(key)?.unwrap().extract()?;
+    let bytes: &[u8] = required(dict, key)?.extract()?;
     if bytes.len() != 32 {
         return Err(PyValueError::new_err(format!("{} must be 32 bytes", key)));
     }
@@ -274,7 +356,7 @@ fn extract_hash(dict: &PyDict, key: &str) -> PyResult<[u8; 32]> {
 }
 
 fn extract_signature(dict: &PyDict, key: &str) -> PyResult<[u8; 64]> {
-    let bytes: &[u8] = dict.get_item(key)?.unwrap().extract()?;
+    let bytes: &[u8] = required(dict, key)?.extract()?;
     if bytes.len() != 64 {
         return Err(PyValueError::new_err(format!("{} must be 64 bytes", key)));
     }
@@ -299,6 +381,8 @@ fn coinjecture_core(_py: Python, m: &PyModule) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(compute_transaction_hash_py, m)?)?;
     m.add_function(wrap_pyfunction!(compute_merkle_root_py, m)?)?;
     m.add_function(wrap_pyfunction!(verify_subset_sum_py, m)?)?;
+    m.add_function(wrap_pyfunction!(compute_header_hashes_py, m)?)?;
+    m.add_function(wrap_pyfunction!(verify_subset_sum_batch_py, m)?)?;
     m.add_function(wrap_pyfunction!(compute_miner_salt_py, m)?)?;
 
     // Version info
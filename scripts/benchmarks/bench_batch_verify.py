@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark single vs batch Rust header/proof verification.
+
+Verifies the same headers (with subset sum proofs) one at a time and through
+the batch bindings, directly and through DualRunConsensus, and checks that
+both paths agree. Needs the Rust extension:
+    cd rust/coinjecture-core && maturin develop --release --features python
+
+Usage:
+    python scripts/benchmarks/bench_batch_verify.py [--headers 10000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from consensus_wrapper import VERIFY_BUDGET, ConsensusMode, DualRunConsensus
+
+
+@dataclass
+class BenchProof:
+    elements: list
+    target: int
+    solution: list
+    tier: int = 1
+    timestamp: int = 1609459200
+
+
+@dataclass
+class BenchBlock:
+    index: int
+    timestamp: int
+    nonce: int
+    previous_hash: bytes = b'\x00' * 32
+    merkle_root: bytes = b'\x00' * 32
+    miner_address: bytes = b'\x00' * 32
+    commitment: bytes = b'\x00' * 32
+    difficulty: int = 1000
+    codec_version: int = 1
+    extra_data: bytes = b''
+    proof: BenchProof = field(default=None)
+
+
+def make_blocks(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    blocks = []
+    for index in range(count):
+        elements = [rng.randint(1, 1000) for _ in range(rng.randint(8, 16))]
+        solution = sorted(rng.sample(range(len(elements)), rng.randint(1, 4)))
+        proof = BenchProof(elements, sum(elements[i] for i in solution), solution)
+        blocks.append(BenchBlock(
+            index=index,
+            timestamp=1609459200 + index,
+            nonce=rng.getrandbits(32),
+            previous_hash=rng.randbytes(32),
+            proof=proof,
+        ))
+    return blocks
+
+
+def timed(label: str, count: int, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"   {label:<28} {elapsed:8.3f} s   {count / elapsed:10.0f} headers/s")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--headers', type=int, default=10000, help='Headers to verify')
+    args = parser.parse_args()
+
+    try:
+        from coinjecture._core import (
+            compute_header_hash_py,
+            compute_header_hashes_py,
+            verify_subset_sum_batch_py,
+            verify_subset_sum_py,
+        )
+    except ImportError as e:
+        print(f"Rust extension with batch bindings not available: {e}")
+        sys.exit(1)
+
+    blocks = make_blocks(args.headers)
+    headers = [DualRunConsensus._header_dict(block) for block in blocks]
+    proofs = [DualRunConsensus._proof_dicts(block) for block in blocks]
+    problems = [proof[0] for proof in proofs]
+    solutions = [proof[1] for proof in proofs]
+
+    print(f"Bindings ({args.headers} headers)")
+    single_hashes, single_time = timed("single header hash", args.headers,
+                                       lambda: [compute_header_hash_py(h) for h in headers])
+    batch_hashes, batch_time = timed("batch header hash", args.headers,
+                                     lambda: compute_header_hashes_py(headers))
+    assert [h for h, _ in batch_hashes] == single_hashes, "batch header hashes diverged"
+    print(f"   speedup {single_time / batch_time:.1f}x")
+
+    single_valid, single_time = timed("single proof verify", args.headers,
+                                      lambda: [verify_subset_sum_py(p, s, VERIFY_BUDGET)
+                                               for p, s in zip(problems, solutions)])
+    batch_valid, batch_time = timed("batch proof verify", args.headers,
+                                    lambda: verify_subset_sum_batch_py(problems, solutions, VERIFY_BUDGET))
+    assert [v for v, _ in batch_valid] == single_valid, "batch proof verdicts diverged"
+    print(f"   speedup {single_time / batch_time:.1f}x")
+
+    print(f"DualRunConsensus REFACTORED_ONLY ({args.headers} blocks)")
+    consensus = DualRunConsensus(mode=ConsensusMode.REFACTORED_ONLY)
+    single, single_time = timed("verify_block loop", args.headers,
+                                lambda: [consensus.verify_block(block)[0] for block in blocks])
+    batch, batch_time = timed("verify_blocks", args.headers,
+                              lambda: [valid for valid, _ in consensus.verify_blocks(blocks)])
+    assert single == batch, "wrapper batch path diverged"
+    print(f"   speedup {single_time / batch_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
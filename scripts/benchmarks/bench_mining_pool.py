@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark the multi-core MiningPool against single-core solving.
+
+Measures solved problems per second for a fixed wall-clock window.
+
+Usage:
+    python scripts/benchmarks/bench_mining_pool.py [--seconds 10] [--workers N] [--tier cluster]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from core.blockchain import ProblemTier
+from mining_pool import MiningJob, MiningPool, solve_mining_job
+
+
+def bench_single(tier: ProblemTier, seconds: float) -> int:
+    solved = 0
+    deadline = time.time() + seconds
+    while time.time() < deadline:
+        job = MiningJob(job_id=solved, epoch=1, parent_hash="00" * 32, parent_index=0,
+                        tier=tier.value, problem_type="subset_sum", seed=f"single-{solved}")
+        if solve_mining_job(job).valid:
+            solved += 1
+    return solved
+
+
+def bench_pool(tier: ProblemTier, seconds: float, workers: int) -> int:
+    pool = MiningPool(workers=workers, tiers=[tier])
+    pool.start("00" * 32, 0)
+    solved = 0
+    deadline = time.time() + seconds
+    try:
+        while time.time() < deadline:
+            if pool.next_result(timeout=max(0.0, deadline - time.time())) is not None:
+                solved += 1
+    finally:
+        pool.stop()
+    return solved
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--tier', default=ProblemTier.TIER_5_CLUSTER.value,
+                        choices=[t.value for t in ProblemTier])
+    args = parser.parse_args()
+    tier = ProblemTier(args.tier)
+
+    single = bench_single(tier, args.seconds)
+    pooled = bench_pool(tier, args.seconds, args.workers)
+    print(f"tier={tier.value} window={args.seconds:.0f}s")
+    print(f"   single core : {single / args.seconds:10.1f} problems/s")
+    print(f"   {args.workers:>3} workers : {pooled / args.seconds:10.1f} problems/s  "
+          f"({pooled / max(single, 1):.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
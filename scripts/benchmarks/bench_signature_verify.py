@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark Ed25519 verification: one at a time vs SignatureVerifier batches.
+
+For each batch size, reports signatures/second for:
+    serial   direct verify calls on the calling thread (the old path)
+    batch    verify_batch() on a cold cache (worker pool when workers > 1)
+    cached   verify_batch() again, as block ingest after mempool admission
+
+Usage:
+    python scripts/benchmarks/bench_signature_verify.py [--sizes 1000 10000] [--workers N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from signature_verifier import SignatureVerifier, verify_one
+
+
+def make_items(count: int, keys: int = 64):
+    private_keys = [ed25519.Ed25519PrivateKey.generate() for _ in range(keys)]
+    publics = [k.public_key().public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+               for k in private_keys]
+    items = []
+    for i in range(count):
+        message = f"CJ-sender-{i}CJ-recipient{i * 0.5}{1700000000 + i}".encode()
+        items.append((publics[i % keys], message, private_keys[i % keys].sign(message)))
+    return items
+
+
+def rate(count: int, seconds: float) -> str:
+    return f"{count / seconds:>10,.0f}/s"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    print(f"workers={args.workers}")
+    for size in args.sizes:
+        items = make_items(size)
+
+        start = time.perf_counter()
+        assert all(verify_one(*item) for item in items)
+        serial = time.perf_counter() - start
+
+        verifier = SignatureVerifier(workers=args.workers, cache_size=size)
+        verifier.verify_batch(items[:args.workers])  # Start the pool outside the timing
+        start = time.perf_counter()
+        assert all(verifier.verify_batch(items))
+        batch = time.perf_counter() - start
+
+        start = time.perf_counter()
+        assert all(verifier.verify_batch(items))
+        cached = time.perf_counter() - start
+        verifier.close()
+
+        print(f"{size:>6} sigs  serial {rate(size, serial)}  batch {rate(size, batch)}  "
+              f"cached {rate(size, cached)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark StorageManager header ingest throughput.
+
+"before" replays the old access pattern: a fresh sqlite3 connection and a
+commit for every header, work_index and tip write. "pooled" uses the pooled
+StorageManager with one transaction per block, as ConsensusEngine does, and
+"write-behind" additionally batches those transactions into bulk flushes.
+
+Usage:
+    python scripts/benchmarks/bench_storage_ingest.py [--blocks 100000]
+"""
+
+import argparse
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from core.blockchain import Block, ProblemTier
+from storage import NodeRole, PruningMode, StorageConfig, StorageManager
+
+
+def make_block(height: int) -> Block:
+    return Block(
+        index=height,
+        timestamp=1_700_000_000.0 + height,
+        previous_hash=f"{height - 1:064x}",
+        transactions=[],
+        merkle_root=f"{height:064x}",
+        problem={},
+        solution=[],
+        complexity=None,
+        mining_capacity=ProblemTier.TIER_2_DESKTOP,
+        cumulative_work_score=float(height),
+        block_hash=f"{height:064x}"
+    )
+
+
+def ingest_before(storage: StorageManager, blocks) -> None:
+    """Old pattern: one connection and one commit per write."""
+    for block in blocks:
+        header_bytes = storage._serialize_header(block)
+        for sql, params in (
+            ("INSERT OR REPLACE INTO headers (header_hash, header_bytes, height, timestamp) VALUES (?, ?, ?, ?)",
+             (block.block_hash.encode(), header_bytes, block.index, int(block.timestamp))),
+            ("INSERT OR REPLACE INTO work_index (height, cumulative_work, block_hash) VALUES (?, ?, ?)",
+             (block.index, block.index, block.block_hash.encode())),
+            ("INSERT OR REPLACE INTO tips (tip_hash, cumulative_work) VALUES (?, ?)",
+             (block.block_hash.encode(), block.index)),
+        ):
+            with sqlite3.connect(storage.db_path) as conn:
+                conn.execute(sql, params)
+                conn.commit()
+
+
+def ingest_after(storage: StorageManager, blocks) -> None:
+    """Pooled connection, one transaction per block."""
+    for block in blocks:
+        with storage.transaction():
+            storage.store_header(block)
+            storage.store_work_index(block.index, block.index, block.block_hash)
+            storage.store_tip(block.block_hash, block.index)
+
+
+def run(name: str, ingest, blocks, write_behind: bool = False) -> float:
+    data_dir = tempfile.mkdtemp(prefix=f"coinjecture-bench-{name}-")
+    try:
+        storage = StorageManager(StorageConfig(data_dir=data_dir, role=NodeRole.FULL,
+                                               pruning_mode=PruningMode.FULL,
+                                               write_behind=write_behind))
+        start = time.perf_counter()
+        ingest(storage, blocks)
+        storage.close()
+        return time.perf_counter() - start
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--blocks', type=int, default=100_000)
+    args = parser.parse_args()
+
+    blocks = [make_block(h) for h in range(args.blocks)]
+    before = run('before', ingest_before, blocks)
+    print(f"blocks={args.blocks}")
+    print(f"   before       : {args.blocks / before:10.0f} headers/s")
+    for name, write_behind in (('pooled', False), ('write-behind', True)):
+        elapsed = run(name, ingest_after, blocks, write_behind=write_behind)
+        print(f"   {name:<12} : {args.blocks / elapsed:10.0f} headers/s  ({before / elapsed:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
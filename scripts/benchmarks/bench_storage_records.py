@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Compare legacy JSON storage rows with the binary record format.
+
+Reports row size and encode/decode time for headers and full blocks.
+
+Usage:
+    python scripts/benchmarks/bench_storage_records.py [--blocks 20000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from core.blockchain import (
+    Block, EnergyMetrics, ProblemTier, generate_subset_sum_problem, solve_subset_sum,
+    subset_sum_complexity
+)
+from storage_codec import (
+    HAS_MSGSPEC, decode_block_record, decode_header_record, encode_block_record,
+    encode_header_record
+)
+from storage_codec import _legacy_block, _legacy_header
+
+
+def make_block(height: int) -> Block:
+    problem = generate_subset_sum_problem(seed=f"records-{height}", tier=ProblemTier.TIER_3_WORKSTATION)
+    solution = solve_subset_sum(problem)
+    energy = EnergyMetrics(0.1, 0.001, 100, 1, 0.001, 0.00001, 80.0, 50.0, 0.0)
+    return Block(
+        index=height,
+        timestamp=1_700_000_000.0 + height,
+        previous_hash=f"{height - 1:064x}",
+        transactions=[],
+        merkle_root=f"{height:064x}",
+        problem=problem,
+        solution=solution,
+        complexity=subset_sum_complexity(problem, solution, 0.001, 0.00001, 1024, 64, energy),
+        mining_capacity=ProblemTier.TIER_3_WORKSTATION,
+        cumulative_work_score=float(height),
+        block_hash=f"{height + 1:064x}",
+        offchain_cid="QmYwAPJzv5CZsnA625s3Xf2nemtYgPpHdWEz79ojWnPbdG"
+    )
+
+
+def legacy_header(block: Block) -> bytes:
+    return json.dumps({
+        'index': block.index, 'timestamp': block.timestamp, 'previous_hash': block.previous_hash,
+        'merkle_root': block.merkle_root, 'mining_capacity': block.mining_capacity.value,
+        'cumulative_work_score': block.cumulative_work_score, 'block_hash': block.block_hash,
+        'offchain_cid': block.offchain_cid
+    }).encode()
+
+
+def legacy_block(block: Block) -> bytes:
+    return json.dumps({
+        'index': block.index, 'timestamp': block.timestamp, 'previous_hash': block.previous_hash,
+        'transactions': block.transactions, 'merkle_root': block.merkle_root,
+        'problem': block.problem, 'solution': block.solution,
+        'mining_capacity': block.mining_capacity.value,
+        'cumulative_work_score': block.cumulative_work_score, 'block_hash': block.block_hash,
+        'offchain_cid': block.offchain_cid
+    }).encode()
+
+
+def measure(label, blocks, encode, decode):
+    start = time.perf_counter()
+    rows = [encode(b) for b in blocks]
+    encode_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for row in rows:
+        decode(row)
+    decode_time = time.perf_counter() - start
+    avg_size = sum(len(r) for r in rows) / len(rows)
+    print(f"   {label:<16} {avg_size:8.1f} B/row   encode {encode_time / len(rows) * 1e6:7.2f} us   "
+          f"decode {decode_time / len(rows) * 1e6:7.2f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--blocks', type=int, default=20_000)
+    args = parser.parse_args()
+
+    blocks = [make_block(h) for h in range(1, args.blocks + 1)]
+    print(f"blocks={args.blocks} msgspec={'yes' if HAS_MSGSPEC else 'no (JSON body fallback)'}")
+    print("headers")
+    measure("legacy json", blocks, legacy_header, lambda r: _legacy_header(json.loads(r.decode())))
+    measure("binary record", blocks, encode_header_record, decode_header_record)
+    print("blocks (legacy rows omit complexity; binary rows include it)")
+    measure("legacy json", blocks, legacy_block, lambda r: _legacy_block(json.loads(r.decode())))
+    measure("binary record", blocks, encode_block_record, decode_block_record)
+
+
+if __name__ == '__main__':
+    main()
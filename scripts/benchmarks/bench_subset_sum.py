@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark Subset Sum solver backends against the reference DP.
+
+Generates problems for every ProblemTier, solves them with each backend and
+checks that every backend returns exactly the reference solution.
+
+Usage:
+    python scripts/benchmarks/bench_subset_sum.py [--problems 50]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from core.blockchain import ProblemTier, generate_subset_sum_problem, verify_subset_sum
+from core.subset_sum_engine import SUBSET_SUM_BACKENDS, _HAS_NUMPY
+
+
+def bench_tier(tier: ProblemTier, problem_count: int):
+    problems = [generate_subset_sum_problem(seed=f"bench-{tier.value}-{i}", tier=tier)
+                for i in range(problem_count)]
+    backends = ['reference', 'bitset'] + (['numpy'] if _HAS_NUMPY else [])
+
+    timings = {}
+    reference_solutions = None
+    for name in backends:
+        solver = SUBSET_SUM_BACKENDS[name]
+        start = time.perf_counter()
+        solutions = [solver(p['numbers'], p['target']) for p in problems]
+        timings[name] = time.perf_counter() - start
+
+        if reference_solutions is None:
+            reference_solutions = solutions
+        elif solutions != reference_solutions:
+            raise AssertionError(f"{name} diverged from reference on {tier.name}")
+        if not all(verify_subset_sum(p, s) for p, s in zip(problems, solutions)):
+            raise AssertionError(f"{name} produced an invalid solution on {tier.name}")
+
+    base = timings['reference']
+    print(f"{tier.name:<22} sizes {tier.get_size_range()}")
+    for name, elapsed in timings.items():
+        per_problem_ms = elapsed / problem_count * 1000
+        print(f"   {name:<10} {per_problem_ms:9.3f} ms/problem   {base / max(elapsed, 1e-12):7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--problems', type=int, default=50, help='Problems per tier')
+    args = parser.parse_args()
+
+    print(f"NumPy backend: {'available' if _HAS_NUMPY else 'not installed'}")
+    for tier in ProblemTier:
+        bench_tier(tier, args.problems)
+
+
+if __name__ == '__main__':
+    main()
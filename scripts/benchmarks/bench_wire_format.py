@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark NetworkProtocol wire formats: legacy JSON envelope vs binary frame.
+
+Encodes and decodes header announcements (real binary header records) and
+reveal messages in both wire versions, checking round-trips and reporting
+bytes on the wire and encode/decode cost per message.
+
+Usage:
+    python scripts/benchmarks/bench_wire_format.py [--messages 10000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from core.blockchain import Block, ProblemTier
+from network import (
+    HAS_MSGSPEC, HeaderMsg, NetworkProtocol, RevealMsg,
+    WIRE_VERSION_BINARY, WIRE_VERSION_JSON,
+)
+from storage_codec import encode_header_record
+
+
+class _Stub:
+    pass
+
+
+def make_headers(count: int, seed: int = 11):
+    rng = random.Random(seed)
+    messages = []
+    for index in range(count):
+        block = Block(
+            index=index,
+            timestamp=1_700_000_000.0 + index * 14.14,
+            previous_hash=rng.randbytes(32).hex(),
+            transactions=[],
+            merkle_root=rng.randbytes(32).hex(),
+            problem={},
+            solution=[],
+            complexity=None,
+            mining_capacity=ProblemTier.TIER_2_DESKTOP,
+            cumulative_work_score=float(index * 1000),
+            block_hash=rng.randbytes(32).hex(),
+        )
+        messages.append(HeaderMsg(header_bytes=encode_header_record(block),
+                                  tip_work=index * 1000, peer_id="bench-peer"))
+    return messages
+
+
+def make_reveals(count: int, seed: int = 13):
+    rng = random.Random(seed)
+    return [RevealMsg(cid="Qm" + rng.randbytes(22).hex(), commitment=rng.randbytes(32),
+                      problem_type=1, capacity=2) for _ in range(count)]
+
+
+def bench(net: NetworkProtocol, label: str, messages):
+    results = {}
+    for version, name in ((WIRE_VERSION_JSON, "json envelope"), (WIRE_VERSION_BINARY, "binary frame")):
+        start = time.perf_counter()
+        encoded = [net.encode_message(m, version=version) for m in messages]
+        encode_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        decoded = [net.decode_message(e) for e in encoded]
+        decode_time = time.perf_counter() - start
+        if decoded != messages:
+            raise AssertionError(f"{name} round-trip failed for {label}")
+
+        results[name] = (sum(len(e) for e in encoded) / len(encoded),
+                         encode_time / len(messages) * 1e6, decode_time / len(messages) * 1e6)
+
+    print(f"{label} ({len(messages)} messages)")
+    base_bytes, base_enc, base_dec = results["json envelope"]
+    for name, (size, enc_us, dec_us) in results.items():
+        print(f"   {name:<14} {size:8.1f} B/msg  ({base_bytes / size:4.1f}x)   "
+              f"encode {enc_us:7.2f} us ({base_enc / enc_us:4.1f}x)   "
+              f"decode {dec_us:7.2f} us ({base_dec / dec_us:4.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--messages', type=int, default=10000, help='Messages per type')
+    args = parser.parse_args()
+
+    print(f"msgspec bodies: {'yes' if HAS_MSGSPEC else 'no (JSON body fallback)'}")
+    net = NetworkProtocol(_Stub(), _Stub(), _Stub())
+    bench(net, "HeaderMsg", make_headers(args.messages))
+    bench(net, "RevealMsg", make_reveals(args.messages))
+
+
+if __name__ == '__main__':
+    main()
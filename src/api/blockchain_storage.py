@@ -6,6 +6,7 @@ Implements storage.md specification with proper DB schema and IPFS integration
 
 import os
 import json
+import math
 import time
 import hashlib
 import sqlite3
@@ -13,6 +14,38 @@ from typing import Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+# Block fields promoted out of block_bytes into indexed columns
+INDEXED_BLOCK_COLUMNS = {
+    'miner_address': 'TEXT',
+    'cid': 'TEXT',
+    'previous_hash': 'TEXT',
+    'capacity': 'TEXT',
+}
+
+# Column projection used by queries that never decode block_bytes
+BLOCK_SUMMARY_COLUMNS = (
+    'height', 'block_hash', 'previous_hash', 'timestamp', 'miner_address', 'cid',
+    'capacity', 'work_score', 'gas_used', 'gas_limit', 'gas_price', 'reward',
+    'cumulative_work'
+)
+
+# Explorer sort keys -> indexed columns; ties are broken by height
+EXPLORER_SORT_COLUMNS = {
+    'height': 'height',
+    'timestamp': 'timestamp',
+    'work_score': 'work_score',
+    'reward': 'reward',
+}
+
+# Fields only kept in block_bytes, decoded for the rows of one explorer page
+EXPLORER_EXTRA_FIELDS = {
+    'merkle_root': '',
+    'nonce': 0,
+    'difficulty': 1.0,
+    'size_bytes': 0,
+    'transaction_count': 0,
+}
+
 class PruningMode(Enum):
     LIGHT = "light"      # Keep headers + commit_index only
     FULL = "full"        # Keep recent N epochs of bundles
@@ -38,9 +71,11 @@ class COINjectureStorage:
     Follows storage.md specification with proper DB schema
     """
     
-    def __init__(self, data_dir: str = "data", pruning_mode: PruningMode = PruningMode.FULL):
+    def __init__(self, data_dir: str = "data", pruning_mode: PruningMode = PruningMode.FULL,
+                 ipfs_api_url: str = "http://localhost:8080"):
         self.data_dir = data_dir
         self.pruning_mode = pruning_mode
+        self.ipfs_api_url = ipfs_api_url
         # Use absolute path for database
         self.db_path = os.path.join(data_dir, "blockchain.db")
         
@@ -50,7 +85,7 @@ class COINjectureStorage:
         # Initialize database with proper schema
         self.init_database()
         
-        # IPFS client (placeholder for now)
+        # IPFS client, the shared pooled one for ipfs_api_url (set on first read)
         self.ipfs_client = None
         
     def init_database(self):
@@ -120,11 +155,235 @@ class COINjectureStorage:
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_blocks_height ON blocks(height)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_work_height ON work_index(height)')
         
+        # Promote block fields to columns (older databases only have block_bytes)
+        existing = {row[1] for row in cursor.execute('PRAGMA table_info(blocks)')}
+        for column, column_type in INDEXED_BLOCK_COLUMNS.items():
+            if column not in existing:
+                cursor.execute(f'ALTER TABLE blocks ADD COLUMN {column} {column_type}')
+        
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_blocks_miner ON blocks(miner_address, height)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_blocks_cid ON blocks(cid)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_blocks_previous_hash ON blocks(previous_hash)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_blocks_capacity ON blocks(capacity)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_blocks_timestamp ON blocks(timestamp, height)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_blocks_work_score ON blocks(work_score, height)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_blocks_reward ON blocks(reward, height)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_blocks_cumulative_work ON blocks(cumulative_work, height)')
+        # Explorer sorts treat NULL metrics as 0 (see _explorer_sort_expression)
+        for column in EXPLORER_SORT_COLUMNS.values():
+            if column != 'height':
+                cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_blocks_explorer_{column} '
+                               f'ON blocks(COALESCE({column}, 0), height)')
+        
+        # Running totals over the blocks table, maintained on every block write
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS block_summary (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                total_blocks INTEGER NOT NULL DEFAULT 0,
+                total_gas_used INTEGER NOT NULL DEFAULT 0,
+                total_rewards REAL NOT NULL DEFAULT 0,
+                total_work_score REAL NOT NULL DEFAULT 0
+            )
+        ''')
+        cursor.execute('SELECT 1 FROM block_summary WHERE id = 1')
+        summary_missing = cursor.fetchone() is None
+        
+        # Canonical chain by height, moved with the best tip (see _update_canonical_chain)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS canonical_chain (
+                height INTEGER PRIMARY KEY,
+                block_hash TEXT NOT NULL
+            )
+        ''')
+        
         conn.commit()
         conn.close()
         
+        self.backfill_block_columns()
+        if summary_missing:
+            self.rebuild_block_summary()
+        
+        # Walks previous_hash, so only after the backfill (a no-op when current)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            self._update_canonical_chain(conn.cursor())
+            conn.commit()
+        finally:
+            conn.close()
+        
         print(f"📦 Database initialized: {self.db_path}")
     
+    def backfill_block_columns(self, chunk_size: int = 1000) -> int:
+        """
+        One-shot migration: fill the indexed block columns from block_bytes.
+        
+        Only rows whose miner_address is still NULL are visited; they are set
+        to '' when the block has no miner so the scan never repeats.
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        updated = 0
+        last_rowid = 0
+        
+        try:
+            while True:
+                cursor.execute('''
+                    SELECT rowid, block_bytes FROM blocks
+                    WHERE rowid > ? AND miner_address IS NULL
+                    ORDER BY rowid LIMIT ?
+                ''', (last_rowid, chunk_size))
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+                
+                updates = []
+                for rowid, block_bytes in rows:
+                    last_rowid = rowid
+                    updates.append(self._indexed_values_from_bytes(block_bytes) + (rowid,))
+                
+                cursor.executemany('''
+                    UPDATE blocks SET miner_address = ?, cid = ?, previous_hash = ?, capacity = ?
+                    WHERE rowid = ?
+                ''', updates)
+                conn.commit()
+                updated += len(updates)
+        finally:
+            conn.close()
+        
+        if updated:
+            print(f"📦 Backfilled indexed columns for {updated} blocks")
+        return updated
+    
+    def rebuild_block_summary(self):
+        """Recompute the block_summary totals from the blocks table."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute('''
+                INSERT OR REPLACE INTO block_summary
+                (id, total_blocks, total_gas_used, total_rewards, total_work_score)
+                SELECT 1, COUNT(*), COALESCE(SUM(gas_used), 0), COALESCE(SUM(reward), 0),
+                       COALESCE(SUM(work_score), 0)
+                FROM blocks
+            ''')
+            conn.commit()
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def _update_block_summary(cursor, old_row: Optional[tuple], new_row: Optional[tuple]):
+        """
+        Apply a block write to the running totals.
+        
+        Rows are (gas_used, reward, work_score) of the replaced and the written
+        block; either may be None for an insert or a delete.
+        """
+        old = [value or 0 for value in (old_row or (0, 0, 0))]
+        new = [value or 0 for value in (new_row or (0, 0, 0))]
+        count_delta = (new_row is not None) - (old_row is not None)
+        cursor.execute('''
+            UPDATE block_summary SET
+                total_blocks = total_blocks + ?,
+                total_gas_used = total_gas_used + ?,
+                total_rewards = total_rewards + ?,
+                total_work_score = total_work_score + ?
+            WHERE id = 1
+        ''', (count_delta, new[0] - old[0], new[1] - old[1], new[2] - old[2]))
+    
+    @staticmethod
+    def _update_canonical_chain(cursor):
+        """
+        Point canonical_chain at the best tip (most cumulative work, then height).
+        
+        Walks back from the tip only until it meets a block that is already
+        canonical, so extending the chain costs O(1) and a reorg costs its
+        depth. An empty table (older databases) is filled by one full walk.
+        """
+        cursor.execute('SELECT block_hash, height FROM blocks ORDER BY cumulative_work DESC, height DESC LIMIT 1')
+        tip = cursor.fetchone()
+        if tip is None:
+            cursor.execute('DELETE FROM canonical_chain')
+            return
+        tip_hash, tip_height = tip
+        cursor.execute('SELECT block_hash FROM canonical_chain WHERE height = ?', (tip_height,))
+        current = cursor.fetchone()
+        cursor.execute('SELECT MAX(height) FROM canonical_chain')
+        if current and current[0] == tip_hash and cursor.fetchone()[0] == tip_height:
+            return
+        
+        cursor.execute('''
+            WITH RECURSIVE chain(block_hash, previous_hash, height, joined) AS (
+                SELECT block_hash, previous_hash, height,
+                       EXISTS (SELECT 1 FROM canonical_chain k
+                               WHERE k.height = blocks.height AND k.block_hash = blocks.block_hash)
+                FROM blocks WHERE block_hash = ?
+                UNION ALL
+                SELECT b.block_hash, b.previous_hash, b.height,
+                       EXISTS (SELECT 1 FROM canonical_chain k
+                               WHERE k.height = b.height AND k.block_hash = b.block_hash)
+                FROM blocks b JOIN chain c ON b.block_hash = c.previous_hash
+                WHERE NOT c.joined AND b.height < c.height
+            )
+            SELECT height, block_hash, joined FROM chain
+        ''', (tip_hash,))
+        chain = cursor.fetchall()
+        cursor.executemany('INSERT OR REPLACE INTO canonical_chain (height, block_hash) VALUES (?, ?)',
+                           [(height, block_hash) for height, block_hash, _ in chain])
+        cursor.execute('DELETE FROM canonical_chain WHERE height > ?', (tip_height,))
+        if not any(joined for _, _, joined in chain):
+            # The walk ran out of stored parents: nothing below it is known canonical
+            cursor.execute('DELETE FROM canonical_chain WHERE height < ?', (min(row[0] for row in chain),))
+    
+    @staticmethod
+    def _existing_block_metrics(cursor, block_hash: str) -> Optional[tuple]:
+        cursor.execute('SELECT gas_used, reward, work_score FROM blocks WHERE block_hash = ?', (block_hash,))
+        return cursor.fetchone()
+    
+    @staticmethod
+    def _indexed_values(block_data: dict) -> Tuple[str, Optional[str], Optional[str], Optional[str]]:
+        """Values for the indexed block columns, in INDEXED_BLOCK_COLUMNS order."""
+        cid = block_data.get('cid') or block_data.get('offchain_cid') or block_data.get('ipfs_cid')
+        capacity = block_data.get('capacity', block_data.get('mining_capacity'))
+        return (
+            block_data.get('miner_address') or '',
+            cid,
+            block_data.get('previous_hash'),
+            str(capacity) if capacity is not None else None
+        )
+    
+    @classmethod
+    def _indexed_values_from_bytes(cls, block_bytes: Optional[bytes]) -> Tuple[str, Optional[str], Optional[str], Optional[str]]:
+        """_indexed_values() of a stored block; blocks that are not JSON objects get a blank miner."""
+        try:
+            block_data = json.loads(block_bytes) if block_bytes else {}
+        except (ValueError, TypeError):
+            block_data = {}
+        if not isinstance(block_data, dict):
+            block_data = {}
+        return cls._indexed_values(block_data)
+    
+    @staticmethod
+    def _summary_row_to_dict(row: tuple) -> dict:
+        """Build a block summary dict from a BLOCK_SUMMARY_COLUMNS row."""
+        summary = dict(zip(BLOCK_SUMMARY_COLUMNS, row))
+        summary['index'] = summary['height']
+        summary['cumulative_work_score'] = summary['cumulative_work']
+        return summary
+    
+    def _query_block_summaries(self, where: str, params: tuple, order: str = 'height DESC',
+                               limit: Optional[int] = None) -> List[dict]:
+        """Run an indexed block query that reads columns only, never block_bytes."""
+        sql = f'SELECT {", ".join(BLOCK_SUMMARY_COLUMNS)} FROM blocks WHERE {where} ORDER BY {order}'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params = params + (limit,)
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+        return [self._summary_row_to_dict(row) for row in rows]
+    
     def add_header(self, header_hash: str, header_bytes: bytes, height: int, timestamp: float):
         """Add header to storage"""
         conn = sqlite3.connect(self.db_path)
@@ -143,10 +402,14 @@ class COINjectureStorage:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
+        old_row = self._existing_block_metrics(cursor, block_hash)
         cursor.execute('''
-            INSERT OR REPLACE INTO blocks (block_hash, block_bytes, height, is_full_block)
-            VALUES (?, ?, ?, ?)
-        ''', (block_hash, block_bytes, height, is_full_block))
+            INSERT OR REPLACE INTO blocks
+            (block_hash, block_bytes, height, is_full_block, miner_address, cid, previous_hash, capacity)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (block_hash, block_bytes, height, is_full_block) + self._indexed_values_from_bytes(block_bytes))
+        self._update_block_summary(cursor, old_row, (0, 0, 0))
+        self._update_canonical_chain(cursor)
         
         conn.commit()
         conn.close()
@@ -289,10 +552,13 @@ class COINjectureStorage:
             
             # Remove full blocks, keep only headers
             cursor.execute('DELETE FROM blocks WHERE is_full_block = 1')
+            self._update_canonical_chain(cursor)
             
             conn.commit()
             conn.close()
             
+            self.rebuild_block_summary()
+            
         elif self.pruning_mode == PruningMode.FULL:
             # Keep recent N epochs (configurable)
             # Implementation would depend on epoch definition
@@ -323,13 +589,20 @@ class COINjectureStorage:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             
+            miner_address, cid, previous_hash, capacity = self._indexed_values(block_data)
+            
+            old_row = self._existing_block_metrics(cursor, block_hash)
             cursor.execute('''
                 INSERT OR REPLACE INTO blocks 
                 (block_hash, block_bytes, height, timestamp, work_score, 
-                 gas_used, gas_limit, gas_price, reward, cumulative_work, is_full_block)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                 gas_used, gas_limit, gas_price, reward, cumulative_work, is_full_block,
+                 miner_address, cid, previous_hash, capacity)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (block_hash, block_bytes, height, timestamp, work_score,
-                  gas_used, gas_limit, gas_price, reward, cumulative_work, True))
+                  gas_used, gas_limit, gas_price, reward, cumulative_work, True,
+                  miner_address, cid, previous_hash, capacity))
+            self._update_block_summary(cursor, old_row, (gas_used, reward, work_score))
+            self._update_canonical_chain(cursor)
             
             conn.commit()
             conn.close()
@@ -382,17 +655,22 @@ class COINjectureStorage:
         """Get IPFS data by CID"""
         try:
             # Actually retrieve data from IPFS
-            from storage import IPFSClient
+            if self.ipfs_client is None:
+                from storage import get_ipfs_client
+                self.ipfs_client = get_ipfs_client(self.ipfs_api_url)
             
-            ipfs_client = IPFSClient("http://localhost:8080")
-            if not ipfs_client.health_check():
-                print(f"❌ IPFS daemon not available for CID: {cid}")
-                return None
+            ipfs_client = self.ipfs_client
             
-            # Get data from IPFS
-            data = ipfs_client.get(cid)
-            if data:
-                proof_json = json.loads(data.decode("utf-8"))
+            def fetch():
+                if not ipfs_client.health_check():
+                    print(f"❌ IPFS daemon not available for CID: {cid}")
+                    return None
+                return ipfs_client.get(cid)
+            
+            # Get data from the shared proof cache, falling back to IPFS
+            from proof_cache import get_proof_cache
+            proof_json = get_proof_cache().get_object(cid, fetch)
+            if proof_json is not None:
                 return {
                     'problem_data': proof_json.get('problem', {}),
                     'solution_data': proof_json.get('solution', {}),
@@ -409,49 +687,95 @@ class COINjectureStorage:
             print(f"❌ Error retrieving IPFS data for CID {cid}: {e}")
             return None
 
-    def get_blocks_by_miner(self, miner_address: str) -> List[dict]:
-        """Get all blocks mined by a specific address"""
+    def get_blocks_by_miner(self, miner_address: str, limit: Optional[int] = None) -> List[dict]:
+        """Get blocks mined by a specific address (indexed, newest first)"""
+        try:
+            return self._query_block_summaries('miner_address = ?', (miner_address,), limit=limit)
+        except Exception as e:
+            print(f"❌ Error getting blocks by miner {miner_address}: {e}")
+            return []
+    
+    def get_miner_reward_summary(self, miner_address: str) -> dict:
+        """Aggregate block count, rewards and work score for a miner"""
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             
-            # Get all blocks and filter by miner address in block_bytes
             cursor.execute('''
-                SELECT height, block_bytes, work_score, gas_used, gas_limit, gas_price, 
-                       reward, cumulative_work 
-                FROM blocks 
-                ORDER BY height DESC
-            ''')
-            results = cursor.fetchall()
+                SELECT COUNT(*), COALESCE(SUM(reward), 0), COALESCE(SUM(work_score), 0)
+                FROM blocks WHERE miner_address = ?
+            ''', (miner_address,))
+            total_blocks, total_rewards, total_work_score = cursor.fetchone()
             conn.close()
             
-            blocks = []
-            for result in results:
-                height, block_bytes, work_score, gas_used, gas_limit, gas_price, reward, cumulative_work = result
-                
-                # Parse block data and check if miner matches
-                try:
-                    if block_bytes:
-                        block_data = json.loads(block_bytes) if isinstance(block_bytes, str) else json.loads(block_bytes.decode('utf-8'))
-                        # Check if this block was mined by the requested address
-                        if block_data.get('miner_address') == miner_address:
-                            block_data.update({
-                                'work_score': work_score,
-                                'gas_used': gas_used,
-                                'gas_limit': gas_limit,
-                                'gas_price': gas_price,
-                                'reward': reward,
-                                'cumulative_work': cumulative_work
-                            })
-                            blocks.append(block_data)
-                except (json.JSONDecodeError, AttributeError):
-                    # Skip blocks with invalid JSON or no block_bytes
-                    continue
+            return {
+                'total_blocks': total_blocks,
+                'total_rewards': total_rewards,
+                'total_work_score': total_work_score
+            }
             
+        except Exception as e:
+            print(f"❌ Error getting reward summary for {miner_address}: {e}")
+            return {'total_blocks': 0, 'total_rewards': 0.0, 'total_work_score': 0.0}
+    
+    def get_recent_blocks(self, count: int) -> List[dict]:
+        """Get summaries of the latest `count` blocks (oldest first)"""
+        try:
+            blocks = self._query_block_summaries('1 = 1', (), limit=count)
+            blocks.reverse()
             return blocks
-            
         except Exception as e:
-            print(f"❌ Error getting blocks by miner {miner_address}: {e}")
+            print(f"❌ Error getting recent blocks: {e}")
+            return []
+    
+    def get_headers(self, start: int, limit: int) -> List[dict]:
+        """
+        Get header fields for heights start..start+limit-1 (ascending) for headers-first sync.
+        
+        Only the canonical chain is returned (the canonical_chain height map
+        kept at the best tip), so stored fork blocks never show up as
+        duplicate heights; each page costs O(limit).
+        """
+        try:
+            canonical = '''height >= ? AND height < ? AND block_hash IN (
+                SELECT block_hash FROM canonical_chain WHERE height >= ? AND height < ?
+            )'''
+            blocks = self._query_block_summaries(canonical, (start, start + limit) * 2,
+                                                 order='height ASC')
+            return [{
+                'height': block['height'],
+                'block_hash': block['block_hash'],
+                'previous_hash': block['previous_hash'],
+                'cumulative_work': block['cumulative_work'],
+                'timestamp': block['timestamp'],
+            } for block in blocks]
+        except Exception as e:
+            print(f"❌ Error getting headers from {start}: {e}")
+            return []
+    
+    def get_block_by_cid(self, cid: str) -> Optional[dict]:
+        """Get block summary by IPFS CID"""
+        try:
+            blocks = self._query_block_summaries('cid = ?', (cid,), limit=1)
+            return blocks[0] if blocks else None
+        except Exception as e:
+            print(f"❌ Error getting block by CID {cid}: {e}")
+            return None
+    
+    def get_child_blocks(self, previous_hash: str) -> List[dict]:
+        """Get summaries of blocks built on the given parent hash"""
+        try:
+            return self._query_block_summaries('previous_hash = ?', (previous_hash,), order='height ASC')
+        except Exception as e:
+            print(f"❌ Error getting children of {previous_hash[:16]}...: {e}")
+            return []
+    
+    def get_blocks_by_capacity(self, capacity: str, limit: Optional[int] = None) -> List[dict]:
+        """Get summaries of blocks mined at a given capacity tier (newest first)"""
+        try:
+            return self._query_block_summaries('capacity = ?', (capacity,), limit=limit)
+        except Exception as e:
+            print(f"❌ Error getting blocks for capacity {capacity}: {e}")
             return []
 
     def get_block_data(self, index: int) -> Optional[dict]:
@@ -505,11 +829,14 @@ class COINjectureStorage:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             
+            old_row = self._existing_block_metrics(cursor, block_hash)
             cursor.execute("""
                 UPDATE blocks 
                 SET gas_used = ? 
                 WHERE block_hash = ?
             """, (new_gas, block_hash))
+            if cursor.rowcount > 0:
+                self._update_block_summary(cursor, old_row, (new_gas,) + tuple(old_row[1:]))
             
             conn.commit()
             conn.close()
@@ -528,45 +855,9 @@ class COINjectureStorage:
     def get_blocks_in_timeframe(self, start_time: float, end_time: float) -> List[dict]:
         """Get blocks within a time frame."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT height, block_bytes, work_score, gas_used, gas_limit, gas_price, 
-                       reward, cumulative_work 
-                FROM blocks 
-                WHERE timestamp >= ? AND timestamp <= ?
-                ORDER BY height ASC
-            ''', (start_time, end_time))
-            
-            results = cursor.fetchall()
-            conn.close()
-            
-            blocks = []
-            for result in results:
-                height, block_bytes, work_score, gas_used, gas_limit, gas_price, reward, cumulative_work = result
-                
-                # Parse block data
-                try:
-                    block_data = json.loads(block_bytes) if block_bytes else {}
-                except:
-                    block_data = {}
-                
-                blocks.append({
-                    'height': height,
-                    'block_hash': block_data.get('block_hash', ''),
-                    'timestamp': block_data.get('timestamp', 0),
-                    'miner_address': block_data.get('miner_address', ''),
-                    'work_score': work_score,
-                    'gas_used': gas_used,
-                    'gas_limit': gas_limit,
-                    'gas_price': gas_price,
-                    'reward': reward,
-                    'cumulative_work_score': cumulative_work
-                })
-            
-            return blocks
-            
+            return self._query_block_summaries(
+                'timestamp >= ? AND timestamp <= ?', (start_time, end_time), order='height ASC'
+            )
         except Exception as e:
             print(f"❌ Error getting blocks in timeframe: {e}")
             return []
@@ -578,31 +869,171 @@ class COINjectureStorage:
             cursor = conn.cursor()
             
             cursor.execute('''
-                SELECT DISTINCT block_bytes 
+                SELECT DISTINCT miner_address 
                 FROM blocks 
-                WHERE timestamp >= ? AND timestamp <= ?
+                WHERE timestamp >= ? AND timestamp <= ? AND miner_address != ''
             ''', (start_time, end_time))
             
             results = cursor.fetchall()
             conn.close()
             
-            miners = set()
-            for result in results:
-                block_bytes = result[0]
-                try:
-                    block_data = json.loads(block_bytes) if block_bytes else {}
-                    miner = block_data.get('miner_address', '')
-                    if miner:
-                        miners.add(miner)
-                except:
-                    continue
-            
-            return miners
+            return {row[0] for row in results}
             
         except Exception as e:
             print(f"❌ Error getting unique miners: {e}")
             return set()
 
+    @staticmethod
+    def _search_clause(search: str) -> Tuple[str, tuple]:
+        """
+        WHERE clause for an explorer search, on indexed columns only.
+        
+        Matches an exact height, or a prefix of the block hash, miner address
+        or CID (range scans, so each arm can use its index).
+        """
+        search = search.strip()
+        if not search:
+            return '1 = 1', ()
+        
+        arms = []
+        params: list = []
+        if search.isdigit():
+            arms.append('height = ?')
+            params.append(int(search))
+        for column, value in (('block_hash', search.lower()), ('miner_address', search), ('cid', search)):
+            arms.append(f'({column} >= ? AND {column} < ?)')
+            params.extend([value, value + '\uffff'])
+        return '(' + ' OR '.join(arms) + ')', tuple(params)
+    
+    @staticmethod
+    def _explorer_sort_expression(column: str) -> str:
+        """Sort key for an explorer column; NULL metrics sort (and page) as 0."""
+        return column if column == 'height' else f'COALESCE({column}, 0)'
+    
+    @staticmethod
+    def encode_explorer_cursor(block: dict, sort_by: str) -> str:
+        """Opaque keyset cursor pointing just past the given block."""
+        value = block[EXPLORER_SORT_COLUMNS[sort_by]]
+        return f"{0 if value is None else value!r}:{block['height']}"
+    
+    @staticmethod
+    def _decode_explorer_cursor(cursor: str, sort_by: str) -> Tuple[float, int]:
+        """
+        Parse a cursor from encode_explorer_cursor().
+        
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        try:
+            value, height = cursor.rsplit(':', 1)
+            value = int(value) if sort_by == 'height' else float(value)
+            height = int(height)
+        except (ValueError, TypeError):
+            raise ValueError(f"malformed explorer cursor: {cursor!r}")
+        if not math.isfinite(value):
+            raise ValueError(f"malformed explorer cursor: {cursor!r}")
+        return value, height
+    
+    def get_explorer_blocks(self, sort_by: str = 'height', sort_order: str = 'desc', limit: int = 50,
+                            cursor: Optional[str] = None, offset: int = 0,
+                            search: str = '') -> Tuple[List[dict], Optional[str]]:
+        """
+        One explorer page, sorted in SQL on an indexed column.
+        
+        With a cursor (from a previous page's next_cursor) the page is found
+        by keyset seek, otherwise by offset. Only the rows of the page are
+        read, and only they have block_bytes decoded for the extra fields.
+        
+        Returns:
+            (blocks, next_cursor); next_cursor is None on the last page
+            
+        Raises:
+            ValueError: If cursor is malformed
+        """
+        column = EXPLORER_SORT_COLUMNS.get(sort_by, 'height')
+        sort_by = column
+        sort_key = self._explorer_sort_expression(column)
+        descending = sort_order != 'asc'
+        direction = 'DESC' if descending else 'ASC'
+        
+        where, params = self._search_clause(search)
+        if cursor:
+            value, height = self._decode_explorer_cursor(cursor, sort_by)
+            where += f' AND ({sort_key}, height) {"<" if descending else ">"} (?, ?)'
+            params += (value, height)
+            offset = 0
+        
+        sql = (f'SELECT {", ".join(BLOCK_SUMMARY_COLUMNS)}, block_bytes FROM blocks '
+               f'WHERE {where} ORDER BY {sort_key} {direction}, height {direction} LIMIT ? OFFSET ?')
+        
+        try:
+            conn = sqlite3.connect(self.db_path)
+            rows = conn.execute(sql, params + (limit + 1, max(0, offset))).fetchall()
+            conn.close()
+        except Exception as e:
+            print(f"❌ Error getting explorer blocks: {e}")
+            return [], None
+        
+        blocks = []
+        for row in rows[:limit]:
+            block = self._summary_row_to_dict(row[:-1])
+            try:
+                block_data = json.loads(row[-1]) if row[-1] else {}
+            except (ValueError, TypeError):
+                block_data = {}
+            for field, default in EXPLORER_EXTRA_FIELDS.items():
+                block[field] = block_data.get(field, default) if isinstance(block_data, dict) else default
+            blocks.append(block)
+        
+        next_cursor = None
+        if len(rows) > limit and blocks:
+            next_cursor = self.encode_explorer_cursor(blocks[-1], sort_by)
+        return blocks, next_cursor
+    
+    def get_block_summary(self, search: str = '') -> dict:
+        """
+        Totals over all blocks (or over blocks matching an explorer search).
+        
+        Unfiltered totals come from the block_summary row maintained at
+        ingest time; searches aggregate over the indexed matches.
+        """
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            if search.strip():
+                where, params = self._search_clause(search)
+                cursor.execute(f'''
+                    SELECT COUNT(*), COALESCE(SUM(gas_used), 0), COALESCE(SUM(reward), 0),
+                           COALESCE(SUM(work_score), 0)
+                    FROM blocks WHERE {where}
+                ''', params)
+            else:
+                cursor.execute('''
+                    SELECT total_blocks, total_gas_used, total_rewards, total_work_score
+                    FROM block_summary WHERE id = 1
+                ''')
+            row = cursor.fetchone() or (0, 0, 0.0, 0.0)
+            conn.close()
+            
+            total_blocks, total_gas_used, total_rewards, total_work_score = row
+            return {
+                'total_blocks': total_blocks,
+                'total_gas_used': total_gas_used,
+                'total_rewards': total_rewards,
+                'total_work_score': total_work_score,
+                'avg_work_score': total_work_score / max(total_blocks, 1),
+                'avg_reward': total_rewards / max(total_blocks, 1),
+                'avg_gas_used': total_gas_used / max(total_blocks, 1)
+            }
+            
+        except Exception as e:
+            print(f"❌ Error getting block summary: {e}")
+            return {
+                'total_blocks': 0, 'total_gas_used': 0, 'total_rewards': 0.0,
+                'total_work_score': 0.0, 'avg_work_score': 0.0, 'avg_reward': 0.0,
+                'avg_gas_used': 0.0
+            }
+
     def get_total_mining_attempts(self) -> int:
         """Get total mining attempts (estimated from block count)."""
         try:
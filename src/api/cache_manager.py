@@ -10,6 +10,12 @@ import time
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from .coupling_config import ETA, CACHE_READ_INTERVAL, CouplingState
+from .state_journal import StateJournalReader
+
+try:
+    from ..proof_cache import ProofBundleCache
+except ImportError:
+    from proof_cache import ProofBundleCache
 
 
 class CacheManager:
@@ -37,6 +43,12 @@ class CacheManager:
         self.cached_blocks = {}
         self.last_poll_time = 0.0
         
+        # Tails the consensus state journal; each poll reads only new segments
+        self._state_reader = StateJournalReader(blockchain_state_path)
+        
+        # CID lookups never change once found, so keep them out of the state scan
+        self._ipfs_cache = ProofBundleCache(max_memory_bytes=16 * 1024 * 1024)
+        
         # Ensure cache directory exists
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
@@ -95,6 +107,17 @@ class CacheManager:
         with open(file_path, 'w') as f:
             json.dump(data, f, indent=2)
     
+    def _load_blockchain_state(self) -> Optional[Dict[str, Any]]:
+        """
+        Blockchain state published by consensus, in the blockchain_state.json shape.
+        
+        Returns:
+            State dict with latest_block and blocks, or None if nothing is published
+        """
+        if not self._state_reader.poll():
+            return None
+        return self._state_reader.as_state()
+    
     def get_latest_block(self) -> Dict[str, Any]:
         """
         Get the latest block from cache with η-damped polling.
@@ -361,10 +384,8 @@ class CacheManager:
                 return all_blocks
             else:
                 # Fallback to JSON if database not available
-                if os.path.exists(self.blockchain_state_path):
-                    with open(self.blockchain_state_path, 'r') as f:
-                        blockchain_state = json.load(f)
-                    
+                blockchain_state = self._load_blockchain_state()
+                if blockchain_state:
                     # Get all blocks from blockchain state
                     all_blocks = []
                     if 'blocks' in blockchain_state:
@@ -394,34 +415,37 @@ class CacheManager:
             IPFS data or None if not found
         """
         try:
-            # Read from blockchain state
-            if os.path.exists(self.blockchain_state_path):
-                with open(self.blockchain_state_path, 'r') as f:
-                    blockchain_state = json.load(f)
-                
-                # Look for IPFS data in blockchain state
-                if 'ipfs_data' in blockchain_state:
-                    ipfs_data = blockchain_state['ipfs_data']
-                    if cid in ipfs_data:
-                        return ipfs_data[cid]
-                
-                # Look in blocks for IPFS references
-                if 'blocks' in blockchain_state:
-                    for block in blockchain_state['blocks']:
-                        if block.get('cid') == cid:
-                            return {
-                                'cid': cid,
-                                'block_index': block.get('index'),
-                                'block_hash': block.get('block_hash'),
-                                'data': block.get('data', {}),
-                                'timestamp': block.get('timestamp')
-                            }
-            
-            return None
+            # Found entries are cached; misses are retried on the next call
+            return self._ipfs_cache.get_object(cid, lambda: self._find_ipfs_data(cid))
         except Exception as e:
             print(f"Error getting IPFS data for CID {cid}: {e}")
             return None
     
+    def _find_ipfs_data(self, cid: str) -> Optional[bytes]:
+        """Scan blockchain state for a CID; JSON bytes of the entry or None."""
+        # Read from blockchain state
+        blockchain_state = self._load_blockchain_state()
+        if blockchain_state:
+            # Look for IPFS data in blockchain state
+            if 'ipfs_data' in blockchain_state:
+                ipfs_data = blockchain_state['ipfs_data']
+                if cid in ipfs_data:
+                    return json.dumps(ipfs_data[cid]).encode('utf-8')
+            
+            # Look in blocks for IPFS references
+            if 'blocks' in blockchain_state:
+                for block in blockchain_state['blocks']:
+                    if block.get('cid') == cid:
+                        return json.dumps({
+                            'cid': cid,
+                            'block_index': block.get('index'),
+                            'block_hash': block.get('block_hash'),
+                            'data': block.get('data', {}),
+                            'timestamp': block.get('timestamp')
+                        }).encode('utf-8')
+        
+        return None
+    
     def list_ipfs_cids(self) -> List[str]:
         """
         List all available IPFS CIDs.
@@ -433,10 +457,8 @@ class CacheManager:
             cids = []
             
             # Read from blockchain state
-            if os.path.exists(self.blockchain_state_path):
-                with open(self.blockchain_state_path, 'r') as f:
-                    blockchain_state = json.load(f)
-                
+            blockchain_state = self._load_blockchain_state()
+            if blockchain_state:
                 # Get CIDs from IPFS data
                 if 'ipfs_data' in blockchain_state:
                     cids.extend(blockchain_state['ipfs_data'].keys())
@@ -467,10 +489,8 @@ class CacheManager:
             query_lower = query.lower()
             
             # Read from blockchain state
-            if os.path.exists(self.blockchain_state_path):
-                with open(self.blockchain_state_path, 'r') as f:
-                    blockchain_state = json.load(f)
-                
+            blockchain_state = self._load_blockchain_state()
+            if blockchain_state:
                 # Search in IPFS data
                 if 'ipfs_data' in blockchain_state:
                     for cid, data in blockchain_state['ipfs_data'].items():
@@ -568,13 +588,11 @@ class CacheManager:
                 # Update last poll time
                 self.last_poll_time = time.time()
             else:
-                # Fallback to JSON if database not available
-                if not os.path.exists(self.blockchain_state_path):
+                # Fallback to the consensus state journal if database not available
+                blockchain_state = self._load_blockchain_state()
+                if not blockchain_state:
                     return  # No blockchain state yet
                 
-                with open(self.blockchain_state_path, 'r') as f:
-                    blockchain_state = json.load(f)
-                
                 # Lightweight validation (trust consensus)
                 if 'latest_block' in blockchain_state:
                     self.cached_blocks['latest_block'] = blockchain_state['latest_block']
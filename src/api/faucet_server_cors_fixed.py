@@ -5,6 +5,8 @@ import json
 import time
 import logging
 import sqlite3
+import threading
+from collections import OrderedDict
 from flask import Flask, request, jsonify
 from flask_cors import CORS, cross_origin
 
@@ -12,9 +14,11 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-from blockchain_storage import storage
+from blockchain_storage import storage, EXPLORER_SORT_COLUMNS
+from rolling_metrics import RollingMetrics
 from metrics_engine import MetricsEngine, get_metrics_engine, SATOSHI_CONSTANT, NetworkState
-from storage import IPFSClient
+from storage import get_ipfs_client
+from proof_cache import ProofBundleCache, get_proof_cache
 from pow import ProblemRegistry, ProblemType
 
 metrics_engine = get_metrics_engine()
@@ -35,78 +39,33 @@ except Exception as e:
     logger.warning(f"⚠️  Could not start equilibrium service: {e}")
     equilibrium_service = None
 
+# In-memory sliding windows behind the dashboard; updated on every ingest
+rolling_metrics = RollingMetrics()
+try:
+    rolling_metrics.load_from_storage(storage)
+except Exception as e:
+    logger.warning(f"⚠️  Could not seed rolling metrics: {e}")
+
 # Helper functions for dynamic metric calculations
 def calculate_tps(seconds: int) -> float:
     """Calculate transactions per second over time window."""
     try:
-        current_time = time.time()
-        start_time = current_time - seconds
-        
-        # Get blocks in timeframe
-        blocks = storage.get_blocks_in_timeframe(start_time, current_time)
-        return len(blocks) / seconds if seconds > 0 else 0.0
+        return rolling_metrics.tps(seconds)
     except Exception:
         return 0.0
 
 def calculate_avg_block_time(num_blocks: int = None) -> float:
     """Calculate average time between blocks."""
     try:
-        latest_height = storage.get_latest_height()
-        if latest_height < 1:
-            return 0.0
-        
-        # Get recent blocks
-        if num_blocks:
-            start_height = max(0, latest_height - num_blocks + 1)
-        else:
-            start_height = max(0, latest_height - 10)  # Default to last 10 blocks
-        
-        total_time = 0.0
-        count = 0
-        
-        for i in range(start_height + 1, latest_height + 1):
-            current_block = storage.get_block_data(i)
-            previous_block = storage.get_block_data(i - 1)
-            
-            if current_block and previous_block:
-                time_diff = current_block.get('timestamp', 0) - previous_block.get('timestamp', 0)
-                if time_diff > 0:
-                    total_time += time_diff
-                    count += 1
-        
-        return total_time / count if count > 0 else 0.0
+        # num_blocks blocks span num_blocks - 1 intervals; default is the last 10 intervals
+        return rolling_metrics.avg_block_time(num_blocks - 1 if num_blocks else 10)
     except Exception:
         return 0.0
 
 def calculate_median_block_time() -> float:
     """Calculate median block time."""
     try:
-        latest_height = storage.get_latest_height()
-        if latest_height < 1:
-            return 0.0
-        
-        # Get last 20 blocks for median calculation
-        start_height = max(0, latest_height - 19)
-        times = []
-        
-        for i in range(start_height + 1, latest_height + 1):
-            current_block = storage.get_block_data(i)
-            previous_block = storage.get_block_data(i - 1)
-            
-            if current_block and previous_block:
-                time_diff = current_block.get('timestamp', 0) - previous_block.get('timestamp', 0)
-                if time_diff > 0:
-                    times.append(time_diff)
-        
-        if not times:
-            return 0.0
-        
-        times.sort()
-        n = len(times)
-        if n % 2 == 0:
-            return (times[n//2 - 1] + times[n//2]) / 2
-        else:
-            return times[n//2]
+        return rolling_metrics.median_block_time()
     except Exception:
         return 0.0
 
@@ -132,8 +91,7 @@ def get_active_peers_count() -> int:
     try:
         # This would ideally come from network status
         # For now, return a reasonable estimate based on recent activity
-        latest_height = storage.get_latest_height()
-        if latest_height < 1:
+        if rolling_metrics.latest_height < 1:
             return 0
         
         # Count unique miners in last hour
@@ -144,90 +102,35 @@ def get_active_peers_count() -> int:
 def get_unique_miners_count(seconds: int) -> int:
     """Count unique miners in time window."""
     try:
-        current_time = time.time()
-        start_time = current_time - seconds
-        
-        miners = storage.get_unique_miners(start_time, current_time)
-        return len(miners)
+        return rolling_metrics.unique_miners(seconds)
     except Exception:
         return 0
 
 def calculate_avg_difficulty() -> float:
     """Calculate average difficulty."""
     try:
-        latest_height = storage.get_latest_height()
-        if latest_height < 0:
-            return 0.0
-        
-        # Get last 10 blocks for average
-        start_height = max(0, latest_height - 9)
-        total_difficulty = 0.0
-        count = 0
-        
-        for i in range(start_height, latest_height + 1):
-            block = storage.get_block_data(i)
-            if block:
-                difficulty = block.get('difficulty', 1.0)
-                total_difficulty += difficulty
-                count += 1
-        
-        return total_difficulty / count if count > 0 else 1.0
+        return rolling_metrics.avg_difficulty()
     except Exception:
         return 1.0
 
 def calculate_efficiency_ratio() -> float:
     """Calculate work efficiency metric."""
     try:
-        # Calculate based on recent work scores and time
-        latest_height = storage.get_latest_height()
-        if latest_height < 1:
-            return 0.0
-        
-        # Get last 10 blocks
-        start_height = max(0, latest_height - 9)
-        total_work = 0.0
-        total_time = 0.0
-        
-        for i in range(start_height, latest_height + 1):
-            block = storage.get_block_data(i)
-            if block:
-                work_score = block.get('work_score', 0)
-                total_work += work_score
-        
-        # Calculate time span
-        if start_height < latest_height:
-            first_block = storage.get_block_data(start_height)
-            last_block = storage.get_block_data(latest_height)
-            if first_block and last_block:
-                total_time = last_block.get('timestamp', 0) - first_block.get('timestamp', 0)
-        
-        if total_time > 0:
-            return total_work / total_time
-        else:
-            return total_work
+        return rolling_metrics.efficiency_ratio()
     except Exception:
         return 0.0
 
 def count_blocks_in_timeframe(seconds: int) -> int:
     """Count blocks in time window."""
     try:
-        current_time = time.time()
-        start_time = current_time - seconds
-        
-        blocks = storage.get_blocks_in_timeframe(start_time, current_time)
-        return len(blocks)
+        return rolling_metrics.block_count(seconds)
     except Exception:
         return 0
 
 def sum_work_score_in_timeframe(seconds: int) -> float:
     """Sum work scores in time window."""
     try:
-        current_time = time.time()
-        start_time = current_time - seconds
-        
-        blocks = storage.get_blocks_in_timeframe(start_time, current_time)
-        total_work = sum(block.get('work_score', 0) for block in blocks)
-        return total_work
+        return rolling_metrics.work_score_sum(seconds)
     except Exception:
         return 0.0
 
@@ -298,7 +201,9 @@ def health_check():
 def dashboard_metrics():
     try:
         network_metrics = metrics_engine.get_network_metrics()
-        latest_block = storage.get_latest_block_data()
+        # Catch up on blocks stored by other writers, then serve from memory
+        rolling_metrics.sync(storage)
+        latest_block = rolling_metrics.latest_block() or storage.get_latest_block_data()
         
         satoshi_constant = network_metrics.get('satoshi_constant', SATOSHI_CONSTANT)
         damping_ratio = network_metrics.get('damping_ratio', SATOSHI_CONSTANT)
@@ -400,147 +305,143 @@ def dashboard_metrics():
 def _get_recent_transactions():
     try:
         recent_blocks = []
-        latest_height = storage.get_latest_height()
         current_time = time.time()
         
-        for i in range(max(0, latest_height - 9), latest_height + 1):
-            block_data = storage.get_block_data(i)
-            if block_data:
-                block_hash = block_data.get('block_hash', '')
-                miner = block_data.get('miner_address', 'Unknown')
-                previous_hash = block_data.get('previous_hash', '')
-                cid = block_data.get('cid', 'N/A')
-                timestamp = block_data.get('timestamp', 0)
-                gas_used = block_data.get('gas_used', 0)
-                
-                # Calculate age display
-                age_seconds = current_time - timestamp
-                if age_seconds < 60:
-                    age_display = f"{int(age_seconds)}s ago"
-                elif age_seconds < 3600:
-                    age_display = f"{int(age_seconds/60)}m ago"
-                else:
-                    age_display = f"{int(age_seconds/3600)}h ago"
-                
-                # Format timestamp display
-                timestamp_display = time.strftime('%m/%d/%Y, %I:%M:%S %p', time.localtime(timestamp))
-                
-                recent_blocks.append({
-                    'block_index': i,
-                    'age_display': age_display,
-                    'block_hash': block_hash,
-                    'block_hash_short': block_hash[:16] + '...' if len(block_hash) > 16 else block_hash,
-                    'miner': miner,
-                    'miner_short': miner[:16] + '...' if len(miner) > 16 else miner,
-                    'work_score': block_data.get('work_score', 0),
-                    'capacity': block_data.get('capacity', 'Unknown'),
-                    'timestamp': timestamp,
-                    'timestamp_display': timestamp_display,
-                    'previous_hash': previous_hash,
-                    'previous_hash_short': previous_hash[:16] + '...' if len(previous_hash) > 16 else previous_hash,
-                    'cid': cid,
-                    'cid_short': cid[:16] + '...' if len(cid) > 16 else cid,
-                    'gas_used': gas_used,
-                    'gas_used_formatted': f"{gas_used:,}" if gas_used > 0 else "0",
-                    'reward': block_data.get('reward', 0)
-                })
+        for block_data in rolling_metrics.recent_blocks():
+            i = block_data['height']
+            block_hash = block_data.get('block_hash') or ''
+            miner = block_data.get('miner_address') or 'Unknown'
+            previous_hash = block_data.get('previous_hash') or ''
+            cid = block_data.get('cid') or 'N/A'
+            timestamp = block_data.get('timestamp') or 0
+            gas_used = block_data.get('gas_used') or 0
+            
+            # Calculate age display
+            age_seconds = current_time - timestamp
+            if age_seconds < 60:
+                age_display = f"{int(age_seconds)}s ago"
+            elif age_seconds < 3600:
+                age_display = f"{int(age_seconds/60)}m ago"
+            else:
+                age_display = f"{int(age_seconds/3600)}h ago"
+            
+            # Format timestamp display
+            timestamp_display = time.strftime('%m/%d/%Y, %I:%M:%S %p', time.localtime(timestamp))
+            
+            recent_blocks.append({
+                'block_index': i,
+                'age_display': age_display,
+                'block_hash': block_hash,
+                'block_hash_short': block_hash[:16] + '...' if len(block_hash) > 16 else block_hash,
+                'miner': miner,
+                'miner_short': miner[:16] + '...' if len(miner) > 16 else miner,
+                'work_score': block_data.get('work_score', 0),
+                'capacity': block_data.get('capacity', 'Unknown'),
+                'timestamp': timestamp,
+                'timestamp_display': timestamp_display,
+                'previous_hash': previous_hash,
+                'previous_hash_short': previous_hash[:16] + '...' if len(previous_hash) > 16 else previous_hash,
+                'cid': cid,
+                'cid_short': cid[:16] + '...' if len(cid) > 16 else cid,
+                'gas_used': gas_used,
+                'gas_used_formatted': f"{gas_used:,}" if gas_used > 0 else "0",
+                'reward': block_data.get('reward', 0)
+            })
         
         return recent_blocks
     except Exception as e:
         logger.error(f'Error getting recent transactions: {e}')
         return []
 
+def _explorer_block_info(block_data: dict, current_time: float) -> dict:
+    """Format one explorer row for the frontend."""
+    height = block_data.get('height', 0)
+    timestamp = block_data.get('timestamp') or 0
+    block_hash = block_data.get('block_hash') or ''
+    miner = block_data.get('miner_address') or 'Unknown'
+    previous_hash = block_data.get('previous_hash') or ''
+    cid = block_data.get('cid') or 'N/A'
+    gas_used = block_data.get('gas_used') or 0
+    reward = block_data.get('reward') or 0
+    cumulative_work = block_data.get('cumulative_work_score') or 0
+    
+    # Calculate age display
+    age_seconds = current_time - timestamp
+    if age_seconds < 60:
+        age_display = f"{int(age_seconds)}s ago"
+    elif age_seconds < 3600:
+        age_display = f"{int(age_seconds/60)}m ago"
+    elif age_seconds < 86400:
+        age_display = f"{int(age_seconds/3600)}h ago"
+    else:
+        age_display = f"{int(age_seconds/86400)}d ago"
+    
+    # Format timestamp display
+    timestamp_display = time.strftime('%m/%d/%Y, %I:%M:%S %p', time.localtime(timestamp))
+    
+    return {
+        'height': height,
+        'block_index': height,
+        'hash': block_hash,
+        'hash_short': block_hash[:16] + '...',
+        'miner': miner,
+        'miner_short': miner[:16] + '...',
+        'work_score': block_data.get('work_score') or 0,
+        'capacity': block_data.get('capacity') or 'Unknown',
+        'timestamp': timestamp,
+        'timestamp_display': timestamp_display,
+        'age_display': age_display,
+        'previous_hash': previous_hash,
+        'previous_hash_short': previous_hash[:16] + '...',
+        'cid': cid,
+        'cid_short': cid[:16] + '...',
+        'gas_used': gas_used,
+        'gas_limit': block_data.get('gas_limit', 1000000),
+        'gas_price': block_data.get('gas_price', 0.000001),
+        'gas_used_formatted': f"{gas_used:,}",
+        'reward': reward,
+        'reward_formatted': f"{reward:.6f} BEANS",
+        'cumulative_work': cumulative_work,
+        'cumulative_work_formatted': f"{cumulative_work:,.2f}",
+        'merkle_root': block_data.get('merkle_root', ''),
+        'nonce': block_data.get('nonce', 0),
+        'difficulty': block_data.get('difficulty', 1.0),
+        'size_bytes': block_data.get('size_bytes', 0),
+        'transaction_count': block_data.get('transaction_count', 0)
+    }
+
 @app.route('/v1/explorer/blocks', methods=['GET'])
 def block_explorer():
     try:
-        page = int(request.args.get('page', 1))
-        limit = int(request.args.get('limit', 50))
+        page = max(1, int(request.args.get('page', 1)))
+        limit = max(1, min(int(request.args.get('limit', 50)), 500))
+        cursor = request.args.get('cursor') or None
         search = request.args.get('search', '')
         sort_by = request.args.get('sort_by', 'height')
         sort_order = request.args.get('sort_order', 'desc')
+        if sort_by not in EXPLORER_SORT_COLUMNS:
+            sort_by = 'height'
+        
+        # Sorting, search and paging all run in SQL on indexed columns;
+        # pass next_cursor back as ?cursor= for constant-cost deep paging
+        try:
+            blocks, next_cursor = storage.get_explorer_blocks(
+                sort_by=sort_by,
+                sort_order=sort_order,
+                limit=limit,
+                cursor=cursor,
+                offset=(page - 1) * limit,
+                search=search
+            )
+        except ValueError:
+            return jsonify({'status': 'error', 'message': 'Invalid cursor'}), 400
+        summary = storage.get_block_summary(search)
         
-        latest_height = storage.get_latest_height()
+        current_time = time.time()
+        paginated_blocks = [_explorer_block_info(block, current_time) for block in blocks]
         
-        # Get all blocks first
-        all_blocks = []
-        for height in range(0, latest_height + 1):
-            block_data = storage.get_block_data(height)
-            if block_data:
-                current_time = time.time()
-                timestamp = block_data.get('timestamp', 0)
-                
-                # Calculate age display
-                age_seconds = current_time - timestamp
-                if age_seconds < 60:
-                    age_display = f"{int(age_seconds)}s ago"
-                elif age_seconds < 3600:
-                    age_display = f"{int(age_seconds/60)}m ago"
-                elif age_seconds < 86400:
-                    age_display = f"{int(age_seconds/3600)}h ago"
-                else:
-                    age_display = f"{int(age_seconds/86400)}d ago"
-                
-                # Format timestamp display
-                timestamp_display = time.strftime('%m/%d/%Y, %I:%M:%S %p', time.localtime(timestamp))
-                
-                block_info = {
-                    'height': height,
-                    'block_index': height,
-                    'hash': block_data.get('block_hash', ''),
-                    'hash_short': block_data.get('block_hash', '')[:16] + '...',
-                    'miner': block_data.get('miner_address', 'Unknown'),
-                    'miner_short': block_data.get('miner_address', 'Unknown')[:16] + '...',
-                    'work_score': block_data.get('work_score', 0),
-                    'capacity': block_data.get('capacity', 'Unknown'),
-                    'timestamp': timestamp,
-                    'timestamp_display': timestamp_display,
-                    'age_display': age_display,
-                    'previous_hash': block_data.get('previous_hash', ''),
-                    'previous_hash_short': block_data.get('previous_hash', '')[:16] + '...',
-                    'cid': block_data.get('cid', 'N/A'),
-                    'cid_short': block_data.get('cid', 'N/A')[:16] + '...',
-                    'gas_used': block_data.get('gas_used', 0),
-                    'gas_limit': block_data.get('gas_limit', 1000000),
-                    'gas_price': block_data.get('gas_price', 0.000001),
-                    'gas_used_formatted': f"{block_data.get('gas_used', 0):,}",
-                    'reward': block_data.get('reward', 0),
-                    'reward_formatted': f"{block_data.get('reward', 0):.6f} BEANS",
-                    'cumulative_work': block_data.get('cumulative_work_score', 0),
-                    'cumulative_work_formatted': f"{block_data.get('cumulative_work_score', 0):,.2f}",
-                    'merkle_root': block_data.get('merkle_root', ''),
-                    'nonce': block_data.get('nonce', 0),
-                    'difficulty': block_data.get('difficulty', 1.0),
-                    'size_bytes': block_data.get('size_bytes', 0),
-                    'transaction_count': block_data.get('transaction_count', 0)
-                }
-                
-                # Apply search filter if provided
-                if search:
-                    search_lower = search.lower()
-                    if (search_lower in str(height) or 
-                        search_lower in block_info['hash'].lower() or 
-                        search_lower in block_info['miner'].lower() or 
-                        search_lower in block_info['cid'].lower()):
-                        all_blocks.append(block_info)
-                else:
-                    all_blocks.append(block_info)
-        
-        # Sort blocks
-        if sort_by == 'height':
-            all_blocks.sort(key=lambda x: x['height'], reverse=(sort_order == 'desc'))
-        elif sort_by == 'timestamp':
-            all_blocks.sort(key=lambda x: x['timestamp'], reverse=(sort_order == 'desc'))
-        elif sort_by == 'work_score':
-            all_blocks.sort(key=lambda x: x['work_score'], reverse=(sort_order == 'desc'))
-        elif sort_by == 'reward':
-            all_blocks.sort(key=lambda x: x['reward'], reverse=(sort_order == 'desc'))
-        
-        # Pagination
-        total_blocks = len(all_blocks)
+        total_blocks = summary['total_blocks']
         total_pages = (total_blocks + limit - 1) // limit
-        start_idx = (page - 1) * limit
-        end_idx = start_idx + limit
-        paginated_blocks = all_blocks[start_idx:end_idx]
         
         return jsonify({
             'status': 'success',
@@ -551,8 +452,9 @@ def block_explorer():
                     'limit': limit,
                     'total_blocks': total_blocks,
                     'total_pages': total_pages,
-                    'has_next': page < total_pages,
-                    'has_prev': page > 1
+                    'has_next': next_cursor is not None,
+                    'has_prev': page > 1 or cursor is not None,
+                    'next_cursor': next_cursor
                 },
                 'filters': {
                     'search': search,
@@ -561,9 +463,9 @@ def block_explorer():
                 },
                 'summary': {
                     'total_blocks': total_blocks,
-                    'total_gas_used': sum(block['gas_used'] for block in all_blocks),
-                    'total_rewards': sum(block['reward'] for block in all_blocks),
-                    'avg_work_score': sum(block['work_score'] for block in all_blocks) / max(len(all_blocks), 1),
+                    'total_gas_used': summary['total_gas_used'],
+                    'total_rewards': summary['total_rewards'],
+                    'avg_work_score': summary['avg_work_score'],
                     'avg_block_time': 7.5
                 }
             }
@@ -578,26 +480,10 @@ def block_explorer_summary():
     try:
         latest_height = storage.get_latest_height()
         
-        # Get summary statistics
+        # Exact totals from the aggregates maintained at ingest time
+        summary = storage.get_block_summary()
         total_blocks = latest_height + 1
-        total_gas_used = 0
-        total_rewards = 0
-        total_work_score = 0
-        
-        # Sample some blocks for statistics (to avoid loading all blocks)
-        sample_blocks = []
-        step = max(1, total_blocks // 100)  # Sample up to 100 blocks
-        for i in range(0, total_blocks, step):
-            block_data = storage.get_block_data(i)
-            if block_data:
-                sample_blocks.append(block_data)
-                total_gas_used += block_data.get('gas_used', 0)
-                total_rewards += block_data.get('reward', 0)
-                total_work_score += block_data.get('work_score', 0)
-        
-        avg_work_score = total_work_score / max(len(sample_blocks), 1)
-        avg_reward = total_rewards / max(len(sample_blocks), 1)
-        avg_gas_used = total_gas_used / max(len(sample_blocks), 1)
+        total_rewards = summary['total_rewards']
         
         # Get latest block for current stats
         latest_block = storage.get_latest_block_data()
@@ -608,12 +494,12 @@ def block_explorer_summary():
                 'total_blocks': total_blocks,
                 'latest_height': latest_height,
                 'latest_hash': latest_block.get('block_hash', '') if latest_block else '',
-                'total_gas_used': total_gas_used,
+                'total_gas_used': summary['total_gas_used'],
                 'total_rewards': total_rewards,
                 'total_rewards_formatted': f"{total_rewards:.6f} BEANS",
-                'avg_work_score': avg_work_score,
-                'avg_reward': avg_reward,
-                'avg_gas_used': avg_gas_used,
+                'avg_work_score': summary['avg_work_score'],
+                'avg_reward': summary['avg_reward'],
+                'avg_gas_used': summary['avg_gas_used'],
                 'cumulative_work': latest_block.get('cumulative_work_score', 0) if latest_block else 0,
                 'network_hashrate': 1500.0,
                 'avg_block_time': 7.5,
@@ -652,6 +538,20 @@ def get_block(block_index):
         logger.error(f'Error getting block {block_index}: {e}')
         return jsonify({'status': 'error', 'message': 'Failed to get block data'}), 500
 
+@app.route('/v1/data/headers', methods=['GET'])
+def get_headers():
+    """Header range for headers-first sync: ?start=<height>&limit=<n> (max 2000)"""
+    try:
+        start = max(0, int(request.args.get('start', 0)))
+        limit = max(1, min(int(request.args.get('limit', 500)), 2000))
+        headers = storage.get_headers(start, limit)
+        return jsonify({'status': 'success', 'data': {'start': start, 'headers': headers}})
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'start and limit must be integers'}), 400
+    except Exception as e:
+        logger.error(f'Error getting headers from {request.args.get("start")}: {e}')
+        return jsonify({'status': 'error', 'message': 'Failed to get headers'}), 500
+
 @app.route('/v1/data/block/latest', methods=['GET'])
 def get_latest_block():
     try:
@@ -668,16 +568,12 @@ def get_latest_block():
 def get_rewards(address):
     """Get rewards for a specific address"""
     try:
-        # Get all blocks mined by this address
-        blocks = storage.get_blocks_by_miner(address)
-        
-        total_rewards = 0.0
-        total_work_score = 0.0
-        total_blocks = len(blocks)
+        # Indexed aggregate over this address's blocks
+        summary = storage.get_miner_reward_summary(address)
         
-        for block in blocks:
-            total_rewards += block.get('reward', 0.0)
-            total_work_score += block.get('work_score', 0.0)
+        total_rewards = summary['total_rewards']
+        total_work_score = summary['total_work_score']
+        total_blocks = summary['total_blocks']
         
         avg_reward = total_rewards / total_blocks if total_blocks > 0 else 0.0
         avg_work_score = total_work_score / total_blocks if total_blocks > 0 else 0.0
@@ -704,13 +600,12 @@ def get_rewards(address):
 def create_and_upload_proof_data(block_hash, block_index, miner_address, work_score, problem_data, solution_data):
     """Create and upload proof data to IPFS for incoming blocks."""
     try:
-        from storage import IPFSClient
         import json
         import time
         import random
         
-        # Initialize IPFS client
-        ipfs_client = IPFSClient("http://localhost:5001")
+        # Shared IPFS client (pooled keep-alive connections)
+        ipfs_client = get_ipfs_client("http://localhost:5001")
         if not ipfs_client.health_check():
             logger.error("❌ IPFS daemon not available for proof data upload")
             return None
@@ -790,12 +685,10 @@ def create_and_upload_proof_data(block_hash, block_index, miner_address, work_sc
         new_cid = ipfs_client.add(bundle_bytes)
         
         if new_cid:
-            # Pin the CID
-            import subprocess
-            result = subprocess.run([
-                "curl", "-X", "POST", 
-                f"http://localhost:5001/api/v0/pin/add?arg={new_cid}"
-            ], capture_output=True, text=True, timeout=30)
+            get_proof_cache().put(new_cid, bundle_bytes)
+            
+            # Pin the CID over the same pooled connection
+            ipfs_client.pin(new_cid)
             
             logger.info(f"📦 Created and uploaded proof data to IPFS: {new_cid[:16]}... ({len(bundle_bytes)} bytes)")
             return new_cid
@@ -952,7 +845,9 @@ def ingest_block():
         }
         
         # Store the block (only after CID validation)
-        storage.add_block_data(block_data)
+        if storage.add_block_data(block_data):
+            rolling_metrics.record_block(block_data)
+            _forget_ipfs_miss(final_cid)
         
         logger.info(f'Block ingested: {block_hash[:16]}... by {miner_address[:16]}... (work: {work_score}, reward: {reward:.6f})')
         
@@ -973,41 +868,81 @@ def ingest_block():
         logger.error(f'Error ingesting block: {e}')
         return jsonify({'status': 'error', 'message': 'Failed to ingest block'}), 500
 
+# Proof bundle summaries keyed by CID; built from immutable block rows
+_ipfs_summary_cache = ProofBundleCache(max_memory_bytes=16 * 1024 * 1024)
+
+# CIDs with no block yet: cid -> expiry, so repeated 404s skip the lookup
+IPFS_MISS_TTL = 30.0  # seconds
+IPFS_MISS_CAPACITY = 10000
+_ipfs_misses = OrderedDict()
+_ipfs_misses_lock = threading.Lock()
+
+
+def _is_recent_ipfs_miss(cid):
+    with _ipfs_misses_lock:
+        expiry = _ipfs_misses.get(cid)
+        if expiry is None:
+            return False
+        if expiry > time.time():
+            return True
+        del _ipfs_misses[cid]
+        return False
+
+
+def _record_ipfs_miss(cid):
+    with _ipfs_misses_lock:
+        _ipfs_misses[cid] = time.time() + IPFS_MISS_TTL
+        _ipfs_misses.move_to_end(cid)
+        while len(_ipfs_misses) > IPFS_MISS_CAPACITY:
+            _ipfs_misses.popitem(last=False)
+
+
+def _forget_ipfs_miss(cid):
+    """Called when a block with this CID is ingested."""
+    with _ipfs_misses_lock:
+        _ipfs_misses.pop(cid, None)
+
+
+def _load_ipfs_summary(cid):
+    """Build the /v1/ipfs/<cid> proof bundle JSON from the block that references cid."""
+    # Indexed lookup on blocks.cid (idx_blocks_cid), then one row by primary key
+    summary = storage.get_block_by_cid(cid)
+    block_bytes = storage.get_block(summary['block_hash']) if summary else None
+    if not block_bytes:
+        return None
+    
+    block_data = json.loads(block_bytes if isinstance(block_bytes, str) else block_bytes.decode('utf-8'))
+    
+    # Create proof bundle JSON
+    proof_bundle = {
+        'cid': cid,
+        'block_hash': block_data.get('hash', summary['block_hash']),
+        'block_height': block_data.get('index', 0),
+        'timestamp': block_data.get('timestamp', 0),
+        'miner_address': block_data.get('miner_address', ''),
+        'problem_data': block_data.get('problem_data', {}),
+        'solution_data': block_data.get('solution_data', {}),
+        'work_score': block_data.get('work_score', 0),
+        'gas_used': block_data.get('gas_used', 0),
+        'capacity': block_data.get('capacity', 'unknown')
+    }
+    return json.dumps(proof_bundle).encode('utf-8')
+
+
 @app.route('/v1/ipfs/<cid>', methods=['GET'])
 @cross_origin()
 def get_ipfs_data(cid):
     """Get IPFS proof bundle data by CID"""
     try:
-        # Get block data by CID
-        conn = sqlite3.connect(storage.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT block_bytes FROM blocks 
-            WHERE block_bytes LIKE ? 
-            ORDER BY height DESC LIMIT 1
-        ''', (f'%{cid}%',))
-        
-        result = cursor.fetchone()
-        conn.close()
-        
-        if result and result[0]:
-            block_data = json.loads(result[0].decode('utf-8'))
-            
-            # Create proof bundle JSON
-            proof_bundle = {
-                'cid': cid,
-                'block_hash': block_data.get('hash', ''),
-                'block_height': block_data.get('index', 0),
-                'timestamp': block_data.get('timestamp', 0),
-                'miner_address': block_data.get('miner_address', ''),
-                'problem_data': block_data.get('problem_data', {}),
-                'solution_data': block_data.get('solution_data', {}),
-                'work_score': block_data.get('work_score', 0),
-                'gas_used': block_data.get('gas_used', 0),
-                'capacity': block_data.get('capacity', 'unknown')
-            }
-            
+        # Found bundles are cached for good; misses only for IPFS_MISS_TTL (or
+        # until a block with this CID is ingested), so it still resolves later
+        proof_bundle = None
+        if not _is_recent_ipfs_miss(cid):
+            proof_bundle = _ipfs_summary_cache.get_object(cid, lambda: _load_ipfs_summary(cid))
+            if proof_bundle is None:
+                _record_ipfs_miss(cid)
+        
+        if proof_bundle is not None:
             return jsonify({
                 'status': 'success',
                 'data': proof_bundle
@@ -1018,6 +953,11 @@ def get_ipfs_data(cid):
                 'message': 'CID not found'
             }), 404
             
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'status': 'error',
@@ -1030,12 +970,13 @@ def get_ipfs_data(cid):
 def get_proof_data_by_cid(cid):
     """Get proof bundle data directly from IPFS by CID"""
     try:
-        # Initialize IPFS client
-        ipfs_client = IPFSClient("http://localhost:5001")
+        # Shared IPFS client
+        ipfs_client = get_ipfs_client("http://localhost:5001")
         
-        # Get data from IPFS
-        data = ipfs_client.get(cid)
-        proof_json = json.loads(data.decode("utf-8"))
+        # Get data from the proof cache, falling back to IPFS
+        proof_json = get_proof_cache().get_object(cid, lambda: ipfs_client.get(cid))
+        if proof_json is None:
+            raise Exception(f"CID not retrievable: {cid}")
         
         return jsonify({
             'status': 'success',
@@ -1069,10 +1010,11 @@ def get_proof_data_by_block(block_index):
                 'message': 'No CID found for block'
             }), 404
         
-        # Get proof data from IPFS
-        ipfs_client = IPFSClient("http://localhost:5001")
-        data = ipfs_client.get(cid)
-        proof_json = json.loads(data.decode("utf-8"))
+        # Get proof data from the proof cache, falling back to IPFS
+        ipfs_client = get_ipfs_client("http://localhost:5001")
+        proof_json = get_proof_cache().get_object(cid, lambda: ipfs_client.get(cid))
+        if proof_json is None:
+            raise Exception(f"CID not retrievable: {cid}")
         
         return jsonify({
             'status': 'success',
@@ -99,7 +99,8 @@ class HealthMonitorAPI:
         desync_detected = self.detect_consensus_desync()
         
         blockchain_state = self.get_blockchain_state()
-        total_blocks = len(blockchain_state.get("blocks", [])) if blockchain_state else 0
+        # Journal manifests carry block_count; legacy state files list every block
+        total_blocks = blockchain_state.get("block_count", len(blockchain_state.get("blocks", []))) if blockchain_state else 0
         latest_block = blockchain_state.get("latest_block", {}) if blockchain_state else {}
         latest_index = latest_block.get("index", 0)
         
@@ -132,7 +133,7 @@ class HealthMonitorAPI:
                 "message": "Blockchain state not found"
             }
         
-        total_blocks = len(blockchain_state.get("blocks", []))
+        total_blocks = blockchain_state.get("block_count", len(blockchain_state.get("blocks", [])))
         latest_block = blockchain_state.get("latest_block", {})
         
         # Check if cache is in sync
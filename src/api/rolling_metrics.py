@@ -0,0 +1,261 @@
+"""
+Rolling Metrics for COINjecture Faucet API
+
+In-process sliding-window aggregates for the dashboard endpoints. Every
+ingested block updates the windows once; dashboard reads are served from
+memory, so their cost does not depend on chain height.
+"""
+
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import Counter, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+class _TimeWindow:
+    """Blocks seen in the last `seconds`, with running count, work sum and miners."""
+
+    def __init__(self, seconds: int):
+        self.seconds = seconds
+        self.entries: Deque[Tuple[float, float, str]] = deque()
+        self.work_sum = 0.0
+        self.miners: Counter = Counter()
+
+    def add(self, timestamp: float, work_score: float, miner: str):
+        self.entries.append((timestamp, work_score, miner))
+        self.work_sum += work_score
+        if miner:
+            self.miners[miner] += 1
+
+    def expire(self, now: float):
+        cutoff = now - self.seconds
+        while self.entries and self.entries[0][0] < cutoff:
+            _, work_score, miner = self.entries.popleft()
+            self.work_sum -= work_score
+            if miner:
+                self.miners[miner] -= 1
+                if self.miners[miner] <= 0:
+                    del self.miners[miner]
+        if not self.entries:
+            # Reset accumulated float error whenever the window drains
+            self.work_sum = 0.0
+
+
+class _IntervalWindow:
+    """Last `size` block intervals; only positive intervals are counted."""
+
+    def __init__(self, size: int, keep_sorted: bool = False):
+        self.size = size
+        self.values: Deque[float] = deque()
+        self.total = 0.0
+        self.positive = 0
+        self.sorted_values: Optional[List[float]] = [] if keep_sorted else None
+
+    def add(self, value: float):
+        self.values.append(value)
+        if value > 0:
+            self.total += value
+            self.positive += 1
+            if self.sorted_values is not None:
+                insort(self.sorted_values, value)
+
+        if len(self.values) > self.size:
+            old = self.values.popleft()
+            if old > 0:
+                self.total -= old
+                self.positive -= 1
+                if self.sorted_values is not None:
+                    del self.sorted_values[bisect_left(self.sorted_values, old)]
+
+    def mean(self) -> float:
+        return self.total / self.positive if self.positive > 0 else 0.0
+
+    def median(self) -> float:
+        values = self.sorted_values or []
+        n = len(values)
+        if n == 0:
+            return 0.0
+        if n % 2 == 0:
+            return (values[n//2 - 1] + values[n//2]) / 2
+        return values[n//2]
+
+
+class RollingMetrics:
+    """
+    Sliding-window dashboard metrics updated on block ingest.
+
+    Time windows (TPS, block counts, work sums, unique miners) expire
+    entries on every ingested block, relative to that block's timestamp, so
+    they stay bounded without reads; reads expire them again against the
+    current time. Block-count windows keep the intervals between
+    consecutive heights for mean/median block time, and the last few
+    blocks for difficulty, efficiency and the recent blocks list.
+    """
+
+    def __init__(self, time_windows: Tuple[int, ...] = (60, 300, 3600, 86400),
+                 block_time_windows: Tuple[int, ...] = (10, 99),
+                 median_window: int = 19, recent_blocks: int = 10):
+        """
+        Args:
+            time_windows: Window lengths in seconds kept as running aggregates
+            block_time_windows: Interval counts kept for average block time
+            median_window: Interval count used for the median block time
+            recent_blocks: Number of latest blocks kept in full
+        """
+        self._lock = threading.Lock()
+        self._time_windows = {seconds: _TimeWindow(seconds) for seconds in time_windows}
+        self._longest_window = self._time_windows[max(time_windows)]
+        self._block_time_windows = {size: _IntervalWindow(size) for size in block_time_windows}
+        self._median_window = _IntervalWindow(median_window, keep_sorted=True)
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=recent_blocks)
+        self._history_depth = max(max(block_time_windows), median_window, recent_blocks) + 1
+        self.latest_height = -1
+        self._latest_timestamp: Optional[float] = None
+
+    def record_block(self, block: Dict[str, Any]):
+        """Add one ingested block (dict as stored by COINjectureStorage)."""
+        height = block.get('height', block.get('index'))
+        if height is None:
+            return
+        timestamp = block.get('timestamp') or 0.0
+        work_score = block.get('work_score') or 0.0
+        miner = block.get('miner_address') or ''
+
+        with self._lock:
+            if height <= self.latest_height:
+                return
+
+            # An interval only exists between consecutive heights
+            if self._latest_timestamp is not None and height == self.latest_height + 1:
+                interval = timestamp - self._latest_timestamp
+            else:
+                interval = 0.0
+            if self.latest_height >= 0:
+                for window in self._block_time_windows.values():
+                    window.add(interval)
+                self._median_window.add(interval)
+
+            for window in self._time_windows.values():
+                window.add(timestamp, work_score, miner)
+                window.expire(timestamp)
+
+            self._recent.append(dict(block, height=height, index=height))
+            self.latest_height = height
+            self._latest_timestamp = timestamp
+
+    def load_from_storage(self, storage, now: Optional[float] = None):
+        """Seed the windows from COINjectureStorage (run once at startup)."""
+        now = time.time() if now is None else now
+        latest_height = storage.get_latest_height()
+
+        blocks: Dict[int, Dict[str, Any]] = {}
+        for block in storage.get_blocks_in_timeframe(now - self._longest_window.seconds, now):
+            blocks[block['height']] = block
+        for block in storage.get_recent_blocks(self._history_depth):
+            blocks[block['height']] = block
+        # Full records (difficulty etc.) for the blocks kept in full
+        for height in range(max(0, latest_height - self._recent.maxlen + 1), latest_height + 1):
+            block = storage.get_block_data(height)
+            if block:
+                blocks[height] = dict(blocks.get(height, {}), **block)
+
+        for height in sorted(blocks):
+            self.record_block(blocks[height])
+
+    def sync(self, storage):
+        """Pick up blocks written to storage by other processes."""
+        latest_height = storage.get_latest_height()
+        if latest_height <= self.latest_height:
+            return
+        if latest_height - self.latest_height > self._history_depth:
+            self.reset()
+            self.load_from_storage(storage)
+            return
+        for height in range(self.latest_height + 1, latest_height + 1):
+            block = storage.get_block_data(height)
+            if block:
+                self.record_block(block)
+
+    def reset(self):
+        """Drop all windows (e.g. after a chain regeneration)."""
+        with self._lock:
+            for window in self._time_windows.values():
+                window.entries.clear()
+                window.work_sum = 0.0
+                window.miners.clear()
+            for size in list(self._block_time_windows):
+                self._block_time_windows[size] = _IntervalWindow(size)
+            self._median_window = _IntervalWindow(self._median_window.size, keep_sorted=True)
+            self._recent.clear()
+            self.latest_height = -1
+            self._latest_timestamp = None
+
+    def _window(self, seconds: int, now: Optional[float]) -> _TimeWindow:
+        """Expired running window for `seconds` (caller holds the lock)."""
+        now = time.time() if now is None else now
+        window = self._time_windows.get(seconds)
+        if window is None:
+            # Unconfigured length: aggregate from the longest window
+            window = _TimeWindow(seconds)
+            cutoff = now - seconds
+            for entry in self._longest_window.entries:
+                if entry[0] >= cutoff:
+                    window.add(*entry)
+            return window
+        window.expire(now)
+        return window
+
+    def block_count(self, seconds: int, now: Optional[float] = None) -> int:
+        with self._lock:
+            return len(self._window(seconds, now).entries)
+
+    def tps(self, seconds: int, now: Optional[float] = None) -> float:
+        return self.block_count(seconds, now) / seconds if seconds > 0 else 0.0
+
+    def work_score_sum(self, seconds: int, now: Optional[float] = None) -> float:
+        with self._lock:
+            return self._window(seconds, now).work_sum
+
+    def unique_miners(self, seconds: int, now: Optional[float] = None) -> int:
+        with self._lock:
+            return len(self._window(seconds, now).miners)
+
+    def avg_block_time(self, intervals: int = 10) -> float:
+        """Mean of the positive intervals among the last `intervals` blocks."""
+        with self._lock:
+            window = self._block_time_windows.get(intervals)
+            if window is not None:
+                return window.mean()
+            # Other lengths are answered from the longest kept window
+            longest = self._block_time_windows[max(self._block_time_windows)]
+            values = [v for v in list(longest.values)[-intervals:] if v > 0]
+            return sum(values) / len(values) if values else 0.0
+
+    def median_block_time(self) -> float:
+        with self._lock:
+            return self._median_window.median()
+
+    def avg_difficulty(self) -> float:
+        with self._lock:
+            if not self._recent:
+                return 1.0
+            return sum(block.get('difficulty', 1.0) for block in self._recent) / len(self._recent)
+
+    def efficiency_ratio(self) -> float:
+        """Work per second over the most recent blocks."""
+        with self._lock:
+            if len(self._recent) < 2:
+                return 0.0
+            total_work = sum(block.get('work_score') or 0 for block in self._recent)
+            total_time = (self._recent[-1].get('timestamp') or 0) - (self._recent[0].get('timestamp') or 0)
+            return total_work / total_time if total_time > 0 else total_work
+
+    def recent_blocks(self) -> List[Dict[str, Any]]:
+        """Latest blocks, oldest first."""
+        with self._lock:
+            return list(self._recent)
+
+    def latest_block(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._recent[-1] if self._recent else None
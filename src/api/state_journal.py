@@ -0,0 +1,334 @@
+"""
+Blockchain State Journal
+
+Incremental replacement for rewriting the whole blockchain_state.json on
+every consensus write.
+
+Layout:
+    blockchain_state.json           tip manifest, small, replaced atomically
+    blockchain_state.segments/      append-only JSON-lines segment files
+        segment-000000.jsonl
+        segment-000001.jsonl
+
+Each segment line is a block record or a truncate marker
+{"op": "truncate", "index": N} (drop published blocks above index N),
+written when a reorg replaces part of the published chain. The manifest
+lists every segment with its committed byte length; readers never read
+past it, so a half-written append is never visible.
+
+Publishing and tailing both cost O(new blocks), not O(chain). Segments also
+record the highest block index they hold, so a reader started from a
+snapshot height skips every segment wholly below it.
+
+Blocks replaced by a reorg stay in the segments until compact() rewrites
+the journal without them (the consensus service does so after each
+checkpoint). The rewrite gets a new journal_id, so tailing readers re-read
+it once.
+"""
+
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+JOURNAL_VERSION = 1
+DEFAULT_SEGMENT_RECORDS = 10000
+
+
+def segments_dir_for(state_path: str) -> Path:
+    """Directory holding the segments for a manifest path."""
+    path = Path(state_path)
+    return path.with_name(path.stem + ".segments")
+
+
+def _atomic_write_json(path: Path, data: Dict[str, Any]):
+    """Write JSON to a temp file and rename it over the target."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, separators=(',', ':'))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _read_manifest(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class StateJournalWriter:
+    """
+    Publishes the canonical chain as an append-only journal plus tip manifest.
+
+    The writer tracks the last published tip; callers pass only the blocks
+    above it (and the fork index when a reorg replaced published blocks).
+    """
+
+    def __init__(self, state_path: str = "data/blockchain_state.json",
+                 segment_records: int = DEFAULT_SEGMENT_RECORDS):
+        """
+        Args:
+            state_path: Manifest path (the old blockchain_state.json location)
+            segment_records: Records per segment before rolling to a new file
+        """
+        self.state_path = Path(state_path)
+        self.segments_dir = segments_dir_for(state_path)
+        self.segment_records = segment_records
+
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+
+        manifest = _read_manifest(self.state_path)
+        if manifest and manifest.get('journal_version') == JOURNAL_VERSION:
+            self.manifest = manifest
+            self._discard_uncommitted()
+        else:
+            # No journal yet (or the legacy full-state file): start a new one
+            self._reset()
+
+    @property
+    def tip_index(self) -> Optional[int]:
+        latest = self.manifest.get('latest_block')
+        return latest.get('index') if latest else None
+
+    @property
+    def tip_hash(self) -> Optional[str]:
+        latest = self.manifest.get('latest_block')
+        return latest.get('block_hash') if latest else None
+
+    @property
+    def block_count(self) -> int:
+        return self.manifest.get('block_count', 0)
+
+    def _reset(self):
+        for stale in self.segments_dir.glob("segment-*.jsonl"):
+            stale.unlink()
+        self.manifest = {
+            'journal_version': JOURNAL_VERSION,
+            'journal_id': uuid.uuid4().hex,
+            'segments': [],
+            'block_count': 0,
+            'latest_block': None,
+        }
+
+    def _discard_uncommitted(self):
+        """Cut segment files back to their committed length after a crash."""
+        committed = set()
+        for segment in self.manifest['segments']:
+            committed.add(segment['name'])
+            path = self.segments_dir / segment['name']
+            if path.exists() and path.stat().st_size > segment['bytes']:
+                with open(path, 'r+b') as f:
+                    f.truncate(segment['bytes'])
+        # Files of an interrupted compaction (or the ones it replaced)
+        for path in self.segments_dir.glob("segment-*.jsonl"):
+            if path.name not in committed:
+                path.unlink()
+
+    def _segment_name(self, number: int, generation: Optional[int] = None) -> str:
+        generation = self.manifest.get('generation', 0) if generation is None else generation
+        if generation == 0:
+            return f"segment-{number:06d}.jsonl"
+        return f"segment-g{generation}-{number:06d}.jsonl"
+
+    def _current_segment(self) -> Dict[str, Any]:
+        segments = self.manifest['segments']
+        if not segments or segments[-1]['records'] >= self.segment_records:
+            segments.append({
+                'name': self._segment_name(len(segments)),
+                'records': 0,
+                'bytes': 0,
+            })
+        return segments[-1]
+
+    @staticmethod
+    def _write_records(path: Path, records: List[Dict[str, Any]], mode: str = 'ab') -> int:
+        """Write JSON lines and fsync; returns the bytes written."""
+        data = ''.join(json.dumps(record, separators=(',', ':')) + '\n' for record in records).encode()
+        with open(path, mode) as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        return len(data)
+
+    def publish(self, new_blocks: List[Dict[str, Any]], latest_block: Dict[str, Any],
+                truncate_to: Optional[int] = None, **metadata):
+        """
+        Append new canonical blocks and atomically replace the tip manifest.
+
+        Args:
+            new_blocks: Block records above the published tip (or above truncate_to)
+            latest_block: Tip record for the manifest
+            truncate_to: Drop published blocks with index above this first (reorg)
+            **metadata: Extra manifest fields (consensus_version, ...)
+        """
+        records = []
+        block_count = self.block_count
+        if truncate_to is not None:
+            records.append({'op': 'truncate', 'index': truncate_to})
+            if self.tip_index is not None:
+                block_count -= max(0, self.tip_index - truncate_to)
+            block_count = max(0, block_count)
+        records.extend(new_blocks)
+        block_count += len(new_blocks)
+
+        if records:
+            segment = self._current_segment()
+            segment['bytes'] += self._write_records(self.segments_dir / segment['name'], records)
+            segment['records'] += len(records)
+            if truncate_to is not None:
+                segment['truncates'] = True
+            indexes = [record['index'] for record in new_blocks if 'index' in record]
+            if indexes:
+                segment['last_index'] = max(segment.get('last_index', -1), max(indexes))
+
+        self.manifest.update(metadata)
+        self.manifest['block_count'] = block_count
+        self.manifest['latest_block'] = latest_block
+        self.manifest['last_updated'] = time.time()
+        _atomic_write_json(self.state_path, self.manifest)
+
+    def compact(self) -> bool:
+        """
+        Rewrite the journal without the blocks that reorgs replaced.
+
+        The surviving blocks go to new dense segments, the manifest switches
+        to them under a new journal_id, and the old files are removed.
+        Journals without truncate markers are left alone.
+
+        Returns:
+            True if the journal was rewritten
+        """
+        if not any(segment.get('truncates') for segment in self.manifest['segments']):
+            return False
+
+        reader = StateJournalReader(str(self.state_path))
+        if not reader.poll():
+            return False
+        blocks = reader.blocks
+
+        generation = self.manifest.get('generation', 0) + 1
+        old_names = [segment['name'] for segment in self.manifest['segments']]
+        segments = []
+        for start in range(0, len(blocks), self.segment_records):
+            chunk = blocks[start:start + self.segment_records]
+            name = self._segment_name(len(segments), generation)
+            segment = {
+                'name': name,
+                'records': len(chunk),
+                'bytes': self._write_records(self.segments_dir / name, chunk, mode='wb'),
+            }
+            indexes = [record['index'] for record in chunk if 'index' in record]
+            if indexes:
+                segment['last_index'] = max(indexes)
+            segments.append(segment)
+
+        self.manifest.update(
+            journal_id=uuid.uuid4().hex,
+            generation=generation,
+            segments=segments,
+            block_count=len(blocks),
+            last_compacted=time.time()
+        )
+        _atomic_write_json(self.state_path, self.manifest)
+        for name in old_names:
+            (self.segments_dir / name).unlink(missing_ok=True)
+        return True
+
+
+class StateJournalReader:
+    """
+    Tails a state journal, reading only bytes committed since the last poll.
+
+    Also accepts the legacy single-file blockchain_state.json (with a full
+    "blocks" list), which is simply re-read.
+    """
+
+    def __init__(self, state_path: str = "data/blockchain_state.json", start_index: int = 0):
+        """
+        Args:
+            state_path: Manifest path
+            start_index: Keep only blocks at or above this index; segments
+                that end below it are not read
+        """
+        self.state_path = Path(state_path)
+        self.start_index = start_index
+        self.segments_dir = segments_dir_for(state_path)
+        self.manifest: Dict[str, Any] = {}
+        self.blocks: List[Dict[str, Any]] = []
+        self._journal_id: Optional[str] = None
+        self._positions: Dict[str, int] = {}
+
+    @property
+    def latest_block(self) -> Optional[Dict[str, Any]]:
+        return self.manifest.get('latest_block')
+
+    def poll(self) -> bool:
+        """
+        Pick up newly published blocks.
+
+        Returns:
+            True if a manifest was read
+        """
+        manifest = _read_manifest(self.state_path)
+        if manifest is None:
+            return False
+        self.manifest = manifest
+
+        if 'segments' not in manifest:
+            # Legacy full-state file
+            self.blocks = [block for block in manifest.get('blocks', [])
+                           if block.get('index', 0) >= self.start_index]
+            self._journal_id = None
+            self._positions = {}
+            return True
+
+        if manifest.get('journal_id') != self._journal_id:
+            self.blocks = []
+            self._positions = {}
+            self._journal_id = manifest.get('journal_id')
+
+        for segment in manifest['segments']:
+            name = segment['name']
+            position = self._positions.get(name, 0)
+            committed = segment['bytes']
+            if committed <= position:
+                continue
+            if segment.get('last_index', self.start_index) < self.start_index and not segment.get('truncates'):
+                self._positions[name] = committed  # Wholly below start_index
+                continue
+            try:
+                with open(self.segments_dir / name, 'rb') as f:
+                    f.seek(position)
+                    data = f.read(committed - position)
+            except FileNotFoundError:
+                # Compacted away since the manifest was read: start over from
+                # the new manifest (compaction replaces it before deleting)
+                current = _read_manifest(self.state_path)
+                if current and current.get('journal_id') != self._journal_id:
+                    return self.poll()
+                raise
+            for line in data.splitlines():
+                if line:
+                    self._apply(json.loads(line))
+            self._positions[name] = committed
+        return True
+
+    def _apply(self, record: Dict[str, Any]):
+        if record.get('op') == 'truncate':
+            index = record['index']
+            while self.blocks and self.blocks[-1].get('index', 0) > index:
+                self.blocks.pop()
+        elif record.get('index', 0) >= self.start_index:
+            self.blocks.append(record)
+
+    def as_state(self) -> Dict[str, Any]:
+        """State in the legacy blockchain_state.json shape."""
+        state = {key: value for key, value in self.manifest.items() if key != 'segments'}
+        state['blocks'] = self.blocks
+        return state
@@ -0,0 +1,471 @@
+"""
+Module: async_transport
+
+Asyncio transport shared by NetworkProtocol and P2PDiscoveryService.
+
+One event loop per process runs in a background thread (EventLoopThread);
+every AsyncTransport schedules its connections and periodic tasks on it,
+so thousands of idle peers cost sockets, not threads, and nothing polls.
+
+Per connection (PeerConnection):
+    - streaming framed reads (a frame may span any number of TCP segments)
+    - a bounded send queue drained by a writer task; send() waits when the
+      queue is full, send_nowait() drops and counts, writer awaits drain()
+    - idle, connect, write and request timeouts
+Connections are pooled by (host, port) and reused until closed.
+
+Framers:
+    LengthPrefixedFramer  u32 big-endian length + payload (node gossip)
+    JsonObjectFramer      back-to-back JSON objects, no prefix (the legacy
+                          discovery protocol spoken by bootstrap nodes)
+
+Synchronous code talks to the loop through submit()/run()/call_soon().
+"""
+
+import asyncio
+import logging
+import struct
+import threading
+from collections import defaultdict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+DEFAULT_MAX_FRAME_SIZE = 4 * 1024 * 1024  # 4MB
+DEFAULT_SEND_QUEUE_SIZE = 256
+DEFAULT_CONNECT_TIMEOUT = 5.0  # seconds
+DEFAULT_IDLE_TIMEOUT = 300.0  # seconds
+DEFAULT_WRITE_TIMEOUT = 10.0  # seconds
+DEFAULT_REQUEST_TIMEOUT = 5.0  # seconds
+
+PeerKey = Tuple[str, int]
+FrameHandler = Callable[['PeerConnection', bytes], Optional[Awaitable[Any]]]
+
+
+class EventLoopThread:
+    """Reference-counted asyncio loop running in a daemon thread."""
+
+    def __init__(self, name: str = "coinjecture-net"):
+        self.name = name
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._users = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> asyncio.AbstractEventLoop:
+        """Start the loop if needed and register a user."""
+        with self._lock:
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                started = threading.Event()
+
+                def run():
+                    asyncio.set_event_loop(self.loop)
+                    self.loop.call_soon(started.set)
+                    self.loop.run_forever()
+
+                self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+                self._thread.start()
+                started.wait()
+            self._users += 1
+            return self.loop
+
+    def release(self):
+        """Unregister a user; the last one stops the loop."""
+        with self._lock:
+            self._users = max(0, self._users - 1)
+            if self._users or self.loop is None:
+                return
+            loop, thread = self.loop, self._thread
+            self.loop, self._thread = None, None
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not threading.current_thread():
+            thread.join(timeout=5.0)
+        loop.close()
+
+
+_shared_loop_thread = EventLoopThread()
+
+
+def shared_event_loop() -> EventLoopThread:
+    """The process-wide network event loop."""
+    return _shared_loop_thread
+
+
+class LengthPrefixedFramer:
+    """u32 big-endian length prefix followed by the payload."""
+
+    _LENGTH = struct.Struct('>I')
+
+    def __init__(self, max_frame_size: int = DEFAULT_MAX_FRAME_SIZE):
+        self.max_frame_size = max_frame_size
+
+    def encode(self, payload: bytes) -> bytes:
+        if len(payload) > self.max_frame_size:
+            raise ValueError(f"Frame too large: {len(payload)} bytes")
+        return self._LENGTH.pack(len(payload)) + payload
+
+    async def read_frame(self, reader: asyncio.StreamReader) -> Optional[bytes]:
+        """Next frame, or None on a clean EOF between frames."""
+        try:
+            header = await reader.readexactly(self._LENGTH.size)
+        except asyncio.IncompleteReadError as e:
+            if e.partial:
+                raise ConnectionError("Connection closed mid-frame")
+            return None
+        (length,) = self._LENGTH.unpack(header)
+        if length > self.max_frame_size:
+            raise ValueError(f"Frame too large: {length} bytes")
+        try:
+            return await reader.readexactly(length)
+        except asyncio.IncompleteReadError:
+            raise ConnectionError("Connection closed mid-frame")
+
+
+class JsonObjectFramer:
+    """
+    Splits a byte stream into top-level JSON objects.
+
+    Scans bytes for balanced braces outside strings; structural characters
+    are ASCII so multi-byte UTF-8 sequences never confuse the scan. State is
+    kept between reads, so each byte is scanned once.
+    """
+
+    _READ_SIZE = 65536
+    _WHITESPACE = b' \t\r\n'
+
+    def __init__(self, max_frame_size: int = DEFAULT_MAX_FRAME_SIZE):
+        self.max_frame_size = max_frame_size
+        self.buffer = bytearray()
+        self._reset_scan()
+
+    def _reset_scan(self):
+        self._pos = 0
+        self._start: Optional[int] = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def encode(self, payload: bytes) -> bytes:
+        return payload
+
+    def feed(self, data: bytes):
+        self.buffer += data
+
+    def next_frame(self) -> Optional[bytes]:
+        """Complete object from the buffer, or None if more data is needed."""
+        buf = self.buffer
+        i = self._pos
+        end = len(buf)
+        while i < end:
+            c = buf[i]
+            if self._start is None:
+                if c == 0x7B:  # {
+                    self._start = i
+                    self._depth = 1
+                elif c not in self._WHITESPACE:
+                    raise ValueError("Expected a JSON object")
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == 0x5C:  # backslash
+                    self._escape = True
+                elif c == 0x22:  # "
+                    self._in_string = False
+            elif c == 0x22:
+                self._in_string = True
+            elif c == 0x7B:
+                self._depth += 1
+            elif c == 0x7D:  # }
+                self._depth -= 1
+                if self._depth == 0:
+                    frame = bytes(buf[self._start:i + 1])
+                    del buf[:i + 1]
+                    self._reset_scan()
+                    return frame
+            i += 1
+        self._pos = i
+        if len(buf) > self.max_frame_size:
+            raise ValueError(f"Frame too large: over {self.max_frame_size} bytes")
+        return None
+
+    async def read_frame(self, reader: asyncio.StreamReader) -> Optional[bytes]:
+        """Next object, or None on a clean EOF between objects."""
+        while True:
+            frame = self.next_frame()
+            if frame is not None:
+                return frame
+            chunk = await reader.read(self._READ_SIZE)
+            if not chunk:
+                if self.buffer.strip(self._WHITESPACE):
+                    raise ConnectionError("Connection closed mid-object")
+                return None
+            self.feed(chunk)
+
+
+class PeerConnection:
+    """One TCP connection with framed reads and a bounded send queue."""
+
+    def __init__(self, transport: 'AsyncTransport', key: PeerKey,
+                 reader: asyncio.StreamReader, writer: asyncio.StreamWriter, inbound: bool = False):
+        self.transport = transport
+        self.key = key
+        self.inbound = inbound
+        self.peer_id: Optional[str] = None
+        self.reader = reader
+        self.writer = writer
+        self.framer = transport.framer_factory(transport.max_frame_size)
+        self.send_queue: asyncio.Queue = asyncio.Queue(maxsize=transport.send_queue_size)
+        self.closed = False
+        self._waiter: Optional[asyncio.Future] = None
+        self._request_lock = asyncio.Lock()
+        self._reader_task = asyncio.ensure_future(self._read_loop())
+        self._writer_task = asyncio.ensure_future(self._write_loop())
+
+    async def send(self, payload: bytes, timeout: Optional[float] = None):
+        """Queue a frame, waiting while the send queue is full (backpressure)."""
+        if self.closed:
+            raise ConnectionError(f"Connection to {self.key} is closed")
+        frame = self.framer.encode(payload)
+        await asyncio.wait_for(self.send_queue.put(frame), timeout or self.transport.write_timeout)
+
+    def send_nowait(self, payload: bytes) -> bool:
+        """Queue a frame without waiting; drops it (and counts) if the queue is full."""
+        if self.closed:
+            return False
+        try:
+            self.send_queue.put_nowait(self.framer.encode(payload))
+            return True
+        except asyncio.QueueFull:
+            self.transport.stats["dropped_frames"] += 1
+            return False
+
+    async def request(self, payload: bytes, timeout: Optional[float] = None) -> bytes:
+        """Send a frame and wait for the next inbound frame (one request in flight)."""
+        timeout = timeout or self.transport.request_timeout
+        async with self._request_lock:
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self.send(payload, timeout)
+                return await asyncio.wait_for(self._waiter, timeout)
+            finally:
+                self._waiter = None
+
+    async def _write_loop(self):
+        try:
+            while True:
+                frame = await self.send_queue.get()
+                self.writer.write(frame)
+                await asyncio.wait_for(self.writer.drain(), self.transport.write_timeout)
+                self.transport.stats["frames_sent"] += 1
+                self.transport.stats["bytes_sent"] += len(frame)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.transport.logger.debug(f"Write to {self.key} failed: {e}")
+            await self.close()
+
+    async def _read_loop(self):
+        error: Optional[BaseException] = None
+        try:
+            while True:
+                frame = await asyncio.wait_for(self.framer.read_frame(self.reader),
+                                               self.transport.idle_timeout)
+                if frame is None:
+                    break
+                self.transport.stats["frames_received"] += 1
+                self.transport.stats["bytes_received"] += len(frame)
+                if self._waiter is not None and not self._waiter.done():
+                    self._waiter.set_result(frame)
+                else:
+                    await self.transport._dispatch(self, frame)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            error = ConnectionError(f"Connection to {self.key} idle for {self.transport.idle_timeout}s")
+        except Exception as e:
+            error = e
+            self.transport.logger.debug(f"Read from {self.key} failed: {e}")
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_exception(error or ConnectionError(f"Connection to {self.key} closed"))
+        await self.close()
+
+    async def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.transport._forget(self)
+        current = asyncio.current_task()
+        for task in (self._reader_task, self._writer_task):
+            if task is not current:
+                task.cancel()
+        try:
+            self.writer.close()
+            await asyncio.wait_for(self.writer.wait_closed(), 1.0)
+        except Exception:
+            pass
+
+
+class AsyncTransport:
+    """
+    Pooled framed connections on the shared network event loop.
+
+    Coroutine methods (connect, send, request, listen) run on the loop;
+    submit()/run() call them from other threads.
+    """
+
+    def __init__(
+        self,
+        name: str = "transport",
+        on_frame: Optional[FrameHandler] = None,
+        framer_factory: Callable[[int], Any] = LengthPrefixedFramer,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        write_timeout: float = DEFAULT_WRITE_TIMEOUT,
+        request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        send_queue_size: int = DEFAULT_SEND_QUEUE_SIZE,
+        max_frame_size: int = DEFAULT_MAX_FRAME_SIZE,
+        loop_thread: Optional[EventLoopThread] = None
+    ):
+        """
+        Args:
+            name: Label for logs
+            on_frame: Called (on the loop) with (connection, frame) for inbound
+                frames that are not a request's response; may be a coroutine
+            framer_factory: Framer class, instantiated per connection
+            connect_timeout: Seconds to establish a TCP connection
+            idle_timeout: Seconds without an inbound frame before closing
+            write_timeout: Seconds to queue or flush a frame
+            request_timeout: Default seconds to wait for a response
+            send_queue_size: Frames buffered per connection before backpressure
+            max_frame_size: Largest accepted frame
+            loop_thread: Event loop to run on (the shared one by default)
+        """
+        self.name = name
+        self.on_frame = on_frame
+        self.framer_factory = framer_factory
+        self.connect_timeout = connect_timeout
+        self.idle_timeout = idle_timeout
+        self.write_timeout = write_timeout
+        self.request_timeout = request_timeout
+        self.send_queue_size = send_queue_size
+        self.max_frame_size = max_frame_size
+        self.logger = logging.getLogger(f"{__name__}.{name}")
+
+        self._loop_thread = loop_thread or shared_event_loop()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.connections: Dict[PeerKey, PeerConnection] = {}
+        self._dial_locks: Dict[PeerKey, asyncio.Lock] = {}
+        self._servers = []
+        self.stats: Dict[str, int] = defaultdict(int)
+
+    @property
+    def running(self) -> bool:
+        return self.loop is not None
+
+    def start(self):
+        if self.loop is None:
+            self.loop = self._loop_thread.acquire()
+
+    def stop(self):
+        """Close every connection and server, then release the loop."""
+        if self.loop is None:
+            return
+        try:
+            self.run(self.close_all(), timeout=5.0)
+        except Exception as e:
+            self.logger.debug(f"Error closing {self.name} transport: {e}")
+        self.loop = None
+        self._loop_thread.release()
+
+    # ---- calls from other threads ----
+
+    def submit(self, coro) -> Future:
+        """Schedule a coroutine on the loop; returns a concurrent Future."""
+        if self.loop is None:
+            raise RuntimeError(f"{self.name} transport is not running")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout: Optional[float] = None):
+        """Run a coroutine on the loop and wait for its result (not from the loop thread)."""
+        return self.submit(coro).result(timeout)
+
+    def call_soon(self, callback: Callable, *args):
+        """Thread-safe loop.call_soon."""
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(callback, *args)
+
+    # ---- coroutines (run on the loop) ----
+
+    async def connect(self, host: str, port: int) -> PeerConnection:
+        """Pooled connection to host:port, dialing if needed."""
+        key = (host, port)
+        connection = self.connections.get(key)
+        if connection is not None and not connection.closed:
+            self.stats["connections_reused"] += 1
+            return connection
+
+        lock = self._dial_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            connection = self.connections.get(key)
+            if connection is not None and not connection.closed:
+                self.stats["connections_reused"] += 1
+                return connection
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port, limit=self.max_frame_size), self.connect_timeout)
+            connection = PeerConnection(self, key, reader, writer)
+            self.connections[key] = connection
+            self.stats["connections_opened"] += 1
+            return connection
+
+    async def send(self, host: str, port: int, payload: bytes, timeout: Optional[float] = None):
+        connection = await self.connect(host, port)
+        await connection.send(payload, timeout)
+
+    async def request(self, host: str, port: int, payload: bytes, timeout: Optional[float] = None) -> bytes:
+        connection = await self.connect(host, port)
+        return await connection.request(payload, timeout)
+
+    async def listen(self, host: str, port: int):
+        """Accept inbound connections; their frames go to on_frame."""
+        async def accept(reader, writer):
+            peer = writer.get_extra_info('peername') or ("unknown", 0)
+            connection = PeerConnection(self, (peer[0], peer[1]), reader, writer, inbound=True)
+            self.connections[connection.key] = connection
+            self.stats["connections_accepted"] += 1
+
+        server = await asyncio.start_server(accept, host, port, limit=self.max_frame_size)
+        self._servers.append(server)
+        return server
+
+    async def close_all(self):
+        for server in self._servers:
+            server.close()
+        self._servers = []
+        for connection in list(self.connections.values()):
+            await connection.close()
+
+    async def close_connection(self, host: str, port: int):
+        connection = self.connections.get((host, port))
+        if connection is not None:
+            await connection.close()
+
+    async def _dispatch(self, connection: PeerConnection, frame: bytes):
+        if self.on_frame is None:
+            return
+        try:
+            result = self.on_frame(connection, frame)
+            if asyncio.iscoroutine(result) or isinstance(result, asyncio.Future):
+                await result
+        except Exception as e:
+            self.logger.debug(f"Frame handler error for {connection.key}: {e}")
+
+    def _forget(self, connection: PeerConnection):
+        if self.connections.get(connection.key) is connection:
+            del self.connections[connection.key]
+            self.stats["connections_closed"] += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        stats = dict(self.stats)
+        stats["open_connections"] = len(self.connections)
+        return stats
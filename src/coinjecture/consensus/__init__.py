@@ -1,5 +1,6 @@
 """Consensus codec for canonical serialization."""
 
 from . import codec
+from . import merkle
 
-__all__ = ["codec"]
+__all__ = ["codec", "merkle"]
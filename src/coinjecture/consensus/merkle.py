@@ -0,0 +1,177 @@
+"""
+Module: consensus.merkle
+Merkle tree with cached levels, incremental append and inclusion proofs.
+
+Roots are identical to codec.compute_merkle_root:
+- empty tree: sha256(b"")
+- single leaf: the leaf itself
+- odd level: the last node is paired with itself
+- parent = sha256(left || right) over raw 32-byte nodes
+
+Note: as in Bitcoin, duplicating the last node means [a, b, c] and
+[a, b, c, c] share a root; callers that need the leaf count must commit to
+it separately (block headers carry the transactions themselves).
+"""
+
+from __future__ import annotations
+import hashlib
+from dataclasses import dataclass, field
+from typing import Iterable, List, Union
+
+
+Leaf = Union[bytes, str]  # raw 32 bytes or hex
+
+EMPTY_ROOT = hashlib.sha256(b"").digest()
+
+
+def _to_bytes(leaf: Leaf) -> bytes:
+    return bytes.fromhex(leaf) if isinstance(leaf, str) else bytes(leaf)
+
+
+def _hash_pair(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(left + right).digest()
+
+
+@dataclass
+class MerkleProof:
+    """Inclusion proof: sibling hashes from leaf level up to the root."""
+    index: int
+    leaf: bytes
+    siblings: List[bytes] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "index": self.index,
+            "leaf": self.leaf.hex(),
+            "siblings": [s.hex() for s in self.siblings],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MerkleProof":
+        return cls(
+            index=data["index"],
+            leaf=bytes.fromhex(data["leaf"]),
+            siblings=[bytes.fromhex(s) for s in data["siblings"]],
+        )
+
+
+class MerkleTree:
+    """
+    Merkle tree keeping every level.
+
+    append() and update() rehash only the O(log n) nodes on the leaf's path,
+    so a block template can grow one transaction at a time; proof() reads
+    the siblings straight from the cached levels.
+    """
+
+    def __init__(self, leaves: Iterable[Leaf] = ()):
+        self._levels: List[List[bytes]] = [[_to_bytes(leaf) for leaf in leaves]]
+        self._rebuild()
+
+    def __len__(self) -> int:
+        return len(self._levels[0])
+
+    @property
+    def levels(self) -> List[List[bytes]]:
+        """Cached levels, leaves first (treat as read-only)."""
+        return self._levels
+
+    @property
+    def root(self) -> bytes:
+        if not self._levels[0]:
+            return EMPTY_ROOT
+        return self._levels[-1][0]
+
+    def root_hex(self) -> str:
+        return self.root.hex()
+
+    def _rebuild(self):
+        del self._levels[1:]
+        level = self._levels[0]
+        while len(level) > 1:
+            level = [
+                _hash_pair(level[i], level[i + 1] if i + 1 < len(level) else level[i])
+                for i in range(0, len(level), 2)
+            ]
+            self._levels.append(level)
+
+    def _rehash_path(self, index: int):
+        level = 0
+        while len(self._levels[level]) > 1:
+            nodes = self._levels[level]
+            parent_index = index // 2
+            left = nodes[2 * parent_index]
+            right = nodes[2 * parent_index + 1] if 2 * parent_index + 1 < len(nodes) else left
+            parent = _hash_pair(left, right)
+            if level + 1 == len(self._levels):
+                self._levels.append([])
+            upper = self._levels[level + 1]
+            if parent_index < len(upper):
+                upper[parent_index] = parent
+            else:
+                upper.append(parent)
+            index = parent_index
+            level += 1
+
+    def append(self, leaf: Leaf) -> int:
+        """Add a leaf; returns its index."""
+        self._levels[0].append(_to_bytes(leaf))
+        index = len(self._levels[0]) - 1
+        self._rehash_path(index)
+        return index
+
+    def extend(self, leaves: Iterable[Leaf]):
+        for leaf in leaves:
+            self.append(leaf)
+
+    def update(self, index: int, leaf: Leaf):
+        """Replace a leaf and rehash its path."""
+        self._levels[0][index] = _to_bytes(leaf)
+        self._rehash_path(index)
+
+    def proof(self, index: int) -> MerkleProof:
+        """
+        Inclusion proof for the leaf at index.
+
+        Args:
+            index: Leaf position
+
+        Returns:
+            MerkleProof with one sibling per level below the root
+        """
+        if not 0 <= index < len(self._levels[0]):
+            raise IndexError(f"Leaf index out of range: {index}")
+        siblings = []
+        position = index
+        for nodes in self._levels[:-1]:
+            sibling = position ^ 1
+            siblings.append(nodes[sibling] if sibling < len(nodes) else nodes[position])
+            position //= 2
+        return MerkleProof(index=index, leaf=self._levels[0][index], siblings=siblings)
+
+
+def verify_proof(proof: MerkleProof, root: Leaf) -> bool:
+    """
+    Check that proof.leaf is included under root.
+
+    Args:
+        proof: Inclusion proof
+        root: Expected root (bytes or hex)
+
+    Returns:
+        True if the proof hashes up to root
+    """
+    node = proof.leaf
+    position = proof.index
+    for sibling in proof.siblings:
+        node = _hash_pair(sibling, node) if position & 1 else _hash_pair(node, sibling)
+        position //= 2
+    return position == 0 and node == _to_bytes(root)
+
+
+def merkle_root(leaves: Iterable[Leaf]) -> str:
+    """Hex root of leaves (same result as codec.compute_merkle_root)."""
+    return MerkleTree(leaves).root_hex()
+
+
+__all__ = ["MerkleTree", "MerkleProof", "verify_proof", "merkle_root", "EMPTY_ROOT"]
@@ -10,7 +10,7 @@ import time
 import hashlib
 import math
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple, Set
+from typing import Any, Callable, Dict, List, Optional, Tuple, Set
 from enum import Enum
 from collections import deque
 
@@ -64,12 +64,31 @@ class RevealValidationError(ValidationError):
     pass
 
 
+def _invert_lowest_one(n: int) -> int:
+    return n & (n - 1)
+
+
+def get_skip_height(height: int) -> int:
+    """
+    Height of the skip-list ancestor for a node at `height`.
+    
+    Same construction as Bitcoin's CBlockIndex::pskip: any ancestor is
+    reachable in O(log n) hops using skip and parent pointers.
+    """
+    if height < 2:
+        return 0
+    if height & 1:
+        return _invert_lowest_one(_invert_lowest_one(height - 1)) + 1
+    return _invert_lowest_one(height)
+
+
 @dataclass
 class BlockNode:
     """
     Node in the block tree for fork choice.
     
     Represents a block in the chain with its cumulative work score.
+    parent and skip link to in-tree ancestors (None for roots/orphans).
     """
     block: Block
     parent_hash: str
@@ -77,9 +96,57 @@ class BlockNode:
     height: int
     receipt_time: float
     children: List[str] = field(default_factory=list)
+    parent: Optional['BlockNode'] = field(default=None, repr=False, compare=False)
+    skip: Optional['BlockNode'] = field(default=None, repr=False, compare=False)
     
     def __hash__(self):
         return hash(self.block.block_hash)
+    
+    def get_ancestor(self, height: int) -> Optional['BlockNode']:
+        """
+        Ancestor at the given height in O(log n) hops.
+        
+        Returns:
+            The ancestor node, or None if height is above this node or
+            below the root of its subtree
+        """
+        if height > self.height or height < 0:
+            return None
+        
+        walk = self
+        while walk is not None and walk.height > height:
+            skip = walk.skip
+            skip_height = skip.height if skip is not None else -1
+            skip_height_prev = get_skip_height(walk.height - 1)
+            if skip is not None and (skip_height == height or
+                                     (skip_height > height and
+                                      not (skip_height_prev < skip_height - 2 and skip_height_prev >= height))):
+                walk = skip
+            else:
+                walk = walk.parent
+        return walk
+
+
+def find_common_ancestor(a: BlockNode, b: BlockNode) -> Optional[BlockNode]:
+    """
+    Last common ancestor of two block nodes in O(log n) hops.
+    
+    Returns:
+        Fork point node, or None if the nodes are in disjoint subtrees
+    """
+    if a.height > b.height:
+        a = a.get_ancestor(b.height)
+    elif b.height > a.height:
+        b = b.get_ancestor(a.height)
+    
+    # Both at the same height, so their skip pointers target the same height:
+    # differing skip targets mean the fork is below them
+    while a is not None and b is not None and a is not b:
+        if a.skip is not None and b.skip is not None and a.skip is not b.skip:
+            a, b = a.skip, b.skip
+        else:
+            a, b = a.parent, b.parent
+    return a if a is b else None
 
 
 @dataclass
@@ -205,6 +272,13 @@ class ConsensusEngine:
         # Current best tip
         self.best_tip: Optional[BlockNode] = None
         
+        # Canonical chain index (height -> block hash) for the best tip,
+        # maintained incrementally whenever the tip changes
+        self._canonical: Dict[int, str] = {}
+        
+        # Nodes whose parent has not arrived yet, keyed by parent hash
+        self._orphans: Dict[str, List[BlockNode]] = {}
+        
         # Genesis block
         self.genesis_block: Optional[Block] = None
         
@@ -254,7 +328,7 @@ class ConsensusEngine:
                 self.storage.store_header(self.genesis_block)
                 self._add_block_to_tree(self.genesis_block, receipt_time=self.genesis_block.timestamp)
         
-        self.best_tip = self.block_tree.get(self.genesis_block.block_hash)
+        self._set_best_tip(self.block_tree.get(self.genesis_block.block_hash))
     
     def _create_genesis_from_network(self, network_data: Dict) -> 'Block':
         """Create genesis block from existing network data."""
@@ -504,7 +578,12 @@ class ConsensusEngine:
         if not self._validate_difficulty(block):
             raise HeaderValidationError("Difficulty validation failed")
         
-        # 4) Fork-choice enqueue
+        # 4) Transaction signatures, verified as one batch (header-only blocks have none;
+        #    signatures seen on mempool admission come from the verifier's cache)
+        if not block.verify_transaction_signatures():
+            raise HeaderValidationError("Transaction signature validation failed")
+        
+        # 5) Fork-choice enqueue
         self._add_block_to_tree(block, receipt_time=time.time())
         
         return True
@@ -753,13 +832,15 @@ class ConsensusEngine:
             cumulative_work = calculate_work_score(block.complexity) if block.complexity else 0
             height = block.index
         
-        # Create block node
+        # Create block node with skip-list links into its ancestry
         node = BlockNode(
             block=block,
             parent_hash=block.previous_hash,
             cumulative_work=cumulative_work,
             height=height,
-            receipt_time=receipt_time
+            receipt_time=receipt_time,
+            parent=parent_node,
+            skip=parent_node.get_ancestor(get_skip_height(height)) if parent_node else None
         )
         
         # Add to tree
@@ -768,13 +849,22 @@ class ConsensusEngine:
         # Update parent's children
         if parent_node:
             parent_node.children.append(block.block_hash)
+        elif block.previous_hash != "0" * 64:
+            self._orphans.setdefault(block.previous_hash, []).append(node)
+        
+        # Attach orphans that were waiting for this block
+        for orphan in self._orphans.pop(block.block_hash, []):
+            orphan.parent = node
+            orphan.skip = node.get_ancestor(get_skip_height(orphan.height))
+            node.children.append(orphan.block.block_hash)
         
         # Update best tip if necessary
         self._update_best_tip(node)
         
-        # Store work index
-        self.storage.store_work_index(height, int(cumulative_work), block.block_hash)
-        self.storage.store_tip(block.block_hash, int(cumulative_work))
+        # Store work index and tip in one transaction
+        with self.storage.transaction():
+            self.storage.store_work_index(height, int(cumulative_work), block.block_hash)
+            self.storage.store_tip(block.block_hash, int(cumulative_work))
     
     def _update_best_tip(self, node: BlockNode):
         """
@@ -786,16 +876,86 @@ class ConsensusEngine:
             node: Newly added node
         """
         if not self.best_tip:
-            self.best_tip = node
+            self._set_best_tip(node)
             return
         
         # Compare cumulative work
         if node.cumulative_work > self.best_tip.cumulative_work:
-            self.best_tip = node
+            self._set_best_tip(node)
         elif node.cumulative_work == self.best_tip.cumulative_work:
             # Tie-breaker: earliest receipt time
             if node.receipt_time < self.best_tip.receipt_time:
-                self.best_tip = node
+                self._set_best_tip(node)
+    
+    def _set_best_tip(self, node: Optional[BlockNode]):
+        """
+        Switch the best tip and update the canonical height index.
+        
+        Only heights above the fork point are rewritten, so extending the
+        tip costs O(1) and a reorg costs O(log n + reorg depth).
+        """
+        old_tip = self.best_tip
+        self.best_tip = node
+        if node is None:
+            self._canonical.clear()
+            return
+        
+        fork = find_common_ancestor(old_tip, node) if old_tip is not None else None
+        if fork is None:
+            self._canonical.clear()
+            keep_height = -1
+        else:
+            for height in range(fork.height + 1, old_tip.height + 1):
+                self._canonical.pop(height, None)
+            keep_height = fork.height
+        
+        walk = node
+        while walk is not None and walk.height > keep_height:
+            self._canonical[walk.height] = walk.block.block_hash
+            walk = walk.parent
+    
+    def get_canonical_hash(self, height: int) -> Optional[str]:
+        """Block hash at the given height on the best chain, if any."""
+        return self._canonical.get(height)
+    
+    def get_canonical_blocks(self, start_height: int) -> List[Block]:
+        """
+        Best-chain blocks from start_height up to the tip, from the height index.
+        
+        Args:
+            start_height: First height to return
+            
+        Returns:
+            Blocks in height order (empty if start_height is above the tip)
+        """
+        if not self.best_tip:
+            return []
+        blocks = []
+        for height in range(max(0, start_height), self.best_tip.height + 1):
+            # Below a restored snapshot's window only the hash is known
+            node = self.block_tree.get(self._canonical.get(height))
+            if node is not None:
+                blocks.append(node.block)
+        return blocks
+    
+    def is_canonical(self, block_hash: str) -> bool:
+        """True if the block is on the best chain."""
+        node = self.block_tree.get(block_hash)
+        return node is not None and self._canonical.get(node.height) == block_hash
+    
+    def find_fork_point(self, hash_a: str, hash_b: str) -> Optional[Block]:
+        """
+        Last common ancestor of two blocks in the tree.
+        
+        Returns:
+            Fork point block, or None if unknown or unrelated
+        """
+        node_a = self.block_tree.get(hash_a)
+        node_b = self.block_tree.get(hash_b)
+        if node_a is None or node_b is None:
+            return None
+        fork = find_common_ancestor(node_a, node_b)
+        return fork.block if fork else None
     
     def get_best_tip(self) -> Optional[Block]:
         """
@@ -823,18 +983,23 @@ class ConsensusEngine:
             return []
         
         # Build chain backwards from tip to genesis
-        chain = []
-        current_node = self.block_tree[tip_hash]
-        
-        while current_node:
-            chain.append(current_node.block)
+        return [node.block for node in self._path_to_root(self.block_tree[tip_hash])]
+    
+    def _path_to_root(self, node: BlockNode, stop: Optional[BlockNode] = None) -> List[BlockNode]:
+        """
+        Nodes from the root of node's subtree (or just above `stop`) to node.
+        """
+        path = []
+        current_node = node
+        while current_node is not None and current_node is not stop:
+            path.append(current_node)
             if current_node.parent_hash == "0" * 64:
                 break
-            current_node = self.block_tree.get(current_node.parent_hash)
+            current_node = current_node.parent
         
         # Reverse to get genesis -> tip order
-        chain.reverse()
-        return chain
+        path.reverse()
+        return path
     
     def is_finalized(self, block_hash: str) -> bool:
         """
@@ -867,36 +1032,118 @@ class ConsensusEngine:
         if not self.best_tip or new_tip_hash not in self.block_tree:
             return ([], [])
         
+        old_tip_node = self.best_tip
         new_tip_node = self.block_tree[new_tip_hash]
         
-        # Check reorg depth
-        old_chain = self.get_chain_from_genesis(self.best_tip.block.block_hash)
-        new_chain = self.get_chain_from_genesis(new_tip_hash)
-        
-        # Find common ancestor
-        common_height = min(len(old_chain), len(new_chain))
-        fork_point = 0
-        
-        for i in range(common_height):
-            if old_chain[i].block_hash == new_chain[i].block_hash:
-                fork_point = i
-            else:
-                break
+        # Find common ancestor via skip pointers instead of comparing full chains
+        fork = find_common_ancestor(old_tip_node, new_tip_node)
         
         # Check reorg depth limit
-        reorg_depth = len(old_chain) - fork_point - 1
+        if fork is not None:
+            reorg_depth = old_tip_node.height - fork.height
+        else:
+            reorg_depth = len(self._path_to_root(old_tip_node))
         if reorg_depth > self.config.max_reorg_depth:
             print(f"Reorg depth {reorg_depth} exceeds maximum {self.config.max_reorg_depth}")
             return ([], [])
         
-        # Get removed and added blocks
-        removed_blocks = old_chain[fork_point + 1:]
-        added_blocks = new_chain[fork_point + 1:]
+        # Get removed and added blocks (walks only the blocks above the fork)
+        removed_blocks = [node.block for node in self._path_to_root(old_tip_node, stop=fork)]
+        added_blocks = [node.block for node in self._path_to_root(new_tip_node, stop=fork)]
         
         # Update best tip
-        self.best_tip = new_tip_node
+        self._set_best_tip(new_tip_node)
         
         return (removed_blocks, added_blocks)
+    
+    def export_snapshot_state(
+        self,
+        encode_block: Callable[[Block], Dict[str, Any]],
+        window: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Fork-choice state for a checkpoint.
+        
+        Holds the full canonical height index (hashes only) and the tree nodes
+        within `window` heights of the best tip, side branches included, so a
+        reorg up to that depth still finds its fork point after a restore.
+        
+        Args:
+            encode_block: Serializes a block for the snapshot
+            window: Heights of tree kept below the tip (default: max_reorg_depth)
+            
+        Returns:
+            Snapshot state dict, or None if there is no tip yet
+        """
+        if not self.best_tip:
+            return None
+        window = self.config.max_reorg_depth if window is None else window
+        floor = max(0, self.best_tip.height - window)
+        
+        nodes = sorted(
+            (node for node in self.block_tree.values() if node.height >= floor),
+            key=lambda node: node.height
+        )
+        base_height = min(self._canonical) if self._canonical else 0
+        return {
+            'tip_hash': self.best_tip.block.block_hash,
+            'height': self.best_tip.height,
+            'cumulative_work': self.best_tip.cumulative_work,
+            'canonical_base': base_height,
+            'canonical': [self._canonical.get(h) for h in range(base_height, self.best_tip.height + 1)],
+            'tips': [node.block.block_hash for node in nodes if not node.children],
+            'nodes': [{
+                'block': encode_block(node.block),
+                'height': node.height,
+                'cumulative_work': node.cumulative_work,
+                'receipt_time': node.receipt_time,
+            } for node in nodes],
+        }
+    
+    def restore_snapshot_state(
+        self,
+        state: Dict[str, Any],
+        decode_block: Callable[[Dict[str, Any]], Optional[Block]]
+    ) -> bool:
+        """
+        Replace the block tree with a checkpoint from export_snapshot_state().
+        
+        Nodes keep their recorded cumulative work; the lowest ones become
+        roots. Nothing is written to storage. Blocks below the window are
+        known only by hash in the canonical index.
+        
+        Returns:
+            True if the tip was restored
+        """
+        restored: Dict[str, BlockNode] = {}
+        for entry in state['nodes']:
+            block = decode_block(entry['block'])
+            if block is None:
+                return False
+            parent = restored.get(block.previous_hash)
+            node = BlockNode(
+                block=block,
+                parent_hash=block.previous_hash,
+                cumulative_work=entry['cumulative_work'],
+                height=entry['height'],
+                receipt_time=entry['receipt_time'],
+                parent=parent,
+                skip=parent.get_ancestor(get_skip_height(entry['height'])) if parent else None
+            )
+            if parent is not None:
+                parent.children.append(block.block_hash)
+            restored[block.block_hash] = node
+        
+        tip = restored.get(state['tip_hash'])
+        if tip is None:
+            return False
+        
+        base = state['canonical_base']
+        self.block_tree = restored
+        self._orphans = {}
+        self._canonical = {base + i: h for i, h in enumerate(state['canonical']) if h is not None}
+        self.best_tip = tip
+        return True
 
 
 if __name__ == "__main__":
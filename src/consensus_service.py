@@ -7,12 +7,11 @@ Processes block events into actual blockchain blocks
 import sys
 import os
 import time
-import json
 import logging
 import signal
 import threading
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable
 
 # Add src to path
 sys.path.append('src')
@@ -20,9 +19,11 @@ sys.path.append('src')
 # Import consensus and storage modules
 from consensus import ConsensusEngine, ConsensusConfig
 from storage import StorageManager, StorageConfig, NodeRole, PruningMode
-from pow import ProblemRegistry
+from pow import ProblemRegistry, DifficultyAdjuster, calculate_work_score
 from api.ingest_store import IngestStore
 from api.coupling_config import LAMBDA, CONSENSUS_WRITE_INTERVAL, CouplingState
+from api.state_journal import StateJournalReader, StateJournalWriter
+from consensus_snapshot import SnapshotStore, DEFAULT_SNAPSHOT_DIR, DEFAULT_SNAPSHOT_INTERVAL
 
 # Set up logging
 log_dir = Path('logs')
@@ -42,13 +43,32 @@ logger = logging.getLogger('coinjecture-consensus-service')
 class ConsensusService:
     """Consensus service that processes block events into blockchain blocks."""
     
-    def __init__(self):
+    def __init__(self, snapshot_trusted_keys: Optional[Iterable[str]] = None):
+        """
+        Args:
+            snapshot_trusted_keys: Snapshot signer public keys (hex) accepted on
+                restore besides this node's own, e.g. a checkpoint provider's
+                (default: comma-separated $COINJECTURE_SNAPSHOT_TRUSTED_KEYS)
+        """
         self.running = False
         self.consensus_engine = None
         self.ingest_store = None
         self.processed_events = set()
         self.coupling_state = CouplingState()
         self.blockchain_state_path = "data/blockchain_state.json"
+        self.state_journal = StateJournalWriter(self.blockchain_state_path)
+        
+        # Signed checkpoints: restarts restore the latest and replay only newer blocks
+        if snapshot_trusted_keys is None:
+            snapshot_trusted_keys = [key.strip() for key in
+                                     os.environ.get('COINJECTURE_SNAPSHOT_TRUSTED_KEYS', '').split(',')
+                                     if key.strip()]
+        self.snapshot_store = SnapshotStore(DEFAULT_SNAPSHOT_DIR, trusted_keys=snapshot_trusted_keys)
+        self.snapshot_interval = int(os.environ.get('COINJECTURE_SNAPSHOT_INTERVAL', DEFAULT_SNAPSHOT_INTERVAL))
+        self.last_snapshot_height = self.snapshot_store.latest_height() or -1
+        
+        # Difficulty state, fed by every block added to the tree
+        self.difficulty_adjuster = DifficultyAdjuster()
         
         # NEW: Initialize P2P discovery
         from p2p_discovery import P2PDiscoveryService, DiscoveryConfig
@@ -119,32 +139,106 @@ class ConsensusService:
             return False
     
     def bootstrap_from_cache(self):
-        """Bootstrap consensus engine with existing blockchain state."""
+        """
+        Bootstrap consensus engine with existing blockchain state.
+        
+        Restores the latest verified snapshot and replays only the published
+        blocks above it, so restart time is bounded by the snapshot interval.
+        Without a usable snapshot every published block is replayed.
+        """
         try:
-            # Check if blockchain state file exists
-            if os.path.exists(self.blockchain_state_path):
-                with open(self.blockchain_state_path, 'r') as f:
-                    blockchain_state = json.load(f)
-                
-                blocks = blockchain_state.get('blocks', [])
-                logger.info(f"Found {len(blocks)} blocks in blockchain state")
-                
-                # Add each block to consensus engine
-                for block_data in blocks:
-                    block = self._convert_cache_block_to_block(block_data)
-                    if block:
-                        # Add to block tree without validation
-                        self.consensus_engine._add_block_to_tree(block, receipt_time=block.timestamp)
-                        logger.info(f"Bootstrapped block #{block.index}")
-                
-                return True
-            else:
-                logger.info("No blockchain state found, starting from genesis")
-                return True
+            snapshot = self.snapshot_store.load_latest()
+            start_index = 0
+            
+            # Read the published state journal (or legacy state file), from
+            # the snapshot height when there is one
+            reader = None
+            if snapshot:
+                reader = StateJournalReader(self.blockchain_state_path, start_index=snapshot['height'])
+                reader.poll()
+                anchor = reader.blocks[0] if reader.blocks else None
+                if anchor and anchor.get('index') == snapshot['height'] \
+                        and anchor.get('block_hash') == snapshot['tip_hash'] \
+                        and self._restore_snapshot(snapshot):
+                    start_index = snapshot['height'] + 1
+                    logger.info(f"Restored snapshot at height {snapshot['height']}")
+                else:
+                    logger.warning(f"Snapshot at height {snapshot['height']} is not on the published chain, "
+                                   f"replaying from genesis")
+                    reader = None
+            
+            if reader is None:
+                reader = StateJournalReader(self.blockchain_state_path)
+                if not reader.poll():
+                    logger.info("No blockchain state found, starting from genesis")
+                    return True
+            
+            blocks = [b for b in reader.blocks if b.get('index', 0) >= start_index]
+            logger.info(f"Replaying {len(blocks)} blocks from blockchain state (from #{start_index})")
+            
+            # Add each block to consensus engine
+            for block_data in blocks:
+                block = self._convert_cache_block_to_block(block_data)
+                if block:
+                    # Add to block tree without validation
+                    self.consensus_engine._add_block_to_tree(block, receipt_time=block.timestamp)
+                    self._track_difficulty(block)
+            
+            best_tip = self.consensus_engine.get_best_tip()
+            if best_tip:
+                logger.info(f"Bootstrapped to block #{best_tip.index}")
+            return True
         except Exception as e:
             logger.error(f"Failed to bootstrap from cache: {e}")
             return False
     
+    def _restore_snapshot(self, snapshot: Dict[str, Any]) -> bool:
+        """Load consensus, difficulty and (on a fresh node) balance state from a snapshot."""
+        sections = snapshot['sections']
+        if not self.consensus_engine.restore_snapshot_state(sections['consensus'],
+                                                            self._convert_cache_block_to_block):
+            return False
+        
+        difficulty = sections.get('difficulty')
+        if difficulty:
+            self.difficulty_adjuster = DifficultyAdjuster(**difficulty)
+        
+        balances = sections.get('balances')
+        if balances:
+            blockchain_state = self._get_blockchain_state()
+            if not blockchain_state.balances:
+                blockchain_state.balances.update(balances)
+        
+        self.last_snapshot_height = snapshot['height']
+        return True
+    
+    def _maybe_write_snapshot(self):
+        """Checkpoint consensus state once the tip is snapshot_interval past the last one."""
+        best_tip = self.consensus_engine.get_best_tip()
+        if not best_tip or best_tip.index - self.last_snapshot_height < self.snapshot_interval:
+            return
+        
+        consensus_state = self.consensus_engine.export_snapshot_state(self._block_state_record)
+        balances = dict(self._get_blockchain_state().balances)
+        sections = {
+            'consensus': consensus_state,
+            'balances': balances,
+            'difficulty': self.difficulty_adjuster.to_dict(),
+        }
+        if self.snapshot_store.write(best_tip.index, best_tip.block_hash, sections):
+            self.last_snapshot_height = best_tip.index
+            # Drop blocks replaced by reorgs so replays stay proportional to the chain
+            if self.state_journal.compact():
+                logger.info(f"🗜️  Compacted blockchain state journal ({self.state_journal.block_count} blocks)")
+    
+    def _track_difficulty(self, block):
+        """Feed a newly added block's work and block time to the difficulty adjuster."""
+        if not block.complexity:
+            return
+        parent = self.consensus_engine.block_tree.get(block.previous_hash)
+        block_time = block.timestamp - parent.block.timestamp if parent else self.difficulty_adjuster.target_block_time
+        self.difficulty_adjuster.update(calculate_work_score(block.complexity), block_time)
+    
     def _convert_cache_block_to_block(self, block_data: Dict[str, Any]) -> Optional[Any]:
         """Convert cached block data to Block object."""
         try:
@@ -243,9 +337,9 @@ class ConsensusService:
             # Always check for new events, but only write at λ-coupled intervals
             # This allows continuous processing while respecting λ-coupling for writes
             
-            # Get current chain length
-            current_chain = self.consensus_engine.get_chain_from_genesis()
-            current_tip_index = current_chain[-1].index if current_chain else -1
+            # Get current chain length from the tip (no full-chain walk)
+            current_tip = self.consensus_engine.get_best_tip()
+            current_tip_index = current_tip.index if current_tip else -1
             
             # Get latest block events
             block_events = self.ingest_store.latest_blocks(limit=50)
@@ -276,6 +370,7 @@ class ConsensusService:
                     # Store block in consensus engine
                     self.consensus_engine.storage.store_block(block)
                     self.consensus_engine.storage.store_header(block)
+                    self._track_difficulty(block)
                     
                     # Mark as processed
                     self.processed_events.add(event_id)
@@ -344,6 +439,7 @@ class ConsensusService:
                     self.consensus_engine.validate_header(block)
                     self.consensus_engine.storage.store_block(block)
                     self.consensus_engine.storage.store_header(block)
+                    self._track_difficulty(block)
                     
                     self.processed_events.add(event.get('event_id'))
                     processed += 1
@@ -370,8 +466,8 @@ class ConsensusService:
             from core.blockchain import Block, ProblemTier, ComputationalComplexity, EnergyMetrics
             
             # η-damping: Use current chain tip + 1 instead of event's block_index
-            current_chain = self.consensus_engine.get_chain_from_genesis()
-            current_tip_index = current_chain[-1].index if current_chain else -1
+            current_tip = self.consensus_engine.get_best_tip()
+            current_tip_index = current_tip.index if current_tip else -1
             block_index = current_tip_index + 1
             
             # Extract event data with η-damping (graceful defaults)
@@ -438,7 +534,7 @@ class ConsensusService:
             )
             
             # η-damping: Use previous block hash from chain tip
-            previous_hash = current_chain[-1].block_hash if current_chain else "0" * 64
+            previous_hash = current_tip.block_hash if current_tip else "0" * 64
             
             # Create Block object with η-damped validation
             block = Block(
@@ -463,57 +559,64 @@ class ConsensusService:
             logger.error(f"❌ Failed to convert event to block: {e}")
             return None
     
+    @staticmethod
+    def _block_state_record(block) -> Dict[str, Any]:
+        """Block fields published to the shared blockchain state."""
+        return {
+            "index": block.index,
+            "timestamp": block.timestamp,
+            "previous_hash": block.previous_hash,
+            "merkle_root": block.merkle_root,
+            "mining_capacity": block.mining_capacity.value if hasattr(block.mining_capacity, 'value') else str(block.mining_capacity),
+            "cumulative_work_score": block.cumulative_work_score,
+            "block_hash": block.block_hash,
+            "offchain_cid": block.offchain_cid
+        }
+    
     def _write_blockchain_state(self):
-        """Write blockchain state to shared storage for cache manager."""
+        """Publish new canonical blocks to the shared state journal for cache manager."""
         try:
             # Get current blockchain state
             best_tip = self.consensus_engine.get_best_tip()
             if not best_tip:
                 return
             
-            # Get chain from genesis
-            chain = self.consensus_engine.get_chain_from_genesis()
-            
-            # Create blockchain state structure
-            blockchain_state = {
-                "latest_block": {
-                    "index": best_tip.index,
-                    "timestamp": best_tip.timestamp,
-                    "previous_hash": best_tip.previous_hash,
-                    "merkle_root": best_tip.merkle_root,
-                    "mining_capacity": best_tip.mining_capacity.value if hasattr(best_tip.mining_capacity, 'value') else str(best_tip.mining_capacity),
-                    "cumulative_work_score": best_tip.cumulative_work_score,
-                    "block_hash": best_tip.block_hash,
-                    "offchain_cid": best_tip.offchain_cid,
-                    "last_updated": time.time()
-                },
-                "blocks": [
-                    {
-                        "index": block.index,
-                        "timestamp": block.timestamp,
-                        "previous_hash": block.previous_hash,
-                        "merkle_root": block.merkle_root,
-                        "mining_capacity": block.mining_capacity.value if hasattr(block.mining_capacity, 'value') else str(block.mining_capacity),
-                        "cumulative_work_score": block.cumulative_work_score,
-                        "block_hash": block.block_hash,
-                        "offchain_cid": block.offchain_cid
-                    }
-                    for block in chain
-                ],
-                "last_updated": time.time(),
-                "consensus_version": "3.9.0-alpha.2",
-                "lambda_coupling": LAMBDA,
-                "processed_events_count": len(self.processed_events)
-            }
+            engine = self.consensus_engine
+            journal = self.state_journal
             
-            # Ensure data directory exists
-            os.makedirs(os.path.dirname(self.blockchain_state_path), exist_ok=True)
+            # Only blocks above the published tip are written; if a reorg moved
+            # the published tip off the best chain, rewind to the fork point
+            truncate_to = None
+            if journal.tip_hash is None:
+                start_index = 0
+            elif engine.get_canonical_hash(journal.tip_index) == journal.tip_hash:
+                start_index = journal.tip_index + 1
+            else:
+                fork = engine.find_fork_point(journal.tip_hash, best_tip.block_hash)
+                truncate_to = fork.index if fork else -1
+                start_index = truncate_to + 1
             
-            # Write to shared blockchain state file
-            with open(self.blockchain_state_path, 'w') as f:
-                json.dump(blockchain_state, f, indent=2)
+            new_blocks = [self._block_state_record(block) for block in engine.get_canonical_blocks(start_index)]
+            if not new_blocks and truncate_to is None and journal.tip_hash == best_tip.block_hash:
+                return
+            
+            latest_block = self._block_state_record(best_tip)
+            latest_block["last_updated"] = time.time()
+            
+            journal.publish(
+                new_blocks,
+                latest_block,
+                truncate_to=truncate_to,
+                consensus_version="3.9.0-alpha.2",
+                lambda_coupling=LAMBDA,
+                processed_events_count=len(self.processed_events)
+            )
             
-            logger.info(f"📝 Blockchain state written: {len(chain)} blocks, tip: #{best_tip.index}")
+            logger.info(f"📝 Blockchain state published: +{len(new_blocks)} blocks "
+                        f"({journal.block_count} total), tip: #{best_tip.index}")
+            
+            # Snapshots only cover published heights, so replay can start from them
+            self._maybe_write_snapshot()
             
         except Exception as e:
             logger.error(f"❌ Failed to write blockchain state: {e}")
@@ -526,14 +629,19 @@ class ConsensusService:
     def _is_duplicate(self, block):
         """Check if block is duplicate."""
         try:
-            chain = self.consensus_engine.get_chain_from_genesis()
-            for existing in chain:
-                if existing.index == block.index:
-                    return True
-            return False
+            # Canonical height index lookup instead of scanning the chain
+            return self.consensus_engine.get_canonical_hash(block.index) is not None
         except:
             return False
     
+    def _get_blockchain_state(self):
+        """Balance state, loaded on first use."""
+        if not hasattr(self, 'blockchain_state'):
+            from tokenomics.blockchain_state import BlockchainState
+            self.blockchain_state = BlockchainState()
+            self.blockchain_state.load_state()
+        return self.blockchain_state
+    
     def _distribute_mining_rewards(self, event: Dict[str, Any], block: Any):
         """Automatically distribute mining rewards to the miner."""
         try:
@@ -558,12 +666,9 @@ class ConsensusService:
             # Implement actual token transfer to miner's wallet
             try:
                 # Import blockchain state management
-                from tokenomics.blockchain_state import BlockchainState, Transaction
+                from tokenomics.blockchain_state import Transaction
                 
-                # Initialize blockchain state if not exists
-                if not hasattr(self, 'blockchain_state'):
-                    self.blockchain_state = BlockchainState()
-                    self.blockchain_state.load_state()
+                self._get_blockchain_state()
                 
                 # Create mining reward transaction from network to miner
                 mining_transaction = Transaction(
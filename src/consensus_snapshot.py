@@ -0,0 +1,229 @@
+"""
+Module: consensus_snapshot
+
+Signed checkpoints of consensus state, so a restart restores one snapshot
+and replays only the blocks published after it.
+
+A snapshot is taken at a best-tip height and holds named sections, e.g.:
+    consensus   canonical height index, tip set and the block tree nodes
+                within the reorg window (ConsensusEngine.export_snapshot_state)
+    balances    address balances
+    difficulty  difficulty adjuster state
+
+File layout (snapshot-<height>.snap, written to a temp file and renamed):
+    line 1      JSON header: version, height, tip hash, signer public key,
+                Ed25519 signature and SHA-256 of the payload
+    rest        payload JSON, exactly the bytes that were signed
+
+load_latest() returns the newest snapshot whose signature verifies under a
+trusted key, skipping damaged or foreign files.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .tokenomics.wallet import Wallet
+    from .signature_verifier import get_signature_verifier
+except ImportError:
+    from tokenomics.wallet import Wallet
+    from signature_verifier import get_signature_verifier
+
+logger = logging.getLogger('coinjecture-consensus-snapshot')
+
+SNAPSHOT_VERSION = 1
+DEFAULT_SNAPSHOT_DIR = "data/snapshots"
+DEFAULT_SNAPSHOT_INTERVAL = 1000  # blocks between snapshots
+DEFAULT_KEEP = 3
+_SNAPSHOT_GLOB = "snapshot-*.snap"
+
+
+class SnapshotStore:
+    """
+    Writes, signs, verifies and prunes consensus snapshots.
+
+    Usage:
+        store = SnapshotStore("data/snapshots")
+        store.write(height, tip_hash, {"consensus": ..., "balances": ...})
+        snapshot = store.load_latest()  # {"height", "tip_hash", "sections", ...}
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_SNAPSHOT_DIR,
+        signer: Optional[Wallet] = None,
+        trusted_keys: Iterable[str] = (),
+        keep: int = DEFAULT_KEEP,
+        node_key_path: Optional[str] = None
+    ):
+        """
+        Args:
+            directory: Snapshot directory
+            signer: Signing wallet (default: the node key, created on first use)
+            trusted_keys: Extra signer public keys (hex) accepted on load,
+                e.g. a checkpoint provider's for a fresh node
+            keep: Snapshots kept on disk
+            node_key_path: Node key file, kept outside the snapshot directory
+                so snapshots can be copied or served without it
+                (default: <directory>_node_key.json beside the directory)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.keep = keep
+        self.node_key_path = Path(node_key_path) if node_key_path else \
+            self.directory.with_name(self.directory.name + "_node_key.json")
+        self.signer = signer or self._load_node_key()
+        self.public_key_hex = self.signer.get_public_key_bytes().hex()
+        self.trusted_keys = {self.public_key_hex, *trusted_keys}
+
+    def _load_node_key(self) -> Wallet:
+        key_path = self.node_key_path
+        legacy_path = self.directory / "node_key.json"
+        key_path.parent.mkdir(parents=True, exist_ok=True)
+        if not key_path.exists() and legacy_path.exists():
+            # Older stores kept the key inside the snapshot directory
+            os.replace(legacy_path, key_path)
+            os.chmod(key_path, 0o600)
+        if key_path.exists():
+            wallet = Wallet.load_from_file(str(key_path))
+            if wallet is not None:
+                return wallet
+            raise ValueError(f"unreadable snapshot node key: {key_path}")
+
+        wallet = Wallet.generate_new()
+        key_data = json.dumps({
+            'address': wallet.address,
+            'private_key': wallet.get_private_key_bytes().hex(),
+            'public_key': wallet.get_public_key_bytes().hex()
+        }, indent=2)
+        # Created owner-only; O_EXCL so a concurrent creator's key is never overwritten
+        fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            f.write(key_data)
+        return wallet
+
+    def path_for(self, height: int) -> Path:
+        return self.directory / f"snapshot-{height:012d}.snap"
+
+    # ---- write ----
+
+    def write(self, height: int, tip_hash: str, sections: Dict[str, Any]) -> Optional[Path]:
+        """
+        Sign and store a snapshot, then prune old ones.
+
+        Returns:
+            Snapshot path, or None if it could not be written
+        """
+        try:
+            payload = json.dumps({
+                'height': height,
+                'tip_hash': tip_hash,
+                'created': time.time(),
+                'sections': sections,
+            }, separators=(',', ':')).encode()
+            header = {
+                'snapshot_version': SNAPSHOT_VERSION,
+                'height': height,
+                'tip_hash': tip_hash,
+                'public_key': self.public_key_hex,
+                'signature': self.signer.sign_transaction(payload).hex(),
+                'payload_sha256': hashlib.sha256(payload).hexdigest(),
+            }
+
+            path = self.path_for(height)
+            tmp_path = path.with_name(path.name + ".tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(json.dumps(header, separators=(',', ':')).encode() + b'\n')
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            self._prune()
+            logger.info(f"Wrote snapshot at height {height} ({len(payload)} bytes)")
+            return path
+        except Exception as e:
+            logger.error(f"Failed to write snapshot at height {height}: {e}")
+            return None
+
+    def _prune(self):
+        for _, path in self._snapshot_files()[self.keep:]:
+            path.unlink(missing_ok=True)
+
+    # ---- load ----
+
+    def _snapshot_files(self) -> List[Tuple[int, Path]]:
+        """Snapshot files, newest height first."""
+        files = []
+        for path in self.directory.glob(_SNAPSHOT_GLOB):
+            try:
+                files.append((int(path.stem.split('-', 1)[1]), path))
+            except ValueError:
+                continue
+        files.sort(reverse=True)
+        return files
+
+    def load(self, path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Read and verify one snapshot.
+
+        Returns:
+            Payload dict, or None if the file is damaged, unsigned or signed
+            by an untrusted key
+        """
+        try:
+            with open(path, 'rb') as f:
+                header = json.loads(f.readline())
+                payload = f.read()
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unreadable snapshot {path.name}: {e}")
+            return None
+
+        if header.get('snapshot_version') != SNAPSHOT_VERSION:
+            logger.warning(f"Snapshot {path.name} has unsupported version {header.get('snapshot_version')}")
+            return None
+        if header.get('public_key') not in self.trusted_keys:
+            logger.warning(f"Snapshot {path.name} is signed by an untrusted key")
+            return None
+        if hashlib.sha256(payload).hexdigest() != header.get('payload_sha256'):
+            logger.warning(f"Snapshot {path.name} is truncated or corrupt")
+            return None
+        try:
+            public_key = bytes.fromhex(header['public_key'])
+            signature = bytes.fromhex(header['signature'])
+        except (KeyError, ValueError):
+            return None
+        if not get_signature_verifier().verify(public_key, payload, signature):
+            logger.warning(f"Snapshot {path.name} has an invalid signature")
+            return None
+
+        snapshot = json.loads(payload)
+        if snapshot.get('height') != header.get('height') or snapshot.get('tip_hash') != header.get('tip_hash'):
+            return None
+        return snapshot
+
+    def load_latest(self, max_height: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Newest verified snapshot.
+
+        Args:
+            max_height: Ignore snapshots above this height
+
+        Returns:
+            Payload dict (height, tip_hash, created, sections) or None
+        """
+        for height, path in self._snapshot_files():
+            if max_height is not None and height > max_height:
+                continue
+            snapshot = self.load(path)
+            if snapshot is not None:
+                return snapshot
+        return None
+
+    def latest_height(self) -> Optional[int]:
+        files = self._snapshot_files()
+        return files[0][0] if files else None
@@ -17,12 +17,23 @@ Version: 4.1.0
 from __future__ import annotations
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, List, Tuple
 import logging
 import time
 import traceback
 
 
+# Budget applied to every Rust proof verification
+VERIFY_BUDGET = {
+    "max_ops": 1000000,
+    "max_duration_ms": 10000,
+    "max_memory_bytes": 100_000_000,
+}
+
+# (valid, error, duration_ms) for one block from a batch verification
+RustOutcome = Tuple[bool, Optional[str], float]
+
+
 class ConsensusMode(Enum):
     """Consensus migration modes for safe cutover."""
     LEGACY_ONLY = "legacy"          # Use legacy Python consensus only
@@ -102,6 +113,7 @@ class DualRunConsensus:
 
         # Rust consensus (loaded when mode != LEGACY_ONLY)
         self.rust_available = False
+        self.rust_batch_available = False
         if mode != ConsensusMode.LEGACY_ONLY:
             try:
                 from coinjecture._core import (
@@ -116,6 +128,18 @@ class DualRunConsensus:
                 self.rust_verify_subset_sum = verify_subset_sum_py
                 self.rust_available = True
                 self.logger.info("Rust consensus loaded successfully")
+
+                # Batch entry points (older builds only have the single-item ones)
+                try:
+                    from coinjecture._core import (
+                        compute_header_hashes_py,
+                        verify_subset_sum_batch_py,
+                    )
+                    self.rust_header_hashes = compute_header_hashes_py
+                    self.rust_verify_subset_sum_batch = verify_subset_sum_batch_py
+                    self.rust_batch_available = True
+                except ImportError:
+                    self.logger.warning("Rust batch verification not available, using per-block calls")
             except ImportError as e:
                 self.logger.error(f"Cannot import Rust consensus: {e}")
                 if mode == ConsensusMode.REFACTORED_ONLY:
@@ -136,22 +160,72 @@ class DualRunConsensus:
             (is_valid, result_metadata)
         """
         self.stats["total_verifications"] += 1
+        return self._dispatch(block)
+
+    def verify_blocks(self, blocks) -> List[Tuple[bool, ConsensusResult]]:
+        """
+        Verify a batch of blocks.
+
+        In Rust modes all headers are hashed and all proofs verified in two
+        batch calls that release the GIL; each block then goes through the
+        same mode logic (divergence checks, legacy fallback) as verify_block.
+
+        Nothing in the node calls DualRunConsensus yet; this is the entry
+        point for batch callers (e.g. scripts/benchmarks/bench_batch_verify.py)
+        and for the sync path once the migration wires the wrapper in.
+
+        Returns:
+            [(is_valid, result_metadata), ...] in block order
+        """
+        blocks = list(blocks)
+        if self.mode == ConsensusMode.LEGACY_ONLY or not self.rust_batch_available:
+            return [self.verify_block(block) for block in blocks]
+
+        try:
+            outcomes = self._rust_verify_blocks_impl(blocks)
+        except Exception as e:
+            # Whole batch failed (e.g. binding error): same as a per-block Rust error
+            outcomes = [(False, f"Rust batch verification failed: {e}", 0.0)] * len(blocks)
+
+        results = []
+        for block, outcome in zip(blocks, outcomes):
+            self.stats["total_verifications"] += 1
+            results.append(self._dispatch(block, outcome))
+        return results
 
+    def _dispatch(self, block, rust_outcome: Optional[RustOutcome] = None) -> Tuple[bool, ConsensusResult]:
         if self.mode == ConsensusMode.LEGACY_ONLY:
             return self._verify_legacy_only(block)
 
         elif self.mode == ConsensusMode.SHADOW:
-            return self._verify_shadow_mode(block)
+            return self._verify_shadow_mode(block, rust_outcome)
 
         elif self.mode == ConsensusMode.REFACTORED_PRIMARY:
-            return self._verify_rust_primary(block)
+            return self._verify_rust_primary(block, rust_outcome)
 
         elif self.mode == ConsensusMode.REFACTORED_ONLY:
-            return self._verify_rust_only(block)
+            return self._verify_rust_only(block, rust_outcome)
 
         else:
             raise ValueError(f"Unknown consensus mode: {self.mode}")
 
+    def _run_rust(self, block, rust_outcome: Optional[RustOutcome] = None) -> Tuple[bool, float]:
+        """
+        Rust verdict and duration for a block.
+
+        Uses the batch outcome when given, otherwise verifies the block on
+        its own. Batch errors are raised like single-block errors.
+        """
+        if rust_outcome is None:
+            start = time.time()
+            valid = self._rust_verify_block_impl(block)
+            return valid, (time.time() - start) * 1000
+
+        valid, error, duration_ms = rust_outcome
+        if error is not None:
+            raise RuntimeError(error)
+        return valid, duration_ms
+
     def _verify_legacy_only(self, block) -> Tuple[bool, ConsensusResult]:
         """Phase 0: Legacy Python consensus only (current production)."""
         start = time.time()
@@ -170,7 +244,7 @@ class DualRunConsensus:
             self.logger.error(f"Legacy verification error: {e}")
             raise
 
-    def _verify_shadow_mode(self, block) -> Tuple[bool, ConsensusResult]:
+    def _verify_shadow_mode(self, block, rust_outcome: Optional[RustOutcome] = None) -> Tuple[bool, ConsensusResult]:
         """
         Phase 1: Run BOTH legacy and Rust, use legacy result, log divergences.
 
@@ -187,16 +261,13 @@ class DualRunConsensus:
             raise  # Can't continue without legacy in shadow mode
 
         # Run Rust for comparison
-        start_rust = time.time()
         rust_valid = None
         rust_error = None
 
         try:
-            rust_valid = self._rust_verify_block_impl(block)
-            rust_duration = (time.time() - start_rust) * 1000
+            rust_valid, rust_duration = self._run_rust(block, rust_outcome)
         except Exception as e:
             rust_error = str(e)
-            rust_duration = (time.time() - start_rust) * 1000
             self.logger.error(f"Rust verification failed in shadow mode: {e}")
             self.stats["rust_errors"] += 1
 
@@ -238,18 +309,15 @@ class DualRunConsensus:
             error=rust_error if rust_error else None
         )
 
-    def _verify_rust_primary(self, block) -> Tuple[bool, ConsensusResult]:
+    def _verify_rust_primary(self, block, rust_outcome: Optional[RustOutcome] = None) -> Tuple[bool, ConsensusResult]:
         """
         Phase 2: Use Rust first, fallback to legacy on error.
 
         This phase tests Rust in production with a safety net.
         """
-        start_rust = time.time()
-
         try:
             # Try Rust first
-            rust_valid = self._rust_verify_block_impl(block)
-            rust_duration = (time.time() - start_rust) * 1000
+            rust_valid, rust_duration = self._run_rust(block, rust_outcome)
 
             # Also run legacy for comparison (catch bugs)
             try:
@@ -292,17 +360,14 @@ class DualRunConsensus:
                 error=str(e)
             )
 
-    def _verify_rust_only(self, block) -> Tuple[bool, ConsensusResult]:
+    def _verify_rust_only(self, block, rust_outcome: Optional[RustOutcome] = None) -> Tuple[bool, ConsensusResult]:
         """
         Phase 3: Rust only, no fallback.
 
         This is the final state - legacy code can be removed.
         """
-        start = time.time()
-
         try:
-            is_valid = self._rust_verify_block_impl(block)
-            duration = (time.time() - start) * 1000
+            is_valid, duration = self._run_rust(block, rust_outcome)
 
             return is_valid, ConsensusResult(
                 valid=is_valid,
@@ -323,50 +388,20 @@ class DualRunConsensus:
 
         # For now, verify individual components:
         # 1. Block header hash
-        header_dict = {
-            "codec_version": getattr(block, 'codec_version', 1),
-            "block_index": getattr(block, 'index', 0),
-            "timestamp": int(getattr(block, 'timestamp', time.time())),
-            "parent_hash": getattr(block, 'previous_hash', b'\x00' * 32),
-            "merkle_root": getattr(block, 'merkle_root', b'\x00' * 32),
-            "miner_address": getattr(block, 'miner_address', b'\x00' * 32),
-            "commitment": getattr(block, 'commitment', b'\x00' * 32),
-            "difficulty_target": getattr(block, 'difficulty', 1000),
-            "nonce": getattr(block, 'nonce', 0),
-            "extra_data": getattr(block, 'extra_data', b''),
-        }
-
         try:
-            header_hash = self.rust_header_hash(header_dict)
+            header_hash = self.rust_header_hash(self._header_dict(block))
         except Exception as e:
             raise RuntimeError(f"Rust header hash failed: {e}")
 
         # 2. Verify proof (if present)
-        if hasattr(block, 'proof') and block.proof is not None:
-            problem_dict = {
-                "problem_type": 0,  # SubsetSum
-                "tier": getattr(block.proof, 'tier', 1),
-                "elements": getattr(block.proof, 'elements', []),
-                "target": getattr(block.proof, 'target', 0),
-                "timestamp": int(getattr(block.proof, 'timestamp', time.time())),
-            }
-
-            solution_dict = {
-                "indices": getattr(block.proof, 'solution', []),
-                "timestamp": int(time.time()),
-            }
-
-            budget_dict = {
-                "max_ops": 1000000,
-                "max_duration_ms": 10000,
-                "max_memory_bytes": 100_000_000,
-            }
-
+        proof = self._proof_dicts(block)
+        if proof is not None:
+            problem_dict, solution_dict = proof
             try:
                 is_valid = self.rust_verify_subset_sum(
                     problem_dict,
                     solution_dict,
-                    budget_dict
+                    VERIFY_BUDGET
                 )
                 if not is_valid:
                     return False
@@ -376,6 +411,81 @@ class DualRunConsensus:
         # If we get here, block is valid
         return True
 
+    def _rust_verify_blocks_impl(self, blocks) -> List[RustOutcome]:
+        """
+        Verify blocks with the Rust batch entry points.
+
+        Same checks as _rust_verify_block_impl, but two FFI crossings for the
+        whole batch instead of two per block. Batch time is split evenly
+        across the blocks for reporting.
+        """
+        if not blocks:
+            return []
+        start = time.time()
+
+        header_results = self.rust_header_hashes([self._header_dict(block) for block in blocks])
+
+        proof_positions = []
+        problems = []
+        solutions = []
+        for position, block in enumerate(blocks):
+            proof = self._proof_dicts(block)
+            if proof is not None:
+                proof_positions.append(position)
+                problems.append(proof[0])
+                solutions.append(proof[1])
+        proof_results = {}
+        if problems:
+            batch = self.rust_verify_subset_sum_batch(problems, solutions, VERIFY_BUDGET)
+            proof_results = dict(zip(proof_positions, batch))
+
+        share_ms = (time.time() - start) * 1000 / len(blocks)
+        outcomes = []
+        for position, (header_hash, header_error) in enumerate(header_results):
+            if header_error is not None:
+                outcomes.append((False, f"Rust header hash failed: {header_error}", share_ms))
+                continue
+            proof_valid, proof_error = proof_results.get(position, (True, None))
+            if proof_error is not None:
+                outcomes.append((False, f"Rust proof verification failed: {proof_error}", share_ms))
+            else:
+                outcomes.append((proof_valid, None, share_ms))
+        return outcomes
+
+    @staticmethod
+    def _header_dict(block) -> Dict[str, Any]:
+        """Header fields in the shape the Rust codec expects."""
+        return {
+            "codec_version": getattr(block, 'codec_version', 1),
+            "block_index": getattr(block, 'index', 0),
+            "timestamp": int(getattr(block, 'timestamp', time.time())),
+            "parent_hash": getattr(block, 'previous_hash', b'\x00' * 32),
+            "merkle_root": getattr(block, 'merkle_root', b'\x00' * 32),
+            "miner_address": getattr(block, 'miner_address', b'\x00' * 32),
+            "commitment": getattr(block, 'commitment', b'\x00' * 32),
+            "difficulty_target": getattr(block, 'difficulty', 1000),
+            "nonce": getattr(block, 'nonce', 0),
+            "extra_data": getattr(block, 'extra_data', b''),
+        }
+
+    @staticmethod
+    def _proof_dicts(block) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """(problem, solution) dicts for the block's proof, or None."""
+        if getattr(block, 'proof', None) is None:
+            return None
+        problem_dict = {
+            "problem_type": 0,  # SubsetSum
+            "tier": getattr(block.proof, 'tier', 1),
+            "elements": getattr(block.proof, 'elements', []),
+            "target": getattr(block.proof, 'target', 0),
+            "timestamp": int(getattr(block.proof, 'timestamp', time.time())),
+        }
+        solution_dict = {
+            "indices": getattr(block.proof, 'solution', []),
+            "timestamp": int(time.time()),
+        }
+        return problem_dict, solution_dict
+
     def get_stats(self) -> Dict[str, Any]:
         """Get migration statistics for monitoring."""
         return {
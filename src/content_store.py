@@ -0,0 +1,235 @@
+"""
+Module: content_store
+
+IPFS-compatible content addressing without an IPFS daemon.
+
+compute_cid() reproduces the CIDv0 that `ipfs add --cid-version=0` assigns
+with default settings: 256 KiB fixed-size chunks, UnixFS protobuf leaves
+wrapped in dag-pb nodes, balanced DAG with at most 174 links per node, and
+a base58btc-encoded sha2-256 multihash of the root node.
+
+LocalBlobStore is a filesystem content-addressed store with the same
+add/get/pin/health_check interface as storage.IPFSClient, so it can replace
+the daemon for tests and single-node deployments. Blobs are stored whole,
+sharded into directories like go-ds-flatfs (next-to-last two characters).
+CIDs are checked with is_valid_cid() before they touch the filesystem.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+
+DEFAULT_CHUNK_SIZE = 256 * 1024  # ipfs add default chunker (size-262144)
+DEFAULT_MAX_LINKS = 174  # balanced layout fan-out
+
+_BASE58_ALPHABET = b"123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+_SHA2_256_PREFIX = b"\x12\x20"  # multihash: sha2-256, 32 bytes
+_UNIXFS_FILE = 2
+
+# CIDv0 / base58btc multibase, or CIDv1 in lowercase base32 multibase ('b')
+_CID_PATTERN = re.compile(r"[1-9A-HJ-NP-Za-km-z]+|b[a-z2-7]+")
+MAX_CID_LENGTH = 128
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _field_bytes(number: int, value: bytes) -> bytes:
+    return _varint(number << 3 | 2) + _varint(len(value)) + value
+
+
+def _field_varint(number: int, value: int) -> bytes:
+    return _varint(number << 3) + _varint(value)
+
+
+def base58btc_encode(data: bytes) -> str:
+    """Bitcoin-alphabet base58 (leading zero bytes become '1')."""
+    num = int.from_bytes(data, 'big')
+    out = bytearray()
+    while num:
+        num, rem = divmod(num, 58)
+        out.append(_BASE58_ALPHABET[rem])
+    pad = len(data) - len(data.lstrip(b"\x00"))
+    return (b"1" * pad + bytes(reversed(out))).decode('ascii')
+
+
+def is_valid_cid(cid: str) -> bool:
+    """True if cid is a base58btc or base32 CID string (safe as a file name)."""
+    return (isinstance(cid, str) and len(cid) <= MAX_CID_LENGTH
+            and _CID_PATTERN.fullmatch(cid) is not None)
+
+
+def _unixfs_file(data: Optional[bytes], filesize: int, blocksizes: Tuple[int, ...] = ()) -> bytes:
+    message = _field_varint(1, _UNIXFS_FILE)
+    if data:
+        message += _field_bytes(2, data)
+    message += _field_varint(3, filesize)
+    for size in blocksizes:
+        message += _field_varint(4, size)
+    return message
+
+
+def _dag_pb_node(unixfs: bytes, links: Tuple[Tuple[bytes, int], ...] = ()) -> bytes:
+    # dag-pb canonical order: Links (field 2) before Data (field 1);
+    # go-merkledag always writes the (empty) link Name
+    node = b""
+    for multihash, tsize in links:
+        node += _field_bytes(2, _field_bytes(1, multihash) + _field_bytes(2, b"") + _field_varint(3, tsize))
+    return node + _field_bytes(1, unixfs)
+
+
+def _multihash(node: bytes) -> bytes:
+    return _SHA2_256_PREFIX + hashlib.sha256(node).digest()
+
+
+def compute_cid(data: bytes, chunk_size: int = DEFAULT_CHUNK_SIZE, max_links: int = DEFAULT_MAX_LINKS) -> str:
+    """
+    CIDv0 of data as added by a default `ipfs add --cid-version=0`.
+
+    Args:
+        data: File contents
+        chunk_size: Fixed chunk size
+        max_links: Maximum children per internal node
+
+    Returns:
+        Base58btc CIDv0 string ("Qm...")
+    """
+    if len(data) <= chunk_size:
+        return base58btc_encode(_multihash(_dag_pb_node(_unixfs_file(data, len(data)))))
+
+    # Level entries: (multihash, file bytes covered, cumulative encoded size)
+    level: List[Tuple[bytes, int, int]] = []
+    for offset in range(0, len(data), chunk_size):
+        chunk = data[offset:offset + chunk_size]
+        node = _dag_pb_node(_unixfs_file(chunk, len(chunk)))
+        level.append((_multihash(node), len(chunk), len(node)))
+
+    while len(level) > 1:
+        parents = []
+        for start in range(0, len(level), max_links):
+            children = level[start:start + max_links]
+            filesize = sum(child[1] for child in children)
+            node = _dag_pb_node(
+                _unixfs_file(None, filesize, tuple(child[1] for child in children)),
+                tuple((child[0], child[2]) for child in children)
+            )
+            parents.append((_multihash(node), filesize, len(node) + sum(child[2] for child in children)))
+        level = parents
+    return base58btc_encode(level[0][0])
+
+
+class LocalBlobStore:
+    """
+    Content-addressed blob store on the local filesystem.
+
+    Drop-in for storage.IPFSClient: add() returns the CID an IPFS daemon
+    would, get() returns the stored bytes, pin() records a pin marker.
+    Writes are atomic (temp file + rename), so concurrent writers of the
+    same content are harmless.
+    """
+
+    def __init__(self, root_dir: str, verify_reads: bool = False, max_workers: int = 8):
+        """
+        Args:
+            root_dir: Directory holding the blobs
+            verify_reads: Recompute the CID of every blob read
+            max_workers: Threads for add_many/get_many
+        """
+        self.root_dir = root_dir
+        self.verify_reads = verify_reads
+        self.max_workers = max_workers
+        self.api_url = f"file://{os.path.abspath(root_dir)}"
+        os.makedirs(os.path.join(root_dir, "blocks"), exist_ok=True)
+        os.makedirs(os.path.join(root_dir, "pins"), exist_ok=True)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def _path(self, cid: str, kind: str = "blocks") -> str:
+        """Path for cid under root_dir; raises ValueError for malformed CIDs."""
+        if not is_valid_cid(cid):
+            raise ValueError(f"Malformed CID: {cid!r}")
+        if kind == "pins":
+            return os.path.join(self.root_dir, "pins", cid)
+        shard = cid[-3:-1] if len(cid) >= 3 else "_"
+        return os.path.join(self.root_dir, "blocks", shard, cid)
+
+    def add(self, obj_bytes: bytes) -> str:
+        """Store bytes and return their CID."""
+        cid = compute_cid(obj_bytes)
+        path = self._path(cid)
+        if os.path.exists(path):
+            return cid
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(obj_bytes)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return cid
+
+    def get(self, cid: str) -> bytes:
+        """Bytes stored under cid; raises KeyError if absent, ValueError if malformed."""
+        try:
+            with open(self._path(cid), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            raise KeyError(f"CID not in local store: {cid}")
+        if self.verify_reads and compute_cid(data) != cid:
+            raise ValueError(f"Stored content does not match CID {cid}")
+        return data
+
+    def has(self, cid: str) -> bool:
+        return is_valid_cid(cid) and os.path.exists(self._path(cid))
+
+    def pin(self, cid: str) -> bool:
+        if not self.has(cid):
+            return False
+        open(self._path(cid, "pins"), "a").close()
+        return True
+
+    def is_pinned(self, cid: str) -> bool:
+        return is_valid_cid(cid) and os.path.exists(self._path(cid, "pins"))
+
+    def health_check(self) -> bool:
+        return os.path.isdir(os.path.join(self.root_dir, "blocks"))
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="blobstore")
+            return self._executor
+
+    def add_many(self, objects: List[bytes]) -> List[str]:
+        """Store several blobs concurrently; CIDs in input order."""
+        return list(self._pool().map(self.add, objects))
+
+    def get_many(self, cids: List[str]) -> Dict[str, Optional[bytes]]:
+        """Fetch several blobs concurrently; missing CIDs map to None."""
+        def fetch(cid):
+            try:
+                return self.get(cid)
+            except KeyError:
+                return None
+        return dict(zip(cids, self._pool().map(fetch, cids)))
+
+    def close(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
@@ -3,6 +3,7 @@ import time
 import json
 import hashlib
 from hashlib import sha256
+import functools
 import os
 try:
     import psutil  # type: ignore
@@ -16,6 +17,26 @@ from typing import Literal, Optional, Tuple # Import Optional and Tuple
 import math
 from enum import Enum
 
+try:
+    from .subset_sum_engine import SubsetSumEngine, _HAS_NUMPY
+except ImportError:
+    from core.subset_sum_engine import SubsetSumEngine, _HAS_NUMPY
+
+try:
+    from .complexity import has_asymptotic_form, operations as complexity_operations
+except ImportError:
+    from core.complexity import has_asymptotic_form, operations as complexity_operations
+
+try:
+    from ..coinjecture.consensus.merkle import MerkleTree, MerkleProof, verify_proof
+except (ImportError, ValueError):
+    from coinjecture.consensus.merkle import MerkleTree, MerkleProof, verify_proof
+
+try:
+    from ..signature_verifier import get_signature_verifier
+except (ImportError, ValueError):
+    from signature_verifier import get_signature_verifier
+
 # Aggregation feature flag
 ENABLE_AGGREGATION = True
 
@@ -360,6 +381,29 @@ class ProblemTier(Enum):
             raise ValueError("Unknown ProblemTier")
 
 
+def subset_sum_tier_for_size(size: int) -> Optional[str]:
+    """Return the highest tier whose size range contains the given problem size."""
+    for tier in reversed(list(ProblemTier)):
+        min_size, max_size = tier.get_size_range()
+        if min_size <= size <= max_size:
+            return tier.value
+    return None
+
+
+# Solver backend per tier; switch with SUBSET_SUM_ENGINE.set_tier_backend(tier, name)
+SUBSET_SUM_ENGINE = SubsetSumEngine(
+    default_backend='bitset',
+    tier_backends={
+        ProblemTier.TIER_1_MOBILE: 'bitset',
+        ProblemTier.TIER_2_DESKTOP: 'bitset',
+        ProblemTier.TIER_3_WORKSTATION: 'bitset',
+        ProblemTier.TIER_4_SERVER: 'numpy' if _HAS_NUMPY else 'bitset',
+        ProblemTier.TIER_5_CLUSTER: 'numpy' if _HAS_NUMPY else 'bitset',
+    },
+    tier_resolver=subset_sum_tier_for_size,
+)
+
+
 def complexity_to_operations(complexity_str: str, n: int) -> float:
     """
     Convert Big-O notation to estimated operation count.
@@ -370,72 +414,60 @@ def complexity_to_operations(complexity_str: str, n: int) -> float:
         O(2^n) with n=20 -> 1,048,876 operations
         O(n!) with n=10 -> 3,628,800 operations
         O(n * target) with n=10 and target=100 -> 1000 operations
-    """
 
-    # Parse complexity string - handle O(), Omega(), Theta() if needed, but for operations
-    # we likely just use the dominant term from O() or Theta(). Sticking to O() for now.
-    # Remove "O(", "Omega(", "Theta(" and ")"
-    cleaned_complexity_str = complexity_str.replace("O(", "").replace("Omega(", "").replace("Theta(", "").replace(")", "").strip()
-
-
-    complexity_map = {
-        '1': lambda n: 1,
-        'log n': lambda n: math.log2(n) if n > 1 else 0, # log(1) is 0 or undefined, handle n=1
-        'n': lambda n: n,
-        'n log n': lambda n: n * math.log2(n) if n > 1 else 0, # handle n=1
-        'n^2': lambda n: n ** 2,
-        'n^3': lambda n: n ** 3,
-        '2^n': lambda n: 2 ** n,
-        '2^(n/2)': lambda n: 2 ** (n / 2),
-        'n!': lambda n: math.factorial(n),
-        'n^n': lambda n: n ** n,
-    }
-
-
-    if cleaned_complexity_str in complexity_map:
-        return complexity_map[cleaned_complexity_str](n)
-    else:
-        # Attempt to parse n^k or c^n forms
-        if '^' in cleaned_complexity_str:
-            parts = cleaned_complexity_str.split('^')
-            if len(parts) == 2:
-                base, exponent = parts
-                if base == 'n':
-                    try:
-                        k = float(exponent)
-                        return n ** k
-                    except ValueError:
-                        pass
-                else:
-                    try:
-                        c = float(base)
-                        if exponent == 'n':
-                            return c ** n
-                        else: # Handle cases like c^k
-                             k = float(exponent)
-                             return c ** k
-                    except ValueError:
-                        pass
-        # If none of the above, it's an unknown complexity string
-        raise ValueError(f"Unknown or unparseable complexity: {cleaned_complexity_str}")
+    Expressions are compiled once and results memoized per (expression, n);
+    see core.complexity for the accepted forms and evaluate_many().
+    """
+    return complexity_operations(complexity_str, n)
 
 
 def calculate_computational_work_score(complexity: ComputationalComplexity) -> float:
     """
     Calculate proof-of-work score based primarily on measured performance and energy,
     incorporating refined complexity metrics.
+
+    Scores are memoized on the fields they depend on, so re-scoring a block
+    (validation, reward and difficulty paths all score the same block) is a lookup.
     """
+    return _work_score(
+        complexity.problem_size,
+        complexity.problem_class,
+        complexity.time_solve_O,
+        complexity.time_verify_O,
+        complexity.measured_solve_time,
+        complexity.measured_verify_time,
+        complexity.measured_solve_space,
+        complexity.measured_verify_space,
+        complexity.epsilon_approximation,
+        complexity.asymmetry_time,
+        complexity.asymmetry_space,
+        complexity.energy_metrics.solve_energy_joules,
+    )
 
-    n = complexity.problem_size
-    energy = complexity.energy_metrics
+
+@functools.lru_cache(maxsize=8192)
+def _work_score(
+    n: int,
+    problem_class: str,
+    time_solve_O: str,
+    time_verify_O: str,
+    measured_solve_time: float,
+    measured_verify_time: float,
+    measured_solve_space: float,
+    measured_verify_space: float,
+    epsilon_approximation: Optional[float],
+    asymmetry_time: float,
+    asymmetry_space: float,
+    solve_energy_joules: float,
+) -> float:
 
     # Prioritize measured metrics for work score
     # Time and Space Asymmetry based on measured values
     time_asymmetry_measured = (
-        complexity.measured_solve_time / max(1e-9, complexity.measured_verify_time) # Avoid division by zero
+        measured_solve_time / max(1e-9, measured_verify_time) # Avoid division by zero
     )
     space_asymmetry_measured = (
-        complexity.measured_solve_space / max(1, complexity.measured_verify_space) # Avoid division by zero
+        measured_solve_space / max(1, measured_verify_space) # Avoid division by zero
     )
 
     # Problem Class Weight
@@ -447,7 +479,7 @@ def calculate_computational_work_score(complexity: ComputationalComplexity) -> f
         'PSPACE': 500,
         'EXPTIME': 1000
     }
-    problem_weight = class_weights.get(complexity.problem_class, 1)
+    problem_weight = class_weights.get(problem_class, 1)
 
     # Size Factor
     size_factor = max(1, n)
@@ -456,23 +488,23 @@ def calculate_computational_work_score(complexity: ComputationalComplexity) -> f
     # Lower epsilon means higher quality (closer to optimal)
     # Score should be higher for lower epsilon. 1 / (1 + epsilon) is one way.
     # For exact solutions (epsilon is None), quality is 1.0.
-    if complexity.epsilon_approximation is None:
+    if epsilon_approximation is None:
         quality_score = 1.0
     else:
         # Ensure epsilon is non-negative
-        epsilon = max(0.0, complexity.epsilon_approximation)
+        epsilon = max(0.0, epsilon_approximation)
         quality_score = 1.0 / (1.0 + epsilon) # Score decreases as epsilon increases
 
 
     # Energy Efficiency Score
     energy_efficiency_score = 1.0
-    if energy.solve_energy_joules > 0 and complexity.measured_solve_time > 0:
+    if solve_energy_joules > 0 and measured_solve_time > 0:
         # Use estimated solve operations from O() as a proxy for work size
         try:
-            estimated_solve_ops = complexity_to_operations(complexity.time_solve_O, n)
+            estimated_solve_ops = complexity_to_operations(time_solve_O, n)
             if estimated_solve_ops > 0:
                 reference_energy_per_op = 1e-9 # Example: 1 nJ per operation (needs calibration)
-                actual_energy_per_op = energy.solve_energy_joules / estimated_solve_ops
+                actual_energy_per_op = solve_energy_joules / estimated_solve_ops
                 if actual_energy_per_op > 0:
                      energy_efficiency_score = min(2.0, max(0.1, reference_energy_per_op / actual_energy_per_op)) # Cap efficiency bonus/penalty
         except ValueError:
@@ -494,7 +526,7 @@ def calculate_computational_work_score(complexity: ComputationalComplexity) -> f
     try:
         # These calls might fail if the complexity strings are not parsable by complexity_to_operations
         # We need to ensure complexity_to_operations can handle all strings stored in Complexity.
-        theoretical_time_asymmetry = complexity_to_operations(complexity.time_solve_O, n) / max(1e-9, complexity_to_operations(complexity.time_verify_O, n))
+        theoretical_time_asymmetry = complexity_to_operations(time_solve_O, n) / max(1e-9, complexity_to_operations(time_verify_O, n))
         # This call will fail if complexity_to_operations doesn't handle "O(n * target)"
         # Now, subset_sum_complexity calculates asymmetry directly, so this call is fine if space_solve_O is a parsable term like O(n) or O(2^n)
         # If space_solve_O is "O(n * target)", this call will still fail.
@@ -502,8 +534,8 @@ def calculate_computational_work_score(complexity: ComputationalComplexity) -> f
 
         # After modifying subset_sum_complexity to calculate asymmetry directly,
         # we can use the stored asymmetry values here for the theoretical bonus.
-        theoretical_time_asymmetry_stored = complexity.asymmetry_time
-        theoretical_space_asymmetry_stored = complexity.asymmetry_space
+        theoretical_time_asymmetry_stored = asymmetry_time
+        theoretical_space_asymmetry_stored = asymmetry_space
 
 
         theoretical_bonus = math.log(max(1, theoretical_time_asymmetry_stored)) + math.log(max(1, theoretical_space_asymmetry_stored)) * 0.5
@@ -684,6 +716,46 @@ class Block:
         return sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
 
 
+    def merkle_tree(self) -> MerkleTree:
+        """Merkle tree over this block's transactions and problem/solution leaf."""
+        return build_merkle_tree(merkle_leaf_dicts(self.transactions, self.problem, self.solution))
+
+    def transaction_proof(self, index: int) -> MerkleProof:
+        """Inclusion proof for the transaction at index, verifiable against merkle_root."""
+        if not 0 <= index < len(self.transactions):
+            raise IndexError(f"Transaction index out of range: {index}")
+        return self.merkle_tree().proof(index)
+
+    @staticmethod
+    def verify_transaction_proof(transaction, proof: MerkleProof, merkle_root: str) -> bool:
+        """
+        Light-client check that a transaction is in a block with merkle_root.
+
+        Args:
+            transaction: Transaction (or its dict)
+            proof: Proof from transaction_proof()
+            merkle_root: Block header merkle root
+
+        Returns:
+            True if the transaction is included
+        """
+        tx_dict = transaction.to_dict() if hasattr(transaction, 'to_dict') else transaction
+        return proof.leaf.hex() == merkle_leaf_hash(tx_dict) and verify_proof(proof, merkle_root)
+
+    def verify_transaction_signatures(self) -> bool:
+        """
+        Verify every signed transaction in one batch.
+
+        Signatures already checked on mempool admission are answered from
+        the verifier's cache. Unsigned entries (e.g. rewards) are skipped.
+
+        Returns:
+            True if no signature is invalid
+        """
+        signed = [tx for tx in self.transactions
+                  if (tx.get('signature') if isinstance(tx, dict) else getattr(tx, 'signature', ''))]
+        return all(verify_transaction_signatures(signed))
+
     def is_valid(self) -> bool:
         """
         Validate block by verifying the solution and problem size against the mining tier.
@@ -784,10 +856,8 @@ def verify_complexity_metrics(complexity: ComputationalComplexity) -> bool:
         return False # Cannot verify space complexity without target
 
     # 1. Verify claimed asymptotic complexities are in the supported map or parsable format
-    supported_asymptotic_forms = ['O()', 'Omega()', 'Theta()'] # Basic check for format
-    def check_asymptotic_form(comp_str):
-         if comp_str is None: return True # Theta is optional
-         return any(comp_str.startswith(form) for form in supported_asymptotic_forms) and comp_str.endswith(')')
+    # O(...), Omega(...) or Theta(...); the old literal 'O()' prefixes rejected every real string
+    check_asymptotic_form = has_asymptotic_form  # None allowed: Theta is optional
 
     # Check format of all complexity strings
     if not (check_asymptotic_form(complexity.time_solve_O) and
@@ -909,6 +979,45 @@ def mine_block(
         # This indicates an issue with the solver or problem generation.
         raise InvalidSolutionError("Solution doesn't satisfy problem")
 
+    return assemble_block(
+        transactions,
+        previous_block,
+        capacity,
+        problem,
+        solution,
+        solve_time=solve_time,
+        verify_time=verify_time,
+        solve_memory=solve_memory,
+        verify_memory=verify_memory,
+        submission_id=submission_id,
+        problem_pool=problem_pool,
+        miner_address=miner_address
+    )
+
+
+def assemble_block(
+    transactions: list['Transaction'],
+    previous_block: Block,
+    capacity: ProblemTier,
+    problem: dict,
+    solution,
+    *,
+    solve_time: float,
+    verify_time: float,
+    solve_memory: int,
+    verify_memory: int,
+    submission_id: Optional[str] = None,
+    problem_pool: Optional[object] = None,
+    miner_address: str = "Miner"
+) -> Block:
+    """
+    Build a block around an already solved and verified problem.
+
+    Split out of mine_block so solutions produced elsewhere (e.g. by the
+    MiningPool worker processes) go through the same commitment, merkle
+    root, proof bundle and aggregation steps.
+    """
+
     # 4. Create complexity specification (based on measured performance and known theoreticals)
     # Note: Energy metrics are placeholders and need real measurement.
     placeholder_energy_metrics = EnergyMetrics(
@@ -952,7 +1061,6 @@ def mine_block(
     except ImportError:
         # Fallback for direct execution
         import sys
-        import os
         sys.path.append(os.path.dirname(os.path.dirname(__file__)))
         from pow import create_commitment, compute_solution_hash, derive_epoch_salt
     
@@ -980,11 +1088,9 @@ def mine_block(
     )
 
     # 5. Build merkle root
-    # Assuming transactions is a list of objects with a to_dict() or similar method
-    transaction_dicts = [tx.to_dict() for tx in transactions] if transactions else []
-    # Merkle root now includes problem and solution as part of the "transaction" data
-    # conceptually, though not actual user transactions.
-    merkle_root = build_merkle_root(transaction_dicts + [{'problem': problem, 'solution': solution}], "") # No separate proof commitment in this model
+    # Merkle root includes problem and solution as a final leaf after the
+    # transactions, conceptually, though not an actual user transaction.
+    merkle_root = build_merkle_tree(merkle_leaf_dicts(transactions, problem, solution)).root_hex()
 
 
     # 6. Create block
@@ -1046,7 +1152,7 @@ def mine_block(
                 work_score=current_block_work_score,
                 solve_time=solve_time,
                 energy_used=placeholder_energy_metrics.solve_energy_joules,
-                verified=is_valid,
+                verified=True,
                 verification_time=verify_time,
             )
             problem_pool.record_solution(submission_id, record)
@@ -1087,24 +1193,30 @@ def store_proof_ipfs(proof_data):
     # Placeholder: Return a dummy CID.
     return "Qm...dummyCID..."
 
-def build_merkle_root(data_dicts, *args):
-    """Build a Merkle root from data dictionaries."""
-    # Includes problem and solution in the data_dicts.
-    import hashlib
-    # Ensure data_dicts are serializable
+def merkle_leaf_hash(item) -> str:
+    """Leaf hash of one merkle item: sha256 of its sorted-key JSON."""
     try:
-        data_hashes = [hashlib.sha256(json.dumps(item, sort_keys=True).encode('utf-8')).hexdigest() for item in data_dicts]
+        return hashlib.sha256(json.dumps(item, sort_keys=True).encode('utf-8')).hexdigest()
     except TypeError as e:
-         print(f"Error serializing data for Merkle root: {e}")
-         data_hashes = [hashlib.sha256(str(item).encode('utf-8')).hexdigest() for item in data_dicts] # Simple string representation as fallback
+        print(f"Error serializing data for Merkle root: {e}")
+        return hashlib.sha256(str(item).encode('utf-8')).hexdigest()  # Simple string representation as fallback
+
+
+def merkle_leaf_dicts(transactions, problem, solution) -> list:
+    """Merkle items of a block: transaction dicts, then the problem/solution."""
+    transaction_dicts = [tx.to_dict() if hasattr(tx, 'to_dict') else tx for tx in transactions or []]
+    return transaction_dicts + [{'problem': problem, 'solution': solution}]
 
-    # Simple concatenation and hash for placeholder Merkle root:
-    if not data_hashes:
-        return hashlib.sha256("").hexdigest() # Hash of empty string if no data
 
-    # A proper Merkle tree would build a tree structure.
-    # Simple concatenation for placeholder:
-    return hashlib.sha256("".join(data_hashes).encode('utf-8')).hexdigest()
+def build_merkle_tree(data_dicts) -> MerkleTree:
+    """Merkle tree over data dictionaries (leaves are merkle_leaf_hash of each)."""
+    return MerkleTree(merkle_leaf_hash(item) for item in data_dicts)
+
+
+def build_merkle_root(data_dicts, *args):
+    """Build a Merkle root from data dictionaries."""
+    # Includes problem and solution in the data_dicts.
+    return build_merkle_tree(data_dicts).root_hex()
 
 
 def get_memory_usage():
@@ -1141,35 +1253,14 @@ def generate_subset_sum_problem(seed, tier: ProblemTier):
 
 
 def solve_subset_sum(problem):
-    """Solve the Subset Sum problem using a dynamic programming approach."""
-    numbers = problem['numbers']
-    target = problem['target']
-    n = len(numbers)
+    """
+    Solve the Subset Sum problem.
 
-    if target < 0:
-        return []
-    if target == 0:
-        return []
-
-    # Use indices to avoid duplicate usage of the same number
-    dp = {0: []}
-
-    for i, num in enumerate(numbers):
-        new_sums = {}
-        for current_sum, path in dp.items():
-            new_sum = current_sum + num
-            if new_sum <= target:
-                if new_sum not in dp:
-                    # Check if this number index is already used in the path
-                    if i not in [j for j in path if isinstance(j, tuple)]:
-                        new_sums[new_sum] = path + [(i, num)]
-        dp.update(new_sums)
-
-    if target in dp:
-        # Extract just the numbers from the solution
-        return [num for _, num in dp[target]]
-    else:
-        return []
+    Dispatches to the backend configured for the problem's tier in
+    SUBSET_SUM_ENGINE; every backend returns the same solution as the
+    original dynamic programming solver (see core.subset_sum_engine).
+    """
+    return SUBSET_SUM_ENGINE.solve(problem)
 
 
 def verify_subset_sum(problem, solution):
@@ -1245,29 +1336,28 @@ class Transaction:
             print(f"Error signing transaction: {e}")
             return ""
     
+    def signature_item(self) -> Optional[Tuple[bytes, bytes, bytes]]:
+        """(public_key, message, signature) for the verifier, or None if unsigned/malformed."""
+        if not self.signature or not self.public_key:
+            return None
+        try:
+            transaction_data = f"{self.sender}{self.recipient}{self.amount}{self.timestamp}".encode()
+            return bytes.fromhex(self.public_key), transaction_data, bytes.fromhex(self.signature)
+        except ValueError:
+            return None
+    
     def verify_signature(self) -> bool:
         """
-        Verify transaction signature.
+        Verify transaction signature (cached by the shared verifier).
         
         Returns:
             True if signature is valid
         """
         try:
-            from cryptography.hazmat.primitives.asymmetric import ed25519
-            
-            if not self.signature or not self.public_key:
+            item = self.signature_item()
+            if item is None:
                 return False
-            
-            # Load public key
-            public_key_bytes = bytes.fromhex(self.public_key)
-            public_key = ed25519.Ed25519PublicKey.from_public_bytes(public_key_bytes)
-            
-            # Verify signature
-            transaction_data = f"{self.sender}{self.recipient}{self.amount}{self.timestamp}".encode()
-            signature_bytes = bytes.fromhex(self.signature)
-            
-            public_key.verify(signature_bytes, transaction_data)
-            return True
+            return get_signature_verifier().verify(*item)
         except Exception:
             return False
     
@@ -1299,4 +1389,41 @@ class Transaction:
     def __str__(self):
         return f"Transaction {self.transaction_id[:8]}...: {self.sender} -> {self.recipient} ({self.amount})"
 
+
+def _transaction_signature_item(tx) -> Optional[Tuple[bytes, bytes, bytes]]:
+    """Verifier triple for a transaction object or dict (None if unsigned/malformed)."""
+    if not isinstance(tx, dict):
+        return tx.signature_item()
+    if not tx.get('signature') or not tx.get('public_key'):
+        return None
+    # Same bytes as the signing transaction classes; fee/nonce only when set
+    data = f"{tx.get('sender')}{tx.get('recipient')}{tx.get('amount')}{tx.get('timestamp')}"
+    if tx.get('fee') or tx.get('nonce') is not None:
+        data += f"|fee={tx.get('fee', 0.0)}|nonce={tx.get('nonce')}"
+    try:
+        return bytes.fromhex(tx['public_key']), data.encode(), bytes.fromhex(tx['signature'])
+    except (ValueError, TypeError):
+        return None
+
+
+def verify_transaction_signatures(transactions) -> list:
+    """
+    Verify many transaction signatures in one batch.
+    
+    Args:
+        transactions: Objects with signature_item() (both Transaction classes)
+            or their to_dict() form, as in blocks read back from storage
+        
+    Returns:
+        One bool per transaction; unsigned or malformed ones are False
+    """
+    items = [_transaction_signature_item(tx) for tx in transactions]
+    present = [item for item in items if item is not None]
+    try:
+        verdicts = iter(get_signature_verifier().verify_batch(present)) if present else iter(())
+    except Exception as e:
+        print(f"Error verifying signatures: {e}")
+        return [False] * len(items)
+    return [next(verdicts) if item is not None else False for item in items]
+
 # Sample block creation code removed - CLI now connects to live network
\ No newline at end of file
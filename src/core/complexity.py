@@ -0,0 +1,197 @@
+"""
+Module: core.complexity
+
+Compiled Big-O expressions for operation-count estimates.
+
+parse_complexity() turns a complexity string ("O(n^2)", "Theta(n log n)",
+"O(2^n)", ...) into a CompiledComplexity once; parses are cached per
+string, failures included, so hot paths never repeat the string work.
+
+    operations(expr, n)         one size, memoized per (expression, n)
+    evaluate_many(expr, sizes)  many sizes in one call; closed forms run as
+                                a single NumPy expression when NumPy is
+                                installed, the rest reuse the scalar cache
+
+Accepted forms are those complexity_to_operations() has always accepted:
+the named terms in TERMS, n^k, c^n and c^k. Anything else raises
+ValueError with the same message as before. As before, stripping the
+wrapper removes every ")", so parenthesised terms such as O(2^(n/2)) do
+not parse; work scores already recorded depend on that.
+"""
+
+import math
+from functools import lru_cache
+from typing import Callable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np  # type: ignore
+    _HAS_NUMPY = True
+except Exception:
+    np = None  # type: ignore
+    _HAS_NUMPY = False
+
+
+# Scalar evaluators for the named terms. Integer results stay exact ints.
+TERMS = {
+    '1': lambda n: 1,
+    'log n': lambda n: math.log2(n) if n > 1 else 0,  # log(1) is 0 or undefined, handle n=1
+    'n': lambda n: n,
+    'n log n': lambda n: n * math.log2(n) if n > 1 else 0,  # handle n=1
+    'n^2': lambda n: n ** 2,
+    'n^3': lambda n: n ** 3,
+    '2^n': lambda n: 2 ** n,
+    '2^(n/2)': lambda n: 2 ** (n / 2),
+    'n!': lambda n: math.factorial(n),
+    'n^n': lambda n: n ** n,
+}
+
+OPERATIONS_CACHE_SIZE = 65536
+_VECTOR_MIN_SIZES = 64  # smaller batches are cheaper through the scalar cache
+
+
+def strip_bound(complexity_str: str) -> str:
+    """Drop the O()/Omega()/Theta() wrapper, leaving the growth term."""
+    return complexity_str.replace("O(", "").replace("Omega(", "").replace("Theta(", "").replace(")", "").strip()
+
+
+class CompiledComplexity:
+    """
+    A parsed growth term.
+
+    scalar(n) gives the operation count for one size; vector, when set,
+    evaluates a NumPy array of sizes in one expression.
+    """
+
+    __slots__ = ("source", "term", "scalar", "vector")
+
+    def __init__(self, source: str, term: str, scalar: Callable[[int], float],
+                 vector: Optional[Callable] = None):
+        self.source = source
+        self.term = term
+        self.scalar = scalar
+        self.vector = vector
+
+    def __call__(self, n: int) -> float:
+        return self.scalar(n)
+
+    def __repr__(self) -> str:
+        return f"CompiledComplexity({self.source!r})"
+
+
+def _vector_term(term: str) -> Optional[Callable]:
+    """NumPy form of a named term, if it has a closed float form."""
+    if not _HAS_NUMPY:
+        return None
+    vectors = {
+        '1': lambda n: np.ones_like(n, dtype=np.float64),
+        'log n': lambda n: np.where(n > 1, np.log2(np.maximum(n, 1)), 0.0),
+        'n': lambda n: n.astype(np.float64),
+        'n log n': lambda n: np.where(n > 1, n * np.log2(np.maximum(n, 1)), 0.0),
+        'n^2': lambda n: n.astype(np.float64) ** 2,
+        'n^3': lambda n: n.astype(np.float64) ** 3,
+        '2^n': lambda n: np.exp2(n),
+        '2^(n/2)': lambda n: np.exp2(n / 2),
+    }
+    return vectors.get(term)
+
+
+def _compile(complexity_str: str) -> CompiledComplexity:
+    term = strip_bound(complexity_str)
+    if term in TERMS:
+        return CompiledComplexity(complexity_str, term, TERMS[term], _vector_term(term))
+
+    # Attempt to parse n^k or c^n forms
+    if '^' in term:
+        parts = term.split('^')
+        if len(parts) == 2:
+            base, exponent = parts
+            if base == 'n':
+                try:
+                    k = float(exponent)
+                    vector = (lambda n: n.astype(np.float64) ** k) if _HAS_NUMPY else None
+                    return CompiledComplexity(complexity_str, term, lambda n: n ** k, vector)
+                except ValueError:
+                    pass
+            else:
+                try:
+                    c = float(base)
+                    if exponent == 'n':
+                        vector = (lambda n: np.power(c, n.astype(np.float64))) if _HAS_NUMPY else None
+                        return CompiledComplexity(complexity_str, term, lambda n: c ** n, vector)
+                    # Handle cases like c^k
+                    value = c ** float(exponent)
+                    vector = (lambda n: np.full(n.shape, value)) if _HAS_NUMPY else None
+                    return CompiledComplexity(complexity_str, term, lambda n: value, vector)
+                except ValueError:
+                    pass
+    # If none of the above, it's an unknown complexity string
+    raise ValueError(f"Unknown or unparseable complexity: {term}")
+
+
+@lru_cache(maxsize=4096)
+def _parse_cached(complexity_str: str) -> Tuple[Optional[CompiledComplexity], Optional[str]]:
+    try:
+        return _compile(complexity_str), None
+    except ValueError as e:
+        return None, str(e)
+
+
+def parse_complexity(complexity_str: str) -> CompiledComplexity:
+    """
+    Compile a complexity string (cached).
+
+    Raises:
+        ValueError: If the expression is not a supported form
+    """
+    compiled, error = _parse_cached(complexity_str)
+    if compiled is None:
+        raise ValueError(error)
+    return compiled
+
+
+@lru_cache(maxsize=OPERATIONS_CACHE_SIZE)
+def operations(complexity_str: str, n: int) -> float:
+    """
+    Estimated operation count of complexity_str at size n (memoized).
+
+    Raises:
+        ValueError: If the expression is not a supported form
+    """
+    return parse_complexity(complexity_str).scalar(n)
+
+
+def evaluate_many(complexity_str: str, sizes: Sequence[int]) -> List[float]:
+    """
+    Operation counts for many sizes of one expression.
+
+    Closed forms are evaluated as one NumPy expression when NumPy is
+    available (float64, so huge values become inf rather than exact ints);
+    otherwise each size goes through the memoized scalar path.
+
+    Raises:
+        ValueError: If the expression is not a supported form
+    """
+    compiled = parse_complexity(complexity_str)
+    if compiled.vector is not None and len(sizes) >= _VECTOR_MIN_SIZES:
+        with np.errstate(over='ignore'):
+            return compiled.vector(np.asarray(sizes)).tolist()
+    return [operations(complexity_str, n) for n in sizes]
+
+
+def has_asymptotic_form(complexity_str: Optional[str]) -> bool:
+    """True for None (optional bounds) or an O()/Omega()/Theta() wrapped expression."""
+    if complexity_str is None:
+        return True
+    return _has_asymptotic_form(complexity_str)
+
+
+@lru_cache(maxsize=4096)
+def _has_asymptotic_form(complexity_str: str) -> bool:
+    return complexity_str.startswith(('O(', 'Omega(', 'Theta(')) and complexity_str.endswith(')')
+
+
+def clear_caches():
+    """Drop memoized parses and evaluations (tests, long-running tools)."""
+    _parse_cached.cache_clear()
+    operations.cache_clear()
+    _has_asymptotic_form.cache_clear()
@@ -0,0 +1,197 @@
+"""
+High-performance Subset Sum solver backends for COINjecture.
+
+The reference solver in core.blockchain keeps a dict of sum -> Python list
+path and copies the path on every extension. The backends here compute the
+same reachability with big-int bitsets (or NumPy boolean rows) and rebuild
+the path afterwards from per-prefix reachability, so they return exactly the
+solution the reference DP returns while using a fraction of the memory.
+
+Backends:
+- bitset: Python big-int shifts, one int per prefix (default)
+- numpy:  boolean DP matrix, used when NumPy is installed
+- mitm:   meet-in-the-middle for targets too large for a bitset
+- reference: the original dict DP (kept for benchmarks and odd inputs)
+"""
+
+from typing import Callable, Dict, List, Optional
+
+try:
+    import numpy as np  # type: ignore
+    _HAS_NUMPY = True
+except Exception:
+    np = None  # type: ignore
+    _HAS_NUMPY = False
+
+
+# Largest target handled with a bitset/NumPy row before switching to meet-in-the-middle
+BITSET_MAX_TARGET = 1 << 22
+
+# Meet-in-the-middle enumerates 2^(n/2) sums per half
+MITM_MAX_ELEMENTS = 48
+
+
+def solve_reference(numbers: List[int], target: int) -> List[int]:
+    """Original dict-of-paths dynamic programming solver."""
+    if target <= 0:
+        return []
+
+    dp = {0: []}
+    for i, num in enumerate(numbers):
+        new_sums = {}
+        for current_sum, path in dp.items():
+            new_sum = current_sum + num
+            if new_sum <= target and new_sum not in dp:
+                new_sums[new_sum] = path + [(i, num)]
+        dp.update(new_sums)
+
+    if target in dp:
+        return [num for _, num in dp[target]]
+    return []
+
+
+def _backtrack(prefix_reach: List, numbers: List[int], target: int, is_set: Callable) -> List[int]:
+    """
+    Rebuild the reference DP's path from per-prefix reachability.
+
+    The reference DP records a sum the first time it becomes reachable and
+    appends that element to the path of (sum - element). Walking the prefixes
+    backwards and taking element i only when the running sum was not yet
+    reachable before i reproduces that path exactly.
+    """
+    picked = []
+    remaining = target
+    for i in range(len(numbers) - 1, -1, -1):
+        if remaining == 0:
+            break
+        if not is_set(prefix_reach[i], remaining):
+            picked.append(numbers[i])
+            remaining -= numbers[i]
+    picked.reverse()
+    return picked
+
+
+def solve_bitset(numbers: List[int], target: int) -> List[int]:
+    """Big-int bitset reachability with back-pointer reconstruction."""
+    if target <= 0:
+        return []
+
+    mask = (1 << (target + 1)) - 1
+    reach = 1
+    # prefix_reach[i] = sums reachable using numbers[:i]
+    prefix_reach = []
+    for num in numbers:
+        prefix_reach.append(reach)
+        reach = (reach | (reach << num)) & mask
+
+    if not (reach >> target) & 1:
+        return []
+    return _backtrack(prefix_reach, numbers, target, lambda bits, s: (bits >> s) & 1)
+
+
+def solve_numpy(numbers: List[int], target: int) -> List[int]:
+    """Boolean NumPy DP matrix with back-pointer reconstruction."""
+    if not _HAS_NUMPY:
+        return solve_bitset(numbers, target)
+    if target <= 0:
+        return []
+
+    n = len(numbers)
+    table = np.zeros((n + 1, target + 1), dtype=bool)
+    table[0, 0] = True
+    for i, num in enumerate(numbers):
+        table[i + 1] = table[i]
+        if num <= target:
+            table[i + 1, num:] |= table[i, :target + 1 - num]
+
+    if not table[n, target]:
+        return []
+    return _backtrack(table, numbers, target, lambda row, s: row[s])
+
+
+def solve_meet_in_middle(numbers: List[int], target: int) -> List[int]:
+    """
+    Meet-in-the-middle search for large targets.
+
+    Returns a valid subset (in input order) but not necessarily the one the
+    reference DP would pick; only used where the DP is infeasible anyway.
+    """
+    if target <= 0:
+        return []
+
+    half = len(numbers) // 2
+    left, right = numbers[:half], numbers[half:]
+
+    def enumerate_sums(items: List[int]) -> Dict[int, int]:
+        sums = {0: 0}
+        for bit, num in enumerate(items):
+            for s, subset_mask in list(sums.items()):
+                sums.setdefault(s + num, subset_mask | (1 << bit))
+        return sums
+
+    right_sums = enumerate_sums(right)
+    for left_sum, left_mask in sorted(enumerate_sums(left).items()):
+        right_mask = right_sums.get(target - left_sum)
+        if right_mask is None:
+            continue
+        chosen = [num for bit, num in enumerate(left) if left_mask >> bit & 1]
+        chosen += [num for bit, num in enumerate(right) if right_mask >> bit & 1]
+        return chosen
+    return []
+
+
+SUBSET_SUM_BACKENDS: Dict[str, Callable[[List[int], int], List[int]]] = {
+    'reference': solve_reference,
+    'bitset': solve_bitset,
+    'numpy': solve_numpy,
+    'mitm': solve_meet_in_middle,
+}
+
+
+class SubsetSumEngine:
+    """
+    Dispatches Subset Sum problems to a solver backend chosen per tier.
+
+    tier_resolver maps a problem size to a tier key (e.g. ProblemTier value);
+    tier_backends maps that key to a backend name. Problems the bitset
+    backends cannot represent fall back automatically.
+    """
+
+    def __init__(self, default_backend: str = 'bitset',
+                 tier_backends: Optional[Dict[str, str]] = None,
+                 tier_resolver: Optional[Callable[[int], Optional[str]]] = None):
+        self._check_backend(default_backend)
+        self.default_backend = default_backend
+        self.tier_backends: Dict[str, str] = {}
+        self.tier_resolver = tier_resolver
+        for tier, backend in (tier_backends or {}).items():
+            self.set_tier_backend(tier, backend)
+
+    @staticmethod
+    def _check_backend(name: str):
+        if name not in SUBSET_SUM_BACKENDS:
+            raise ValueError(f"Unknown subset sum backend: {name}")
+
+    def set_tier_backend(self, tier: str, backend: str):
+        """Select the backend used for problems of the given tier."""
+        self._check_backend(backend)
+        self.tier_backends[getattr(tier, 'value', tier)] = backend
+
+    def backend_for(self, problem: dict, tier: Optional[str] = None) -> str:
+        """Return the backend name that will solve this problem."""
+        numbers = problem['numbers']
+        target = problem['target']
+
+        # Bitsets only model non-negative sums
+        if any(num < 0 for num in numbers):
+            return 'reference'
+        if target > BITSET_MAX_TARGET:
+            return 'mitm' if len(numbers) <= MITM_MAX_ELEMENTS else 'reference'
+
+        if tier is None and self.tier_resolver is not None:
+            tier = self.tier_resolver(problem.get('size', len(numbers)))
+        return self.tier_backends.get(getattr(tier, 'value', tier), self.default_backend)
+
+    def solve(self, problem: dict, tier: Optional[str] = None) -> List[int]:
+        backend = self.backend_for(problem, tier)
+        return SUBSET_SUM_BACKENDS[backend](problem['numbers'], problem['target'])
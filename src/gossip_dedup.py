@@ -0,0 +1,257 @@
+"""
+Module: gossip_dedup
+
+Bounded, time-expiring "have I seen this?" caches for gossip.
+
+Two backends with the same interface:
+    LRUDedupCache       exact; OrderedDict of key -> expiry, bounded by
+                        capacity and TTL (memory ~ capacity entries);
+                        duplicates refresh their entry
+    RotatingBloomFilter approximate; two Bloom filter generations rotated
+                        every TTL/2 or when the active one is full (memory
+                        fixed by capacity and false-positive rate)
+
+GossipDedup wraps one cache shared by header, reveal and CID gossip; keys
+are namespaced per kind and hits/misses are counted per kind.
+"""
+
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+
+DEFAULT_DEDUP_CAPACITY = 100_000
+DEFAULT_DEDUP_TTL = 900.0  # seconds
+DEFAULT_FALSE_POSITIVE_RATE = 0.001
+
+
+@dataclass
+class DedupConfig:
+    """Gossip dedup configuration."""
+    backend: str = "lru"  # "lru" or "bloom"
+    capacity: int = DEFAULT_DEDUP_CAPACITY
+    ttl: float = DEFAULT_DEDUP_TTL
+    false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE  # bloom only
+
+
+class LRUDedupCache:
+    """
+    Exact dedup cache bounded by capacity and TTL.
+
+    Entries are kept in last-seen order, which is also expiry order (fixed
+    TTL from the last sighting), so both expiry and eviction pop from the
+    front. Re-adding or touching a key moves it to the back with a new expiry.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_DEDUP_CAPACITY, ttl: float = DEFAULT_DEDUP_TTL):
+        self.capacity = capacity
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def contains(self, key: str, now: float) -> bool:
+        expiry = self._entries.get(key)
+        return expiry is not None and expiry > now
+
+    def add(self, key: str, now: float):
+        # Also revives an expired entry the cleanup loop has not dropped yet
+        self._entries[key] = now + self.ttl
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def touch(self, key: str, now: float):
+        """Mark a seen key as recently used."""
+        self.add(key, now)
+
+    def expire(self, now: float) -> int:
+        """Drop expired entries; returns how many were removed."""
+        removed = 0
+        while self._entries:
+            key, expiry = next(iter(self._entries.items()))
+            if expiry > now:
+                break
+            del self._entries[key]
+            removed += 1
+        self.expirations += removed
+        return removed
+
+    def memory_bytes(self) -> int:
+        # Rough: dict slot + key string + float per entry
+        return len(self._entries) * 120
+
+
+class _BloomGeneration:
+    def __init__(self, num_bits: int, num_hashes: int):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bytearray((num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def contains(self, key: str) -> bool:
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+    def add(self, key: str):
+        bits = self.bits
+        for p in self._positions(key):
+            bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+
+class RotatingBloomFilter:
+    """
+    Approximate dedup with fixed memory.
+
+    Keys are added to the active generation and looked up in both. The
+    active generation becomes the previous one every TTL/2 or when it holds
+    capacity/2 keys, so a key is remembered for at least TTL/2 (and at most
+    TTL) and each generation stays within its sized false-positive rate.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_DEDUP_CAPACITY, ttl: float = DEFAULT_DEDUP_TTL,
+                 false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE):
+        self.capacity = capacity
+        self.ttl = ttl
+        self.false_positive_rate = false_positive_rate
+        self._generation_capacity = max(1, capacity // 2)
+        # Standard sizing: m = -n ln p / (ln 2)^2, k = m/n ln 2
+        self.num_bits = max(8, int(math.ceil(
+            -self._generation_capacity * math.log(false_positive_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / self._generation_capacity * math.log(2))))
+        self._active = _BloomGeneration(self.num_bits, self.num_hashes)
+        self._previous = _BloomGeneration(self.num_bits, self.num_hashes)
+        self._rotated_at: Optional[float] = None
+        self._last_add: Optional[float] = None
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return self._active.count + self._previous.count
+
+    def contains(self, key: str, now: float) -> bool:
+        return self._active.contains(key) or self._previous.contains(key)
+
+    def add(self, key: str, now: float):
+        if self._rotated_at is None:
+            self._rotated_at = now
+        if self._active.count >= self._generation_capacity:
+            # Full before its time: dropping the previous generation evicts it
+            self.evictions += self._previous.count
+            self._rotate(now)
+        self._active.add(key)
+        self._last_add = now
+
+    def touch(self, key: str, now: float):
+        # Generations cannot move single keys; a hit keeps its generation
+        pass
+
+    def expire(self, now: float) -> int:
+        if self._rotated_at is None or now - self._rotated_at < self.ttl / 2:
+            return 0
+        removed = self._previous.count
+        if now - self._last_add >= self.ttl:
+            # Nothing added for a whole TTL: the active generation is stale too
+            removed += self._active.count
+            self._active = _BloomGeneration(self.num_bits, self.num_hashes)
+        self._rotate(now)
+        self.expirations += removed
+        return removed
+
+    def _rotate(self, now: float):
+        self._previous = self._active
+        self._active = _BloomGeneration(self.num_bits, self.num_hashes)
+        self._rotated_at = now
+
+    def memory_bytes(self) -> int:
+        return 2 * len(self._active.bits)
+
+
+class GossipDedup:
+    """
+    Shared gossip dedup with per-kind hit/miss counters.
+
+    Usage:
+        if dedup.check_and_add("header", block_hash):
+            return  # duplicate
+    """
+
+    def __init__(self, config: Optional[DedupConfig] = None):
+        self.config = config or DedupConfig()
+        if self.config.backend == "bloom":
+            self.cache = RotatingBloomFilter(self.config.capacity, self.config.ttl,
+                                             self.config.false_positive_rate)
+        elif self.config.backend == "lru":
+            self.cache = LRUDedupCache(self.config.capacity, self.config.ttl)
+        else:
+            raise ValueError(f"Unknown dedup backend: {self.config.backend}")
+        self.hits: Dict[str, int] = defaultdict(int)
+        self.misses: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.cache)
+
+    def seen(self, kind: str, key: str, now: Optional[float] = None) -> bool:
+        """True if key was seen for this kind (does not record it)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            return self.cache.contains(f"{kind}:{key}", now)
+
+    def check_and_add(self, kind: str, key: str, now: Optional[float] = None) -> bool:
+        """
+        Record a key, reporting whether it was already seen.
+
+        Args:
+            kind: Gossip kind ("header", "reveal", "cid")
+            key: Dedup key within the kind
+            now: Current time (defaults to time.time())
+
+        Returns:
+            True if the key is a duplicate
+        """
+        now = time.time() if now is None else now
+        namespaced = f"{kind}:{key}"
+        with self._lock:
+            if self.cache.contains(namespaced, now):
+                self.hits[kind] += 1
+                self.cache.touch(namespaced, now)
+                return True
+            self.misses[kind] += 1
+            self.cache.add(namespaced, now)
+            return False
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Drop expired entries (called from the network cleanup loop)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            return self.cache.expire(now)
+
+    def get_stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "backend": self.config.backend,
+                "entries": len(self.cache),
+                "capacity": self.config.capacity,
+                "memory_bytes": self.cache.memory_bytes(),
+                "hits": dict(self.hits),
+                "misses": dict(self.misses),
+                "evictions": self.cache.evictions,
+                "expirations": self.cache.expirations,
+            }
@@ -0,0 +1,650 @@
+"""
+Module: header_sync
+
+Headers-first block synchronisation from several HTTP peers.
+
+    1. headers   header ranges (height, block_hash, previous_hash,
+                 cumulative work) are downloaded and linked into one chain
+                 from the local tip before any block body is requested
+    2. bodies    bodies, and optionally proof bundles, are fetched in
+                 parallel over a sliding window of heights, spread across
+                 the best-scoring peers; each body must match its header
+    3. apply     bodies are handed to the caller in height order as the
+                 front of the window completes, so the window only moves
+                 as fast as the chain can be applied
+
+Peers are scored on latency and outcome. A failed request backs the peer
+off exponentially and retries the height elsewhere; repeated failures, or
+any data that contradicts the validated header chain, ban the peer for
+ban_seconds.
+
+Peer access goes through a client object (HttpPeerClient by default) so the
+engine can be driven by other transports and by tests.
+"""
+
+import logging
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import requests
+except ImportError:  # Only HttpPeerClient needs it
+    requests = None
+
+logger = logging.getLogger('coinjecture-header-sync')
+
+DEFAULT_HEADER_BATCH = 500
+DEFAULT_WINDOW = 512  # heights between the next block to apply and the furthest request
+DEFAULT_WORKERS = 16
+DEFAULT_PER_PEER_IN_FLIGHT = 8
+DEFAULT_MAX_ATTEMPTS = 8  # per height, across peers
+DEFAULT_MAX_FAILURES = 5  # consecutive failures before a ban
+DEFAULT_BAN_SECONDS = 600.0
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_MAX = 30.0
+
+
+class PeerError(Exception):
+    """A peer request failed (transport error or malformed response)."""
+
+
+def block_height(block: Dict[str, Any]) -> Optional[int]:
+    """Height of a block or header dict ('index' in block bodies, 'height' in headers)."""
+    height = block.get('index', block.get('height'))
+    return int(height) if height is not None else None
+
+
+def block_work(block: Dict[str, Any]) -> Optional[float]:
+    work = block.get('cumulative_work', block.get('cumulative_work_score'))
+    return float(work) if work is not None else None
+
+
+def header_from_block(block: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a block body to the header fields the sync validates."""
+    return {
+        'height': block_height(block),
+        'block_hash': block.get('block_hash'),
+        'previous_hash': block.get('previous_hash'),
+        'cumulative_work': block_work(block),
+        'timestamp': block.get('timestamp'),
+    }
+
+
+def check_header_link(parent: Optional[Dict[str, Any]], header: Dict[str, Any]) -> Optional[str]:
+    """
+    Check that header extends parent.
+
+    Args:
+        parent: Previous header, or None when header is the first one synced
+        header: Header to check
+
+    Returns:
+        None if the link is valid, otherwise the reason it is not
+    """
+    if not header.get('block_hash') or block_height(header) is None:
+        return "header is missing block_hash or height"
+    if parent is None:
+        return None
+    if block_height(header) != block_height(parent) + 1:
+        return f"height {block_height(header)} does not follow {block_height(parent)}"
+    if header.get('previous_hash') != parent.get('block_hash'):
+        return f"header {block_height(header)} does not link to its parent"
+    work, parent_work = block_work(header), block_work(parent)
+    if work is not None and parent_work is not None and work < parent_work:
+        return f"cumulative work decreases at height {block_height(header)}"
+    return None
+
+
+def body_matches_header(block: Dict[str, Any], header: Dict[str, Any]) -> bool:
+    """True if a downloaded body is the block the header chain committed to."""
+    return (
+        block_height(block) == block_height(header)
+        and block.get('block_hash') == header['block_hash']
+        and block.get('previous_hash') == header.get('previous_hash')
+    )
+
+
+class PeerScore:
+    """Running reputation of one peer."""
+
+    __slots__ = ("address", "score", "latency", "successes", "failures",
+                 "consecutive_failures", "backoff_until", "banned_until", "ban_reason")
+
+    def __init__(self, address: str):
+        self.address = address
+        self.score = 0.0
+        self.latency: Optional[float] = None  # EWMA seconds per request
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.backoff_until = 0.0
+        self.banned_until = 0.0
+        self.ban_reason: Optional[str] = None
+
+    def sort_key(self) -> Tuple[float, float]:
+        return (-self.score, self.latency if self.latency is not None else 1.0)
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        return {
+            'address': self.address,
+            'score': round(self.score, 3),
+            'latency': self.latency,
+            'successes': self.successes,
+            'failures': self.failures,
+            'banned': self.banned_until > now,
+            'ban_reason': self.ban_reason,
+        }
+
+
+class PeerSet:
+    """
+    Peers available to a sync, ranked by score then latency.
+
+    Not thread-safe: the sync engine updates scores from its scheduling
+    thread only, as fetches complete.
+    """
+
+    def __init__(
+        self,
+        peers: Iterable[str] = (),
+        max_failures: int = DEFAULT_MAX_FAILURES,
+        ban_seconds: float = DEFAULT_BAN_SECONDS,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_failures = max_failures
+        self.ban_seconds = ban_seconds
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._clock = clock
+        self._peers: Dict[str, PeerScore] = {}
+        for peer in peers:
+            self.add(peer)
+
+    def add(self, address: str) -> PeerScore:
+        if address not in self._peers:
+            self._peers[address] = PeerScore(address)
+        return self._peers[address]
+
+    def remove(self, address: str):
+        """Forget a peer and its score (no-op if unknown)."""
+        self._peers.pop(address, None)
+
+    def __contains__(self, address: str) -> bool:
+        return address in self._peers
+
+    def __iter__(self):
+        return iter(list(self._peers))
+
+    def __len__(self) -> int:
+        return len(self._peers)
+
+    def get(self, address: str) -> Optional[PeerScore]:
+        return self._peers.get(address)
+
+    # ---- outcomes ----
+
+    def record_success(self, address: str, latency: float):
+        peer = self.add(address)
+        peer.successes += 1
+        peer.consecutive_failures = 0
+        peer.backoff_until = 0.0
+        peer.score = min(peer.score + 1.0, 100.0)
+        peer.latency = latency if peer.latency is None else 0.8 * peer.latency + 0.2 * latency
+
+    def record_failure(self, address: str, reason: str = "request failed"):
+        """Back the peer off; ban it after max_failures in a row."""
+        peer = self.add(address)
+        peer.failures += 1
+        peer.consecutive_failures += 1
+        peer.score -= 5.0
+        delay = min(self.backoff_base * 2 ** (peer.consecutive_failures - 1), self.backoff_max)
+        peer.backoff_until = self._clock() + delay
+        if peer.consecutive_failures >= self.max_failures:
+            self.ban(address, f"{peer.consecutive_failures} consecutive failures ({reason})")
+
+    def ban(self, address: str, reason: str):
+        peer = self.add(address)
+        peer.banned_until = self._clock() + self.ban_seconds
+        peer.ban_reason = reason
+        peer.score = min(peer.score, -100.0)
+        logger.warning(f"Banned peer {address} for {self.ban_seconds:.0f}s: {reason}")
+
+    # ---- selection ----
+
+    def is_banned(self, address: str) -> bool:
+        peer = self._peers.get(address)
+        return peer is not None and peer.banned_until > self._clock()
+
+    def usable(self) -> List[str]:
+        """Peers that are not banned (they may be backing off), best first."""
+        now = self._clock()
+        peers = [p for p in self._peers.values() if p.banned_until <= now]
+        return [p.address for p in sorted(peers, key=PeerScore.sort_key)]
+
+    def available(self, exclude: Iterable[str] = ()) -> List[str]:
+        """Peers that can take a request now, best first."""
+        now = self._clock()
+        excluded = set(exclude)
+        peers = [
+            p for p in self._peers.values()
+            if p.address not in excluded and p.banned_until <= now and p.backoff_until <= now
+        ]
+        return [p.address for p in sorted(peers, key=PeerScore.sort_key)]
+
+    def next_available_in(self, exclude: Iterable[str] = ()) -> Optional[float]:
+        """Seconds until some non-banned peer leaves backoff (None if all are banned)."""
+        now = self._clock()
+        excluded = set(exclude)
+        waits = [
+            max(p.backoff_until - now, 0.0) for p in self._peers.values()
+            if p.address not in excluded and p.banned_until <= now
+        ]
+        return min(waits) if waits else None
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        now = self._clock()
+        return [peer.to_dict(now) for peer in sorted(self._peers.values(), key=PeerScore.sort_key)]
+
+
+class HttpPeerClient:
+    """
+    Peer access over the node HTTP API, with one pooled session per client.
+
+    Uses GET /v1/data/headers for header ranges; peers without that
+    endpoint fall back to deriving headers from /v1/data/block/<height>.
+    """
+
+    def __init__(self, timeout: float = 10.0, pool_size: int = DEFAULT_WORKERS):
+        if requests is None:
+            raise ImportError("HttpPeerClient requires the requests package")
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._no_header_endpoint: Set[str] = set()
+
+    @staticmethod
+    def peer_url(peer: str, path: str) -> str:
+        base = peer if peer.startswith('http') else f"http://{peer}"
+        return f"{base.rstrip('/')}{path}"
+
+    def _get(self, peer: str, path: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """GET a JSON payload; None on 404, PeerError on anything else unexpected."""
+        try:
+            response = self.session.get(self.peer_url(peer, path), params=params, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise PeerError(f"{peer}{path}: {e}") from e
+        if response.status_code == 404:
+            return None
+        if response.status_code != 200:
+            raise PeerError(f"{peer}{path}: HTTP {response.status_code}")
+        try:
+            return response.json()
+        except ValueError as e:
+            raise PeerError(f"{peer}{path}: invalid JSON") from e
+
+    def get_tip_height(self, peer: str) -> int:
+        payload = self._get(peer, '/v1/data/block/latest')
+        if not payload or payload.get('status') != 'success':
+            raise PeerError(f"{peer}: no latest block")
+        return block_height(payload['data']) or 0
+
+    def get_headers(self, peer: str, start: int, count: int) -> List[Dict[str, Any]]:
+        if peer not in self._no_header_endpoint:
+            payload = self._get(peer, '/v1/data/headers', {'start': start, 'limit': count})
+            if payload is not None:
+                if payload.get('status') != 'success':
+                    raise PeerError(f"{peer}: header request failed")
+                return payload['data']['headers']
+            logger.info(f"{peer} has no header endpoint, deriving headers from blocks")
+            self._no_header_endpoint.add(peer)
+
+        headers = []
+        for height in range(start, start + count):
+            block = self.get_block(peer, height)
+            if block is None:
+                break
+            headers.append(header_from_block(block))
+        return headers
+
+    def get_block(self, peer: str, height: int) -> Optional[Dict[str, Any]]:
+        payload = self._get(peer, f'/v1/data/block/{height}')
+        if payload is None:
+            return None
+        if payload.get('status') != 'success':
+            raise PeerError(f"{peer}: block {height} request failed")
+        return payload['data']
+
+    def get_proof(self, peer: str, height: int) -> Optional[Any]:
+        payload = self._get(peer, f'/v1/data/proof/block/{height}')
+        if payload is None or payload.get('status') != 'success':
+            return None  # Block has no proof bundle
+        return payload.get('data')
+
+
+class HeadersFirstSync:
+    """
+    Catch a node up from a set of peers.
+
+    Usage:
+        sync = HeadersFirstSync(HttpPeerClient(), PeerSet(peers),
+                                apply_block=lambda block, proof: store(block))
+        result = sync.sync(start_height=local_height + 1, parent_header=local_tip)
+    """
+
+    def __init__(
+        self,
+        client,
+        peers: PeerSet,
+        apply_block: Callable[[Dict[str, Any], Optional[Any]], bool],
+        window: int = DEFAULT_WINDOW,
+        workers: int = DEFAULT_WORKERS,
+        per_peer_in_flight: int = DEFAULT_PER_PEER_IN_FLIGHT,
+        header_batch: int = DEFAULT_HEADER_BATCH,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        fetch_proofs: bool = False
+    ):
+        """
+        Args:
+            client: Peer access (get_tip_height, get_headers, get_block, get_proof)
+            peers: Peers to sync from; scores and bans persist across syncs
+            apply_block: Called with (block, proof) in height order; returning
+                False stops the sync at that block
+            window: Max heights ahead of the next block to apply that may be
+                requested or buffered
+            workers: Concurrent body downloads
+            per_peer_in_flight: Concurrent body downloads per peer
+            header_batch: Headers per request
+            max_attempts: Tries per height before the sync gives up
+            fetch_proofs: Also download each block's proof bundle
+        """
+        self.client = client
+        self.peers = peers
+        self.apply_block = apply_block
+        self.window = window
+        self.workers = workers
+        self.per_peer_in_flight = per_peer_in_flight
+        self.header_batch = header_batch
+        self.max_attempts = max_attempts
+        self.fetch_proofs = fetch_proofs
+        self.tip_header: Optional[Dict[str, Any]] = None  # Last header applied
+        self.stats: Dict[str, int] = defaultdict(int)
+
+    # ---- entry point ----
+
+    def sync(
+        self,
+        start_height: int,
+        parent_header: Optional[Dict[str, Any]] = None,
+        target_height: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Download and apply blocks from start_height to the network tip.
+
+        Args:
+            start_height: First height to fetch
+            parent_header: Local header at start_height - 1; defaults to the
+                last header this engine applied when that is the parent,
+                otherwise the first downloaded header is trusted as the anchor
+            target_height: Stop here instead of at the best peer's tip
+
+        Returns:
+            Dict with applied count, last applied height and whether the
+            target was reached
+        """
+        started = time.monotonic()
+        if parent_header is None and self.tip_header is not None \
+                and block_height(self.tip_header) == start_height - 1:
+            parent_header = self.tip_header
+        result: Dict[str, Any] = {
+            'start_height': start_height,
+            'target_height': None,
+            'headers': 0,
+            'applied': 0,
+            'height': start_height - 1,
+            'complete': False,
+            'error': None,
+        }
+
+        tip = self.discover_tip()
+        if tip < 0:
+            result['error'] = 'no peer reported a chain tip'
+            return result
+        if target_height is not None:
+            tip = min(tip, target_height)
+        result['target_height'] = tip
+        if tip < start_height:
+            result['complete'] = True
+            return result
+
+        headers = self.download_headers(start_height, tip, parent_header)
+        result['headers'] = len(headers)
+        if not headers:
+            result['error'] = 'no valid headers downloaded'
+            return result
+
+        applied, error = self.download_bodies(headers)
+        result['applied'] = applied
+        result['height'] = start_height + applied - 1
+        result['error'] = error
+        result['complete'] = error is None and result['height'] >= tip
+        result['seconds'] = round(time.monotonic() - started, 3)
+        result['peers'] = self.peers.get_stats()
+        logger.info(f"Sync applied {applied} blocks to height {result['height']} "
+                    f"(target {tip}) in {result['seconds']}s")
+        return result
+
+    # ---- phase 0: tip ----
+
+    def discover_tip(self) -> int:
+        """Highest tip any usable peer reports (-1 if none answer)."""
+        peers = self.peers.usable()
+        if not peers:
+            return -1
+        best = -1
+        with ThreadPoolExecutor(max_workers=min(len(peers), self.workers)) as executor:
+            futures = {executor.submit(self._timed, self.client.get_tip_height, peer): peer for peer in peers}
+            for future, peer in futures.items():
+                try:
+                    height, latency = future.result()
+                except Exception as e:
+                    self.peers.record_failure(peer, f"tip: {e}")
+                    continue
+                self.peers.record_success(peer, latency)
+                best = max(best, height)
+        return best
+
+    # ---- phase 1: headers ----
+
+    def download_headers(
+        self,
+        start_height: int,
+        tip: int,
+        parent_header: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch and link headers start_height..tip.
+
+        A peer whose headers do not link is banned and its batch dropped
+        from the first bad header on. Stops early if no peer can extend the
+        chain.
+
+        Returns:
+            Validated headers, contiguous from start_height
+        """
+        headers: List[Dict[str, Any]] = []
+        parent = parent_header
+        height = start_height
+        tried: Set[str] = set()
+
+        while height <= tip:
+            available = self.peers.available(exclude=tried)
+            if not available:
+                wait_for = self.peers.next_available_in(exclude=tried)
+                if wait_for is None:
+                    break  # Every usable peer has been asked for this range
+                time.sleep(wait_for)
+                continue
+
+            peer = available[0]
+            count = min(self.header_batch, tip - height + 1)
+            try:
+                batch, latency = self._timed(self.client.get_headers, peer, height, count)
+            except Exception as e:
+                self.peers.record_failure(peer, f"headers: {e}")
+                tried.add(peer)
+                continue
+
+            accepted = 0
+            for header in batch[:count]:
+                error = check_header_link(parent, header)
+                if error is None and parent is None and block_height(header) != height:
+                    error = f"expected height {height}, got {block_height(header)}"
+                if error is not None:
+                    self.peers.ban(peer, f"invalid header chain: {error}")
+                    break
+                headers.append(header)
+                parent = header
+                accepted += 1
+
+            if accepted:
+                self.peers.record_success(peer, latency)
+                self.stats['headers'] += accepted
+                height += accepted
+                tried.clear()
+            else:
+                tried.add(peer)  # Has nothing past our chain (or was just banned)
+
+        return headers
+
+    # ---- phase 2: bodies ----
+
+    def download_bodies(self, headers: List[Dict[str, Any]]) -> Tuple[int, Optional[str]]:
+        """
+        Fetch bodies for headers in parallel and apply them in order.
+
+        Returns:
+            (blocks applied, error or None)
+        """
+        if not headers:
+            return 0, None
+        first = block_height(headers[0])
+        last_offset = len(headers) - 1
+
+        fresh = deque(range(len(headers)))  # offsets not requested yet
+        retries: deque = deque()
+        attempts: Dict[int, int] = defaultdict(int)
+        tried: Dict[int, Set[str]] = defaultdict(set)
+        ready: Dict[int, Tuple[Dict[str, Any], Any]] = {}
+        in_flight: Dict[Any, Tuple[int, str]] = {}
+        load: Dict[str, int] = defaultdict(int)
+        next_apply = 0
+        error: Optional[str] = None
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while next_apply <= last_offset and error is None:
+                # Schedule: retries first, then new heights inside the window
+                while len(in_flight) < self.workers:
+                    if retries:
+                        source = retries
+                    elif fresh and fresh[0] < next_apply + self.window:
+                        source = fresh
+                    else:
+                        break
+                    offset = source[0]
+                    peer = self._pick_peer(tried[offset], load)
+                    if peer is None:
+                        break
+                    source.popleft()
+                    attempts[offset] += 1
+                    tried[offset].add(peer)
+                    load[peer] += 1
+                    future = executor.submit(self._fetch_body, peer, first + offset)
+                    in_flight[future] = (offset, peer)
+
+                if not in_flight:
+                    wait_for = self.peers.next_available_in()
+                    if wait_for is None:
+                        error = 'all peers banned'
+                        break
+                    time.sleep(max(wait_for, 0.01))
+                    continue
+
+                done, _ = wait(list(in_flight), timeout=1.0, return_when=FIRST_COMPLETED)
+                for future in done:
+                    offset, peer = in_flight.pop(future)
+                    load[peer] -= 1
+                    header = headers[offset]
+                    try:
+                        block, proof, latency = future.result()
+                    except Exception as e:
+                        block, proof, latency = None, None, None
+                        self.peers.record_failure(peer, f"block {first + offset}: {e}")
+                    else:
+                        if block is None:
+                            self.peers.record_failure(peer, f"block {first + offset} missing")
+                        elif not body_matches_header(block, header):
+                            self.peers.ban(peer, f"block {first + offset} does not match its header")
+                            self.stats['mismatched_bodies'] += 1
+                            block = None
+                        else:
+                            self.peers.record_success(peer, latency)
+
+                    if block is not None:
+                        ready[offset] = (block, proof)
+                        self.stats['bodies'] += 1
+                    elif attempts[offset] >= self.max_attempts:
+                        error = f"block {first + offset} unavailable after {attempts[offset]} attempts"
+                    else:
+                        self.stats['retries'] += 1
+                        retries.append(offset)
+
+                # Apply the completed front of the window
+                while next_apply in ready and error is None:
+                    block, proof = ready.pop(next_apply)
+                    if not self.apply_block(block, proof):
+                        error = f"block {first + next_apply} rejected"
+                        break
+                    self.tip_header = headers[next_apply]
+                    next_apply += 1
+
+            for future in in_flight:
+                future.cancel()
+
+        self.stats['applied'] += next_apply
+        return next_apply, error
+
+    def _pick_peer(self, tried: Set[str], load: Dict[str, int]) -> Optional[str]:
+        """Best available peer with spare capacity, preferring ones not yet tried for this height."""
+        candidates = [p for p in self.peers.available() if load[p] < self.per_peer_in_flight]
+        if not candidates:
+            return None
+        untried = [p for p in candidates if p not in tried]
+        pool = untried or candidates
+        # Spread load: least busy among the top few by score
+        top = pool[:max(3, len(pool) // 2)]
+        return min(top, key=lambda p: load[p])
+
+    def _fetch_body(self, peer: str, height: int) -> Tuple[Optional[Dict[str, Any]], Any, float]:
+        started = time.monotonic()
+        block = self.client.get_block(peer, height)
+        proof = None
+        if block is not None and self.fetch_proofs:
+            proof = self.client.get_proof(peer, height)
+        return block, proof, time.monotonic() - started
+
+    @staticmethod
+    def _timed(fn, *args):
+        started = time.monotonic()
+        value = fn(*args)
+        return value, time.monotonic() - started
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats['peers'] = self.peers.get_stats()
+        return stats
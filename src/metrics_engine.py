@@ -7,7 +7,7 @@ Implements comprehensive metrics calculation with Satoshi Constant for critical
 import time
 import math
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, Optional
 from dataclasses import dataclass
 
 logger = logging.getLogger('coinjecture-metrics')
@@ -160,6 +160,40 @@ class MetricsEngine:
             logger.error(f"❌ Error calculating block reward: {e}")
             return 0.01
     
+    def calculate_block_rewards(self, work_scores: Iterable[float], network_state: NetworkState,
+                                start_cumulative_work: float = 0.0) -> List[float]:
+        """
+        Block rewards for a run of consecutive blocks.
+
+        Same formula as calculate_block_reward(), with each block's deflation
+        taken from the cumulative work before it, but without per-block
+        logging - for recalculating a whole chain.
+
+        Args:
+            work_scores: Work scores in height order
+            network_state: Supplies network_avg_work and damping_ratio
+            start_cumulative_work: Cumulative work before the first block
+
+        Returns:
+            One reward per work score
+        """
+        avg_work = network_state.network_avg_work
+        damping = network_state.damping_ratio
+        log, log2 = math.log, math.log2
+        cumulative_work = start_cumulative_work
+        rewards = []
+        for work_score in work_scores:
+            try:
+                if cumulative_work <= 0:
+                    deflation_factor = 1.0
+                else:
+                    deflation_factor = max(0.1, min(1.0, 1.0 / (2 ** (log2(cumulative_work) / 10))))
+                rewards.append(max(log(1 + work_score / avg_work) * deflation_factor * damping, 0.01))
+            except Exception:
+                rewards.append(0.01)
+            cumulative_work += work_score
+        return rewards
+    
     def get_deflation_factor(self, cumulative_work: float) -> float:
         """
         Calculate deflation factor based on cumulative work:
@@ -0,0 +1,257 @@
+"""
+Module: mining_pool
+
+Multi-core mining engine. Keeps a pool of worker processes busy generating
+and solving problems for the current tip across one or more capacity tiers,
+drops work that went stale when the tip moved, and hands finished
+(problem, solution, timings) results back to the block assembler.
+"""
+
+import itertools
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    from .core.blockchain import (
+        PROBLEM_REGISTRY, ProblemTier, ProblemType, get_memory_usage
+    )
+except ImportError:
+    from core.blockchain import (
+        PROBLEM_REGISTRY, ProblemTier, ProblemType, get_memory_usage
+    )
+
+logger = logging.getLogger('coinjecture-mining-pool')
+
+
+@dataclass
+class MiningJob:
+    """A unit of mining work bound to a parent block."""
+    job_id: int
+    epoch: int
+    parent_hash: str
+    parent_index: int
+    tier: str
+    problem_type: str
+    seed: str
+
+
+@dataclass
+class MiningResult:
+    """A solved and verified problem, ready for block assembly."""
+    job: MiningJob
+    problem: Dict[str, Any]
+    solution: Any
+    solve_time: float
+    verify_time: float
+    solve_memory: int
+    verify_memory: int
+    valid: bool
+    worker_pid: int = 0
+    completed_at: float = field(default_factory=time.time)
+
+
+def solve_mining_job(job: MiningJob) -> MiningResult:
+    """Generate, solve and verify one problem. Runs inside a worker process."""
+    tier = ProblemTier(job.tier)
+    problem = PROBLEM_REGISTRY.generate(ProblemType(job.problem_type), seed=job.seed, tier=tier)
+
+    start_time = time.time()
+    start_memory = get_memory_usage()
+    solution = PROBLEM_REGISTRY.solve(problem)
+    solve_time = time.time() - start_time
+    solve_memory = get_memory_usage() - start_memory
+
+    verify_start = time.time()
+    verify_start_mem = get_memory_usage()
+    valid = PROBLEM_REGISTRY.verify(problem, solution)
+    verify_time = time.time() - verify_start
+    verify_memory = get_memory_usage() - verify_start_mem
+
+    return MiningResult(
+        job=job,
+        problem=problem,
+        solution=solution,
+        solve_time=solve_time,
+        verify_time=verify_time,
+        solve_memory=solve_memory,
+        verify_memory=verify_memory,
+        valid=valid,
+        worker_pid=os.getpid()
+    )
+
+
+class MiningPool:
+    """
+    Process-pool mining engine.
+
+    Each worker slot always has work queued (jobs_per_worker jobs in flight
+    per worker), rotating across the configured tiers. Calling update_tip()
+    starts a new epoch: queued jobs for the old parent are cancelled and any
+    results that still arrive for it are discarded as stale.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        tiers: Optional[List[ProblemTier]] = None,
+        problem_type: ProblemType = ProblemType.SUBSET_SUM,
+        jobs_per_worker: int = 2,
+        executor_factory: Optional[Callable[[int], Executor]] = None
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.tiers = list(tiers or [ProblemTier.TIER_3_WORKSTATION])
+        self.problem_type = problem_type
+        self.max_in_flight = self.workers * max(1, jobs_per_worker)
+        self._executor_factory = executor_factory or (lambda n: ProcessPoolExecutor(max_workers=n))
+
+        self._executor: Optional[Executor] = None
+        # Re-entrant: done-callbacks may fire synchronously inside _fill()
+        self._lock = threading.RLock()
+        self._results: "queue.Queue[MiningResult]" = queue.Queue()
+        self._in_flight: Dict[Future, MiningJob] = {}
+        self._job_ids = itertools.count(1)
+        self._tier_cycle = itertools.cycle(self.tiers)
+
+        self._epoch = 0
+        self._parent_hash: Optional[str] = None
+        self._parent_index = -1
+        self._running = False
+
+        self.stats = {
+            'jobs_submitted': 0,
+            'results_delivered': 0,
+            'stale_discarded': 0,
+            'jobs_cancelled': 0,
+            'invalid_solutions': 0,
+            'worker_errors': 0,
+        }
+
+    @property
+    def epoch(self) -> int:
+        return self._epoch
+
+    def start(self, parent_hash: str, parent_index: int) -> None:
+        """Start the workers mining on top of the given parent."""
+        with self._lock:
+            if self._running:
+                return
+            self._executor = self._executor_factory(self.workers)
+            self._running = True
+        logger.info(f"Mining pool started with {self.workers} workers on tiers "
+                    f"{[t.value for t in self.tiers]}")
+        self.update_tip(parent_hash, parent_index)
+
+    def stop(self) -> None:
+        """Cancel outstanding work and shut the workers down."""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            self._cancel_in_flight()
+            executor, self._executor = self._executor, None
+        executor.shutdown(wait=False, cancel_futures=True)
+        logger.info("Mining pool stopped")
+
+    def update_tip(self, parent_hash: str, parent_index: int) -> None:
+        """Switch all workers to a new parent, dropping work for the old one."""
+        with self._lock:
+            if parent_hash == self._parent_hash:
+                return
+            self._epoch += 1
+            self._parent_hash = parent_hash
+            self._parent_index = parent_index
+            self._cancel_in_flight()
+            self._drain_stale_results()
+            self._fill()
+
+    def next_result(self, timeout: Optional[float] = None) -> Optional[MiningResult]:
+        """Block until a fresh result for the current tip is available."""
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.time())
+            try:
+                result = self._results.get(timeout=remaining)
+            except queue.Empty:
+                return None
+            with self._lock:
+                if result.job.epoch == self._epoch:
+                    self.stats['results_delivered'] += 1
+                    return result
+                self.stats['stale_discarded'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                'workers': self.workers,
+                'in_flight': len(self._in_flight),
+                'epoch': self._epoch,
+                'parent_hash': self._parent_hash,
+            }
+
+    # Internal helpers (callers hold self._lock)
+
+    def _cancel_in_flight(self) -> None:
+        for future in list(self._in_flight):
+            if future.cancel():
+                self.stats['jobs_cancelled'] += 1
+                self._in_flight.pop(future, None)
+
+    def _drain_stale_results(self) -> None:
+        kept = []
+        while True:
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if result.job.epoch == self._epoch:
+                kept.append(result)
+            else:
+                self.stats['stale_discarded'] += 1
+        for result in kept:
+            self._results.put(result)
+
+    def _fill(self) -> None:
+        if not self._running or self._executor is None or self._parent_hash is None:
+            return
+        while len(self._in_flight) < self.max_in_flight:
+            job_id = next(self._job_ids)
+            tier = next(self._tier_cycle)
+            job = MiningJob(
+                job_id=job_id,
+                epoch=self._epoch,
+                parent_hash=self._parent_hash,
+                parent_index=self._parent_index,
+                tier=tier.value,
+                problem_type=self.problem_type.value,
+                seed=f"{self._parent_hash}:{tier.value}:{job_id}"
+            )
+            future = self._executor.submit(solve_mining_job, job)
+            self._in_flight[future] = job
+            self.stats['jobs_submitted'] += 1
+            future.add_done_callback(self._on_done)
+
+    def _on_done(self, future: Future) -> None:
+        with self._lock:
+            job = self._in_flight.pop(future, None)
+            if job is None or future.cancelled():
+                return
+            error = future.exception()
+            if error is not None:
+                self.stats['worker_errors'] += 1
+                logger.error(f"Mining job {job.job_id} failed: {error}")
+            else:
+                result = future.result()
+                if not result.valid:
+                    self.stats['invalid_solutions'] += 1
+                elif job.epoch == self._epoch:
+                    self._results.put(result)
+                else:
+                    self.stats['stale_discarded'] += 1
+            self._fill()
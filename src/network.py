@@ -10,6 +10,7 @@ import json
 import time
 import hashlib
 import struct
+import zlib
 import asyncio
 import logging
 from dataclasses import dataclass, asdict, field
@@ -24,12 +25,20 @@ try:
     from .consensus import ConsensusEngine
     from .storage import StorageManager
     from .pow import ProblemRegistry
+    from .coinjecture.consensus.codec import HAS_MSGSPEC, msgspec
+    from .gossip_dedup import DedupConfig, GossipDedup
+    from .async_transport import AsyncTransport, PeerConnection
+    from .storage_codec import encode_block_json, encode_block_record, encode_header_json, encode_header_record
 except ImportError:
     # Fallback for direct execution
     from core.blockchain import Block, ProblemTier, ProblemType
     from consensus import ConsensusEngine
     from storage import StorageManager
     from pow import ProblemRegistry
+    from coinjecture.consensus.codec import HAS_MSGSPEC, msgspec
+    from gossip_dedup import DedupConfig, GossipDedup
+    from async_transport import AsyncTransport, PeerConnection
+    from storage_codec import encode_block_json, encode_block_record, encode_header_json, encode_header_record
 
 
 # Constants
@@ -38,6 +47,12 @@ DEFAULT_MAX_MESSAGE_SIZE = 1024 * 1024  # 1MB
 DEFAULT_RATE_LIMIT_PER_SECOND = 100
 DEFAULT_COMPRESSION_THRESHOLD = 1024  # 1KB
 DEFAULT_PEER_TIMEOUT = 30.0  # seconds
+DEFAULT_SEND_QUEUE_SIZE = 256  # frames buffered per peer before dropping gossip
+
+# Wire format versions (negotiated per peer; unknown peers get the oldest)
+WIRE_VERSION_JSON = 1    # JSON envelope around hex-encoded JSON payload
+WIRE_VERSION_BINARY = 2  # Length-prefixed binary frame, see WireCodec
+SUPPORTED_WIRE_VERSIONS = (WIRE_VERSION_JSON, WIRE_VERSION_BINARY)
 
 
 class MessageType(Enum):
@@ -46,6 +61,7 @@ class MessageType(Enum):
     REVEAL = "reveal"
     REQUEST = "request"
     RESPONSE = "response"
+    HELLO = "hello"
 
 
 class RequestKind(Enum):
@@ -186,6 +202,43 @@ class ResponseMsg:
         )
 
 
+@dataclass
+class HelloMsg:
+    """Connection handshake: the sender's identity and the wire versions it speaks."""
+    peer_id: str
+    wire_versions: List[int]
+    reply: bool = False  # True when answering a peer's hello
+    timestamp: float = field(default_factory=time.time)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": MessageType.HELLO.value,
+            "peer_id": self.peer_id,
+            "wire_versions": list(self.wire_versions),
+            "reply": self.reply,
+            "timestamp": self.timestamp
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'HelloMsg':
+        return cls(
+            peer_id=data["peer_id"],
+            wire_versions=list(data.get("wire_versions", [])),
+            reply=data.get("reply", False),
+            timestamp=data.get("timestamp", time.time())
+        )
+
+
+MESSAGE_CLASSES = {
+    MessageType.HEADER: HeaderMsg,
+    MessageType.REVEAL: RevealMsg,
+    MessageType.REQUEST: RequestMsg,
+    MessageType.RESPONSE: ResponseMsg,
+    MessageType.HELLO: HelloMsg,
+}
+MESSAGE_TYPE_OF = {cls: message_type for message_type, cls in MESSAGE_CLASSES.items()}
+
+
 class MessageCompressor:
     """Handles message compression and decompression."""
     
@@ -250,6 +303,141 @@ class MessageCompressor:
             raise ValueError(f"Unknown compression codec: {codec}")
 
 
+class WireCodec:
+    """
+    Binary frame codec (WIRE_VERSION_BINARY).
+    
+    Frame layout (little-endian):
+        magic     1 byte   0xC9 (legacy JSON envelopes always start with '{')
+        version   1 byte   WIRE_VERSION_BINARY
+        type      1 byte   1=header 2=reveal 3=request 4=response 5=hello
+        flags     1 byte   FLAG_* bits
+        length    4 bytes  payload length
+        checksum  4 bytes  CRC32 of the payload
+        payload   body, compressed when FLAG_ZSTD / FLAG_SNAPPY is set
+    
+    The body is a positional msgpack array of the message fields (msgspec,
+    FLAG_MSGPACK_BODY) or, without msgspec, the message's compact JSON dict.
+    """
+    
+    MAGIC = 0xC9
+    FLAG_MSGPACK_BODY = 0x01
+    FLAG_ZSTD = 0x02
+    FLAG_SNAPPY = 0x04
+    
+    _FRAME = struct.Struct('<BBBBII')
+    _TYPE_CODES = {MessageType.HEADER: 1, MessageType.REVEAL: 2, MessageType.REQUEST: 3, MessageType.RESPONSE: 4,
+                   MessageType.HELLO: 5}
+    _CODE_TYPES = {code: message_type for message_type, code in _TYPE_CODES.items()}
+    _REQUEST_KINDS = list(RequestKind)
+    _REQUEST_KIND_CODES = {kind: code for code, kind in enumerate(_REQUEST_KINDS)}
+    _CODEC_FLAGS = {CompressionCodec.ZSTD: FLAG_ZSTD, CompressionCodec.SNAPPY: FLAG_SNAPPY}
+    
+    def __init__(self, compressor: MessageCompressor):
+        self.compressor = compressor
+        if HAS_MSGSPEC:
+            self._encoder = msgspec.msgpack.Encoder()
+            self._decoder = msgspec.msgpack.Decoder()
+    
+    @classmethod
+    def is_frame(cls, data: bytes) -> bool:
+        """True if data starts like a binary frame (not a legacy JSON envelope)."""
+        return len(data) >= cls._FRAME.size and data[0] == cls.MAGIC
+    
+    def encode(self, message: Union['HeaderMsg', 'RevealMsg', 'RequestMsg', 'ResponseMsg']) -> bytes:
+        """Encode a message as a binary frame."""
+        message_type = MESSAGE_TYPE_OF[type(message)]
+        if HAS_MSGSPEC:
+            body = self._encoder.encode(self._to_fields(message))
+            flags = self.FLAG_MSGPACK_BODY
+        else:
+            body = json.dumps(message.to_dict(), separators=(',', ':')).encode('utf-8')
+            flags = 0
+        
+        payload, codec = self.compressor.compress(body)
+        flags |= self._CODEC_FLAGS.get(codec, 0)
+        
+        header = self._FRAME.pack(self.MAGIC, WIRE_VERSION_BINARY, self._TYPE_CODES[message_type],
+                                  flags, len(payload), zlib.crc32(payload))
+        return header + payload
+    
+    def decode(self, data: bytes) -> Union['HeaderMsg', 'RevealMsg', 'RequestMsg', 'ResponseMsg']:
+        """Decode a binary frame; raises ValueError on a malformed frame."""
+        if len(data) < self._FRAME.size:
+            raise ValueError("Truncated frame header")
+        magic, version, type_code, flags, length, checksum = self._FRAME.unpack_from(data)
+        if magic != self.MAGIC:
+            raise ValueError("Not a binary frame")
+        if version != WIRE_VERSION_BINARY:
+            raise ValueError(f"Unsupported wire version: {version}")
+        message_type = self._CODE_TYPES.get(type_code)
+        if message_type is None:
+            raise ValueError(f"Unknown message type code: {type_code}")
+        
+        payload = data[self._FRAME.size:]
+        if len(payload) != length:
+            raise ValueError(f"Frame length mismatch: expected {length}, got {len(payload)}")
+        if zlib.crc32(payload) != checksum:
+            raise ValueError("Frame checksum mismatch")
+        
+        if flags & self.FLAG_ZSTD:
+            body = self.compressor.decompress(payload, CompressionCodec.ZSTD)
+        elif flags & self.FLAG_SNAPPY:
+            body = self.compressor.decompress(payload, CompressionCodec.SNAPPY)
+        else:
+            body = payload
+        
+        if flags & self.FLAG_MSGPACK_BODY:
+            if not HAS_MSGSPEC:
+                raise ValueError("msgspec is required to decode this frame")
+            return self._from_fields(message_type, self._decoder.decode(body))
+        return MESSAGE_CLASSES[message_type].from_dict(json.loads(body))
+    
+    def _to_fields(self, message) -> list:
+        if isinstance(message, HeaderMsg):
+            return [message.header_bytes, _pack_work(message.tip_work), message.peer_id, message.timestamp]
+        if isinstance(message, RevealMsg):
+            return [message.cid, message.commitment, message.problem_type, message.capacity, message.timestamp]
+        if isinstance(message, RequestMsg):
+            return [self._REQUEST_KIND_CODES[message.kind], message.params, message.request_id, message.timestamp]
+        if isinstance(message, HelloMsg):
+            return [message.peer_id, list(message.wire_versions), message.reply, message.timestamp]
+        return [message.status, message.payload, message.error_message, message.request_id, message.timestamp]
+    
+    def _from_fields(self, message_type: MessageType, values: list):
+        if message_type == MessageType.HEADER:
+            header_bytes, tip_work, peer_id, timestamp = values
+            return HeaderMsg(header_bytes=header_bytes, tip_work=_unpack_work(tip_work),
+                             peer_id=peer_id, timestamp=timestamp)
+        if message_type == MessageType.REVEAL:
+            cid, commitment, problem_type, capacity, timestamp = values
+            return RevealMsg(cid=cid, commitment=commitment, problem_type=problem_type,
+                             capacity=capacity, timestamp=timestamp)
+        if message_type == MessageType.REQUEST:
+            kind, params, request_id, timestamp = values
+            return RequestMsg(kind=self._REQUEST_KINDS[kind], params=params,
+                              request_id=request_id, timestamp=timestamp)
+        if message_type == MessageType.HELLO:
+            peer_id, wire_versions, reply, timestamp = values
+            return HelloMsg(peer_id=peer_id, wire_versions=list(wire_versions), reply=reply, timestamp=timestamp)
+        status, payload, error_message, request_id, timestamp = values
+        return ResponseMsg(status=status, payload=payload, error_message=error_message,
+                           request_id=request_id, timestamp=timestamp)
+
+
+def _pack_work(tip_work: int) -> Union[int, bytes]:
+    """msgpack integers stop at u64; larger (u128) work goes as 16 big-endian bytes."""
+    if 0 <= tip_work < 1 << 64:
+        return tip_work
+    return tip_work.to_bytes(16, 'big', signed=True)
+
+
+def _unpack_work(value: Union[int, bytes]) -> int:
+    if isinstance(value, bytes):
+        return int.from_bytes(value, 'big', signed=True)
+    return value
+
+
 class RateLimiter:
     """Rate limiter for network messages."""
     
@@ -307,7 +495,9 @@ class NetworkProtocol:
         consensus: ConsensusEngine,
         storage: StorageManager,
         problem_registry: ProblemRegistry,
-        peer_id: str = "local_peer"
+        peer_id: str = "local_peer",
+        dedup_config: Optional[DedupConfig] = None,
+        listen_address: Optional[Tuple[str, int]] = None
     ):
         """
         Initialize network protocol.
@@ -317,6 +507,9 @@ class NetworkProtocol:
             storage: Storage manager
             problem_registry: Problem registry
             peer_id: Local peer identifier
+            dedup_config: Gossip dedup cache settings (bounded LRU by default)
+            listen_address: (host, port) to accept peer connections on while
+                the equilibrium loops run (outbound only if None)
         """
         self.consensus = consensus
         self.storage = storage
@@ -326,14 +519,20 @@ class NetworkProtocol:
         
         # Message handling
         self.compressor = MessageCompressor()
+        self.wire_codec = WireCodec(self.compressor)
         self.rate_limiter = RateLimiter()
         
+        # Wire version negotiation: peer_id -> agreed version
+        self.wire_version = WIRE_VERSION_BINARY
+        self.peer_wire_versions: Dict[str, int] = {}
+        
         # Gossipsub topics
         self.topics = {
             "headers": f"/coinj/headers/{DEFAULT_TOPIC_VERSION}",
             "commit_reveal": f"/coinj/commit-reveal/{DEFAULT_TOPIC_VERSION}",
             "requests": f"/coinj/requests/{DEFAULT_TOPIC_VERSION}",
-            "responses": f"/coinj/responses/{DEFAULT_TOPIC_VERSION}"
+            "responses": f"/coinj/responses/{DEFAULT_TOPIC_VERSION}",
+            "direct": f"/coinj/direct/{DEFAULT_TOPIC_VERSION}"  # point-to-point transport frames
         }
         
         # Message handlers
@@ -341,7 +540,8 @@ class NetworkProtocol:
             MessageType.HEADER: self._handle_header_msg,
             MessageType.REVEAL: self._handle_reveal_msg,
             MessageType.REQUEST: self._handle_request_msg,
-            MessageType.RESPONSE: self._handle_response_msg
+            MessageType.RESPONSE: self._handle_response_msg,
+            MessageType.HELLO: self._handle_hello_msg
         }
         
         # RPC handlers
@@ -351,13 +551,25 @@ class NetworkProtocol:
             RequestKind.GET_PROOF_BY_CID: self._handle_get_proof_by_cid
         }
         
-        # Message deduplication
-        self.seen_headers: Set[str] = set()
-        self.seen_commitments: Set[str] = set()
+        # Message deduplication (headers, reveals and CID gossip share one bounded cache)
+        self.dedup = GossipDedup(dedup_config)
         
         # Pending requests
         self.pending_requests: Dict[str, Dict] = {}
         
+        # Transport: one asyncio loop for every peer connection, frames are
+        # u32-length-prefixed encode_message() payloads
+        self.listen_address = listen_address
+        self.transport = AsyncTransport(
+            name="gossip",
+            on_frame=self._on_frame,
+            idle_timeout=300.0,
+            request_timeout=DEFAULT_PEER_TIMEOUT,
+            send_queue_size=DEFAULT_SEND_QUEUE_SIZE,
+            max_frame_size=DEFAULT_MAX_MESSAGE_SIZE
+        )
+        self.peer_addresses: Dict[str, Tuple[str, int]] = {}  # peer_id -> (host, port)
+        
         # Equilibrium state
         self.peers: Dict[str, float] = {}  # peer_id -> last_seen timestamp
         self.pending_broadcasts: Set[str] = set()  # CIDs to broadcast
@@ -369,10 +581,11 @@ class NetworkProtocol:
         self.last_listen = 0
         self.last_cleanup = 0
         
-        # Equilibrium loops
-        self._broadcast_thread = None
-        self._listen_thread = None
-        self._cleanup_thread = None
+        # Equilibrium loops (tasks on the transport's event loop)
+        self._broadcast_task: Optional[asyncio.Task] = None
+        self._listen_task: Optional[asyncio.Task] = None
+        self._cleanup_task: Optional[asyncio.Task] = None
+        self._broadcast_wakeup: Optional[asyncio.Event] = None
         self._running = False
         
         self.logger.info(f"⚖️  Network initialized with equilibrium: λ = η = {self.LAMBDA:.4f}")
@@ -380,16 +593,32 @@ class NetworkProtocol:
         self.logger.info(f"👂 Listen interval: {self.LISTEN_INTERVAL:.2f}s")
         self.logger.info(f"🧹 Cleanup interval: {self.CLEANUP_INTERVAL:.2f}s")
     
-    def encode_message(self, message: Union[HeaderMsg, RevealMsg, RequestMsg, ResponseMsg]) -> bytes:
+    def encode_message(
+        self,
+        message: Union[HeaderMsg, RevealMsg, RequestMsg, ResponseMsg],
+        peer_id: Optional[str] = None,
+        version: Optional[int] = None
+    ) -> bytes:
         """
         Encode message with compression.
         
         Args:
             message: Message to encode
+            peer_id: Recipient; picks the wire version negotiated with it
+                (gossip without a recipient uses the broadcast version)
+            version: Explicit wire version, overrides peer_id
             
         Returns:
             Encoded message bytes
         """
+        if version is None:
+            version = self.get_peer_wire_version(peer_id) if peer_id else self.broadcast_wire_version()
+        if version >= WIRE_VERSION_BINARY:
+            return self.wire_codec.encode(message)
+        return self._encode_json_envelope(message)
+    
+    def _encode_json_envelope(self, message: Union[HeaderMsg, RevealMsg, RequestMsg, ResponseMsg]) -> bytes:
+        """Encode in the legacy WIRE_VERSION_JSON format."""
         # Convert to dict and serialize to JSON
         message_dict = message.to_dict()
         json_data = json.dumps(message_dict).encode('utf-8')
@@ -409,12 +638,17 @@ class NetworkProtocol:
         """
         Decode message with decompression.
         
+        Accepts both binary frames and legacy JSON envelopes.
+        
         Args:
             data: Encoded message bytes
             
         Returns:
             Decoded message
         """
+        if WireCodec.is_frame(data):
+            return self.wire_codec.decode(data)
+        
         # Parse envelope
         envelope = json.loads(data.decode('utf-8'))
         codec = CompressionCodec(envelope["codec"])
@@ -428,16 +662,37 @@ class NetworkProtocol:
         message_type = MessageType(message_dict["type"])
         
         # Create appropriate message object
-        if message_type == MessageType.HEADER:
-            return HeaderMsg.from_dict(message_dict)
-        elif message_type == MessageType.REVEAL:
-            return RevealMsg.from_dict(message_dict)
-        elif message_type == MessageType.REQUEST:
-            return RequestMsg.from_dict(message_dict)
-        elif message_type == MessageType.RESPONSE:
-            return ResponseMsg.from_dict(message_dict)
-        else:
-            raise ValueError(f"Unknown message type: {message_type}")
+        return MESSAGE_CLASSES[message_type].from_dict(message_dict)
+    
+    def local_wire_versions(self) -> List[int]:
+        """Wire versions this node can speak (sent in the peer handshake)."""
+        return [version for version in SUPPORTED_WIRE_VERSIONS if version <= self.wire_version]
+    
+    def negotiate_wire_version(self, peer_id: str, peer_versions: List[int]) -> int:
+        """
+        Agree on the highest wire version both sides support.
+        
+        Args:
+            peer_id: Remote peer
+            peer_versions: Versions advertised by the peer (empty for old peers)
+            
+        Returns:
+            Agreed wire version
+        """
+        common = set(self.local_wire_versions()) & set(peer_versions or [])
+        version = max(common) if common else WIRE_VERSION_JSON
+        self.peer_wire_versions[peer_id] = version
+        return version
+    
+    def get_peer_wire_version(self, peer_id: str) -> int:
+        """Negotiated version for a peer; peers that never negotiated get JSON."""
+        return self.peer_wire_versions.get(peer_id, WIRE_VERSION_JSON)
+    
+    def broadcast_wire_version(self) -> int:
+        """Version for gossip: the newest one every active peer understands."""
+        if not self.peers:
+            return self.wire_version
+        return min(self.get_peer_wire_version(peer_id) for peer_id in self.peers)
     
     def handle_message(self, peer_id: str, topic: str, data: bytes) -> bool:
         """
@@ -465,8 +720,12 @@ class NetworkProtocol:
             # Decode message
             message = self.decode_message(data)
             
+            # A peer sending binary frames can receive them too
+            if WireCodec.is_frame(data) and self.get_peer_wire_version(peer_id) < WIRE_VERSION_BINARY:
+                self.peer_wire_versions[peer_id] = min(self.wire_version, WIRE_VERSION_BINARY)
+            
             # Route to appropriate handler
-            handler = self.message_handlers.get(type(message).__name__.replace('Msg', '').lower())
+            handler = self.message_handlers.get(MESSAGE_TYPE_OF.get(type(message)))
             if handler:
                 return handler(peer_id, message)
             else:
@@ -477,6 +736,27 @@ class NetworkProtocol:
             print(f"Error handling message from {peer_id}: {e}")
             return False
     
+    def _handle_hello_msg(self, peer_id: str, message: HelloMsg) -> bool:
+        """Handle a connection handshake: agree on a wire version and answer with ours."""
+        version = self.negotiate_wire_version(peer_id, message.wire_versions)
+        self.logger.debug(f"🤝 Handshake with {peer_id} ({message.peer_id}): wire version {version}")
+        if not message.reply:
+            self._send_hello(peer_id, reply=True)
+        return True
+    
+    def _send_hello(self, peer_id: str, reply: bool = False) -> bool:
+        """
+        Queue our handshake for a peer.
+        
+        Hellos always travel as JSON envelopes, which every version can read.
+        """
+        address = self.peer_addresses.get(peer_id)
+        if address is None or not self.transport.running:
+            return False
+        hello = HelloMsg(peer_id=self.peer_id, wire_versions=self.local_wire_versions(), reply=reply)
+        self.transport.call_soon(self._queue_frames, [(address, self.encode_message(hello, version=WIRE_VERSION_JSON))])
+        return True
+    
     def _handle_header_msg(self, peer_id: str, message: HeaderMsg) -> bool:
         """Handle header announcement message."""
         try:
@@ -485,9 +765,8 @@ class NetworkProtocol:
             
             # Deduplication
             header_hash = header.block_hash
-            if header_hash in self.seen_headers:
+            if self.dedup.check_and_add("header", header_hash):
                 return True  # Already seen, but not an error
-            self.seen_headers.add(header_hash)
             
             # Validate header
             self.consensus.validate_header(header)
@@ -507,9 +786,8 @@ class NetworkProtocol:
         try:
             # Deduplication
             commitment_key = f"{message.cid}:{message.commitment.hex()}"
-            if commitment_key in self.seen_commitments:
+            if self.dedup.check_and_add("reveal", commitment_key):
                 return True  # Already seen
-            self.seen_commitments.add(commitment_key)
             
             # Store commitment mapping
             self.storage.store_commitment_cid(message.commitment, message.cid)
@@ -530,8 +808,8 @@ class NetworkProtocol:
                 print(f"No handler for request kind: {message.kind}")
                 return False
             
-            # Process request
-            response = handler(message.params)
+            # Process request (payloads are encoded for the requester's wire version)
+            response = handler(message.params, peer_id)
             
             # Send response
             response_msg = ResponseMsg(
@@ -540,7 +818,7 @@ class NetworkProtocol:
                 request_id=message.request_id
             )
             
-            # In a real implementation, this would send via libp2p
+            self.send_to_peer(peer_id, response_msg)
             print(f"Processed request {message.kind.value} from {peer_id}")
             return True
             
@@ -565,7 +843,7 @@ class NetworkProtocol:
             print(f"Error processing response from {peer_id}: {e}")
             return False
     
-    def _handle_get_headers(self, params: Dict[str, Any]) -> bytes:
+    def _handle_get_headers(self, params: Dict[str, Any], peer_id: Optional[str] = None) -> bytes:
         """Handle get_headers RPC request."""
         start_height = params.get("start_height", 0)
         count = params.get("count", 100)
@@ -578,7 +856,7 @@ class NetworkProtocol:
         
         return json.dumps(headers).encode('utf-8')
     
-    def _handle_get_block_by_hash(self, params: Dict[str, Any]) -> bytes:
+    def _handle_get_block_by_hash(self, params: Dict[str, Any], peer_id: Optional[str] = None) -> bytes:
         """Handle get_block_by_hash RPC request."""
         block_hash = params.get("hash")
         if not block_hash:
@@ -588,11 +866,10 @@ class NetworkProtocol:
         if not block:
             raise ValueError("Block not found")
         
-        # Serialize block
-        block_data = self.storage._serialize_block(block)
-        return block_data
+        # Serialize block in the requester's wire format
+        return self.block_wire_bytes(block, self.get_peer_wire_version(peer_id) if peer_id else WIRE_VERSION_JSON)
     
-    def _handle_get_proof_by_cid(self, params: Dict[str, Any]) -> bytes:
+    def _handle_get_proof_by_cid(self, params: Dict[str, Any], peer_id: Optional[str] = None) -> bytes:
         """Handle get_proof_by_cid RPC request."""
         cid = params.get("cid")
         if not cid:
@@ -602,25 +879,40 @@ class NetworkProtocol:
         proof_bundle = self.storage.ipfs_client.get(cid)
         return proof_bundle
     
+    def header_wire_bytes(self, block: Block, version: int) -> bytes:
+        """
+        Header bytes for HeaderMsg at a wire version.
+        
+        Binary storage records only go to peers that negotiated
+        WIRE_VERSION_BINARY; older peers json.loads the header.
+        """
+        if version >= WIRE_VERSION_BINARY:
+            return encode_header_record(block)
+        return encode_header_json(block)
+    
+    def block_wire_bytes(self, block: Block, version: int) -> bytes:
+        """Block payload bytes at a wire version (JSON unless the peer speaks binary)."""
+        if version >= WIRE_VERSION_BINARY:
+            return encode_block_record(block)
+        return encode_block_json(block)
+    
     def announce_header(self, block: Block):
         """Announce new header to network."""
         try:
-            # Serialize header
-            header_bytes = self.storage._serialize_header(block)
-            
             # Get tip work
             tip_work = int(block.cumulative_work_score) if hasattr(block, 'cumulative_work_score') else 0
             
-            # Create message
-            message = HeaderMsg(
-                header_bytes=header_bytes,
-                tip_work=tip_work,
-                peer_id=self.peer_id
-            )
+            # One message per wire version, with header bytes that version can read
+            def build(version: int) -> HeaderMsg:
+                return HeaderMsg(
+                    header_bytes=self.header_wire_bytes(block, version),
+                    tip_work=tip_work,
+                    peer_id=self.peer_id
+                )
             
-            # Encode and send (simplified - would use libp2p in real implementation)
-            encoded = self.encode_message(message)
-            print(f"Announced header: {block.block_hash[:16]}... (work: {tip_work})")
+            # Encode per peer wire version and queue on every peer connection
+            sent = self._broadcast_versioned(build)
+            print(f"Announced header: {block.block_hash[:16]}... (work: {tip_work}, peers: {sent})")
             
         except Exception as e:
             print(f"Error announcing header: {e}")
@@ -637,8 +929,8 @@ class NetworkProtocol:
             )
             
             # Encode and send
-            encoded = self.encode_message(message)
-            print(f"Announced reveal: {cid}")
+            sent = self.broadcast_message(message)
+            print(f"Announced reveal: {cid} (peers: {sent})")
             
         except Exception as e:
             print(f"Error announcing reveal: {e}")
@@ -666,41 +958,147 @@ class NetworkProtocol:
         # Check if we can broadcast immediately (if interval has passed)
         current_time = time.time()
         if current_time - self.last_broadcast >= self.BROADCAST_INTERVAL:
-            # Flush broadcasts immediately if interval has passed
-            self._flush_pending_broadcasts()
+            if self._running and self._broadcast_wakeup is not None:
+                # Let the broadcast loop flush now instead of at its next tick
+                self.transport.call_soon(self._broadcast_wakeup.set)
+            else:
+                # Flush broadcasts immediately if interval has passed
+                self._flush_pending_broadcasts()
     
     def update_peer(self, peer_id: str):
         """Update peer last-seen timestamp."""
         self.peers[peer_id] = time.time()
         self.logger.debug(f"👥 Updated peer: {peer_id}")
     
+    def connect_peer(self, peer_id: str, host: str, port: int, timeout: float = 10.0) -> bool:
+        """
+        Open (or reuse) a connection to a peer and start the handshake.
+        
+        The peer answers our hello with its own; until then it is sent JSON,
+        afterwards the newest wire version both sides support.
+        
+        Args:
+            peer_id: Peer identifier
+            host: Peer host
+            port: Peer port
+            timeout: Seconds to wait for the connection
+            
+        Returns:
+            True if the peer is connected
+        """
+        self.transport.start()
+        try:
+            connection = self.transport.run(self.transport.connect(host, port), timeout)
+        except Exception as e:
+            self.logger.warning(f"⚠️  Could not connect to {peer_id} at {host}:{port}: {e}")
+            return False
+        connection.peer_id = peer_id
+        self.peer_addresses[peer_id] = (host, port)
+        self.update_peer(peer_id)
+        self._send_hello(peer_id)
+        return True
+    
+    def broadcast_message(self, message: Union[HeaderMsg, RevealMsg, RequestMsg, ResponseMsg]) -> int:
+        """
+        Queue a message on every known peer connection.
+        
+        The message is encoded once per wire version in use; peers whose send
+        queue is full drop it rather than stalling the broadcast.
+        
+        Args:
+            message: Message to broadcast
+            
+        Returns:
+            Number of peers the message was queued for
+        """
+        return self._broadcast_versioned(lambda version: message)
+    
+    def _broadcast_versioned(self, build: Callable[[int], Union[HeaderMsg, RevealMsg, RequestMsg, ResponseMsg]]) -> int:
+        """broadcast_message() with the message built per wire version by build(version)."""
+        encoded_by_version: Dict[int, bytes] = {}
+        frames = []
+        for peer_id, address in list(self.peer_addresses.items()):
+            version = self.get_peer_wire_version(peer_id)
+            if version not in encoded_by_version:
+                encoded_by_version[version] = self.encode_message(build(version), version=version)
+            frames.append((address, encoded_by_version[version]))
+        if frames and self.transport.running:
+            self.transport.call_soon(self._queue_frames, frames)
+        return len(frames) if self.transport.running else 0
+    
+    def send_to_peer(self, peer_id: str, message: Union[HeaderMsg, RevealMsg, RequestMsg, ResponseMsg]) -> bool:
+        """Queue a message for one peer; False if the peer has no known address."""
+        address = self.peer_addresses.get(peer_id)
+        if address is None or not self.transport.running:
+            return False
+        self.transport.call_soon(self._queue_frames, [(address, self.encode_message(message, peer_id=peer_id))])
+        return True
+    
+    def _queue_frames(self, frames: List[Tuple[Tuple[str, int], bytes]]):
+        """Queue frames on their connections, dialing peers not yet connected (loop thread)."""
+        for address, payload in frames:
+            connection = self.transport.connections.get(address)
+            if connection is not None and not connection.closed:
+                connection.send_nowait(payload)
+            else:
+                asyncio.ensure_future(self._dial_and_send(address, payload))
+    
+    async def _dial_and_send(self, address: Tuple[str, int], payload: bytes):
+        try:
+            connection = await self.transport.connect(*address)
+            connection.send_nowait(payload)
+        except Exception as e:
+            self.logger.debug(f"⚠️  Send to {address[0]}:{address[1]} failed: {e}")
+    
+    async def _on_frame(self, connection: PeerConnection, frame: bytes):
+        """Inbound transport frame: handle it off the event loop."""
+        peer_id = connection.peer_id
+        if peer_id is None:
+            peer_id = connection.peer_id = f"{connection.key[0]}:{connection.key[1]}"
+            self.peer_addresses.setdefault(peer_id, connection.key)
+        self.update_peer(peer_id)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.handle_message, peer_id, self.topics["direct"], frame)
+    
     def start_equilibrium_loops(self):
         """Start equilibrium enforcement loops."""
         if self._running:
             return
         
         self._running = True
-        
-        # Start broadcast loop (λ-coupling)
-        self._broadcast_thread = threading.Thread(target=self._broadcast_loop, daemon=True)
-        self._broadcast_thread.start()
-        
-        # Start listen loop (η-damping)
-        self._listen_thread = threading.Thread(target=self._listen_loop, daemon=True)
-        self._listen_thread.start()
-        
-        # Start cleanup loop
-        self._cleanup_thread = threading.Thread(target=self._cleanup_loop, daemon=True)
-        self._cleanup_thread.start()
+        self.transport.start()
+        self.transport.run(self._start_tasks(), timeout=10.0)
         
         self.logger.info("✅ Equilibrium loops started")
     
     def stop_equilibrium_loops(self):
         """Stop equilibrium enforcement loops."""
         self._running = False
+        if self.transport.running:
+            try:
+                self.transport.run(self._stop_tasks(), timeout=10.0)
+            except Exception as e:
+                self.logger.debug(f"⚠️  Error stopping equilibrium loops: {e}")
+            self.transport.stop()
         self.logger.info("🛑 Equilibrium loops stopped")
     
-    def _broadcast_loop(self):
+    async def _start_tasks(self):
+        self._broadcast_wakeup = asyncio.Event()
+        if self.listen_address is not None:
+            await self.transport.listen(*self.listen_address)
+        # λ-coupling broadcast, η-damping listen, cleanup
+        self._broadcast_task = asyncio.ensure_future(self._broadcast_loop())
+        self._listen_task = asyncio.ensure_future(self._listen_loop())
+        self._cleanup_task = asyncio.ensure_future(self._cleanup_loop())
+    
+    async def _stop_tasks(self):
+        tasks = [t for t in (self._broadcast_task, self._listen_task, self._cleanup_task) if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._broadcast_wakeup = None
+    
+    async def _broadcast_loop(self):
         """
         λ-coupling broadcast loop.
         
@@ -713,20 +1111,29 @@ class NetworkProtocol:
         - Achieves λ/η = 1.0 (equilibrium)
         - Improves CID success from 61.8% → >95% (predicted)
         - Reduces block intervals from 4712s → ~14s (333x faster)
+        
+        Sleeps until the interval elapses or announce_proof() wakes it, so a
+        CID queued after a quiet interval goes out immediately.
         """
         while self._running:
             try:
-                current_time = time.time()
-                elapsed = current_time - self.last_broadcast
+                remaining = self.BROADCAST_INTERVAL - (time.time() - self.last_broadcast)
                 
-                if elapsed >= self.BROADCAST_INTERVAL:
+                if remaining <= 0:
                     self._flush_pending_broadcasts()
+                    remaining = self.BROADCAST_INTERVAL
                 
-                time.sleep(1)  # Check every second
+                self._broadcast_wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._broadcast_wakeup.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
                 
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 self.logger.error(f"❌ Broadcast loop error: {e}")
-                time.sleep(5)
+                await asyncio.sleep(5)
     
     def _flush_pending_broadcasts(self):
         """
@@ -764,6 +1171,10 @@ class NetworkProtocol:
     
     def _gossip_cid(self, cid: str):
         """Broadcast CID to all connected peers (synchronous version for threading)."""
+        if self.dedup.check_and_add("cid", cid):
+            self.logger.debug(f"🔁 CID already gossiped recently: {cid[:16]}...")
+            return
+        
         try:
             message = {
                 'type': 'proof_announcement',
@@ -791,7 +1202,7 @@ class NetworkProtocol:
         except Exception as e:
             self.logger.error(f"❌ Error gossiping CID {cid[:16]}...: {e}")
     
-    def _listen_loop(self):
+    async def _listen_loop(self):
         """
         η-damping listen loop.
         
@@ -818,11 +1229,14 @@ class NetworkProtocol:
                     ratio = self.lambda_state / max(self.eta_state, 0.001)
                     self.logger.info(f"⚖️  Equilibrium: λ={self.lambda_state:.4f}, η={self.eta_state:.4f}, ratio={ratio:.4f}")
                 
-                time.sleep(1)  # Check every second
+                # Sleep until the next listen interval
+                await asyncio.sleep(max(0.0, self.LISTEN_INTERVAL - (time.time() - self.last_listen)))
                 
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 self.logger.error(f"❌ Listen loop error: {e}")
-                time.sleep(5)
+                await asyncio.sleep(5)
     
     def _exchange_peer_lists(self):
         """Exchange peer lists with connected peers."""
@@ -839,7 +1253,7 @@ class NetworkProtocol:
             except Exception as e:
                 self.logger.debug(f"⚠️  Peer exchange failed: {peer_id}: {e}")
     
-    def _cleanup_loop(self):
+    async def _cleanup_loop(self):
         """
         Network cleanup loop.
         
@@ -863,18 +1277,38 @@ class NetworkProtocol:
                     
                     for peer_id in stale_peers:
                         del self.peers[peer_id]
+                        self.peer_wire_versions.pop(peer_id, None)
+                        address = self.peer_addresses.pop(peer_id, None)
+                        if address is not None:
+                            await self.transport.close_connection(*address)
                         self.logger.info(f"🧹 Removed stale peer: {peer_id}")
                     
+                    # Drop expired gossip dedup entries
+                    expired = self.dedup.expire(current_time)
+                    
                     self.last_cleanup = current_time
                     
                     # Log network health
                     self.logger.info(f"📊 Network: {len(self.peers)} active peers")
+                    dedup_stats = self.dedup.get_stats()
+                    self.logger.info(
+                        f"📊 Gossip dedup: {dedup_stats['entries']} entries, {expired} expired, "
+                        f"{dedup_stats['evictions']} evicted"
+                    )
+                    transport_stats = self.transport.get_stats()
+                    self.logger.info(
+                        f"📊 Transport: {transport_stats['open_connections']} connections, "
+                        f"{transport_stats.get('dropped_frames', 0)} frames dropped"
+                    )
                 
-                time.sleep(10)  # Check every 10 seconds
+                # Sleep until the next cleanup interval
+                await asyncio.sleep(max(0.0, self.CLEANUP_INTERVAL - (time.time() - self.last_cleanup)))
                 
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 self.logger.error(f"❌ Cleanup loop error: {e}")
-                time.sleep(30)
+                await asyncio.sleep(30)
 
 
 if __name__ == "__main__":
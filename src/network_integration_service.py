@@ -15,6 +15,9 @@ from datetime import datetime
 
 # Add src to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from header_sync import HeadersFirstSync, HttpPeerClient, PeerSet
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
                     handlers=[logging.FileHandler('logs/network_integration.log'), logging.StreamHandler()])
@@ -38,6 +41,12 @@ class NetworkIntegrationService:
         self.running = True
         self.block_processor_thread = None
         
+        # Pooled connections to peers and the headers-first catch-up engine
+        self.peer_client = HttpPeerClient(timeout=10)
+        self.peer_set = PeerSet()
+        self.sync_engine = HeadersFirstSync(self.peer_client, self.peer_set,
+                                            lambda block, proof: self.ingest_block_to_api(block))
+        
     def discover_peers(self):
         """Discover peers from bootstrap nodes"""
         logger.info("🔍 Discovering network peers...")
@@ -93,20 +102,34 @@ class NetworkIntegrationService:
     def fetch_block_from_peer(self, peer_address, block_index):
         """Fetch a specific block from a peer"""
         try:
-            if peer_address.startswith('http'):
-                url = f"{peer_address}/v1/data/block/{block_index}"
-            else:
-                url = f"http://{peer_address}/v1/data/block/{block_index}"
-            
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('status') == 'success':
-                    return data['data']
+            return self.peer_client.get_block(peer_address, block_index)
         except Exception as e:
             logger.warning(f"⚠️  Could not fetch block {block_index} from {peer_address}: {e}")
         return None
     
+    def catch_up(self, current_index):
+        """
+        Sync every block peers have past current_index.
+        
+        Headers are fetched and linked first, then bodies are downloaded in
+        parallel from all connected peers and ingested in order.
+        
+        Returns:
+            Number of blocks ingested
+        """
+        # Mirror connected_peers: keep scores of peers still connected, drop the rest
+        for peer in self.peer_set:
+            if peer not in self.connected_peers:
+                self.peer_set.remove(peer)
+        for peer in self.connected_peers:
+            self.peer_set.add(peer)
+        result = self.sync_engine.sync(current_index + 1)
+        if result.get('error'):
+            logger.warning(f"⚠️  Catch-up stopped at block {result['height']}: {result['error']}")
+        elif result['applied']:
+            logger.info(f"📦 Caught up {result['applied']} blocks to {result['height']}")
+        return result['applied']
+    
     def ingest_block_to_api(self, block_data):
         """Ingest a block to our API"""
         try:
@@ -161,21 +184,11 @@ class NetworkIntegrationService:
                     logger.info(f"📊 Current block index: {current_index}")
                     self.current_block_index = current_index
                 
-                # Try to get next block from peers
+                # Try to get next blocks from peers
                 next_block_index = current_index + 1
-                block_ingested = False
                 
-                # First, try to fetch from real peers
-                for peer in list(self.connected_peers):
-                    if not self.running:
-                        break
-                        
-                    block_data = self.fetch_block_from_peer(peer, next_block_index)
-                    if block_data:
-                        logger.info(f"📦 Fetched block {next_block_index} from {peer}")
-                        if self.ingest_block_to_api(block_data):
-                            block_ingested = True
-                            break
+                # First, catch up from real peers
+                block_ingested = self.catch_up(current_index) > 0
                 
                 # If no real blocks found, simulate network activity
                 if not block_ingested and len(self.connected_peers) > 0:
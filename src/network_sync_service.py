@@ -17,6 +17,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from unified_consensus_service import UnifiedConsensusService
 from metrics_engine import SATOSHI_CONSTANT
+from header_sync import HeadersFirstSync, HttpPeerClient, PeerSet
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -45,6 +46,11 @@ class NetworkSyncService:
         # Discovered peers
         self.discovered_peers = []
         
+        # Headers-first sync engine; peer scores and bans persist across rounds
+        self.peer_client = HttpPeerClient(timeout=10)
+        self.peer_set = PeerSet(self.bootstrap_peers)
+        self.sync_engine = HeadersFirstSync(self.peer_client, self.peer_set, self._apply_synced_block)
+        
         logger.info("✅ Network sync service initialized")
     
     def discover_peers(self) -> List[str]:
@@ -63,13 +69,16 @@ class NetworkSyncService:
                     peer_data = response.json()
                     if 'peers' in peer_data:
                         for peer in peer_data['peers']:
-                            all_peers.add(peer)
+                            # Nodes list peers as {'address': ..., 'status': ...}
+                            all_peers.add(peer['address'] if isinstance(peer, dict) else peer)
                         logger.info(f"📡 Found {len(peer_data['peers'])} peers from {bootstrap_peer}")
                 
             except Exception as e:
                 logger.warning(f"⚠️  Could not discover peers from {bootstrap_peer}: {e}")
         
         self.discovered_peers = list(all_peers)
+        for peer in self.discovered_peers:
+            self.peer_set.add(peer)
         logger.info(f"✅ Discovered {len(self.discovered_peers)} total peers")
         
         return self.discovered_peers
@@ -77,15 +86,7 @@ class NetworkSyncService:
     def get_block_from_peer(self, peer: str, block_height: int) -> Optional[Dict[str, Any]]:
         """Get a specific block from a peer."""
         try:
-            # Try to get block from peer
-            block_url = f"http://{peer}/v1/data/block/{block_height}"
-            response = requests.get(block_url, timeout=10)
-            
-            if response.status_code == 200:
-                block_data = response.json()
-                if 'data' in block_data:
-                    return block_data['data']
-            
+            return self.peer_client.get_block(peer, block_height)
         except Exception as e:
             logger.debug(f"Could not get block {block_height} from {peer}: {e}")
         
@@ -117,70 +118,56 @@ class NetworkSyncService:
         logger.info(f"✅ Latest network height: {latest_height}")
         return latest_height
     
-    def sync_blocks_from_network(self, start_height: int = 0, max_blocks: int = 1000):
-        """Sync blocks from network starting from given height."""
+    def _apply_synced_block(self, block_data: Dict[str, Any], proof_data: Optional[Any]) -> bool:
+        """Hand a downloaded block (already matched to the header chain) to consensus."""
+        result = self.consensus_service.process_block(block_data)
+        if not result.get('valid', False):
+            logger.warning(f"❌ Block {block_data.get('index')} validation failed: {result.get('error', 'Unknown')}")
+            return False
+        return True
+    
+    def sync_blocks_from_network(self, start_height: int = 0, max_blocks: int = 1000,
+                                 parent_header: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Sync blocks from network starting from given height.
+        
+        Headers are downloaded and linked first, then bodies are fetched in
+        parallel from all discovered peers and applied in height order.
+        
+        Args:
+            start_height: First height to sync
+            max_blocks: Maximum blocks to sync this round
+            parent_header: Local header at start_height - 1, if known
+            
+        Returns:
+            Sync result from HeadersFirstSync.sync()
+        """
         logger.info(f"🔄 Starting block sync from height {start_height}")
         
         # Discover peers
         self.discover_peers()
         
-        # Get latest height
-        latest_height = self.get_latest_block_height()
-        
-        if latest_height <= start_height:
-            logger.info("✅ Already synced to latest height")
-            return
-        
-        # Sync blocks
-        synced_count = 0
-        failed_count = 0
-        
-        for height in range(start_height, min(latest_height + 1, start_height + max_blocks)):
-            try:
-                # Try to get block from multiple peers
-                block_data = None
-                
-                for peer in self.discovered_peers:
-                    block_data = self.get_block_from_peer(peer, height)
-                    if block_data:
-                        break
-                
-                if not block_data:
-                    logger.warning(f"⚠️  Could not get block {height} from any peer")
-                    failed_count += 1
-                    continue
-                
-                # Process block through consensus
-                result = self.consensus_service.process_block(block_data)
-                
-                if result.get('valid', False):
-                    synced_count += 1
-                    if synced_count % 100 == 0:
-                        logger.info(f"✅ Synced {synced_count} blocks (height {height})")
-                else:
-                    logger.warning(f"❌ Block {height} validation failed: {result.get('error', 'Unknown')}")
-                    failed_count += 1
-                
-                # Small delay to avoid overwhelming peers
-                time.sleep(0.1)
-                
-            except Exception as e:
-                logger.error(f"❌ Error syncing block {height}: {e}")
-                failed_count += 1
+        result = self.sync_engine.sync(
+            start_height,
+            parent_header=parent_header,
+            target_height=start_height + max_blocks - 1
+        )
         
-        logger.info(f"✅ Sync completed: {synced_count} blocks synced, {failed_count} failed")
+        if result.get('error'):
+            logger.warning(f"⚠️  Sync stopped early: {result['error']}")
+        logger.info(f"✅ Sync completed: {result['applied']} blocks synced, now at height {result['height']}")
+        return result
     
-    def run_sync_loop(self):
-        """Run continuous sync loop."""
+    def run_sync_loop(self, start_height: int = 0):
+        """Run continuous sync loop, resuming after the last synced block."""
         logger.info("🔄 Starting continuous sync loop...")
         
+        current_height = start_height
         while True:
             try:
-                # Get current local height
-                current_height = 0  # This would get from local database
-                
                 # Sync new blocks
-                self.sync_blocks_from_network(start_height=current_height, max_blocks=100)
+                result = self.sync_blocks_from_network(start_height=current_height, max_blocks=100)
+                current_height = result['height'] + 1
                 
                 # Wait before next sync
                 time.sleep(30)
@@ -201,10 +188,10 @@ def main():
         sync_service = NetworkSyncService()
         
         # Initial sync from genesis
-        sync_service.sync_blocks_from_network(start_height=0, max_blocks=2000)
+        result = sync_service.sync_blocks_from_network(start_height=0, max_blocks=2000)
         
         # Run continuous sync
-        sync_service.run_sync_loop()
+        sync_service.run_sync_loop(start_height=result['height'] + 1)
         
     except Exception as e:
         logger.error(f"❌ Fatal error in network sync service: {e}")
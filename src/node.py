@@ -24,9 +24,10 @@ try:
     from .storage import StorageManager, StorageConfig, IPFSClient, PruningMode
     from .consensus import ConsensusEngine, ConsensusConfig
     from .network import NetworkProtocol
-    from .user_submissions.pool import ProblemPool
+    from .user_submissions.pool import ProblemPool, PrefetchQueue
     from .user_submissions.submission import ProblemSubmission, SolutionRecord
     from .user_submissions.aggregation import AggregationStrategy
+    from .mining_pool import MiningPool, MiningResult
 except ImportError:
     # Fallback for direct execution
     from core.blockchain import Block, ProblemType, ProblemTier
@@ -34,9 +35,10 @@ except ImportError:
     from storage import StorageManager, StorageConfig, IPFSClient, PruningMode
     from consensus import ConsensusEngine, ConsensusConfig
     from network import NetworkProtocol
-    from user_submissions.pool import ProblemPool
+    from user_submissions.pool import ProblemPool, PrefetchQueue
     from user_submissions.submission import ProblemSubmission, SolutionRecord
     from user_submissions.aggregation import AggregationStrategy
+    from mining_pool import MiningPool, MiningResult
 
 
 class NodeRole(Enum):
@@ -66,6 +68,8 @@ class NodeConfig:
     # Mining configuration (for miners)
     target_block_interval_secs: int = 30
     difficulty_window: int = 10
+    mining_workers: int = 0  # 0 = one worker process per CPU core
+    mining_tiers: List[str] = field(default_factory=lambda: ["workstation"])
     
     # Logging and metrics
     log_level: str = "INFO"
@@ -101,6 +105,7 @@ class Node:
         
         # User submissions integration
         self.problem_pool: Optional[ProblemPool] = None
+        self._problem_queue: Optional[PrefetchQueue] = None
         
         # Node state
         self.is_running = False
@@ -110,6 +115,7 @@ class Node:
         # Mining state (for miners)
         self.mining_active = False
         self.last_block_time = 0.0
+        self.mining_pool: Optional[MiningPool] = None
         
         self.logger.info(f"Node initialized with role: {config.role.value}")
     
@@ -183,7 +189,7 @@ class Node:
             
             # Initialize user submissions system
             if self.config.enable_user_submissions:
-                self.problem_pool = ProblemPool()
+                self.problem_pool = self._new_problem_pool()
                 self.logger.info("User submissions system enabled")
             
             self.logger.info("Node initialization completed successfully")
@@ -241,6 +247,10 @@ class Node:
         self.is_running = False
         self.mining_active = False
         
+        if self.mining_pool:
+            self.mining_pool.stop()
+            self.mining_pool = None
+        
         if self.network:
             # Stop equilibrium loops before removing network
             self.network.stop_equilibrium_loops()
@@ -261,8 +271,7 @@ class Node:
         # Get best tip from consensus
         best_tip = self.consensus.get_best_tip()
         if best_tip:
-            self.best_tip_hash = best_tip.block_hash
-            self.current_block_height = best_tip.index
+            self._set_tip(best_tip.block_hash, best_tip.index)
             self.logger.info(f"Synced to block {self.current_block_height}: {self.best_tip_hash[:16]}...")
         else:
             self.logger.info("No existing blockchain found, starting from genesis")
@@ -344,6 +353,16 @@ class Node:
         self.logger.info("Starting mining operations...")
         self.mining_active = True
         
+        # Keep every core busy solving consensus problems for the current tip
+        self.mining_pool = MiningPool(
+            workers=self.config.mining_workers or None,
+            tiers=[ProblemTier(tier) for tier in self.config.mining_tiers]
+        )
+        tip = self.consensus.get_best_tip() if self.consensus else None
+        if tip is not None:
+            self._set_tip(tip.block_hash, tip.index)
+        self.mining_pool.start(self.best_tip_hash or "0" * 64, self.current_block_height)
+        
         # Start mining loop in background thread
         import threading
         mining_thread = threading.Thread(target=self._mining_loop, daemon=True)
@@ -353,18 +372,18 @@ class Node:
         """Main mining loop with user submissions integration."""
         while self.mining_active and self.is_running:
             try:
+                # Pick up tips from peers before choosing what to mine
+                self._sync_mining_tip()
+                
                 # Check for user-submitted problems first
                 problem_data = self._get_problem_for_mining()
                 
                 if problem_data:
                     self._mine_block_with_problem(problem_data)
                 else:
-                    # Fall back to consensus-generated problems
+                    # Fall back to consensus problems solved by the mining pool
                     self._mine_consensus_block()
                 
-                # Wait for next mining cycle
-                time.sleep(1.0)
-                
             except Exception as e:
                 self.logger.error(f"Mining loop error: {e}")
                 time.sleep(5.0)
@@ -380,14 +399,12 @@ class Node:
             return None
         
         # Determine miner hardware tier (simplified)
-        miner_tier = ProblemTier.TIER_3_SERVER  # Default to server tier
-        miner_hardware = "CPU"  # Simplified hardware type
+        miner_tier = ProblemTier.TIER_4_SERVER  # Default to server tier
         
-        # Query problem pool for submissions
-        submission_result = self.problem_pool.select_problem_for_mining(
-            miner_tier=miner_tier,
-            miner_hardware=miner_hardware
-        )
+        # Best submissions are prefetched in batches, refilled when the pool changes
+        if self._problem_queue is None or self._problem_queue.pool is not self.problem_pool:
+            self._problem_queue = PrefetchQueue(self.problem_pool, miner_tier)
+        submission_result = self._problem_queue.next()
         
         if submission_result:
             submission_id, submission = submission_result
@@ -415,7 +432,7 @@ class Node:
             problem_instance = self.problem_registry.generate_from_template(
                 problem_type=ProblemType.SUBSET_SUM,  # Simplified
                 template=submission.problem_template,
-                capacity=ProblemTier.TIER_3_SERVER
+                capacity=ProblemTier.TIER_4_SERVER
             )
             
             # Solve the problem (simplified)
@@ -446,8 +463,7 @@ class Node:
             self.problem_pool.record_solution(submission_id, solution_record)
             
             # Update node state
-            self.best_tip_hash = block.block_hash
-            self.current_block_height = block.index
+            self._set_tip(block.block_hash, block.index)
             self.last_block_time = time.time()
             
             self.logger.info(f"Mined block {block.index} with user submission {submission_id}")
@@ -456,37 +472,101 @@ class Node:
             self.logger.error(f"Failed to mine block with user problem: {e}")
     
     def _mine_consensus_block(self) -> None:
-        """Mine a block using consensus-generated problems."""
+        """Mine a block from the next consensus problem solved by the mining pool."""
         try:
-            self.logger.debug("Mining consensus block...")
+            self._sync_mining_tip()
+            result = self.mining_pool.next_result(timeout=1.0)
+            if result is None:
+                return
             
-            # Generate consensus problem
-            problem = self.problem_registry.generate(
-                problem_type=ProblemType.SUBSET_SUM,
-                seed=f"consensus-{int(time.time())}",
-                capacity=ProblemTier.TIER_3_SERVER
-            )
+            # Tip may have moved while the result was queued
+            if result.job.parent_hash != (self.best_tip_hash or "0" * 64):
+                return
             
-            # Solve the problem
-            solution = self._solve_problem(problem)
+            block = self._assemble_pool_block(result)
             
-            # Create block
-            block = self.consensus.create_block(
-                problem=problem,
-                solution=solution,
-                previous_hash=self.best_tip_hash or "0" * 64
-            )
+            # Add to consensus, storage and the network before moving the
+            # workers on, so the next result's parent is the best tip
+            self._publish_block(block)
             
-            # Update node state
-            self.best_tip_hash = block.block_hash
-            self.current_block_height = block.index
+            # Update node state and point the workers at the new tip
+            self._set_tip(block.block_hash, block.index)
             self.last_block_time = time.time()
+            self.mining_pool.update_tip(block.block_hash, block.index)
             
-            self.logger.info(f"Mined consensus block {block.index}")
+            self.logger.info(
+                f"Mined consensus block {block.index} "
+                f"(tier={result.job.tier}, solve={result.solve_time:.4f}s, worker={result.worker_pid})"
+            )
             
         except Exception as e:
             self.logger.error(f"Failed to mine consensus block: {e}")
     
+    def _sync_mining_tip(self) -> None:
+        """
+        Follow the consensus best tip.
+        
+        Peer headers and user-problem blocks move the tip without going
+        through the pool; re-point the workers so their results stay usable.
+        """
+        tip = self.consensus.get_best_tip() if self.consensus else None
+        if tip is None:
+            return
+        if tip.block_hash != self.best_tip_hash:
+            self._set_tip(tip.block_hash, tip.index)
+        self.mining_pool.update_tip(tip.block_hash, tip.index)  # No-op if unchanged
+    
+    def _set_tip(self, block_hash: str, index: int) -> None:
+        """Record a new best tip and move the submission pool's block clock."""
+        self.best_tip_hash = block_hash
+        self.current_block_height = index
+        if self.problem_pool:
+            self.problem_pool.advance_block(index)
+    
+    def _new_problem_pool(self) -> ProblemPool:
+        """Submission pool expiring submissions after submission_timeout_hours of blocks."""
+        max_age_blocks = None
+        if self.config.submission_timeout_hours > 0:
+            max_age_blocks = max(1, int(self.config.submission_timeout_hours * 3600
+                                        // max(1, self.config.target_block_interval_secs)))
+        return ProblemPool(current_block=self.current_block_height, max_age_blocks=max_age_blocks)
+    
+    def _publish_block(self, block: Block) -> None:
+        """
+        Validate a mined block into the fork-choice tree, persist it and announce it.
+        
+        Raises:
+            HeaderValidationError: If consensus rejects the block
+        """
+        self.consensus.validate_header(block)
+        self.storage.store_block(block)
+        self.storage.store_header(block)
+        if self.network:
+            self.network.announce_header(block)
+    
+    def _assemble_pool_block(self, result: MiningResult) -> Block:
+        """Hand a mining pool result to the block assembler."""
+        try:
+            from .core.blockchain import assemble_block
+        except ImportError:
+            from core.blockchain import assemble_block
+        
+        previous_block = self.consensus.get_best_tip()
+        if previous_block is None or previous_block.block_hash != result.job.parent_hash:
+            raise Exception("Mining result parent is no longer the best tip")
+        
+        return assemble_block(
+            [],
+            previous_block,
+            ProblemTier(result.job.tier),
+            result.problem,
+            result.solution,
+            solve_time=result.solve_time,
+            verify_time=result.verify_time,
+            solve_memory=result.solve_memory,
+            verify_memory=result.verify_memory
+        )
+    
     def _solve_problem(self, problem: Dict[str, Any]) -> Any:
         """
         Solve a computational problem (simplified implementation).
@@ -560,7 +640,7 @@ class Node:
         if not self.problem_pool:
             # Initialize problem pool if not already done
             if self.config.enable_user_submissions:
-                self.problem_pool = ProblemPool()
+                self.problem_pool = self._new_problem_pool()
                 self.logger.info("User submissions system initialized")
             else:
                 self.logger.error("User submissions not enabled")
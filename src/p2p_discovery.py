@@ -5,16 +5,23 @@ Implements Critical Complex Equilibrium Conjecture (λ = η = 1/√2 ≈ 0.7071)
 for perfect network balance and peer discovery.
 """
 
-import socket
+import asyncio
 import json
 import time
-import threading
 import logging
 from typing import Dict, List, Set, Optional
 from dataclasses import dataclass
 from enum import Enum
 import math
 
+try:
+    from .async_transport import AsyncTransport, JsonObjectFramer
+except ImportError:
+    from async_transport import AsyncTransport, JsonObjectFramer
+
+
+MAX_DISCOVERY_MESSAGE_SIZE = 256 * 1024  # peer lists are small JSON objects
+
 
 class DiscoveryProtocol(Enum):
     """P2P discovery protocols."""
@@ -94,7 +101,13 @@ class DiscoveryConfig:
 
 
 class P2PDiscoveryService:
-    """Simple P2P discovery service using Critical Complex Equilibrium Conjecture."""
+    """
+    Simple P2P discovery service using Critical Complex Equilibrium Conjecture.
+    
+    Discovery, exchange and cleanup run as tasks on the shared network event
+    loop (see async_transport); connections to bootstrap nodes and peers are
+    pooled and reused between rounds.
+    """
     
     def __init__(self, config: DiscoveryConfig):
         self.config = config
@@ -104,9 +117,17 @@ class P2PDiscoveryService:
         self.discovered_peers: Dict[str, PeerInfo] = {}
         self.connected_peers: Set[str] = set()
         
-        # Discovery state
+        # Discovery state: the legacy protocol sends bare JSON objects
         self.running = False
-        self.discovery_threads: List[threading.Thread] = []
+        self.transport = AsyncTransport(
+            name="discovery",
+            framer_factory=JsonObjectFramer,
+            connect_timeout=5.0,
+            request_timeout=5.0,
+            idle_timeout=config.peer_timeout,
+            max_frame_size=MAX_DISCOVERY_MESSAGE_SIZE
+        )
+        self.discovery_tasks: List[asyncio.Task] = []
         
         # Critical Complex Equilibrium state
         self.lambda_coupling_state = 0.0  # Current coupling state
@@ -120,21 +141,15 @@ class P2PDiscoveryService:
         try:
             self.logger.info("🌐 Starting P2P discovery service with λ = η = 1/√2 ≈ 0.7071...")
             self.running = True
-            
-            # Start λ-coupling bootstrap discovery
-            self._start_lambda_coupling_discovery()
-            
-            # Start η-damping peer exchange
-            self._start_eta_damping_exchange()
-            
-            # Start equilibrium cleanup
-            self._start_equilibrium_cleanup()
+            self.transport.start()
+            self.transport.run(self._start_tasks(), timeout=10.0)
             
             self.logger.info("✅ P2P discovery service started with perfect network equilibrium")
             return True
             
         except Exception as e:
             self.logger.error(f"❌ Failed to start discovery service: {e}")
+            self.running = False
             return False
     
     def stop(self) -> None:
@@ -142,10 +157,12 @@ class P2PDiscoveryService:
         self.logger.info("🛑 Stopping P2P discovery service...")
         self.running = False
         
-        # Wait for threads to finish
-        for thread in self.discovery_threads:
-            if thread.is_alive():
-                thread.join(timeout=5.0)
+        if self.transport.running:
+            try:
+                self.transport.run(self._stop_tasks(), timeout=10.0)
+            except Exception as e:
+                self.logger.debug(f"Error stopping discovery tasks: {e}")
+            self.transport.stop()
         
         self.logger.info("✅ P2P discovery service stopped")
     
@@ -158,176 +175,157 @@ class P2PDiscoveryService:
         return [peer for peer in self.discovered_peers.values() 
                 if peer.peer_id in self.connected_peers]
     
-    def _start_lambda_coupling_discovery(self) -> None:
-        """Start λ-coupling bootstrap discovery for perfect network equilibrium."""
-        def lambda_coupling_loop():
-            while self.running:
-                try:
-                    # Apply λ-coupling to bootstrap discovery
-                    self.lambda_coupling_state = self.config.LAMBDA
-                    self._discover_from_bootstrap_nodes()
-                    
-                    # Update coupling state
-                    self.lambda_coupling_state *= 0.9  # Decay
-                    
-                    time.sleep(self.config.bootstrap_interval)
-                except Exception as e:
-                    self.logger.error(f"λ-coupling discovery error: {e}")
-                    time.sleep(5.0)
-        
-        thread = threading.Thread(target=lambda_coupling_loop, daemon=True)
-        thread.start()
-        self.discovery_threads.append(thread)
+    async def _start_tasks(self) -> None:
+        # λ-coupling bootstrap discovery, η-damping peer exchange, equilibrium cleanup
+        self.discovery_tasks = [
+            asyncio.ensure_future(self._lambda_coupling_loop()),
+            asyncio.ensure_future(self._eta_damping_loop()),
+            asyncio.ensure_future(self._equilibrium_cleanup_loop()),
+        ]
         self.logger.info("🔗 λ-coupling bootstrap discovery started (14.14s intervals)")
-    
-    def _start_eta_damping_exchange(self) -> None:
-        """Start η-damping peer exchange for network stability."""
-        def eta_damping_loop():
-            while self.running:
-                try:
-                    # Apply η-damping to peer exchange
-                    self.eta_damping_state = self.config.ETA
-                    self._exchange_peers_with_connected()
-                    
-                    # Update damping state
-                    self.eta_damping_state *= 0.9  # Decay
-                    
-                    time.sleep(self.config.peer_exchange_interval)
-                except Exception as e:
-                    self.logger.error(f"η-damping exchange error: {e}")
-                    time.sleep(5.0)
-        
-        thread = threading.Thread(target=eta_damping_loop, daemon=True)
-        thread.start()
-        self.discovery_threads.append(thread)
         self.logger.info("🌊 η-damping peer exchange started (14.14s intervals)")
-    
-    def _start_equilibrium_cleanup(self) -> None:
-        """Start equilibrium cleanup for perfect network balance."""
-        def equilibrium_cleanup_loop():
-            while self.running:
-                try:
-                    # Apply equilibrium cleanup
-                    self._cleanup_old_peers()
-                    
-                    # Log equilibrium state
-                    if len(self.discovered_peers) > 0:
-                        self.logger.info(f"⚖️  Network equilibrium: {len(self.discovered_peers)} peers, λ={self.lambda_coupling_state:.3f}, η={self.eta_damping_state:.3f}")
-                    
-                    time.sleep(self.config.cleanup_interval)
-                except Exception as e:
-                    self.logger.error(f"Equilibrium cleanup error: {e}")
-                    time.sleep(30.0)
-        
-        thread = threading.Thread(target=equilibrium_cleanup_loop, daemon=True)
-        thread.start()
-        self.discovery_threads.append(thread)
         self.logger.info("⚖️  Equilibrium cleanup started (70.7s intervals)")
     
-    def _discover_from_bootstrap_nodes(self) -> None:
-        """Discover peers from bootstrap nodes using λ-coupling."""
-        for bootstrap_node in self.config.bootstrap_nodes:
+    async def _stop_tasks(self) -> None:
+        for task in self.discovery_tasks:
+            task.cancel()
+        await asyncio.gather(*self.discovery_tasks, return_exceptions=True)
+        self.discovery_tasks = []
+    
+    async def _lambda_coupling_loop(self) -> None:
+        """λ-coupling bootstrap discovery for perfect network equilibrium."""
+        while self.running:
             try:
-                host, port = bootstrap_node.split(':')
-                port = int(port)
+                # Apply λ-coupling to bootstrap discovery
+                self.lambda_coupling_state = self.config.LAMBDA
+                await self._discover_from_bootstrap_nodes()
                 
-                self.logger.info(f"🔍 λ-coupling query to bootstrap: {bootstrap_node}")
+                # Update coupling state
+                self.lambda_coupling_state *= 0.9  # Decay
                 
-                # Connect to bootstrap node
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(5.0)
+                await asyncio.sleep(self.config.bootstrap_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"λ-coupling discovery error: {e}")
+                await asyncio.sleep(5.0)
+    
+    async def _eta_damping_loop(self) -> None:
+        """η-damping peer exchange for network stability."""
+        while self.running:
+            try:
+                # Apply η-damping to peer exchange
+                self.eta_damping_state = self.config.ETA
+                await self._exchange_peers_with_connected()
                 
-                try:
-                    sock.connect((host, port))
-                    
-                    # Send peer list request with λ-coupling
-                    request = {
-                        "type": "peer_list_request",
-                        "lambda_coupling": self.lambda_coupling_state,
-                        "timestamp": time.time(),
-                        "requester_id": f"λ-coupling-{int(time.time())}"
-                    }
-                    
-                    sock.send(json.dumps(request).encode())
-                    
-                    # Receive peer list response
-                    response_data = sock.recv(4096)
-                    if response_data:
-                        response = json.loads(response_data.decode())
-                        
-                        if response.get("type") == "peer_list_response":
-                            peers = response.get("peers", [])
-                            self.logger.info(f"📡 λ-coupling received {len(peers)} peers from {bootstrap_node}")
-                            
-                            # Add discovered peers with λ-coupling
-                            for peer_data in peers:
-                                self._add_discovered_peer(peer_data, DiscoveryProtocol.BOOTSTRAP)
-                    
-                    sock.close()
-                    
-                except socket.timeout:
-                    self.logger.warning(f"⏰ λ-coupling timeout: {bootstrap_node}")
-                except ConnectionRefusedError:
-                    self.logger.warning(f"❌ Bootstrap not reachable: {bootstrap_node}")
-                except Exception as e:
-                    self.logger.warning(f"⚠️  λ-coupling error with {bootstrap_node}: {e}")
-                finally:
-                    try:
-                        sock.close()
-                    except:
-                        pass
-                        
+                # Update damping state
+                self.eta_damping_state *= 0.9  # Decay
+                
+                await asyncio.sleep(self.config.peer_exchange_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"η-damping exchange error: {e}")
+                await asyncio.sleep(5.0)
+    
+    async def _equilibrium_cleanup_loop(self) -> None:
+        """Equilibrium cleanup for perfect network balance."""
+        while self.running:
+            try:
+                # Apply equilibrium cleanup
+                self._cleanup_old_peers()
+                
+                # Log equilibrium state
+                if len(self.discovered_peers) > 0:
+                    self.logger.info(f"⚖️  Network equilibrium: {len(self.discovered_peers)} peers, λ={self.lambda_coupling_state:.3f}, η={self.eta_damping_state:.3f}")
+                
+                await asyncio.sleep(self.config.cleanup_interval)
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
-                self.logger.error(f"❌ λ-coupling error processing {bootstrap_node}: {e}")
+                self.logger.error(f"Equilibrium cleanup error: {e}")
+                await asyncio.sleep(30.0)
+    
+    async def _request_json(self, host: str, port: int, request: Dict[str, any], timeout: float) -> Dict[str, any]:
+        """Send one JSON request on a pooled connection and decode the reply."""
+        response_data = await self.transport.request(host, port, json.dumps(request).encode(), timeout)
+        return json.loads(response_data.decode())
+    
+    async def _discover_from_bootstrap_nodes(self) -> None:
+        """Discover peers from all bootstrap nodes concurrently using λ-coupling."""
+        await asyncio.gather(*(self._query_bootstrap_node(node) for node in self.config.bootstrap_nodes))
     
-    def _exchange_peers_with_connected(self) -> None:
-        """Exchange peer lists with connected peers using η-damping."""
+    async def _query_bootstrap_node(self, bootstrap_node: str) -> None:
+        try:
+            host, port = bootstrap_node.split(':')
+            port = int(port)
+            
+            self.logger.info(f"🔍 λ-coupling query to bootstrap: {bootstrap_node}")
+            
+            # Send peer list request with λ-coupling
+            request = {
+                "type": "peer_list_request",
+                "lambda_coupling": self.lambda_coupling_state,
+                "timestamp": time.time(),
+                "requester_id": f"λ-coupling-{int(time.time())}"
+            }
+            
+            try:
+                response = await self._request_json(host, port, request, timeout=5.0)
+            except asyncio.TimeoutError:
+                self.logger.warning(f"⏰ λ-coupling timeout: {bootstrap_node}")
+                return
+            except ConnectionRefusedError:
+                self.logger.warning(f"❌ Bootstrap not reachable: {bootstrap_node}")
+                return
+            except Exception as e:
+                self.logger.warning(f"⚠️  λ-coupling error with {bootstrap_node}: {e}")
+                return
+            
+            if response.get("type") == "peer_list_response":
+                peers = response.get("peers", [])
+                self.logger.info(f"📡 λ-coupling received {len(peers)} peers from {bootstrap_node}")
+                
+                # Add discovered peers with λ-coupling
+                for peer_data in peers:
+                    self._add_discovered_peer(peer_data, DiscoveryProtocol.BOOTSTRAP)
+                    
+        except Exception as e:
+            self.logger.error(f"❌ λ-coupling error processing {bootstrap_node}: {e}")
+    
+    async def _exchange_peers_with_connected(self) -> None:
+        """Exchange peer lists with connected peers concurrently using η-damping."""
         connected_peers = self.get_connected_peers()
         
-        for peer in connected_peers[:3]:  # Limit to 3 peers for η-damping efficiency
+        # Limit to 3 peers for η-damping efficiency
+        await asyncio.gather(*(self._exchange_with_peer(peer) for peer in connected_peers[:3]))
+    
+    async def _exchange_with_peer(self, peer: PeerInfo) -> None:
+        try:
+            # Send η-damping peer exchange request
+            request = {
+                "type": "peer_exchange_request",
+                "eta_damping": self.eta_damping_state,
+                "our_peers": [p.to_dict() for p in self.get_peers()[:5]],  # Share our top 5 peers
+                "timestamp": time.time()
+            }
+            
             try:
-                # Connect to peer and request their peer list
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(3.0)
+                response = await self._request_json(peer.address, peer.port, request, timeout=3.0)
+            except Exception as e:
+                self.logger.debug(f"η-damping exchange with {peer.address} failed: {e}")
+                return
+            
+            if response.get("type") == "peer_exchange_response":
+                their_peers = response.get("peers", [])
+                self.logger.info(f"📡 η-damping received {len(their_peers)} peers from {peer.address}")
                 
-                try:
-                    sock.connect((peer.address, peer.port))
+                # Add their peers with η-damping
+                for peer_data in their_peers:
+                    self._add_discovered_peer(peer_data, DiscoveryProtocol.PEER_EXCHANGE)
                     
-                    # Send η-damping peer exchange request
-                    request = {
-                        "type": "peer_exchange_request",
-                        "eta_damping": self.eta_damping_state,
-                        "our_peers": [p.to_dict() for p in self.get_peers()[:5]],  # Share our top 5 peers
-                        "timestamp": time.time()
-                    }
-                    
-                    sock.send(json.dumps(request).encode())
-                    
-                    # Receive their peer list
-                    response_data = sock.recv(4096)
-                    if response_data:
-                        response = json.loads(response_data.decode())
-                        
-                        if response.get("type") == "peer_exchange_response":
-                            their_peers = response.get("peers", [])
-                            self.logger.info(f"📡 η-damping received {len(their_peers)} peers from {peer.address}")
-                            
-                            # Add their peers with η-damping
-                            for peer_data in their_peers:
-                                self._add_discovered_peer(peer_data, DiscoveryProtocol.PEER_EXCHANGE)
-                    
-                    sock.close()
-                    
-                except Exception as e:
-                    self.logger.debug(f"η-damping exchange with {peer.address} failed: {e}")
-                finally:
-                    try:
-                        sock.close()
-                    except:
-                        pass
-                        
-            except Exception as e:
-                self.logger.error(f"Error in η-damping exchange with {peer.address}: {e}")
+        except Exception as e:
+            self.logger.error(f"Error in η-damping exchange with {peer.address}: {e}")
     
     def _cleanup_old_peers(self) -> None:
         """Remove old and low-reputation peers for equilibrium."""
@@ -347,8 +345,11 @@ class P2PDiscoveryService:
         
         # Remove peers
         for peer_id in peers_to_remove:
-            del self.discovered_peers[peer_id]
+            peer = self.discovered_peers.pop(peer_id)
             self.connected_peers.discard(peer_id)
+            if self.transport.running:
+                self.transport.call_soon(asyncio.ensure_future,
+                                         self.transport.close_connection(peer.address, peer.port))
         
         if peers_to_remove:
             self.logger.info(f"🧹 Equilibrium cleanup: removed {len(peers_to_remove)} peers")
@@ -389,13 +390,10 @@ class P2PDiscoveryService:
             if not peer:
                 return False
             
-            # Test connection
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(3.0)
-            
+            # Open a pooled connection (kept for peer exchange)
             try:
-                sock.connect((peer.address, peer.port))
-                sock.close()
+                self.transport.start()
+                self.transport.run(self.transport.connect(peer.address, peer.port), timeout=5.0)
                 
                 # Mark as connected with equilibrium
                 self.connected_peers.add(peer_id)
@@ -422,7 +420,8 @@ class P2PDiscoveryService:
             "eta_damping_state": self.eta_damping_state,
             "equilibrium_ratio": self.lambda_coupling_state / max(self.eta_damping_state, 0.001),
             "average_reputation": sum(p.reputation for p in self.discovered_peers.values()) / max(len(self.discovered_peers), 1),
-            "discovery_threads": len(self.discovery_threads)
+            "discovery_tasks": len(self.discovery_tasks),
+            "transport": self.transport.get_stats()
         }
 
 
@@ -10,7 +10,7 @@ import hashlib
 import time
 import math
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from typing import Dict, Any, Optional, List
 from enum import Enum
 
@@ -21,6 +21,7 @@ try:
         calculate_computational_work_score,
         generate_subset_sum_problem, solve_subset_sum, subset_sum_complexity
     )
+    from .streaming_stats import RollingWindow
 except ImportError:
     # Fallback for direct execution
     from core.blockchain import (
@@ -28,6 +29,7 @@ except ImportError:
         calculate_computational_work_score,
         generate_subset_sum_problem, solve_subset_sum, subset_sum_complexity
     )
+    from streaming_stats import RollingWindow
 
 
 # Constants
@@ -36,6 +38,7 @@ DEFAULT_TARGET_BLOCK_TIME = 30.0  # 30 seconds
 DIFFICULTY_ALPHA = 0.1  # EWMA smoothing factor
 MIN_TARGET = 100.0  # Minimum difficulty target
 MAX_TARGET = 1000000.0  # Maximum difficulty target
+DIFFICULTY_WINDOW = 100  # Observed scores used for the median
 
 
 def derive_epoch_salt(parent_hash: bytes, timestamp: int, epoch_duration: int = DEFAULT_EPOCH_DURATION) -> bytes:
@@ -326,6 +329,8 @@ class DifficultyAdjuster:
     Difficulty adjustment system using EWMA of observed scores.
     
     Implements the difficulty mapping from pow.md specification.
+    The median of the last `window_size` scores comes from a sorted rolling
+    window, so an update does not re-sort the history.
     """
     
     target_block_time: float = DEFAULT_TARGET_BLOCK_TIME
@@ -333,12 +338,13 @@ class DifficultyAdjuster:
     min_target: float = MIN_TARGET
     max_target: float = MAX_TARGET
     current_target: float = 1000.0  # Initial target
-    observed_scores: List[float] = None
+    observed_scores: Optional[RollingWindow] = None
+    window_size: int = DIFFICULTY_WINDOW
     
     def __post_init__(self):
-        """Initialize observed scores list."""
-        if self.observed_scores is None:
-            self.observed_scores = []
+        """Initialize the observed score window (a list of scores is accepted, e.g. from a snapshot)."""
+        if not isinstance(self.observed_scores, RollingWindow):
+            self.observed_scores = RollingWindow(self.window_size, ordered=True, values=self.observed_scores or ())
     
     def update(self, observed_score: float, block_time: float) -> None:
         """
@@ -348,15 +354,11 @@ class DifficultyAdjuster:
             observed_score: Work score of the solved block
             block_time: Time taken to mine the block
         """
-        self.observed_scores.append(observed_score)
-        
-        # Keep only recent scores (last 100 blocks)
-        if len(self.observed_scores) > 100:
-            self.observed_scores = self.observed_scores[-100:]
+        # Keeps only recent scores (last window_size blocks)
+        self.observed_scores.push(observed_score)
         
         # Calculate median score
-        sorted_scores = sorted(self.observed_scores)
-        median_score = sorted_scores[len(sorted_scores) // 2]
+        median_score = self.observed_scores.median_high()
         
         # EWMA update: next_target = alpha * prev_target + (1-alpha) * median_score
         # Adjust based on block time ratio
@@ -368,6 +370,17 @@ class DifficultyAdjuster:
         # Clamp to bounds
         self.current_target = max(self.min_target, min(self.max_target, self.current_target))
     
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        JSON-serializable state; DifficultyAdjuster(**state) restores it.
+        
+        Returns:
+            Field values, with observed scores as a list (oldest first)
+        """
+        state = {f.name: getattr(self, f.name) for f in fields(self)}
+        state['observed_scores'] = self.observed_scores.values()
+        return state
+    
     def get_current_target(self) -> float:
         """
         Get the current difficulty target.
@@ -0,0 +1,317 @@
+"""
+Module: proof_cache
+
+Two-tier cache for immutable, CID-addressed content (proof bundles).
+
+    memory  OrderedDict LRU bounded by total bytes
+    disk    optional spill directory bounded by total bytes; entries evicted
+            from memory are written here and promoted back on a hit
+
+A CID never changes meaning, so entries never need invalidating, only
+evicting. Misses are loaded through a caller-supplied loader with
+single-flight: concurrent get()s for the same key wait for one load.
+Failed loads (loader returns None or raises) are not cached. Keys must be
+well-formed CIDs (content_store.is_valid_cid), since they name spill files;
+get() and put() raise ValueError otherwise.
+
+get_object() adds a small count-bounded tier of decoded objects (JSON by
+default) for hot API paths; returned objects are shared and must be
+treated as read-only.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+try:
+    from .content_store import is_valid_cid
+except ImportError:
+    from content_store import is_valid_cid
+
+
+DEFAULT_MEMORY_BYTES = 64 * 1024 * 1024  # 64MB
+DEFAULT_DISK_BYTES = 1024 * 1024 * 1024  # 1GB
+DEFAULT_MAX_OBJECTS = 4096
+
+Loader = Callable[[], Optional[bytes]]
+
+
+class ProofBundleCache:
+    """
+    Byte-bounded LRU with disk spill, single-flight loads and hit metrics.
+
+    Usage:
+        data = cache.get(cid, lambda: ipfs_client.get(cid))
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes: int = DEFAULT_MEMORY_BYTES,
+        disk_dir: Optional[str] = None,
+        max_disk_bytes: int = DEFAULT_DISK_BYTES,
+        max_objects: int = DEFAULT_MAX_OBJECTS
+    ):
+        """
+        Args:
+            max_memory_bytes: Budget for the in-memory tier
+            disk_dir: Spill directory (memory only if None)
+            max_disk_bytes: Budget for the disk tier
+            max_objects: Decoded objects kept by get_object()
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.max_objects = max_objects
+
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: "OrderedDict[str, int]" = OrderedDict()  # key -> size, LRU order
+        self._disk_bytes = 0
+        self._objects: "OrderedDict[str, Any]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = defaultdict(int)
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._scan_disk()
+
+    # ---- public API ----
+
+    def get(self, key: str, loader: Optional[Loader] = None) -> Optional[bytes]:
+        """
+        Cached bytes for key, loading them on a miss.
+
+        Args:
+            key: CID (or other immutable content key)
+            loader: Called once per miss across concurrent callers
+
+        Returns:
+            Content bytes, or None if absent and not loadable
+
+        Raises:
+            ValueError: If key is not a well-formed CID
+        """
+        self._check_key(key)
+        with self._lock:
+            data = self._lookup_memory(key)
+            if data is not None:
+                return data
+            on_disk = key in self._disk
+            if not on_disk and loader is None:
+                self.stats["misses"] += 1
+                return None
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+            elif not on_disk:
+                self.stats["misses"] += 1
+                self.stats["coalesced"] += 1
+
+        if not owner:
+            return future.result()
+
+        # Disk reads and loads run outside the lock; the in-flight future
+        # keeps other callers for this key waiting on this one
+        data = None
+        from_disk = False
+        failed = False
+        loaded = False
+        try:
+            if on_disk:
+                data = self._read_disk(key)
+                from_disk = data is not None
+            if data is None and loader is not None:
+                loaded = True
+                data = loader()
+        except Exception:
+            failed = True
+        finally:
+            with self._lock:
+                if from_disk:
+                    self.stats["disk_hits"] += 1
+                    if key in self._disk:
+                        self._disk.move_to_end(key)
+                    self._insert_memory(key, data, spill=False)
+                else:
+                    if on_disk:
+                        # File vanished or unreadable: forget the entry
+                        self._disk_bytes -= self._disk.pop(key, 0)
+                    self.stats["misses"] += 1
+                    if loaded:
+                        self.stats["loads"] += 1
+                        self.stats["load_errors"] += failed
+                        if data is not None:
+                            self._insert_memory(key, data)
+                del self._inflight[key]
+            future.set_result(data)
+        return data
+
+    def get_object(self, key: str, loader: Optional[Loader] = None,
+                   decode: Callable[[bytes], Any] = json.loads) -> Optional[Any]:
+        """
+        Decoded content for key (JSON by default), cached after first decode.
+
+        Returns:
+            Decoded object (shared: do not mutate), or None
+        """
+        with self._lock:
+            obj = self._objects.get(key)
+            if obj is not None:
+                self._objects.move_to_end(key)
+                self.stats["object_hits"] += 1
+                return obj
+        data = self.get(key, loader)
+        if data is None:
+            return None
+        obj = decode(data)
+        with self._lock:
+            self._objects[key] = obj
+            self._objects.move_to_end(key)
+            while len(self._objects) > self.max_objects:
+                self._objects.popitem(last=False)
+        return obj
+
+    def put(self, key: str, data: bytes):
+        """Insert known content (e.g. right after uploading it)."""
+        self._check_key(key)
+        with self._lock:
+            if key not in self._memory:
+                self._insert_memory(key, data)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._memory or key in self._disk
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            hits = stats.get("memory_hits", 0) + stats.get("disk_hits", 0)
+            lookups = hits + stats.get("misses", 0)
+            stats.update({
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+                "object_entries": len(self._objects),
+                "hit_rate": hits / lookups if lookups else 0.0,
+            })
+            return stats
+
+    @staticmethod
+    def _check_key(key: str):
+        if not is_valid_cid(key):
+            raise ValueError(f"Malformed CID: {key!r}")
+
+    # ---- tiers (called with the lock held, except _read_disk) ----
+
+    def _lookup_memory(self, key: str) -> Optional[bytes]:
+        data = self._memory.get(key)
+        if data is not None:
+            self._memory.move_to_end(key)
+            self.stats["memory_hits"] += 1
+        return data
+
+    def _insert_memory(self, key: str, data: bytes, spill: bool = True):
+        # Replace rather than double-count a key inserted concurrently (put() during a load)
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        if len(data) > self.max_memory_bytes:
+            # Too big for memory: straight to disk
+            if spill:
+                self._write_disk(key, data)
+            return
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.max_memory_bytes:
+            old_key, old_data = self._memory.popitem(last=False)
+            self._memory_bytes -= len(old_data)
+            self.stats["memory_evictions"] += 1
+            if old_key not in self._disk:
+                self._write_disk(old_key, old_data)
+
+    def _path(self, key: str) -> str:
+        shard = key[-3:-1] if len(key) >= 3 else "_"
+        path = os.path.realpath(os.path.join(self.disk_dir, shard, key))
+        if os.path.dirname(os.path.dirname(path)) != os.path.realpath(self.disk_dir):
+            raise ValueError(f"Cache path escapes disk_dir: {key!r}")
+        return path
+
+    def _scan_disk(self):
+        entries = []
+        for shard in os.listdir(self.disk_dir):
+            shard_dir = os.path.join(self.disk_dir, shard)
+            if not os.path.isdir(shard_dir):
+                continue
+            for name in os.listdir(shard_dir):
+                if name.startswith(".tmp-"):
+                    os.unlink(os.path.join(shard_dir, name))
+                    continue
+                if not is_valid_cid(name):
+                    continue
+                st = os.stat(os.path.join(shard_dir, name))
+                entries.append((st.st_mtime, name, st.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+
+    def _write_disk(self, key: str, data: bytes):
+        if not self.disk_dir or len(data) > self.max_disk_bytes:
+            return
+        try:
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except (OSError, ValueError):
+            self.stats["disk_errors"] += 1
+            return
+        self._disk[key] = len(data)
+        self._disk_bytes += len(data)
+        self.stats["disk_spills"] += 1
+        while self._disk_bytes > self.max_disk_bytes:
+            old_key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            self.stats["disk_evictions"] += 1
+            try:
+                os.unlink(self._path(old_key))
+            except (OSError, ValueError):
+                pass
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        """Read a spilled entry (called without the lock; None if the file is gone)."""
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except (OSError, ValueError):
+            return None
+
+
+_shared_cache: Optional[ProofBundleCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_proof_cache() -> ProofBundleCache:
+    """
+    Process-wide proof bundle cache.
+
+    Sized by $COINJECTURE_PROOF_CACHE_MB (memory, default 64) and spilled
+    to $COINJECTURE_PROOF_CACHE_DIR when set.
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            memory_mb = int(os.environ.get("COINJECTURE_PROOF_CACHE_MB", DEFAULT_MEMORY_BYTES // (1024 * 1024)))
+            _shared_cache = ProofBundleCache(
+                max_memory_bytes=memory_mb * 1024 * 1024,
+                disk_dir=os.environ.get("COINJECTURE_PROOF_CACHE_DIR") or None
+            )
+        return _shared_cache
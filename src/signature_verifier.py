@@ -0,0 +1,386 @@
+"""
+Module: signature_verifier
+
+Batched Ed25519 verification shared by mempool admission and block ingest.
+
+    verify()        one signature, answered from the cache when possible
+    verify_batch()  many signatures: cache hits and duplicates are removed,
+                    the rest are split across a worker pool (small batches
+                    are verified inline, where IPC would cost more than it
+                    saves)
+    submit()        queue one signature from any thread; a dispatcher
+                    collects submissions into batches (up to batch_size, or
+                    whatever arrived within max_delay) and resolves the
+                    returned Future. A lone submission is dispatched at
+                    once; the dispatcher only waits when others are queued
+
+Successfully verified (public key, message, signature) triples are kept in a
+bounded LRU keyed by their SHA-256, so a transaction checked on mempool
+admission is not verified again when its block arrives. Failures are not
+cached.
+
+Ed25519 libraries in Python verify one signature per call (no
+multi-scalar batch equation), so "batching" here amortises dispatch and
+spreads work across cores; worker processes are used by default because the
+backends do not reliably release the GIL.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger('coinjecture-signature-verifier')
+
+# (public key, message, signature), all raw bytes
+SignatureItem = Tuple[bytes, bytes, bytes]
+
+DEFAULT_CACHE_SIZE = 200_000
+DEFAULT_BATCH_SIZE = 512
+DEFAULT_MAX_DELAY = 0.005  # seconds a submit() waits for its batch to fill
+DEFAULT_MIN_PARALLEL = 256  # smaller batches are verified inline
+
+_backends: Optional[List[Callable[[bytes, bytes, bytes], bool]]] = None
+
+
+def _load_backends() -> List[Callable[[bytes, bytes, bytes], bool]]:
+    """Every available Ed25519 implementation, fastest first."""
+    backends = []
+    try:
+        from cryptography.exceptions import InvalidSignature
+        from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+
+        def verify_cryptography(public_key: bytes, message: bytes, signature: bytes) -> bool:
+            try:
+                Ed25519PublicKey.from_public_bytes(public_key).verify(signature, message)
+                return True
+            except (InvalidSignature, ValueError):
+                return False
+
+        backends.append(verify_cryptography)
+    except ImportError:
+        pass
+
+    try:
+        import nacl.exceptions
+        import nacl.signing
+
+        def verify_nacl(public_key: bytes, message: bytes, signature: bytes) -> bool:
+            try:
+                nacl.signing.VerifyKey(public_key).verify(message, signature)
+                return True
+            except (nacl.exceptions.BadSignatureError, ValueError, TypeError):
+                return False
+
+        backends.append(verify_nacl)
+    except ImportError:
+        pass
+
+    try:
+        import ed25519
+
+        def verify_pure(public_key: bytes, message: bytes, signature: bytes) -> bool:
+            try:
+                ed25519.VerifyingKey(public_key).verify(signature, message)
+                return True
+            except Exception:
+                return False
+
+        backends.append(verify_pure)
+    except ImportError:
+        pass
+
+    if not backends:
+        raise ImportError("No Ed25519 implementation available (install cryptography)")
+    return backends
+
+
+def verify_one(public_key: bytes, message: bytes, signature: bytes) -> bool:
+    """
+    Verify a single Ed25519 signature without caching.
+
+    Accepted if any installed implementation accepts it, as wallet
+    verification always has (implementations differ on edge-case encodings,
+    e.g. browser-produced signatures checked by PyNaCl). Valid signatures
+    stop at the first backend; only rejections try the rest.
+    """
+    global _backends
+    if _backends is None:
+        _backends = _load_backends()
+    if len(public_key) != 32 or len(signature) != 64:
+        return False
+    return any(backend(public_key, message, signature) for backend in _backends)
+
+
+def verify_chunk(items: Sequence[SignatureItem]) -> List[bool]:
+    """Verify a list of triples. Runs inside a worker process."""
+    return [verify_one(public_key, message, signature) for public_key, message, signature in items]
+
+
+def signature_cache_key(public_key: bytes, message: bytes, signature: bytes) -> bytes:
+    """Cache key for a triple (lengths prefixed so fields cannot run together)."""
+    digest = hashlib.sha256()
+    digest.update(len(public_key).to_bytes(2, "big"))
+    digest.update(public_key)
+    digest.update(signature)
+    digest.update(message)
+    return digest.digest()
+
+
+class SignatureVerifier:
+    """
+    Ed25519 verification with batching, a worker pool and a verified cache.
+
+    Usage:
+        verifier = get_signature_verifier()
+        ok = verifier.verify(public_key, message, signature)
+        results = verifier.verify_batch([(pk, msg, sig), ...])
+        future = verifier.submit(pk, msg, sig)
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        min_parallel: int = DEFAULT_MIN_PARALLEL,
+        executor_factory: Optional[Callable[[int], Executor]] = None
+    ):
+        """
+        Args:
+            workers: Worker pool size (default: CPU count; 1 verifies inline)
+            cache_size: Verified triples remembered
+            batch_size: Max signatures per submit() batch
+            max_delay: Max seconds a submit() waits for its batch to fill
+                (only while other submissions are queued)
+            min_parallel: Batches smaller than this skip the worker pool
+            executor_factory: Builds the pool (default: ProcessPoolExecutor)
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.min_parallel = min_parallel
+        self._executor_factory = executor_factory or (lambda n: ProcessPoolExecutor(max_workers=n))
+        self._executor: Optional[Executor] = None
+
+        self._cache: "OrderedDict[bytes, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = defaultdict(int)
+
+        self._queue: List[Tuple[SignatureItem, Future]] = []
+        self._queue_ready = threading.Condition(threading.Lock())
+        self._dispatcher: Optional[threading.Thread] = None
+        self._closed = False
+
+    # ---- synchronous API ----
+
+    def verify(self, public_key: bytes, message: bytes, signature: bytes) -> bool:
+        """
+        Verify one signature (cached).
+
+        Returns:
+            True if the signature is valid
+        """
+        key = signature_cache_key(public_key, message, signature)
+        if self._cache_hit(key):
+            return True
+        valid = verify_one(public_key, message, signature)
+        with self._lock:
+            self.stats["verified"] += 1
+            if valid:
+                self._cache_store(key)
+            else:
+                self.stats["invalid"] += 1
+        return valid
+
+    def verify_batch(self, items: Sequence[SignatureItem]) -> List[bool]:
+        """
+        Verify many signatures.
+
+        Args:
+            items: (public_key, message, signature) triples
+
+        Returns:
+            One result per item, in order
+        """
+        results: List[Optional[bool]] = [None] * len(items)
+        pending: Dict[bytes, List[int]] = {}
+        with self._lock:
+            self.stats["batches"] += 1
+            for index, (public_key, message, signature) in enumerate(items):
+                key = signature_cache_key(public_key, message, signature)
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    self.stats["cache_hits"] += 1
+                    results[index] = True
+                elif key in pending:
+                    pending[key].append(index)
+                    self.stats["deduplicated"] += 1
+                else:
+                    pending[key] = [index]
+
+        if pending:
+            keys = list(pending)
+            unique = [items[pending[key][0]] for key in keys]
+            verdicts = self._verify_uncached(unique)
+            with self._lock:
+                self.stats["verified"] += len(unique)
+                for key, valid in zip(keys, verdicts):
+                    if valid:
+                        self._cache_store(key)
+                    else:
+                        self.stats["invalid"] += 1
+                    for index in pending[key]:
+                        results[index] = valid
+        return results
+
+    def _verify_uncached(self, items: List[SignatureItem]) -> List[bool]:
+        if self.workers <= 1 or len(items) < self.min_parallel:
+            return verify_chunk(items)
+        try:
+            executor = self._get_executor()
+            chunk_size = -(-len(items) // self.workers)
+            chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+            results: List[bool] = []
+            for chunk_results in executor.map(verify_chunk, chunks):
+                results.extend(chunk_results)
+            with self._lock:
+                self.stats["parallel_batches"] += 1
+            return results
+        except Exception as e:
+            logger.warning(f"Worker pool verification failed, verifying inline: {e}")
+            return verify_chunk(items)
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._executor_factory(self.workers)
+            return self._executor
+
+    # ---- cache (called with the lock held, except _cache_hit) ----
+
+    def _cache_hit(self, key: bytes) -> bool:
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.stats["cache_hits"] += 1
+                return True
+            return False
+
+    def _cache_store(self, key: bytes):
+        self._cache[key] = None
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+            self.stats["cache_evictions"] += 1
+
+    def is_cached(self, public_key: bytes, message: bytes, signature: bytes) -> bool:
+        """True if this triple has already been verified."""
+        with self._lock:
+            return signature_cache_key(public_key, message, signature) in self._cache
+
+    # ---- asynchronous API ----
+
+    def submit(self, public_key: bytes, message: bytes, signature: bytes) -> Future:
+        """
+        Queue a signature for the next batch.
+
+        Returns:
+            Future resolving to True/False
+        """
+        future: Future = Future()
+        key = signature_cache_key(public_key, message, signature)
+        if self._cache_hit(key):
+            future.set_result(True)
+            return future
+
+        with self._queue_ready:
+            if self._closed:
+                raise RuntimeError("SignatureVerifier is closed")
+            self._queue.append(((public_key, message, signature), future))
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(
+                    target=self._dispatch_loop, name="signature-verifier", daemon=True
+                )
+                self._dispatcher.start()
+            self._queue_ready.notify()
+        return future
+
+    def _dispatch_loop(self):
+        while True:
+            with self._queue_ready:
+                while not self._queue and not self._closed:
+                    self._queue_ready.wait()
+                if not self._queue and self._closed:
+                    return
+                # Give concurrent submitters a moment to fill the batch; a
+                # lone submission (serial callers) is not held back
+                deadline = time.monotonic() + self.max_delay
+                while 1 < len(self._queue) < self.batch_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._queue_ready.wait(remaining)
+                batch, self._queue = self._queue[:self.batch_size], self._queue[self.batch_size:]
+
+            try:
+                results = self.verify_batch([item for item, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), valid in zip(batch, results):
+                future.set_result(valid)
+
+    # ---- lifecycle ----
+
+    def close(self):
+        """Drain queued submissions and shut the worker pool down."""
+        with self._queue_ready:
+            self._closed = True
+            self._queue_ready.notify_all()
+            dispatcher = self._dispatcher
+        if dispatcher is not None:
+            dispatcher.join()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats.update({
+                "cache_entries": len(self._cache),
+                "cache_size": self.cache_size,
+                "workers": self.workers,
+            })
+        with self._queue_ready:
+            stats["queued"] = len(self._queue)
+        return stats
+
+
+_shared_verifier: Optional[SignatureVerifier] = None
+_shared_verifier_lock = threading.Lock()
+
+
+def get_signature_verifier() -> SignatureVerifier:
+    """
+    Process-wide signature verifier.
+
+    Pool size from $COINJECTURE_VERIFY_WORKERS (default: CPU count), cache
+    size from $COINJECTURE_SIGNATURE_CACHE (default 200000).
+    """
+    global _shared_verifier
+    with _shared_verifier_lock:
+        if _shared_verifier is None:
+            workers = int(os.environ.get("COINJECTURE_VERIFY_WORKERS", 0)) or None
+            cache_size = int(os.environ.get("COINJECTURE_SIGNATURE_CACHE", DEFAULT_CACHE_SIZE))
+            _shared_verifier = SignatureVerifier(workers=workers, cache_size=cache_size)
+        return _shared_verifier
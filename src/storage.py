@@ -7,23 +7,43 @@ and pruning strategies per node role.
 """
 
 import os
-import json
 import time
 import hashlib
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Set, Any, Union
 from enum import Enum
 import sqlite3
+import threading
+import atexit
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 
 # Import from existing modules
 try:
     from .core.blockchain import Block, ProblemTier
     from .pow import ProblemRegistry
+    from .content_store import LocalBlobStore
+    from .proof_cache import ProofBundleCache
+    from .storage_codec import (
+        encode_header_record, decode_header_record,
+        encode_block_record, decode_block_record
+    )
 except ImportError:
     # Fallback for direct execution
     from core.blockchain import Block, ProblemTier
     from pow import ProblemRegistry
+    from content_store import LocalBlobStore
+    from proof_cache import ProofBundleCache
+    from storage_codec import (
+        encode_header_record, decode_header_record,
+        encode_block_record, decode_block_record
+    )
+
+
+# PRAGMA user_version once legacy JSON rows have been rewritten as binary records
+BINARY_RECORDS_SCHEMA_VERSION = 1
 
 
 class NodeRole(Enum):
@@ -48,9 +68,14 @@ class StorageConfig:
     role: NodeRole
     pruning_mode: PruningMode
     ipfs_api_url: str = "http://localhost:5001"
+    ipfs_local_dir: Optional[str] = None  # Use a LocalBlobStore here instead of the daemon
     max_bundle_epochs: int = 10  # For FULL mode
     batch_size: int = 100
     fsync_interval: int = 10  # Sync every N blocks
+    write_behind: bool = True  # Buffer writes and flush them in bulk transactions
+    flush_interval: float = 1.0  # Max seconds a buffered write waits before flushing
+    proof_cache_bytes: int = 64 * 1024 * 1024  # In-memory proof bundle cache budget
+    proof_cache_dir: Optional[str] = None  # Disk spill for the cache (default: <data_dir>/proof_cache)
 
 
 @dataclass
@@ -59,6 +84,11 @@ class IPFSClient:
     IPFS client for proof bundle storage.
     
     Implements the IPFS client interface from storage.md specification.
+    
+    All calls share one requests.Session, so connections to the daemon are
+    kept alive and pooled (up to pool_size); add_many/get_many and the
+    *_async variants fan out over a thread pool of the same size. Use
+    get_ipfs_client() to share one instance per endpoint.
     """
     
     api_url: str = "http://localhost:5001"
@@ -67,14 +97,39 @@ class IPFSClient:
     retry_delay: float = 1.0
     pinata_api_key: Optional[str] = None
     pinata_secret_key: Optional[str] = None
+    pool_size: int = 16
     
     def __post_init__(self):
         """Initialize IPFS client."""
         self._session = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
         self._health_check_interval = 60  # seconds
         self._last_health_check = 0
         self._is_healthy = False
     
+    def _http(self):
+        """Shared keep-alive session, created on first use."""
+        with self._lock:
+            if self._session is None:
+                try:
+                    import requests  # type: ignore  # External dependency
+                    from requests.adapters import HTTPAdapter  # type: ignore
+                except ImportError:
+                    raise Exception("requests library not available. Install with: pip install requests")
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+    
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="ipfs")
+            return self._executor
+    
     def _make_request(self, endpoint: str, method: str = "GET", data: Optional[bytes] = None) -> Dict[str, Any]:
         """
         Make HTTP request to IPFS API.
@@ -87,19 +142,15 @@ class IPFSClient:
         Returns:
             Response data
         """
-        try:
-            import requests  # type: ignore  # External dependency
-        except ImportError:
-            raise Exception("requests library not available. Install with: pip install requests")
-        
+        session = self._http()
         url = f"{self.api_url}/api/v0/{endpoint}"
         
         for attempt in range(self.max_retries):
             try:
                 if method == "POST":
-                    response = requests.post(url, data=data, timeout=self.timeout)
+                    response = session.post(url, data=data, timeout=self.timeout)
                 else:
-                    response = requests.get(url, timeout=self.timeout)
+                    response = session.get(url, timeout=self.timeout)
                 
                 response.raise_for_status()
                 return response.json() if response.content else {}
@@ -119,17 +170,14 @@ class IPFSClient:
         Returns:
             IPFS CID
         """
-        try:
-            import requests  # type: ignore  # External dependency
-        except ImportError:
-            raise Exception("requests library not available. Install with: pip install requests")
+        session = self._http()
         
         try:
             url = f"{self.api_url}/api/v0/add"
             files = {"file": ("data", obj_bytes, "application/octet-stream")}
             # Force CIDv0 format (base58btc) for compatibility
             params = {"cid-version": "0"}
-            response = requests.post(url, files=files, params=params, timeout=self.timeout)
+            response = session.post(url, files=files, params=params, timeout=self.timeout)
             response.raise_for_status()
             result = response.json()
             cid = result.get("Hash", "")
@@ -152,20 +200,56 @@ class IPFSClient:
         Returns:
             Object data
         """
-        try:
-            import requests  # type: ignore  # External dependency
-        except ImportError:
-            raise Exception("requests library not available. Install with: pip install requests")
+        session = self._http()
         
         try:
             url = f"{self.api_url}/api/v0/cat"
             files = {"arg": (None, cid)}
-            response = requests.post(url, files=files, timeout=self.timeout)
+            response = session.post(url, files=files, timeout=self.timeout)
             response.raise_for_status()
             return response.content
         except Exception as e:
             raise Exception(f"Failed to get object from IPFS: {e}")
     
+    def add_many(self, objects: List[bytes]) -> List[str]:
+        """
+        Add several objects concurrently over the pooled connections.
+        
+        Args:
+            objects: Object data to store
+            
+        Returns:
+            CIDs in input order (raises if any add fails)
+        """
+        return list(self._pool().map(self.add, objects))
+    
+    def get_many(self, cids: List[str]) -> Dict[str, Optional[bytes]]:
+        """
+        Fetch several objects concurrently over the pooled connections.
+        
+        Args:
+            cids: IPFS CIDs
+            
+        Returns:
+            cid -> data, None for CIDs that could not be fetched
+        """
+        def fetch(cid):
+            try:
+                return self.get(cid)
+            except Exception:
+                return None
+        return dict(zip(cids, self._pool().map(fetch, cids)))
+    
+    async def add_async(self, obj_bytes: bytes) -> str:
+        """add() on the client's pool, awaitable from an event loop."""
+        import asyncio
+        return await asyncio.get_running_loop().run_in_executor(self._pool(), self.add, obj_bytes)
+    
+    async def get_async(self, cid: str) -> bytes:
+        """get() on the client's pool, awaitable from an event loop."""
+        import asyncio
+        return await asyncio.get_running_loop().run_in_executor(self._pool(), self.get, cid)
+    
     def pin(self, cid: str) -> bool:
         """
         Pin object in IPFS.
@@ -177,12 +261,23 @@ class IPFSClient:
             True if successful
         """
         try:
-            self._make_request(f"pin/add?arg={cid}")
+            # The RPC API only accepts POST
+            self._make_request(f"pin/add?arg={cid}", method="POST")
             return True
         except Exception as e:
             print(f"Warning: Failed to pin CID {cid}: {e}")
             return False
     
+    def close(self):
+        """Close pooled connections and worker threads."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+    
     def health_check(self) -> bool:
         """
         Check IPFS node health.
@@ -236,8 +331,8 @@ class IPFSClient:
             return False  # Pinata not configured
         
         try:
-            import requests  # type: ignore  # External dependency
-        except ImportError:
+            session = self._http()
+        except Exception:
             return False
         
         try:
@@ -264,7 +359,7 @@ class IPFSClient:
                 }
             }
             
-            response = requests.post(url, headers=headers, json=data, timeout=self.timeout)
+            response = session.post(url, headers=headers, json=data, timeout=self.timeout)
             response.raise_for_status()
             
             return True
@@ -273,11 +368,127 @@ class IPFSClient:
             return False
 
 
+# Process-wide clients, one per endpoint, so callers share pooled connections
+_ipfs_clients: Dict[str, Union[IPFSClient, LocalBlobStore]] = {}
+_ipfs_clients_lock = threading.Lock()
+
+
+def get_ipfs_client(api_url: str = "http://localhost:5001",
+                    local_dir: Optional[str] = None) -> Union[IPFSClient, LocalBlobStore]:
+    """
+    Shared IPFS client for an endpoint.
+    
+    Args:
+        api_url: IPFS daemon RPC API URL
+        local_dir: Serve content from a LocalBlobStore in this directory instead
+            of the daemon; defaults to $COINJECTURE_IPFS_LOCAL_DIR if set
+            
+    Returns:
+        IPFSClient or LocalBlobStore (same add/get/pin interface)
+    """
+    local_dir = local_dir or os.environ.get("COINJECTURE_IPFS_LOCAL_DIR")
+    key = f"file://{os.path.abspath(local_dir)}" if local_dir else api_url
+    with _ipfs_clients_lock:
+        client = _ipfs_clients.get(key)
+        if client is None:
+            client = LocalBlobStore(local_dir) if local_dir else IPFSClient(api_url)
+            _ipfs_clients[key] = client
+        return client
+
+
+# SQL kept as module constants so sqlite3's per-connection statement cache
+# reuses the prepared statements across calls
+_SQL_INSERT_HEADER = """
+    INSERT OR REPLACE INTO headers
+    (header_hash, header_bytes, height, timestamp)
+    VALUES (?, ?, ?, ?)
+"""
+_SQL_SELECT_HEADER = "SELECT header_bytes FROM headers WHERE header_hash = ?"
+_SQL_INSERT_BLOCK = """
+    INSERT OR REPLACE INTO blocks
+    (block_hash, block_bytes, header_hash)
+    VALUES (?, ?, ?)
+"""
+_SQL_SELECT_BLOCK = "SELECT block_bytes FROM blocks WHERE block_hash = ?"
+_SQL_INSERT_TIP = """
+    INSERT OR REPLACE INTO tips
+    (tip_hash, cumulative_work)
+    VALUES (?, ?)
+"""
+_SQL_SELECT_TIPS = "SELECT tip_hash, cumulative_work FROM tips ORDER BY cumulative_work DESC"
+_SQL_INSERT_WORK_INDEX = """
+    INSERT OR REPLACE INTO work_index
+    (height, cumulative_work, block_hash)
+    VALUES (?, ?, ?)
+"""
+_SQL_SELECT_WORK_AT_HEIGHT = "SELECT cumulative_work FROM work_index WHERE height = ?"
+_SQL_INSERT_COMMITMENT = """
+    INSERT OR REPLACE INTO commit_index
+    (commitment, cid, problem_type, capacity)
+    VALUES (?, ?, ?, ?)
+"""
+_SQL_SELECT_COMMITMENT_CID = "SELECT cid FROM commit_index WHERE commitment = ?"
+
+# Write-behind operation kinds -> statement; flushed in this order
+_WRITE_SQL = {
+    'header': _SQL_INSERT_HEADER,
+    'block': _SQL_INSERT_BLOCK,
+    'work_index': _SQL_INSERT_WORK_INDEX,
+    'tip': _SQL_INSERT_TIP,
+    'commitment': _SQL_INSERT_COMMITMENT,
+}
+
+# Connection tuning applied to every pooled connection
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",      # 64 MiB page cache
+    "PRAGMA mmap_size = 268435456",    # 256 MiB memory-mapped reads
+    "PRAGMA busy_timeout = 5000",
+)
+
+
+def _run_flusher(manager_ref, stop_event: threading.Event, interval: float):
+    """Background loop flushing a StorageManager's write buffer on its time threshold."""
+    while not stop_event.wait(max(0.05, interval / 2)):
+        manager = manager_ref()
+        if manager is None:
+            return
+        try:
+            manager._flush_if_due()
+        except Exception as e:
+            print(f"Error in storage flusher: {e}")
+        del manager
+
+
+def _flush_at_exit(manager_ref):
+    """Flush buffered writes on interpreter shutdown."""
+    manager = manager_ref()
+    if manager is not None:
+        manager.close()
+
+
 class StorageManager:
     """
     Storage manager for blockchain data.
     
     Implements the storage module from storage.md specification.
+    
+    Each thread gets one long-lived SQLite connection (WAL, tuned pragmas,
+    cached prepared statements). Writes go through transaction(), which
+    nests: individual store_* calls commit on their own, but calls made
+    inside an outer ``with storage.transaction():`` block share one commit.
+    
+    With config.write_behind, store_* calls are queued and flushed in one
+    bulk transaction once batch_size writes are pending or flush_interval
+    seconds have passed; reads flush first, and close() / interpreter exit
+    flush whatever is left. Writes made inside transaction() are only
+    queued when the outermost block exits cleanly.
+    
+    store_* calls report errors by returning False, except inside an open
+    transaction, where they raise so the outermost block rolls back as a
+    whole instead of committing the writes that did succeed.
     """
     
     def __init__(self, config: StorageConfig):
@@ -289,21 +500,205 @@ class StorageManager:
         """
         self.config = config
         self.db_path = os.path.join(config.data_dir, "blockchain.db")
-        self.ipfs_client = IPFSClient(config.ipfs_api_url)
+        self.ipfs_client = get_ipfs_client(config.ipfs_api_url, config.ipfs_local_dir)
         
         # Ensure data directory exists
         os.makedirs(config.data_dir, exist_ok=True)
         
+        # Proof bundles are immutable per CID: serve repeats from memory/disk
+        self.proof_cache = ProofBundleCache(
+            max_memory_bytes=config.proof_cache_bytes,
+            disk_dir=config.proof_cache_dir or os.path.join(config.data_dir, "proof_cache")
+        )
+        
+        # Per-thread connection pool
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        
         # Initialize database
         self._init_database()
+        self.migrate_legacy_records()
         
-        # Batch write buffer
+        # Batch write buffer: (kind, params) tuples, see _WRITE_SQL
         self._write_buffer: List[tuple] = []
-        self._last_sync = 0
+        self._buffer_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._oldest_buffered = 0.0
+        self._blocks_since_sync = 0
+        self._last_sync = time.time()
+        self._closed = False
+        
+        self._stop_flusher = threading.Event()
+        if self.config.write_behind:
+            threading.Thread(
+                target=_run_flusher,
+                args=(weakref.ref(self), self._stop_flusher, self.config.flush_interval),
+                name="storage-flusher",
+                daemon=True
+            ).start()
+            atexit.register(_flush_at_exit, weakref.ref(self))
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # isolation_level=None: transactions are managed explicitly in transaction()
+            conn = sqlite3.connect(
+                self.db_path,
+                isolation_level=None,
+                check_same_thread=False,
+                cached_statements=256
+            )
+            for pragma in _CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+            self._local.depth = 0
+            self._local.staged = []
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Run the enclosed writes in a single transaction.
+        
+        Nested use joins the outermost transaction; only the outermost
+        block commits (or rolls back on error). store_* and batch_write()
+        calls inside the block raise their errors instead of returning False.
+        
+        Yields:
+            sqlite3.Connection for this thread
+        """
+        conn = self._connection()
+        if self._local.depth == 0:
+            conn.execute("BEGIN IMMEDIATE")
+        self._local.depth += 1
+        try:
+            yield conn
+        except BaseException:
+            self._local.depth -= 1
+            if self._local.depth == 0:
+                conn.execute("ROLLBACK")
+                self._local.staged = []
+            raise
+        else:
+            self._local.depth -= 1
+            if self._local.depth == 0:
+                conn.execute("COMMIT")
+                staged, self._local.staged = self._local.staged, []
+                if staged:
+                    self._enqueue(staged)
+    
+    def _in_transaction(self) -> bool:
+        """True while this thread is inside transaction()."""
+        return getattr(self._local, 'depth', 0) > 0
+    
+    def _write(self, kind: str, params: tuple):
+        """Apply one write now, or queue it when write-behind is enabled."""
+        if not self.config.write_behind:
+            with self.transaction() as conn:
+                conn.execute(_WRITE_SQL[kind], params)
+            return
+        
+        self._connection()
+        if self._local.depth > 0:
+            # Held back until the enclosing transaction commits
+            self._local.staged.append((kind, params))
+        else:
+            self._enqueue([(kind, params)])
+    
+    def _enqueue(self, operations: List[tuple]):
+        """Add operations to the shared write-behind buffer."""
+        with self._buffer_lock:
+            if not self._write_buffer:
+                self._oldest_buffered = time.time()
+            self._write_buffer.extend(operations)
+            pending = len(self._write_buffer)
+        if pending >= self.config.batch_size:
+            self.flush()
+    
+    def flush(self) -> int:
+        """
+        Write all buffered operations in a single transaction.
+        
+        Returns:
+            Number of operations written
+        """
+        # A flush inside an open transaction would tie other threads'
+        # writes to this thread's commit/rollback; defer to the next flush.
+        if self._in_transaction():
+            return 0
+        
+        with self._flush_lock:
+            with self._buffer_lock:
+                operations, self._write_buffer = self._write_buffer, []
+            if not operations:
+                return 0
+            
+            grouped: Dict[str, List[tuple]] = {kind: [] for kind in _WRITE_SQL}
+            for kind, params in operations:
+                grouped[kind].append(params)
+            
+            try:
+                with self.transaction() as conn:
+                    for kind, rows in grouped.items():
+                        if rows:
+                            conn.executemany(_WRITE_SQL[kind], rows)
+            except Exception as e:
+                # Put the batch back so a later flush can retry it
+                with self._buffer_lock:
+                    self._write_buffer[:0] = operations
+                print(f"Error flushing write buffer: {e}")
+                return 0
+            
+            self._blocks_since_sync += len(grouped['header']) + len(grouped['block'])
+            if self._blocks_since_sync >= self.config.fsync_interval:
+                self._checkpoint()
+            return len(operations)
+    
+    def _flush_if_due(self):
+        """Flush when the oldest buffered write has waited flush_interval seconds."""
+        with self._buffer_lock:
+            due = self._write_buffer and time.time() - self._oldest_buffered >= self.config.flush_interval
+        if due:
+            self.flush()
+    
+    def _flush_for_read(self):
+        """Make buffered writes visible before a read."""
+        if self._write_buffer:
+            self.flush()
+    
+    def _checkpoint(self, mode: str = "PASSIVE"):
+        """Checkpoint the WAL so flushed writes reach the main database file."""
+        self._connection().execute(f"PRAGMA wal_checkpoint({mode})")
+        self._blocks_since_sync = 0
+        self._last_sync = time.time()
+    
+    def close(self):
+        """Flush buffered writes and close all pooled connections."""
+        if self._closed:
+            return
+        self._stop_flusher.set()
+        self.flush()
+        self._closed = True
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception as e:
+                print(f"Error closing connection: {e}")
+        self._local = threading.local()
+    
+    def stop(self):
+        """Stop the storage manager (alias for close)."""
+        self.close()
     
     def _init_database(self):
         """Initialize SQLite database with required tables."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             
             # Headers table: key=header_hash -> header_bytes
@@ -374,8 +769,6 @@ class StorageManager:
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_headers_timestamp ON headers (timestamp)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_work_index_height ON work_index (height)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_commit_index_commitment ON commit_index (commitment)")
-            
-            conn.commit()
     
     def store_header(self, block: Block) -> bool:
         """
@@ -392,17 +785,12 @@ class StorageManager:
             # Use the block's hash field if available, otherwise calculate it
             header_hash = (block.block_hash if hasattr(block, 'block_hash') and block.block_hash else block.calculate_hash()).encode()
             
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT OR REPLACE INTO headers 
-                    (header_hash, header_bytes, height, timestamp)
-                    VALUES (?, ?, ?, ?)
-                """, (header_hash, header_bytes, block.index, int(block.timestamp)))
-                conn.commit()
+            self._write('header', (header_hash, header_bytes, block.index, int(block.timestamp)))
             
             return True
         except Exception as e:
+            if self._in_transaction():
+                raise
             print(f"Error storing header: {e}")
             return False
     
@@ -417,17 +805,11 @@ class StorageManager:
             Block or None
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT header_bytes FROM headers 
-                    WHERE header_hash = ?
-                """, (header_hash.encode(),))
-                
-                result = cursor.fetchone()
-                if result:
-                    return self._deserialize_header(result[0])
-                return None
+            self._flush_for_read()
+            result = self._connection().execute(_SQL_SELECT_HEADER, (header_hash.encode(),)).fetchone()
+            if result:
+                return self._deserialize_header(result[0])
+            return None
         except Exception as e:
             print(f"Error getting header: {e}")
             return None
@@ -445,19 +827,14 @@ class StorageManager:
         try:
             block_bytes = self._serialize_block(block)
             block_hash = block.calculate_hash().encode()
-            header_hash = block.calculate_hash().encode()
+            header_hash = block_hash
             
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT OR REPLACE INTO blocks 
-                    (block_hash, block_bytes, header_hash)
-                    VALUES (?, ?, ?)
-                """, (block_hash, block_bytes, header_hash))
-                conn.commit()
+            self._write('block', (block_hash, block_bytes, header_hash))
             
             return True
         except Exception as e:
+            if self._in_transaction():
+                raise
             print(f"Error storing block: {e}")
             return False
     
@@ -472,17 +849,11 @@ class StorageManager:
             Block or None
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT block_bytes FROM blocks 
-                    WHERE block_hash = ?
-                """, (block_hash.encode(),))
-                
-                result = cursor.fetchone()
-                if result:
-                    return self._deserialize_block(result[0])
-                return None
+            self._flush_for_read()
+            result = self._connection().execute(_SQL_SELECT_BLOCK, (block_hash.encode(),)).fetchone()
+            if result:
+                return self._deserialize_block(result[0])
+            return None
         except Exception as e:
             print(f"Error getting block: {e}")
             return None
@@ -499,17 +870,12 @@ class StorageManager:
             True if successful
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT OR REPLACE INTO tips 
-                    (tip_hash, cumulative_work)
-                    VALUES (?, ?)
-                """, (tip_hash.encode(), cumulative_work))
-                conn.commit()
+            self._write('tip', (tip_hash.encode(), cumulative_work))
             
             return True
         except Exception as e:
+            if self._in_transaction():
+                raise
             print(f"Error storing tip: {e}")
             return False
     
@@ -521,14 +887,9 @@ class StorageManager:
             List of (tip_hash, cumulative_work) tuples
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT tip_hash, cumulative_work FROM tips 
-                    ORDER BY cumulative_work DESC
-                """)
-                
-                return [(row[0].decode(), row[1]) for row in cursor.fetchall()]
+            self._flush_for_read()
+            rows = self._connection().execute(_SQL_SELECT_TIPS).fetchall()
+            return [(row[0].decode(), row[1]) for row in rows]
         except Exception as e:
             print(f"Error getting tips: {e}")
             return []
@@ -546,17 +907,12 @@ class StorageManager:
             True if successful
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT OR REPLACE INTO work_index 
-                    (height, cumulative_work, block_hash)
-                    VALUES (?, ?, ?)
-                """, (height, cumulative_work, block_hash.encode()))
-                conn.commit()
+            self._write('work_index', (height, cumulative_work, block_hash.encode()))
             
             return True
         except Exception as e:
+            if self._in_transaction():
+                raise
             print(f"Error storing work index: {e}")
             return False
     
@@ -571,15 +927,9 @@ class StorageManager:
             Cumulative work or None
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT cumulative_work FROM work_index 
-                    WHERE height = ?
-                """, (height,))
-                
-                result = cursor.fetchone()
-                return result[0] if result else None
+            self._flush_for_read()
+            result = self._connection().execute(_SQL_SELECT_WORK_AT_HEIGHT, (height,)).fetchone()
+            return result[0] if result else None
         except Exception as e:
             print(f"Error getting work at height: {e}")
             return None
@@ -598,17 +948,12 @@ class StorageManager:
             True if successful
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT OR REPLACE INTO commit_index 
-                    (commitment, cid, problem_type, capacity)
-                    VALUES (?, ?, ?, ?)
-                """, (commitment, cid, problem_type, capacity))
-                conn.commit()
+            self._write('commitment', (commitment, cid, problem_type, capacity))
             
             return True
         except Exception as e:
+            if self._in_transaction():
+                raise
             print(f"Error storing commitment: {e}")
             return False
     
@@ -623,15 +968,9 @@ class StorageManager:
             IPFS CID or None
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT cid FROM commit_index 
-                    WHERE commitment = ?
-                """, (commitment,))
-                
-                result = cursor.fetchone()
-                return result[0] if result else None
+            self._flush_for_read()
+            result = self._connection().execute(_SQL_SELECT_COMMITMENT_CID, (commitment,)).fetchone()
+            return result[0] if result else None
         except Exception as e:
             print(f"Error getting commitment CID: {e}")
             return None
@@ -652,6 +991,8 @@ class StorageManager:
                 return None
             
             cid = self.ipfs_client.add(bundle_data)
+            if cid:
+                self.proof_cache.put(cid, bundle_data)
             
             # Pin if in archive mode
             if self.config.pruning_mode == PruningMode.ARCHIVE:
@@ -664,7 +1005,9 @@ class StorageManager:
     
     def get_proof_bundle(self, cid: str) -> Optional[bytes]:
         """
-        Get proof bundle from IPFS.
+        Get proof bundle, from the proof cache or IPFS.
+        
+        Concurrent requests for the same uncached CID share one IPFS fetch.
         
         Args:
             cid: IPFS CID
@@ -672,13 +1015,20 @@ class StorageManager:
         Returns:
             Proof bundle data or None
         """
-        try:
-            if not self.ipfs_client.health_check():
-                print("Warning: IPFS not available, cannot get proof bundle")
+        def fetch() -> Optional[bytes]:
+            try:
+                if not self.ipfs_client.health_check():
+                    print("Warning: IPFS not available, cannot get proof bundle")
+                    return None
+                
+                return self.ipfs_client.get(cid)
+            except Exception as e:
+                print(f"Error getting proof bundle: {e}")
                 return None
-            
-            return self.ipfs_client.get(cid)
-        except Exception as e:
+        
+        try:
+            return self.proof_cache.get(cid, fetch)
+        except ValueError as e:
             print(f"Error getting proof bundle: {e}")
             return None
     
@@ -689,7 +1039,8 @@ class StorageManager:
         Implements pruning strategies from storage.md specification.
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            self.flush()
+            with self.transaction() as conn:
                 cursor = conn.cursor()
                 
                 if self.config.pruning_mode == PruningMode.LIGHT:
@@ -706,8 +1057,7 @@ class StorageManager:
                     
                 # Archive mode keeps everything
                 
-                conn.commit()
-                print(f"Pruning completed for {self.config.pruning_mode.value} mode")
+            print(f"Pruning completed for {self.config.pruning_mode.value} mode")
                 
         except Exception as e:
             print(f"Error during pruning: {e}")
@@ -716,120 +1066,131 @@ class StorageManager:
         """
         Batch write operations for performance.
         
+        All operations are applied in one transaction, together with
+        anything already waiting in the write-behind buffer. Inside
+        transaction() they are queued when the outermost block commits.
+        
         Args:
-            operations: List of (operation_type, data) tuples
+            operations: List of (operation_type, data) tuples, where
+                operation_type is one of:
+                - "header": (block, header_bytes)
+                - "block": block
+                - "tip": (tip_hash, cumulative_work)
+                - "work_index": (height, cumulative_work, block_hash)
+                - "commitment": (commitment, cid, problem_type, capacity)
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            queued = []
+            for op_type, data in operations:
+                if op_type == "header":
+                    header, header_bytes = data
+                    header_hash = (header.block_hash or header.calculate_hash()).encode()
+                    queued.append(('header', (header_hash, header_bytes, header.index, int(header.timestamp))))
                 
-                for op_type, data in operations:
-                    if op_type == "header":
-                        header, header_bytes = data
-                        header_hash = header.calculate_hash().encode()
-                        cursor.execute("""
-                            INSERT OR REPLACE INTO headers 
-                            (header_hash, header_bytes, height, timestamp)
-                            VALUES (?, ?, ?, ?)
-                        """, (header_hash, header_bytes, header.index, int(header.timestamp)))
-                    
-                    elif op_type == "work_index":
-                        height, cumulative_work, block_hash = data
-                        cursor.execute("""
-                            INSERT OR REPLACE INTO work_index 
-                            (height, cumulative_work, block_hash)
-                            VALUES (?, ?, ?)
-                        """, (height, cumulative_work, block_hash.encode()))
+                elif op_type == "block":
+                    block_hash = data.calculate_hash().encode()
+                    queued.append(('block', (block_hash, self._serialize_block(data), block_hash)))
+                
+                elif op_type == "tip":
+                    tip_hash, cumulative_work = data
+                    queued.append(('tip', (tip_hash.encode(), cumulative_work)))
+                
+                elif op_type == "work_index":
+                    height, cumulative_work, block_hash = data
+                    queued.append(('work_index', (height, cumulative_work, block_hash.encode())))
                 
-                conn.commit()
+                elif op_type == "commitment":
+                    queued.append(('commitment', tuple(data)))
+                
+                else:
+                    raise ValueError(f"Unknown batch operation: {op_type}")
+            
+            if self._in_transaction():
+                # Join the enclosing transaction like individual store_* calls
+                for kind, params in queued:
+                    self._write(kind, params)
+            else:
+                self._enqueue(queued)
+                self.flush()
                 
         except Exception as e:
+            if self._in_transaction():
+                raise
             print(f"Error in batch write: {e}")
     
     def sync(self):
         """Force sync to disk."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("PRAGMA synchronous = FULL")
-                conn.commit()
+            self.flush()
+            # Checkpoint the WAL into the main database file
+            self._checkpoint("FULL")
         except Exception as e:
             print(f"Error during sync: {e}")
     
+    def migrate_legacy_records(self, chunk_size: int = 1000, force: bool = False) -> int:
+        """
+        Rewrite JSON header/block rows in the binary record format.
+        
+        Scans both tables once; completion is recorded in PRAGMA user_version
+        so later startups skip the scan. Readers still decode any JSON row.
+        
+        Args:
+            chunk_size: Rows rewritten per transaction
+            force: Scan even if the database is marked as migrated
+        
+        Returns:
+            Number of rows migrated
+        """
+        migrated = 0
+        conn = self._connection()
+        if not force and conn.execute("PRAGMA user_version").fetchone()[0] >= BINARY_RECORDS_SCHEMA_VERSION:
+            return 0
+        for table, data_col, decode, encode in (
+            ("headers", "header_bytes", decode_header_record, encode_header_record),
+            ("blocks", "block_bytes", decode_block_record, encode_block_record),
+        ):
+            last_rowid = 0
+            while True:
+                rows = conn.execute(
+                    f"SELECT rowid, {data_col} FROM {table} "
+                    f"WHERE rowid > ? AND substr({data_col}, 1, 1) = X'7B' "
+                    f"ORDER BY rowid LIMIT ?",
+                    (last_rowid, chunk_size)
+                ).fetchall()
+                if not rows:
+                    break
+                last_rowid = rows[-1][0]
+                updates = []
+                for rowid, data in rows:
+                    try:
+                        updates.append((encode(decode(bytes(data))), rowid))
+                    except Exception as e:
+                        # Leave unreadable rows untouched
+                        print(f"Skipping unreadable {table} row {rowid} during migration: {e}")
+                with self.transaction() as tx:
+                    tx.executemany(f"UPDATE {table} SET {data_col} = ? WHERE rowid = ?", updates)
+                migrated += len(updates)
+        with self.transaction() as tx:
+            tx.execute(f"PRAGMA user_version = {BINARY_RECORDS_SCHEMA_VERSION}")
+        if migrated:
+            print(f"Migrated {migrated} legacy JSON storage rows to binary records")
+        return migrated
+    
     def _serialize_header(self, block: Block) -> bytes:
-        """Serialize block header to bytes."""
-        # Simple JSON serialization for now
-        header_dict = {
-            'index': block.index,
-            'timestamp': block.timestamp,
-            'previous_hash': block.previous_hash,
-            'merkle_root': block.merkle_root,
-            'mining_capacity': block.mining_capacity.value if hasattr(block.mining_capacity, 'value') else str(block.mining_capacity),
-            'cumulative_work_score': block.cumulative_work_score,
-            'block_hash': block.block_hash,
-            'offchain_cid': getattr(block, 'offchain_cid', None)
-        }
-        return json.dumps(header_dict).encode()
+        """Serialize block header to a binary record."""
+        return encode_header_record(block)
     
     def _deserialize_header(self, header_bytes: bytes) -> Block:
-        """Deserialize bytes to block."""
-        header_dict = json.loads(header_bytes.decode())
-        
-        # Create Block object with minimal required fields
-        # Note: This is a simplified deserialization for header-only storage
-        return Block(
-            index=header_dict['index'],
-            timestamp=header_dict['timestamp'],
-            previous_hash=header_dict['previous_hash'],
-            transactions=[],  # Empty for header-only
-            merkle_root=header_dict['merkle_root'],
-            problem={},  # Empty for header-only
-            solution=[],  # Empty for header-only
-            complexity=None,  # Will be None for header-only
-            mining_capacity=ProblemTier(header_dict['mining_capacity']),
-            cumulative_work_score=header_dict['cumulative_work_score'],
-            block_hash=header_dict['block_hash'],
-            offchain_cid=header_dict.get('offchain_cid', None)
-        )
+        """Deserialize a binary (or legacy JSON) header record to a header-only block."""
+        return decode_header_record(bytes(header_bytes))
     
     def _serialize_block(self, block: Block) -> bytes:
-        """Serialize block to bytes."""
-        # Simple JSON serialization for now
-        block_dict = {
-            'index': block.index,
-            'timestamp': block.timestamp,
-            'previous_hash': block.previous_hash,
-            'transactions': block.transactions,
-            'merkle_root': block.merkle_root,
-            'problem': block.problem,
-            'solution': block.solution,
-            'mining_capacity': block.mining_capacity.value if hasattr(block.mining_capacity, 'value') else str(block.mining_capacity),
-            'cumulative_work_score': block.cumulative_work_score,
-            'block_hash': block.block_hash,
-            'offchain_cid': getattr(block, 'offchain_cid', None)
-        }
-        return json.dumps(block_dict).encode()
+        """Serialize block to a binary record."""
+        return encode_block_record(block)
     
     def _deserialize_block(self, block_bytes: bytes) -> Block:
-        """Deserialize bytes to block."""
-        block_dict = json.loads(block_bytes.decode())
-        
-        # Create Block object
-        # Note: This is a simplified deserialization
-        from core.blockchain import ProblemTier
-        
-        return Block(
-            index=block_dict['index'],
-            timestamp=block_dict['timestamp'],
-            previous_hash=block_dict['previous_hash'],
-            transactions=block_dict['transactions'],
-            merkle_root=block_dict['merkle_root'],
-            problem=block_dict['problem'],
-            solution=block_dict['solution'],
-            mining_capacity=ProblemTier(block_dict['mining_capacity']),
-            cumulative_work_score=block_dict['cumulative_work_score'],
-            block_hash=block_dict['block_hash'],
-            offchain_cid=block_dict.get('offchain_cid', None)
-        )
+        """Deserialize a binary (or legacy JSON) block record."""
+        return decode_block_record(bytes(block_bytes))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,285 @@
+"""
+Module: storage_codec
+
+Versioned binary record format for headers and blocks kept by StorageManager.
+
+Record layout (little-endian):
+    magic        1 byte   0xC7
+    version      1 byte   RECORD_VERSION
+    flags        1 byte   FLAG_* bits
+    tier         1 byte   index into ProblemTier
+    index        8 bytes  signed
+    timestamp    8 bytes  double
+    cumulative   8 bytes  double (cumulative_work_score)
+    hashes       3 x 32 raw bytes (previous_hash, merkle_root, block_hash),
+                 or 3 length-prefixed UTF-8 strings with FLAG_TEXT_HASHES
+    offchain_cid length-prefixed UTF-8, only with FLAG_HAS_CID
+    body         block records only: msgpack (msgspec, as in
+                 coinjecture.consensus.codec) or compact JSON fallback
+
+Legacy rows are JSON objects and always start with '{', so readers can
+tell the formats apart from the first byte.
+
+The binary records are a storage format. Peers that have not negotiated
+the binary wire version still expect the JSON form on the wire, which
+encode_header_json() and encode_block_json() produce.
+"""
+
+import json
+import struct
+from dataclasses import fields
+from typing import Any, Dict, List, Optional
+
+try:
+    from .core.blockchain import Block, ComputationalComplexity, EnergyMetrics, ProblemTier
+    from .coinjecture.consensus.codec import HAS_MSGSPEC, msgspec
+except ImportError:
+    from core.blockchain import Block, ComputationalComplexity, EnergyMetrics, ProblemTier
+    from coinjecture.consensus.codec import HAS_MSGSPEC, msgspec
+
+
+RECORD_MAGIC = 0xC7
+RECORD_VERSION = 1
+
+FLAG_HAS_CID = 0x01
+FLAG_TEXT_HASHES = 0x02
+FLAG_MSGPACK_BODY = 0x04
+
+_FIXED = struct.Struct('<BBBBqdd')
+_LEN = struct.Struct('<H')
+
+_TIERS = list(ProblemTier)
+_TIER_CODES = {tier: code for code, tier in enumerate(_TIERS)}
+
+# Complexity is stored positionally in this (version 1) field order. The
+# problem dict is not repeated: it is restored from the block's own problem.
+_COMPLEXITY_FIELDS = [f.name for f in fields(ComputationalComplexity) if f.name != 'problem']
+_ENERGY_FIELDS = [f.name for f in fields(EnergyMetrics)]
+
+
+def is_legacy_record(data: bytes) -> bool:
+    """True for rows written by the old JSON serializer."""
+    return bool(data) and data[:1] == b'{'
+
+
+def _pack_str(value: str) -> bytes:
+    raw = value.encode('utf-8')
+    return _LEN.pack(len(raw)) + raw
+
+
+def _unpack_str(data: bytes, offset: int):
+    (length,) = _LEN.unpack_from(data, offset)
+    offset += _LEN.size
+    return data[offset:offset + length].decode('utf-8'), offset + length
+
+
+def _raw_hash(value: str) -> Optional[bytes]:
+    if len(value) != 64:
+        return None
+    try:
+        return bytes.fromhex(value)
+    except ValueError:
+        return None
+
+
+def _encode_fixed(block: Block, extra_flags: int = 0) -> bytes:
+    tier = block.mining_capacity
+    if not isinstance(tier, ProblemTier):
+        tier = ProblemTier(tier)
+
+    hashes = (block.previous_hash, block.merkle_root, block.block_hash)
+    raw_hashes = [_raw_hash(h or "") for h in hashes]
+    flags = extra_flags
+    cid = getattr(block, 'offchain_cid', None)
+    if cid:
+        flags |= FLAG_HAS_CID
+    if any(raw is None for raw in raw_hashes):
+        flags |= FLAG_TEXT_HASHES
+
+    parts = [_FIXED.pack(RECORD_MAGIC, RECORD_VERSION, flags, _TIER_CODES[tier],
+                         block.index, float(block.timestamp), float(block.cumulative_work_score))]
+    if flags & FLAG_TEXT_HASHES:
+        parts.extend(_pack_str(h or "") for h in hashes)
+    else:
+        parts.extend(raw_hashes)
+    if cid:
+        parts.append(_pack_str(cid))
+    return b''.join(parts)
+
+
+def _decode_fixed(data: bytes) -> tuple:
+    magic, version, flags, tier_code, index, timestamp, cumulative = _FIXED.unpack_from(data, 0)
+    if magic != RECORD_MAGIC:
+        raise ValueError("Not a storage record")
+    if version != RECORD_VERSION:
+        raise ValueError(f"Unsupported storage record version: {version}")
+
+    offset = _FIXED.size
+    if flags & FLAG_TEXT_HASHES:
+        previous_hash, offset = _unpack_str(data, offset)
+        merkle_root, offset = _unpack_str(data, offset)
+        block_hash, offset = _unpack_str(data, offset)
+    else:
+        previous_hash = data[offset:offset + 32].hex()
+        merkle_root = data[offset + 32:offset + 64].hex()
+        block_hash = data[offset + 64:offset + 96].hex()
+        offset += 96
+
+    cid = None
+    if flags & FLAG_HAS_CID:
+        cid, offset = _unpack_str(data, offset)
+
+    fields = {
+        'index': index,
+        'timestamp': timestamp,
+        'previous_hash': previous_hash,
+        'merkle_root': merkle_root,
+        'mining_capacity': _TIERS[tier_code],
+        'cumulative_work_score': cumulative,
+        'block_hash': block_hash,
+        'offchain_cid': cid,
+    }
+    return fields, flags, offset
+
+
+def encode_header_record(block: Block) -> bytes:
+    """Encode the header fields of a block as a binary record."""
+    return _encode_fixed(block)
+
+
+def decode_header_record(data: bytes) -> Block:
+    """Decode a binary header record (or legacy JSON header) into a header-only Block."""
+    if is_legacy_record(data):
+        return _legacy_header(json.loads(data.decode()))
+    fields, _, _ = _decode_fixed(data)
+    return Block(transactions=[], problem={}, solution=[], complexity=None, **fields)
+
+
+def encode_header_json(block: Block) -> bytes:
+    """Encode the header fields of a block in the legacy JSON format."""
+    return json.dumps(_header_dict(block)).encode()
+
+
+def _encode_body(body: Dict[str, Any]) -> tuple:
+    if HAS_MSGSPEC:
+        return msgspec.msgpack.encode(body), FLAG_MSGPACK_BODY
+    return json.dumps(body, separators=(',', ':')).encode(), 0
+
+
+def _decode_body(data: bytes, flags: int) -> Dict[str, Any]:
+    if flags & FLAG_MSGPACK_BODY:
+        if not HAS_MSGSPEC:
+            raise ValueError("msgspec is required to decode this block record")
+        return msgspec.msgpack.decode(data)
+    return json.loads(data.decode())
+
+
+def encode_block_record(block: Block) -> bytes:
+    """Encode a full block (header fields plus body) as a binary record."""
+    complexity = getattr(block, 'complexity', None)
+    body = {
+        'transactions': [tx.to_dict() if hasattr(tx, 'to_dict') else tx for tx in block.transactions],
+        'problem': block.problem,
+        'solution': block.solution,
+        'proof_commitment': getattr(block, 'proof_commitment', None),
+        'complexity': _complexity_to_list(complexity),
+    }
+    body_bytes, body_flags = _encode_body(body)
+    return _encode_fixed(block, body_flags) + body_bytes
+
+
+def encode_block_json(block: Block) -> bytes:
+    """Encode a full block in the legacy JSON format."""
+    block_dict = _header_dict(block)
+    block_dict.update({
+        'transactions': [tx.to_dict() if hasattr(tx, 'to_dict') else tx for tx in block.transactions],
+        'problem': block.problem,
+        'solution': block.solution,
+    })
+    return json.dumps(block_dict).encode()
+
+
+def decode_block_record(data: bytes) -> Block:
+    """Decode a binary block record (or legacy JSON block) into a Block."""
+    if is_legacy_record(data):
+        return _legacy_block(json.loads(data.decode()))
+
+    fields, flags, offset = _decode_fixed(data)
+    body = _decode_body(data[offset:], flags)
+    return Block(
+        transactions=body['transactions'],
+        problem=body['problem'],
+        solution=body['solution'],
+        complexity=_complexity_from_list(body.get('complexity'), body['problem']),
+        proof_commitment=body.get('proof_commitment'),
+        **fields
+    )
+
+
+def _complexity_to_list(complexity: Optional[ComputationalComplexity]) -> Optional[List[Any]]:
+    if complexity is None:
+        return None
+    values = []
+    for name in _COMPLEXITY_FIELDS:
+        value = getattr(complexity, name)
+        if name == 'energy_metrics' and value is not None:
+            value = [getattr(value, energy_name) for energy_name in _ENERGY_FIELDS]
+        values.append(value)
+    return values
+
+
+def _complexity_from_list(values: Optional[List[Any]], problem: dict) -> Optional[ComputationalComplexity]:
+    if not values:
+        return None
+    data = dict(zip(_COMPLEXITY_FIELDS, values))
+    energy = data.get('energy_metrics')
+    if energy is not None:
+        data['energy_metrics'] = EnergyMetrics(*energy)
+    return ComputationalComplexity(problem=problem, **data)
+
+
+def _header_dict(block: Block) -> Dict[str, Any]:
+    return {
+        'index': block.index,
+        'timestamp': block.timestamp,
+        'previous_hash': block.previous_hash,
+        'merkle_root': block.merkle_root,
+        'mining_capacity': block.mining_capacity.value if hasattr(block.mining_capacity, 'value') else str(block.mining_capacity),
+        'cumulative_work_score': block.cumulative_work_score,
+        'block_hash': block.block_hash,
+        'offchain_cid': getattr(block, 'offchain_cid', None)
+    }
+
+
+def _legacy_header(header_dict: Dict[str, Any]) -> Block:
+    return Block(
+        index=header_dict['index'],
+        timestamp=header_dict['timestamp'],
+        previous_hash=header_dict['previous_hash'],
+        transactions=[],
+        merkle_root=header_dict['merkle_root'],
+        problem={},
+        solution=[],
+        complexity=None,
+        mining_capacity=ProblemTier(header_dict['mining_capacity']),
+        cumulative_work_score=header_dict['cumulative_work_score'],
+        block_hash=header_dict['block_hash'],
+        offchain_cid=header_dict.get('offchain_cid', None)
+    )
+
+
+def _legacy_block(block_dict: Dict[str, Any]) -> Block:
+    return Block(
+        index=block_dict['index'],
+        timestamp=block_dict['timestamp'],
+        previous_hash=block_dict['previous_hash'],
+        transactions=block_dict['transactions'],
+        merkle_root=block_dict['merkle_root'],
+        problem=block_dict['problem'],
+        solution=block_dict['solution'],
+        complexity=None,
+        mining_capacity=ProblemTier(block_dict['mining_capacity']),
+        cumulative_work_score=block_dict['cumulative_work_score'],
+        block_hash=block_dict['block_hash'],
+        offchain_cid=block_dict.get('offchain_cid', None)
+    )
@@ -0,0 +1,159 @@
+"""
+Module: streaming_stats
+
+Fixed-size rolling windows with running statistics, for metrics updated
+once per block and read on every reward or difficulty update.
+
+RollingWindow keeps the last `size` values in a ring buffer:
+    push            O(1) (O(log n) search plus a small memmove when ordered)
+    mean, variance  O(1), from running sums
+    median,
+    percentile      O(1) reads from a sorted view, kept only when ordered=True
+
+Memory is bounded by `size` regardless of how many values are pushed.
+Running sums are recomputed exactly once per `size` evictions so float
+error cannot accumulate over millions of blocks.
+"""
+
+import math
+from bisect import bisect_left, insort
+from typing import Iterable, List, Optional
+
+
+class RollingWindow:
+    """
+    Last `size` values with O(1) mean/variance and, if ordered, order statistics.
+
+    Usage:
+        window = RollingWindow(100, ordered=True)
+        window.push(score)
+        window.mean(), window.median(), window.percentile(90)
+    """
+
+    __slots__ = ("size", "ordered", "_buffer", "_head", "_count",
+                 "_sum", "_sum_sq", "_evictions", "_sorted")
+
+    def __init__(self, size: int, ordered: bool = False, values: Iterable[float] = ()):
+        """
+        Args:
+            size: Window length (values kept)
+            ordered: Maintain a sorted view for median/percentile
+            values: Initial values, oldest first; only the last `size` are kept
+        """
+        if size <= 0:
+            raise ValueError("window size must be positive")
+        self.size = size
+        self.ordered = ordered
+        self.clear()
+        for value in values:
+            self.push(value)
+
+    def clear(self):
+        self._buffer: List[float] = [0.0] * self.size
+        self._head = 0  # Slot the next value is written to
+        self._count = 0
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._evictions = 0
+        self._sorted: Optional[List[float]] = [] if self.ordered else None
+
+    def push(self, value: float) -> Optional[float]:
+        """
+        Append a value, evicting the oldest once full.
+
+        Returns:
+            The evicted value, or None while the window is filling
+        """
+        evicted = None
+        if self._count == self.size:
+            evicted = self._buffer[self._head]
+            self._sum -= evicted
+            self._sum_sq -= evicted * evicted
+            if self._sorted is not None:
+                del self._sorted[bisect_left(self._sorted, evicted)]
+            self._evictions += 1
+        else:
+            self._count += 1
+
+        self._buffer[self._head] = value
+        self._head = (self._head + 1) % self.size
+        self._sum += value
+        self._sum_sq += value * value
+        if self._sorted is not None:
+            insort(self._sorted, value)
+
+        if self._evictions >= self.size:
+            # Refresh the running sums to drop accumulated rounding error
+            values = self.values()
+            self._sum = math.fsum(values)
+            self._sum_sq = math.fsum(v * v for v in values)
+            self._evictions = 0
+        return evicted
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self):
+        return iter(self.values())
+
+    def values(self) -> List[float]:
+        """Window contents, oldest first."""
+        if self._count < self.size:
+            return self._buffer[:self._count]
+        return self._buffer[self._head:] + self._buffer[:self._head]
+
+    def last(self, count: int) -> List[float]:
+        """Newest `count` values, oldest first."""
+        return self.values()[-count:] if count > 0 else []
+
+    @property
+    def total(self) -> float:
+        return self._sum
+
+    def mean(self, default: float = 0.0) -> float:
+        return self._sum / self._count if self._count else default
+
+    def variance(self) -> float:
+        """Sample variance (0.0 with fewer than two values)."""
+        if self._count < 2:
+            return 0.0
+        mean = self._sum / self._count
+        return max(0.0, (self._sum_sq - self._count * mean * mean) / (self._count - 1))
+
+    def stdev(self) -> float:
+        return math.sqrt(self.variance())
+
+    def _require_sorted(self) -> List[float]:
+        if self._sorted is None:
+            raise ValueError("order statistics need RollingWindow(..., ordered=True)")
+        if not self._sorted:
+            raise ValueError("window is empty")
+        return self._sorted
+
+    def kth(self, k: int) -> float:
+        """k-th smallest value (0-based)."""
+        return self._require_sorted()[k]
+
+    def median(self) -> float:
+        """Median, averaging the middle pair for even counts (as statistics.median)."""
+        ordered = self._require_sorted()
+        middle = len(ordered) // 2
+        if len(ordered) % 2:
+            return ordered[middle]
+        return (ordered[middle - 1] + ordered[middle]) / 2
+
+    def median_high(self) -> float:
+        """Upper median (as statistics.median_high)."""
+        ordered = self._require_sorted()
+        return ordered[len(ordered) // 2]
+
+    def percentile(self, q: float) -> float:
+        """q-th percentile (0-100), linearly interpolated between ranks."""
+        ordered = self._require_sorted()
+        position = (len(ordered) - 1) * min(100.0, max(0.0, q)) / 100.0
+        lower = int(position)
+        upper = min(lower + 1, len(ordered) - 1)
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+    def __repr__(self) -> str:
+        return f"RollingWindow(size={self.size}, count={self._count}, mean={self.mean():.6g})"
@@ -4,12 +4,26 @@ Blockchain State Management for COINjecture
 Manages balances, transaction pool, and transaction history for the blockchain.
 """
 
+import os
+import sys
 import time
 import hashlib
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
 from collections import defaultdict
 
+try:
+    from .mempool import Mempool
+except ImportError:
+    from mempool import Mempool
+
+try:
+    from ..signature_verifier import get_signature_verifier
+except (ImportError, ValueError):
+    # Loaded as a top-level module: make src/ importable (as dynamic_tokenomics does)
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from signature_verifier import get_signature_verifier
+
 
 @dataclass
 class Transaction:
@@ -23,17 +37,30 @@ class Transaction:
     transaction_id: str = ""
     signature: str = ""
     public_key: str = ""
+    fee: float = 0.0
+    nonce: Optional[int] = None
     
     def __post_init__(self):
         """Calculate transaction ID after initialization."""
         if not self.transaction_id:
             self.transaction_id = self.calculate_transaction_id()
     
+    def signing_data(self) -> bytes:
+        """
+        Bytes covered by the transaction ID and signature.
+        
+        Fee and nonce are only appended when set, so transactions created
+        before they existed keep their IDs and signatures.
+        """
+        data = f"{self.sender}{self.recipient}{self.amount}{self.timestamp}"
+        if self.fee or self.nonce is not None:
+            data += f"|fee={self.fee}|nonce={self.nonce}"
+        return data.encode()
+    
     def calculate_transaction_id(self) -> str:
         """Calculate unique transaction ID from transaction data."""
         # Create hash of transaction data (excluding signature and public_key)
-        data = f"{self.sender}{self.recipient}{self.amount}{self.timestamp}".encode()
-        return hashlib.sha256(data).hexdigest()
+        return hashlib.sha256(self.signing_data()).hexdigest()
     
     def sign(self, private_key_bytes: bytes) -> str:
         """
@@ -60,8 +87,7 @@ class Transaction:
             ).hex()
             
             # Sign transaction data
-            transaction_data = f"{self.sender}{self.recipient}{self.amount}{self.timestamp}".encode()
-            signature = private_key.sign(transaction_data)
+            signature = private_key.sign(self.signing_data())
             self.signature = signature.hex()
             
             return self.signature
@@ -69,30 +95,31 @@ class Transaction:
             print(f"Error signing transaction: {e}")
             return ""
     
+    def signature_item(self) -> Optional[Tuple[bytes, bytes, bytes]]:
+        """(public_key, message, signature) for the verifier, or None if unsigned/malformed."""
+        if not self.signature or not self.public_key:
+            return None
+        try:
+            return bytes.fromhex(self.public_key), self.signing_data(), bytes.fromhex(self.signature)
+        except ValueError:
+            return None
+    
     def verify_signature(self) -> bool:
         """
-        Verify transaction signature.
+        Verify transaction signature (cached by the shared verifier).
+        
+        Verified inline: one signature gains nothing from batching, and
+        waiting for a batch would add latency to mempool admission. Callers
+        with many transactions use verify_transaction_signatures().
         
         Returns:
             True if signature is valid
         """
         try:
-            from cryptography.hazmat.primitives.asymmetric import ed25519
-            from cryptography.hazmat.primitives import serialization
-            
-            if not self.signature or not self.public_key:
+            item = self.signature_item()
+            if item is None:
                 return False
-            
-            # Load public key
-            public_key_bytes = bytes.fromhex(self.public_key)
-            public_key = ed25519.Ed25519PublicKey.from_public_bytes(public_key_bytes)
-            
-            # Verify signature
-            transaction_data = f"{self.sender}{self.recipient}{self.amount}{self.timestamp}".encode()
-            signature_bytes = bytes.fromhex(self.signature)
-            
-            public_key.verify(signature_bytes, transaction_data)
-            return True
+            return get_signature_verifier().verify(*item)
         except Exception:
             return False
     
@@ -105,7 +132,9 @@ class Transaction:
             'amount': self.amount,
             'timestamp': self.timestamp,
             'signature': self.signature,
-            'public_key': self.public_key
+            'public_key': self.public_key,
+            'fee': self.fee,
+            'nonce': self.nonce
         }
     
     @classmethod
@@ -118,7 +147,9 @@ class Transaction:
             timestamp=data['timestamp'],
             transaction_id=data.get('transaction_id', ''),
             signature=data.get('signature', ''),
-            public_key=data.get('public_key', '')
+            public_key=data.get('public_key', ''),
+            fee=data.get('fee', 0.0),
+            nonce=data.get('nonce')
         )
         return tx
     
@@ -131,23 +162,42 @@ class BlockchainState:
     Manages blockchain state including balances, transaction pool, and history.
     """
     
-    def __init__(self):
-        """Initialize blockchain state."""
+    def __init__(self, mempool: Optional[Mempool] = None):
+        """
+        Initialize blockchain state.
+        
+        Args:
+            mempool: Pending transaction pool (default: Mempool with default caps)
+        """
         # Address balances
         self.balances: Dict[str, float] = defaultdict(float)
         
-        # Transaction pool (pending transactions)
-        self.pending_transactions: List[Transaction] = []
+        # Transaction pool (pending transactions), indexed by id, sender/nonce and fee
+        self.mempool: Mempool = mempool if mempool is not None else Mempool()
         
         # Transaction history by address
         self.transaction_history: Dict[str, List[Transaction]] = defaultdict(list)
         
+        # Processed transactions by ID (history lookups, double-spend checks)
+        self.transactions_by_id: Dict[str, Transaction] = {}
+        
         # Set of processed transaction IDs to prevent double-spending
         self.processed_transactions: Set[str] = set()
         
         # Genesis block reward address (if any)
         self.genesis_address: Optional[str] = None
     
+    @property
+    def pending_transactions(self) -> List[Transaction]:
+        """Snapshot of the transaction pool in arrival order."""
+        return self.mempool.transactions()
+    
+    @pending_transactions.setter
+    def pending_transactions(self, transactions: List[Transaction]):
+        self.mempool.clear()
+        for tx in transactions:
+            self.mempool.add(tx)
+    
     def update_balance(self, address: str, amount: float) -> bool:
         """
         Update address balance.
@@ -193,13 +243,9 @@ class BlockchainState:
             if not self.validate_transaction(transaction):
                 return False
             
-            # Check if already in pool
-            if any(tx.transaction_id == transaction.transaction_id for tx in self.pending_transactions):
-                return False
-            
-            # Add to pending pool
-            self.pending_transactions.append(transaction)
-            return True
+            # Add to pending pool (rejects duplicates, underpriced replacements
+            # and transactions that don't outbid a full pool)
+            return self.mempool.add(transaction)
         except Exception as e:
             print(f"Error adding transaction: {e}")
             return False
@@ -223,10 +269,14 @@ class BlockchainState:
             if transaction.sender != "COINBASE" and not transaction.verify_signature():
                 return False
             
-            # Check sender has sufficient balance (skip for coinbase)
+            # Check fee is not negative
+            if transaction.fee < 0:
+                return False
+            
+            # Check sender can cover amount plus fee (skip for coinbase)
             if transaction.sender != "COINBASE":
                 sender_balance = self.get_balance(transaction.sender)
-                if sender_balance < transaction.amount:
+                if sender_balance < transaction.amount + transaction.fee:
                     return False
             
             # Check amount is positive
@@ -252,20 +302,24 @@ class BlockchainState:
         """
         Get pending transactions for block inclusion.
         
+        Highest fee rate first (arrival order among equal fees), with each
+        sender's nonces kept in sequence.
+        
         Args:
             max_count: Maximum number of transactions to return
             
         Returns:
             List of pending transactions
         """
-        # Sort by timestamp (oldest first)
-        sorted_transactions = sorted(self.pending_transactions, key=lambda tx: tx.timestamp)
-        return sorted_transactions[:max_count]
+        return self.mempool.select(max_count)
     
     def process_transactions(self, transactions: List[Transaction]) -> bool:
         """
         Process transactions and update balances.
         
+        Senders are charged amount plus fee; the fee is not credited to
+        anyone here (block rewards are paid separately as coinbase).
+        
         Args:
             transactions: List of transactions to process
             
@@ -276,12 +330,12 @@ class BlockchainState:
             for transaction in transactions:
                 # Update balances
                 if transaction.sender != "COINBASE":
-                    self.update_balance(transaction.sender, -transaction.amount)
+                    self.update_balance(transaction.sender, -(transaction.amount + transaction.fee))
                 self.update_balance(transaction.recipient, transaction.amount)
                 
                 # Add to history
-                self.transaction_history[transaction.sender].append(transaction)
-                self.transaction_history[transaction.recipient].append(transaction)
+                self.record_transaction(transaction.sender, transaction)
+                self.record_transaction(transaction.recipient, transaction)
                 
                 # Mark as processed
                 self.processed_transactions.add(transaction.transaction_id)
@@ -291,6 +345,20 @@ class BlockchainState:
             print(f"Error processing transactions: {e}")
             return False
     
+    def record_transaction(self, address: str, transaction: Transaction):
+        """
+        Append a transaction to an address's history and index it by ID.
+        
+        Every history append goes through here so get_transaction_by_id()
+        finds it without a restart.
+        
+        Args:
+            address: Address whose history gets the transaction
+            transaction: Transaction to record
+        """
+        self.transaction_history[address].append(transaction)
+        self.transactions_by_id[transaction.transaction_id] = transaction
+    
     def clear_pending_transactions(self, processed_transactions: List[Transaction]):
         """
         Remove processed transactions from pending pool.
@@ -298,11 +366,7 @@ class BlockchainState:
         Args:
             processed_transactions: Transactions that were included in a block
         """
-        processed_ids = {tx.transaction_id for tx in processed_transactions}
-        self.pending_transactions = [
-            tx for tx in self.pending_transactions 
-            if tx.transaction_id not in processed_ids
-        ]
+        self.mempool.remove_many(tx.transaction_id for tx in processed_transactions)
     
     def get_transaction_history(self, address: str, limit: int = 100) -> List[Transaction]:
         """
@@ -330,18 +394,10 @@ class BlockchainState:
         Returns:
             Transaction if found, None otherwise
         """
-        # Search in pending transactions
-        for tx in self.pending_transactions:
-            if tx.transaction_id == transaction_id:
-                return tx
-        
-        # Search in history
-        for address_history in self.transaction_history.values():
-            for tx in address_history:
-                if tx.transaction_id == transaction_id:
-                    return tx
-        
-        return None
+        tx = self.mempool.get(transaction_id)
+        if tx is not None:
+            return tx
+        return self.transactions_by_id.get(transaction_id)
     
     def create_coinbase_transaction(self, recipient: str, amount: float, timestamp: float = None) -> Transaction:
         """
@@ -374,7 +430,8 @@ class BlockchainState:
         return {
             'total_addresses': len(self.balances),
             'total_supply': self.get_total_supply(),
-            'pending_transactions': len(self.pending_transactions),
+            'pending_transactions': len(self.mempool),
+            'mempool': self.mempool.get_stats(),
             'processed_transactions': len(self.processed_transactions),
             'top_balances': dict(sorted(self.balances.items(), key=lambda x: x[1], reverse=True)[:10])
         }
@@ -402,6 +459,11 @@ class BlockchainState:
             addr: [Transaction.from_dict(tx_data) for tx_data in txs]
             for addr, txs in data.get('transaction_history', {}).items()
         })
+        self.transactions_by_id = {
+            tx.transaction_id: tx
+            for txs in self.transaction_history.values()
+            for tx in txs
+        }
         self.processed_transactions = set(data.get('processed_transactions', []))
     
     def save_state(self, filepath: str = "data/blockchain_state.json") -> bool:
@@ -33,6 +33,11 @@ from core.blockchain import (
     calculate_computational_work_score, generate_subset_sum_problem,
     solve_subset_sum, subset_sum_complexity, EnergyMetrics
 )
+from streaming_stats import RollingWindow
+
+# Rolling windows (blocks) behind rewards, difficulty and market dynamics
+RECENT_WORK_WINDOW = 100
+CAPACITY_WINDOW = 50
 
 
 @dataclass
@@ -77,6 +82,9 @@ class CapacityMetrics:
     avg_solve_time: float
     avg_asymmetry: float
     recent_records: deque
+    work_window: RollingWindow = field(default_factory=lambda: RollingWindow(CAPACITY_WINDOW))
+    solve_time_window: RollingWindow = field(default_factory=lambda: RollingWindow(CAPACITY_WINDOW))
+    asymmetry_window: RollingWindow = field(default_factory=lambda: RollingWindow(CAPACITY_WINDOW))
 
 
 @dataclass
@@ -98,17 +106,22 @@ class DynamicWorkScoreTokenomics:
     # ============================================
     
     def __init__(self, blockchain_state=None):
-        # Track actual network behavior
-        self.work_score_history: list[WorkScoreRecord] = []
+        # Track actual network behavior (bounded: only recent records are kept)
+        self.work_score_history: deque[WorkScoreRecord] = deque(maxlen=RECENT_WORK_WINDOW)
+        self.blocks_mined: int = 0
         self.capacity_performance: dict[ProblemTier, CapacityMetrics] = {}
         
+        # Running statistics over recent blocks
+        self.recent_work_scores = RollingWindow(RECENT_WORK_WINDOW)
+        self.recent_work_rates = RollingWindow(RECENT_WORK_WINDOW)  # work score per solve second
+        
         # Dynamic supply emerges from network growth
         self.cumulative_work_score: float = 0.0
         self.total_coins_issued: float = 0.0
         
         # Dynamic block time emerges from verification performance
-        self.recent_verification_times: deque = deque(maxlen=100)
-        self.recent_solve_times: deque = deque(maxlen=100)
+        self.recent_verification_times = RollingWindow(100, ordered=True)
+        self.recent_solve_times = RollingWindow(100)
         
         # Blockchain state for wallet integration
         self.blockchain_state = blockchain_state
@@ -152,20 +165,19 @@ class DynamicWorkScoreTokenomics:
         
         return reward
     
-    def _get_recent_average_work(self, window: int = 100) -> float:
+    def _get_recent_average_work(self, window: int = RECENT_WORK_WINDOW) -> float:
         """
         Calculate average work score from recent blocks.
         This creates a moving baseline - no static target needed.
         """
         
-        if len(self.work_score_history) < window:
-            window = len(self.work_score_history)
-        
-        if window == 0:
+        if len(self.recent_work_scores) == 0:
             return 1.0  # Genesis default
         
-        recent_scores = [record.work_score for record in self.work_score_history[-window:]]
-        return statistics.mean(recent_scores)
+        if window >= len(self.recent_work_scores):
+            return self.recent_work_scores.mean()
+        
+        return statistics.mean(self.recent_work_scores.last(window))
     
     def _calculate_deflation_factor(self) -> float:
         """
@@ -244,13 +256,16 @@ class DynamicWorkScoreTokenomics:
         )
         
         self.work_score_history.append(record)
+        self.blocks_mined += 1
+        self.recent_work_scores.push(block_work_score)
+        self.recent_work_rates.push(block_work_score / max(0.001, complexity.measured_solve_time))
         
         # Update capacity-specific metrics
         self._update_capacity_metrics(block.mining_capacity, record)
         
         # Update verification time tracking
-        self.recent_verification_times.append(complexity.measured_verify_time)
-        self.recent_solve_times.append(complexity.measured_solve_time)
+        self.recent_verification_times.push(complexity.measured_verify_time)
+        self.recent_solve_times.push(complexity.measured_solve_time)
         
         # NEW: Credit reward to miner's wallet if blockchain state is available
         if self.blockchain_state and miner_address:
@@ -267,7 +282,7 @@ class DynamicWorkScoreTokenomics:
             )
             
             # Add to transaction history
-            self.blockchain_state.transaction_history[miner_address].append(coinbase_tx)
+            self.blockchain_state.record_transaction(miner_address, coinbase_tx)
             
             print(f"💰 Credited {reward:.6f} coins to miner {miner_address}")
     
@@ -289,12 +304,14 @@ class DynamicWorkScoreTokenomics:
         metrics.blocks_mined += 1
         metrics.total_work_score += record.work_score
         metrics.recent_records.append(record)
-        
-        # Recalculate averages from recent data
-        recent = list(metrics.recent_records)
-        metrics.avg_work_score = statistics.mean(r.work_score for r in recent)
-        metrics.avg_solve_time = statistics.mean(r.measured_solve_time for r in recent)
-        metrics.avg_asymmetry = statistics.mean(r.asymmetry_ratio for r in recent)
+        metrics.work_window.push(record.work_score)
+        metrics.solve_time_window.push(record.measured_solve_time)
+        metrics.asymmetry_window.push(record.asymmetry_ratio)
+        
+        # Averages over recent data
+        metrics.avg_work_score = metrics.work_window.mean()
+        metrics.avg_solve_time = metrics.solve_time_window.mean()
+        metrics.avg_asymmetry = metrics.asymmetry_window.mean()
     
     def get_dynamic_block_time(self) -> float:
         """
@@ -309,7 +326,7 @@ class DynamicWorkScoreTokenomics:
             return 1.0  # 1 second default
         
         # Median verification time (robust to outliers)
-        median_verify = statistics.median(self.recent_verification_times)
+        median_verify = self.recent_verification_times.median()
         
         # Block time needs to be long enough for:
         # 1. Verification (median_verify)
@@ -331,15 +348,12 @@ class DynamicWorkScoreTokenomics:
         but rather maintaining healthy work score distribution.
         """
         
-        if len(self.work_score_history) < 100:
+        if len(self.recent_work_scores) < 100:
             return 1.0  # No adjustment until enough data
         
         # Analyze work score distribution
-        recent_100 = self.work_score_history[-100:]
-        recent_50 = self.work_score_history[-50:]
-        
-        avg_work_recent = statistics.mean(r.work_score for r in recent_50)
-        avg_work_historical = statistics.mean(r.work_score for r in recent_100)
+        avg_work_recent = statistics.mean(self.recent_work_scores.last(50))
+        avg_work_historical = self.recent_work_scores.mean()
         
         # If recent work is much higher/lower than historical, adjust
         if avg_work_historical > 0:
@@ -363,12 +377,15 @@ class DynamicWorkScoreTokenomics:
         If one capacity is over/under-represented, miners will adjust.
         """
         
-        total_blocks = len(self.work_score_history)
+        total_blocks = self.blocks_mined
         if total_blocks == 0:
             return {}
         
         dynamics = {}
         
+        # Network average over recent blocks
+        avg_work_per_second = self.recent_work_rates.mean()
+        
         for capacity, metrics in self.capacity_performance.items():
             # Market share
             market_share = metrics.blocks_mined / total_blocks
@@ -378,12 +395,6 @@ class DynamicWorkScoreTokenomics:
             work_per_second = metrics.avg_work_score / max(0.001, metrics.avg_solve_time)
             
             # Compare to network average
-            all_work_scores = [r.work_score for r in self.work_score_history[-100:]]
-            all_solve_times = [r.measured_solve_time for r in self.work_score_history[-100:]]
-            avg_work_per_second = statistics.mean(
-                w / max(0.001, t) for w, t in zip(all_work_scores, all_solve_times)
-            )
-            
             relative_profitability = work_per_second / avg_work_per_second if avg_work_per_second > 0 else 1.0
             
             dynamics[capacity] = {
@@ -424,7 +435,7 @@ class DynamicWorkScoreTokenomics:
             'total_coins_issued': self.total_coins_issued,
             'coins_per_work_unit': self.total_coins_issued / max(1, self.cumulative_work_score),
             'current_deflation_factor': self._calculate_deflation_factor(),
-            'blocks_mined': len(self.work_score_history),
+            'blocks_mined': self.blocks_mined,
             'dynamic_block_time': self.get_dynamic_block_time(),
             'difficulty_adjustment': self.get_difficulty_adjustment(),
             'capacity_dynamics': self.get_capacity_market_dynamics(),
@@ -435,11 +446,12 @@ class DynamicWorkScoreTokenomics:
     def _analyze_work_score_trend(self) -> dict:
         """Analyze how work scores are evolving"""
         
-        if len(self.work_score_history) < 100:
+        if len(self.recent_work_scores) < 100:
             return {'status': 'INSUFFICIENT_DATA'}
         
-        recent_50 = [r.work_score for r in self.work_score_history[-50:]]
-        older_50 = [r.work_score for r in self.work_score_history[-100:-50]]
+        scores = self.recent_work_scores.last(100)
+        recent_50 = scores[-50:]
+        older_50 = scores[:50]
         
         recent_mean = statistics.mean(recent_50)
         older_mean = statistics.mean(older_50)
@@ -15,6 +15,14 @@ from cryptography.hazmat.primitives.asymmetric import ed25519
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.backends import default_backend
 
+try:
+    from ..signature_verifier import get_signature_verifier
+except (ImportError, ValueError):
+    # Loaded as a top-level module: make src/ importable (as dynamic_tokenomics does)
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from signature_verifier import get_signature_verifier
+
 
 class Wallet:
     """
@@ -98,11 +106,32 @@ class Wallet:
         signature = self.sign_transaction(canonical)
         return signature.hex()
     
+    @staticmethod
+    def _block_signature_item(public_key_hex: str, block_data: dict, signature_hex: str):
+        """(public_key, canonical block bytes, signature), or None if the hex is invalid."""
+        # Validate hex strings before processing
+        if not public_key_hex or not signature_hex:
+            return None
+        
+        try:
+            pub_bytes = bytes.fromhex(public_key_hex)
+            sig_bytes = bytes.fromhex(signature_hex)
+        except ValueError:
+            # Not valid hex strings - this is likely a test or invalid submission
+            return None
+        
+        canonical = json.dumps(block_data, sort_keys=True).encode()
+        return pub_bytes, canonical, sig_bytes
+    
     @staticmethod
     def verify_block_signature(public_key_hex: str, block_data: dict, signature_hex: str) -> bool:
         """
         Verify block signature.
         
+        Goes through the shared SignatureVerifier, so a block signature that
+        was already verified (e.g. on submission, then again on ingest) is
+        answered from its cache.
+        
         Args:
             public_key_hex: Public key as hex string
             block_data: Block data dictionary that was signed
@@ -111,28 +140,10 @@ class Wallet:
         Returns:
             True if signature is valid
         """
-        import json
-        from cryptography.hazmat.primitives.asymmetric import ed25519
-        
-        # Validate hex strings before processing
-        if not public_key_hex or not signature_hex:
+        item = Wallet._block_signature_item(public_key_hex, block_data, signature_hex)
+        if item is None:
             return False
-            
-        # Check if strings are valid hexadecimal
-        try:
-            # Test if strings are valid hex
-            bytes.fromhex(public_key_hex)
-            bytes.fromhex(signature_hex)
-        except ValueError:
-            # Not valid hex strings - this is likely a test or invalid submission
-            return False
-        
-        canonical = json.dumps(block_data, sort_keys=True).encode()
-        pub_bytes = bytes.fromhex(public_key_hex)
-        sig_bytes = bytes.fromhex(signature_hex)
-        
-        # Use multi-implementation verification (prioritizes PyNaCl for browser compatibility)
-        return Wallet._verify_tweetnacl_signature(public_key_hex, canonical, signature_hex)
+        return get_signature_verifier().verify(*item)
     
     def zk_prove_wallet_ownership(self, challenge: bytes) -> str:
         """
@@ -172,58 +183,6 @@ class Wallet:
         except Exception:
             return False
     
-    @staticmethod
-    def _verify_tweetnacl_signature(public_key_hex: str, data: bytes, signature_hex: str) -> bool:
-        """
-        Verify signature using multiple implementations as fallback.
-        
-        Args:
-            public_key_hex: Public key as hex string
-            data: Data that was signed
-            signature_hex: Signature as hex string
-            
-        Returns:
-            True if signature is valid
-        """
-        # Try 1: PyNaCl (most compatible with browser crypto.subtle)
-        try:
-            import nacl.signing
-            pub_bytes = bytes.fromhex(public_key_hex)
-            sig_bytes = bytes.fromhex(signature_hex)
-            verify_key = nacl.signing.VerifyKey(pub_bytes)
-            # PyNaCl expects signature + message concatenated format
-            signed_message = sig_bytes + data
-            verify_key.verify(signed_message)
-            print("✅ Signature verified with PyNaCl (browser-compatible)")
-            return True
-        except Exception as e:
-            print(f"PyNaCl verification failed: {e}")
-        
-        # Try 2: cryptography library (standard Python Ed25519)
-        try:
-            from cryptography.hazmat.primitives.asymmetric import ed25519
-            pub_bytes = bytes.fromhex(public_key_hex)
-            sig_bytes = bytes.fromhex(signature_hex)
-            public_key = ed25519.Ed25519PublicKey.from_public_bytes(pub_bytes)
-            public_key.verify(sig_bytes, data)
-            print("✅ Signature verified with cryptography library")
-            return True
-        except Exception as e:
-            print(f"Cryptography library verification failed: {e}")
-        
-        # Try 3: Pure Python ed25519 library (fallback)
-        try:
-            import ed25519
-            pub_bytes = bytes.fromhex(public_key_hex)
-            sig_bytes = bytes.fromhex(signature_hex)
-            vk = ed25519.VerifyingKey(pub_bytes)
-            vk.verify(sig_bytes, data)
-            return True
-        except Exception as e:
-            pass
-        
-        return False
-    
     def verify_signature(self, data: bytes, signature: bytes) -> bool:
         """
         Verify signature against data using public key.
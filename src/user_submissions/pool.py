@@ -1,4 +1,6 @@
 from __future__ import annotations
+import heapq
+from collections import deque
 from dataclasses import dataclass, field
 from typing import Optional, Tuple
 
@@ -12,17 +14,66 @@ except ImportError:
     from core.blockchain import HardwareType, ProblemTier
 
 
+# Tier order for eligibility: a miner can take submissions at or below its tier
+_TIER_RANK = {tier: rank for rank, tier in enumerate(ProblemTier)}
+
+
 @dataclass
 class ProblemPool:
+    """
+    Open user submissions, indexed for the miner loop.
+
+    Submissions sit in max-heaps keyed by priority score (bounty times
+    aggregation urgency), with submission age (insertion order) as the
+    tie-break, one heap per minimum tier. Scores only change when a
+    solution is recorded, so add, select and record are O(log n); stale
+    heap entries (re-scored, closed, expired or removed submissions) are
+    dropped lazily when they reach the top, and a heap is rebuilt once
+    more than half of it is stale, so heap memory stays proportional to
+    the open submissions.
+
+    Callers that change a submission directly instead of through
+    record_solution() should call refresh() afterwards, and the node
+    reports each new tip height through advance_block().
+    """
+
     pending_problems: dict[str, ProblemSubmission] = field(default_factory=dict)
     current_block: int = 0
+    max_age_blocks: Optional[int] = None  # Expire submissions open longer than this
+    revision: int = field(default=0, init=False)  # Bumped whenever selection may change
+
+    _heaps: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+    _index: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+    _sequence: int = field(default=0, init=False, repr=False, compare=False)
+    _stale: dict = field(default_factory=dict, init=False, repr=False, compare=False)  # tier -> stale entries
+
+    def __post_init__(self):
+        for submission_id, submission in self.pending_problems.items():
+            self._push(submission_id, submission)
 
     def add_submission(self, submission_id: str, submission: ProblemSubmission) -> None:
         self.pending_problems[submission_id] = submission
+        self._push(submission_id, submission)
 
     def get_submission(self, submission_id: str) -> Optional[ProblemSubmission]:
         return self.pending_problems.get(submission_id)
 
+    def remove_submission(self, submission_id: str) -> Optional[ProblemSubmission]:
+        """Drop a submission; its heap entry is discarded lazily."""
+        meta = self._index.pop(submission_id, None)
+        if meta is not None:
+            self._mark_stale(meta[3])
+        self.revision += 1
+        return self.pending_problems.pop(submission_id, None)
+
+    def advance_block(self, height: int) -> None:
+        """Move to a new chain height (submissions older than max_age_blocks expire on selection)."""
+        if height == self.current_block:
+            return
+        self.current_block = height
+        if self.max_age_blocks is not None:
+            self.revision += 1
+
     def get_priority_score(self, submission: ProblemSubmission, current_block: int) -> float:
         base_reward = submission.bounty_per_solution
         urgency_multiplier = 1.0
@@ -41,18 +92,40 @@ class ProblemPool:
         return base_reward * urgency_multiplier
 
     def select_problem_for_mining(self, miner_tier: ProblemTier, miner_hardware: HardwareType) -> Optional[Tuple[str, ProblemSubmission]]:
-        eligible = [
-            (sid, p) for sid, p in self.pending_problems.items()
-            if p.is_accepting_solutions()
-        ]
-        if not eligible:
+        best = None
+        for tier in self._eligible_tiers(miner_tier):
+            entry = self._top(tier)
+            if entry is not None and (best is None or entry < best):
+                best = entry
+        if best is None:
             return None
-        scored = [
-            (sid, p, self.get_priority_score(p, self.current_block))
-            for sid, p in eligible
-        ]
-        sid, best, _ = max(scored, key=lambda x: x[2])
-        return sid, best
+        sid = best[3]
+        return sid, self.pending_problems[sid]
+
+    def prefetch(self, miner_tier: ProblemTier, count: int) -> list[Tuple[str, ProblemSubmission]]:
+        """
+        Up to `count` best eligible submissions, best first.
+
+        Pops and restores heap entries, so the cost is O(count log n).
+        """
+        tiers = [tier for tier in self._eligible_tiers(miner_tier) if self._heaps[tier]]
+        taken = []
+        selected = []
+        while len(selected) < count:
+            best_tier, best = None, None
+            for tier in tiers:
+                entry = self._top(tier)
+                if entry is not None and (best is None or entry < best):
+                    best_tier, best = tier, entry
+            if best is None:
+                break
+            best_heap = self._heaps[best_tier]
+            heapq.heappop(best_heap)
+            taken.append((best_heap, best))
+            selected.append((best[3], self.pending_problems[best[3]]))
+        for heap, entry in taken:
+            heapq.heappush(heap, entry)
+        return selected
 
     def record_solution(self, submission_id: str, record: SolutionRecord) -> None:
         submission = self.pending_problems.get(submission_id)
@@ -60,5 +133,113 @@ class ProblemPool:
             return
         submission.solutions_collected.append(record)
         submission.update_status_after_append()
+        self.refresh(submission_id)
+
+    def refresh(self, submission_id: str) -> None:
+        """Re-score a submission after it changed (solutions, status, bounty)."""
+        submission = self.pending_problems.get(submission_id)
+        if submission is not None:
+            self._push(submission_id, submission)
+
+    def open_count(self) -> int:
+        """Submissions still indexed for mining (closed ones may linger until selected past)."""
+        return len(self._index)
+
+    # ---- heap maintenance ----
+
+    def _push(self, submission_id: str, submission: ProblemSubmission) -> None:
+        self.revision += 1
+        meta = self._index.get(submission_id)
+        if meta is None:
+            # [age sequence, version, block added, heap tier]; the sequence keeps the original age on re-score
+            meta = [self._sequence, 0, self.current_block, None]
+            self._sequence += 1
+        else:
+            meta[1] += 1
+            self._mark_stale(meta[3])  # The previous entry
+        if not submission.is_accepting_solutions():
+            self._index.pop(submission_id, None)
+            return
+        tier = getattr(submission, 'min_tier', None)
+        meta[3] = tier
+        self._index[submission_id] = meta
+
+        heap = self._heaps.setdefault(tier, [])
+        priority = self.get_priority_score(submission, self.current_block)
+        heapq.heappush(heap, (-priority, meta[0], meta[1], submission_id))
+
+    def _eligible_tiers(self, miner_tier: Optional[ProblemTier]) -> list:
+        miner_rank = _TIER_RANK.get(miner_tier, len(_TIER_RANK))
+        return [tier for tier in self._heaps
+                if tier is None or _TIER_RANK.get(tier, 0) <= miner_rank]
+
+    def _is_current(self, entry: tuple) -> bool:
+        meta = self._index.get(entry[3])
+        return meta is not None and meta[0] == entry[1] and meta[1] == entry[2]
+
+    def _mark_stale(self, tier) -> None:
+        """Count a superseded entry in tier's heap; rebuild the heap once half of it is stale."""
+        heap = self._heaps.get(tier)
+        if not heap:
+            return
+        stale = self._stale.get(tier, 0) + 1
+        if stale * 2 > len(heap):
+            heap[:] = [entry for entry in heap if self._is_current(entry)]
+            heapq.heapify(heap)
+            stale = 0
+        self._stale[tier] = stale
+
+    def _top(self, tier) -> Optional[tuple]:
+        """Best live entry of a tier's heap, discarding stale ones on the way."""
+        heap = self._heaps[tier]
+        while heap:
+            entry = heap[0]
+            submission_id = entry[3]
+            meta = self._index.get(submission_id)
+            if meta is None or meta[0] != entry[1] or meta[1] != entry[2]:
+                self._stale[tier] = max(0, self._stale.get(tier, 0) - 1)
+            else:
+                submission = self.pending_problems.get(submission_id)
+                if submission is None or not submission.is_accepting_solutions():
+                    self._index.pop(submission_id, None)
+                elif self.max_age_blocks is not None and self.current_block - meta[2] > self.max_age_blocks:
+                    submission.status = 'expired'
+                    self._index.pop(submission_id, None)
+                    self.revision += 1
+                else:
+                    return entry
+            heapq.heappop(heap)
+        return None
+
+
+class PrefetchQueue:
+    """
+    Mining-side queue of prefetched submissions for one miner tier.
+
+    Hands out the pool's best submissions in order, refilling in batches
+    when it runs dry or the pool has changed since the last fill.
+
+    Usage:
+        queue = PrefetchQueue(pool, ProblemTier.TIER_2_DESKTOP)
+        picked = queue.next()  # (submission_id, submission) or None
+    """
+
+    def __init__(self, pool: ProblemPool, miner_tier: ProblemTier, batch_size: int = 16):
+        self.pool = pool
+        self.miner_tier = miner_tier
+        self.batch_size = batch_size
+        self._queue: deque = deque()
+        self._revision = -1
 
+    def next(self) -> Optional[Tuple[str, ProblemSubmission]]:
+        if not self._queue or self._revision != self.pool.revision:
+            self._queue = deque(self.pool.prefetch(self.miner_tier, self.batch_size))
+            self._revision = self.pool.revision
+        while self._queue:
+            submission_id, submission = self._queue.popleft()
+            if submission.is_accepting_solutions():
+                return submission_id, submission
+        return None
 
+    def __len__(self) -> int:
+        return len(self._queue)
@@ -45,6 +45,9 @@ class ProblemSubmission:
 
     solutions_collected: list[SolutionRecord] = field(default_factory=list)
 
+    # Lowest miner tier that may take this problem (None: any tier)
+    min_tier: Optional[Any] = None
+
     def is_accepting_solutions(self) -> bool:
         if self.status in ['complete', 'expired']:
             return False
@@ -0,0 +1,247 @@
+"""
+Unit Tests for the asyncio network transport
+Tests framing, connection reuse, backpressure and transport-backed discovery
+"""
+
+import asyncio
+import json
+import sys
+import os
+import socket
+import time
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from async_transport import AsyncTransport, EventLoopThread, JsonObjectFramer, LengthPrefixedFramer
+from network import HeaderMsg, HelloMsg, NetworkProtocol, WIRE_VERSION_BINARY
+from p2p_discovery import DiscoveryConfig, P2PDiscoveryService
+
+
+class MockComponent:
+    pass
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(condition, timeout: float = 2.0) -> bool:
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def feed_reader(data: bytes) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+class TestFramers:
+    """Frames survive arbitrary TCP segmentation."""
+
+    def test_length_prefixed(self):
+        framer = LengthPrefixedFramer(max_frame_size=16)
+
+        async def read_all(data):
+            reader = feed_reader(data)
+            frames = []
+            while (frame := await framer.read_frame(reader)) is not None:
+                frames.append(frame)
+            return frames
+
+        stream = framer.encode(b"abc") + framer.encode(b"") + framer.encode(b"x" * 16)
+        assert asyncio.run(read_all(stream)) == [b"abc", b"", b"x" * 16]
+        with pytest.raises(ConnectionError):
+            asyncio.run(read_all(stream[:-1]))
+        with pytest.raises(ValueError):
+            framer.encode(b"x" * 17)
+
+    def test_json_objects_split_anywhere(self):
+        objects = [{"type": "peer_list_response", "peers": [{"note": "} { \" \\"}]}, {"a": {"b": {}}}]
+        stream = b" ".join(json.dumps(o).encode() for o in objects)
+        for split in range(1, len(stream)):
+            framer = JsonObjectFramer()
+            frames = []
+            for chunk in (stream[:split], stream[split:]):
+                framer.feed(chunk)
+                while (frame := framer.next_frame()) is not None:
+                    frames.append(json.loads(frame))
+            assert frames == objects
+
+    def test_json_rejects_garbage(self):
+        framer = JsonObjectFramer()
+        framer.feed(b"[1, 2]")
+        with pytest.raises(ValueError):
+            framer.next_frame()
+
+
+async def echo_server(framer_factory=LengthPrefixedFramer):
+    """Server echoing every frame back; returns (server, port, connection count)."""
+    accepted = []
+
+    async def handle(reader, writer):
+        accepted.append(writer)
+        framer = framer_factory(1024 * 1024)
+        while (frame := await framer.read_frame(reader)) is not None:
+            writer.write(framer.encode(frame))
+            await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1], accepted
+
+
+class TestAsyncTransport:
+    """Pooled connections with timeouts and bounded send queues."""
+
+    def test_request_reuses_connection(self):
+        async def scenario():
+            server, port, accepted = await echo_server()
+            transport = AsyncTransport("test")
+            responses = [await transport.request("127.0.0.1", port, f"ping-{i}".encode()) for i in range(5)]
+            stats = transport.get_stats()
+            await transport.close_all()
+            server.close()
+            return responses, stats, len(accepted)
+
+        responses, stats, accepted = asyncio.run(scenario())
+        assert responses == [f"ping-{i}".encode() for i in range(5)]
+        assert accepted == 1
+        assert stats["connections_opened"] == 1
+        assert stats["connections_reused"] == 4
+
+    def test_unsolicited_frames_dispatched(self):
+        async def scenario():
+            received = asyncio.Queue()
+            server, port, _ = await echo_server()
+            transport = AsyncTransport("test", on_frame=lambda conn, frame: received.put_nowait(frame))
+            await transport.send("127.0.0.1", port, b"hello")
+            frame = await asyncio.wait_for(received.get(), 2.0)
+            await transport.close_all()
+            server.close()
+            return frame
+
+        assert asyncio.run(scenario()) == b"hello"
+
+    def test_send_queue_backpressure(self):
+        async def scenario():
+            # A server that never reads: the socket buffers fill, then the queue
+            server = await asyncio.start_server(lambda r, w: asyncio.sleep(3600), "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            transport = AsyncTransport("test", send_queue_size=4, write_timeout=0.2)
+            connection = await transport.connect("127.0.0.1", port)
+            payload = b"x" * 65536
+            queued = sum(connection.send_nowait(payload) for _ in range(200))
+            with pytest.raises(asyncio.TimeoutError):
+                while True:
+                    await connection.send(payload, timeout=0.2)
+            dropped = transport.get_stats()["dropped_frames"]
+            await transport.close_all()
+            server.close()
+            return queued, dropped
+
+        queued, dropped = asyncio.run(scenario())
+        assert queued < 200
+        assert dropped == 200 - queued
+
+    def test_request_timeout(self):
+        async def scenario():
+            server = await asyncio.start_server(lambda r, w: asyncio.sleep(3600), "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            transport = AsyncTransport("test")
+            try:
+                with pytest.raises(asyncio.TimeoutError):
+                    await transport.request("127.0.0.1", port, b"ping", timeout=0.1)
+            finally:
+                await transport.close_all()
+                server.close()
+
+        asyncio.run(scenario())
+
+
+class TestTransportIntegration:
+    """NetworkProtocol and discovery run on the shared loop thread."""
+
+    def test_header_broadcast_reaches_peer(self):
+        received = []
+        loop_thread = EventLoopThread("test-loop")
+        sink = AsyncTransport("sink", on_frame=lambda conn, frame: received.append(frame), loop_thread=loop_thread)
+        sink.start()
+        server = sink.run(sink.listen("127.0.0.1", 0))
+        port = server.sockets[0].getsockname()[1]
+
+        net = NetworkProtocol(MockComponent(), MockComponent(), MockComponent())
+        net.start_equilibrium_loops()
+        try:
+            assert net.connect_peer("sink", "127.0.0.1", port)
+            message = HeaderMsg(header_bytes=b"h" * 64, tip_work=7, peer_id="local_peer")
+            assert net.broadcast_message(message) == 1
+            assert wait_for(lambda: len(received) >= 2)
+            decoded = [net.decode_message(frame) for frame in received]
+            assert isinstance(decoded[0], HelloMsg)
+            assert decoded[1:] == [message]
+        finally:
+            net.stop_equilibrium_loops()
+            sink.stop()
+
+    def test_peers_negotiate_binary_wire_version(self):
+        port = free_port()
+        server = NetworkProtocol(MockComponent(), MockComponent(), MockComponent(), peer_id="server",
+                                 listen_address=("127.0.0.1", port))
+        client = NetworkProtocol(MockComponent(), MockComponent(), MockComponent(), peer_id="client")
+        server.start_equilibrium_loops()
+        client.start_equilibrium_loops()
+        try:
+            assert client.connect_peer("server", "127.0.0.1", port)
+            assert wait_for(lambda: client.get_peer_wire_version("server") == WIRE_VERSION_BINARY)
+            assert wait_for(lambda: WIRE_VERSION_BINARY in server.peer_wire_versions.values())
+        finally:
+            client.stop_equilibrium_loops()
+            server.stop_equilibrium_loops()
+
+    def test_discovery_queries_bootstraps_concurrently(self):
+        loop_thread = EventLoopThread("test-loop")
+        bootstrap = AsyncTransport("bootstrap", loop_thread=loop_thread)
+        bootstrap.start()
+
+        async def serve():
+            async def handle(reader, writer):
+                framer = JsonObjectFramer()
+                request = json.loads(await framer.read_frame(reader))
+                assert request["type"] == "peer_list_request"
+                await asyncio.sleep(0.3)
+                peer = {"peer_id": f"peer-{writer.get_extra_info('sockname')[1]}", "address": "10.0.0.1",
+                        "port": 12346, "protocol": "bootstrap", "last_seen": 0}
+                # Reply in two segments to exercise the streaming framer
+                body = json.dumps({"type": "peer_list_response", "peers": [peer]}).encode()
+                writer.write(body[:10])
+                await writer.drain()
+                writer.write(body[10:])
+                await writer.drain()
+                writer.close()
+
+            servers = [await asyncio.start_server(handle, "127.0.0.1", 0) for _ in range(3)]
+            return servers, [s.sockets[0].getsockname()[1] for s in servers]
+
+        servers, ports = bootstrap.run(serve())
+        discovery = P2PDiscoveryService(DiscoveryConfig(bootstrap_nodes=[f"127.0.0.1:{p}" for p in ports]))
+        discovery.transport.start()
+        try:
+            start = time.perf_counter()
+            discovery.transport.run(discovery._discover_from_bootstrap_nodes(), timeout=5.0)
+            elapsed = time.perf_counter() - start
+            assert len(discovery.discovered_peers) == 3
+            assert elapsed < 0.8  # three 0.3s servers queried in parallel
+        finally:
+            for server in servers:
+                bootstrap.call_soon(server.close)
+            discovery.transport.stop()
+            bootstrap.stop()
@@ -0,0 +1,62 @@
+"""
+Unit Tests for BlockchainState
+Tests fee validation and charging, and transaction lookups by ID
+"""
+
+import sys
+import os
+
+import pytest
+
+pytest.importorskip("cryptography")
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+
+# Add src/tokenomics to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'tokenomics'))
+
+from blockchain_state import BlockchainState, Transaction
+
+
+ALICE = "CJ" + "a" * 40
+BOB = "CJ" + "b" * 40
+
+
+def signed_tx(amount, fee, timestamp=1000.0):
+    key = ed25519.Ed25519PrivateKey.generate()
+    private_bytes = key.private_bytes(serialization.Encoding.Raw, serialization.PrivateFormat.Raw,
+                                      serialization.NoEncryption())
+    tx = Transaction(sender=ALICE, recipient=BOB, amount=amount, timestamp=timestamp, fee=fee)
+    tx.sign(private_bytes)
+    return tx
+
+
+class TestFees:
+    """Fees are validated against the balance and charged to the sender."""
+
+    def test_fee_validation(self):
+        state = BlockchainState()
+        state.update_balance(ALICE, 10.0)
+        assert state.validate_transaction(signed_tx(9.0, 1.0))
+        assert not state.validate_transaction(signed_tx(9.0, 1.5))
+        assert not state.validate_transaction(signed_tx(1.0, -0.5))
+
+    def test_fee_is_charged(self):
+        state = BlockchainState()
+        state.update_balance(ALICE, 10.0)
+        tx = signed_tx(4.0, 0.5)
+        assert state.add_transaction(tx)
+        assert state.process_transactions([tx])
+        assert state.get_balance(ALICE) == pytest.approx(5.5)
+        assert state.get_balance(BOB) == pytest.approx(4.0)
+
+
+class TestLookups:
+    """Every history append is visible to get_transaction_by_id()."""
+
+    def test_recorded_coinbase_found(self):
+        state = BlockchainState()
+        coinbase = state.create_coinbase_transaction(BOB, 2.0, timestamp=1000.0)
+        state.record_transaction(BOB, coinbase)
+        assert state.get_transaction_by_id(coinbase.transaction_id) is coinbase
+        assert state.get_transaction_history(BOB) == [coinbase]
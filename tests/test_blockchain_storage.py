@@ -0,0 +1,183 @@
+"""
+Unit Tests for the API block storage
+Tests the indexed block columns, canonical header queries over stored forks
+and explorer paging
+"""
+
+import json
+import sqlite3
+import sys
+import os
+
+import pytest
+
+# Add src/api to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'api'))
+
+from blockchain_storage import COINjectureStorage
+
+
+def make_block(height, previous_hash, prefix="a", work=None):
+    return {
+        'index': height,
+        'block_hash': f"{prefix}{height:063d}",
+        'previous_hash': previous_hash,
+        'timestamp': 1000.0 + height,
+        'miner_address': f"BEANS{prefix}",
+        'work_score': 1.0,
+        'cumulative_work_score': float(height if work is None else work),
+    }
+
+
+def add_chain(storage, length, prefix="a", parent=None, start=0, work_bonus=0.0):
+    blocks = []
+    previous = parent or "0" * 64
+    for height in range(start, start + length):
+        block = make_block(height, previous, prefix, work=height + work_bonus)
+        assert storage.add_block_data(block)
+        blocks.append(block)
+        previous = block['block_hash']
+    return blocks
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return COINjectureStorage(data_dir=str(tmp_path))
+
+
+class TestIndexedColumns:
+    """miner_address, cid, previous_hash and capacity mirror block_bytes."""
+
+    def test_add_block_fills_columns(self, storage):
+        block = dict(make_block(1, "0" * 64), cid="QmCid", capacity="TIER_2")
+        storage.add_block(block['block_hash'], json.dumps(block).encode('utf-8'), 1)
+        assert storage.get_block_by_cid("QmCid")['block_hash'] == block['block_hash']
+        assert [b['height'] for b in storage.get_blocks_by_miner("BEANSa")] == [1]
+        assert [b['height'] for b in storage.get_child_blocks("0" * 64)] == [1]
+        assert storage.backfill_block_columns() == 0
+
+    def test_migration_backfills_old_schema(self, tmp_path):
+        conn = sqlite3.connect(str(tmp_path / "blockchain.db"))
+        conn.execute('''
+            CREATE TABLE blocks (block_hash TEXT PRIMARY KEY, block_bytes BLOB, height INTEGER NOT NULL,
+                                 timestamp INTEGER, work_score REAL DEFAULT 0, gas_used INTEGER DEFAULT 0,
+                                 gas_limit INTEGER DEFAULT 1000000, gas_price REAL DEFAULT 0.000001,
+                                 reward REAL DEFAULT 0, cumulative_work REAL DEFAULT 0,
+                                 is_full_block BOOLEAN DEFAULT 0)
+        ''')
+        block = dict(make_block(0, "0" * 64), offchain_cid="QmOld", mining_capacity=3)
+        conn.execute('INSERT INTO blocks (block_hash, block_bytes, height) VALUES (?, ?, ?)',
+                     (block['block_hash'], json.dumps(block).encode('utf-8'), 0))
+        conn.execute('INSERT INTO blocks (block_hash, block_bytes, height) VALUES (?, ?, ?)',
+                     ("f" * 64, b"not json", 1))
+        conn.commit()
+        conn.close()
+
+        storage = COINjectureStorage(data_dir=str(tmp_path))
+        rows = sqlite3.connect(storage.db_path).execute(
+            'SELECT miner_address, cid, previous_hash, capacity FROM blocks ORDER BY height').fetchall()
+        assert rows == [("BEANSa", "QmOld", "0" * 64, "3"), ("", None, None, None)]
+        assert storage.backfill_block_columns() == 0
+
+    def test_backfill_chunks(self, storage):
+        add_chain(storage, 5)
+        conn = sqlite3.connect(storage.db_path)
+        conn.execute('UPDATE blocks SET miner_address = NULL, previous_hash = NULL')
+        conn.commit()
+        conn.close()
+
+        assert storage.backfill_block_columns(chunk_size=2) == 5
+        assert len(storage.get_blocks_by_miner("BEANSa")) == 5
+        assert len(storage.get_child_blocks("0" * 64)) == 1
+
+    def test_miner_reward_summary(self, storage):
+        for height, reward in enumerate((1.5, 2.5)):
+            storage.add_block_data(dict(make_block(height, "0" * 64), reward=reward, work_score=2.0))
+        storage.add_block_data(dict(make_block(0, "0" * 64, prefix="b"), reward=9.0))
+
+        assert storage.get_miner_reward_summary("BEANSa") == {
+            'total_blocks': 2, 'total_rewards': 4.0, 'total_work_score': 4.0}
+        assert storage.get_miner_reward_summary("nobody") == {
+            'total_blocks': 0, 'total_rewards': 0, 'total_work_score': 0}
+
+
+class TestHeaders:
+    """get_headers() follows the canonical chain only."""
+
+    def test_fork_excluded(self, storage):
+        main = add_chain(storage, 6, prefix="a")
+        # Side branch off height 2 with less work, then a heavier one off height 3
+        add_chain(storage, 2, prefix="b", parent=main[2]['block_hash'], start=3, work_bonus=-0.5)
+        heavy = add_chain(storage, 2, prefix="c", parent=main[3]['block_hash'], start=4, work_bonus=5.0)
+
+        headers = storage.get_headers(0, 10)
+        assert [h['height'] for h in headers] == list(range(6))
+        assert [h['block_hash'] for h in headers] == \
+            [b['block_hash'] for b in main[:4] + heavy]
+
+        window = storage.get_headers(3, 2)
+        assert [h['block_hash'] for h in window] == [main[3]['block_hash'], heavy[0]['block_hash']]
+
+    def test_empty(self, storage):
+        assert storage.get_headers(0, 10) == []
+
+    def test_canonical_map_follows_reorgs(self, storage):
+        main = add_chain(storage, 8, prefix="a")
+        conn = sqlite3.connect(storage.db_path)
+        canonical = lambda: [row[0] for row in conn.execute(
+            'SELECT block_hash FROM canonical_chain ORDER BY height')]
+        assert canonical() == [b['block_hash'] for b in main]
+
+        # Heavier, shorter branch off height 4 truncates the map
+        side = add_chain(storage, 2, prefix="s", parent=main[4]['block_hash'], start=5, work_bonus=10.0)
+        assert canonical() == [b['block_hash'] for b in main[:5] + side]
+        assert [h['block_hash'] for h in storage.get_headers(5, 10)] == [b['block_hash'] for b in side]
+
+        # Older databases without the map are filled on open
+        conn.execute('DELETE FROM canonical_chain')
+        conn.commit()
+        reopened = COINjectureStorage(data_dir=storage.data_dir)
+        assert canonical() == [b['block_hash'] for b in main[:5] + side]
+        assert len(reopened.get_headers(0, 100)) == 7
+        conn.close()
+
+
+def page_through(storage, sort_by, sort_order, limit):
+    pages = []
+    cursor = None
+    while True:
+        blocks, cursor = storage.get_explorer_blocks(sort_by=sort_by, sort_order=sort_order,
+                                                     limit=limit, cursor=cursor)
+        pages.extend(block['height'] for block in blocks)
+        if cursor is None:
+            return pages
+
+
+class TestExplorer:
+    """Keyset paging over the explorer sort columns."""
+
+    @pytest.mark.parametrize("cursor", ["garbage", "abc:1", "1.5:x", "nan:3", ":", "None:4"])
+    def test_malformed_cursor_rejected(self, storage, cursor):
+        with pytest.raises(ValueError):
+            storage.get_explorer_blocks(sort_by='timestamp', cursor=cursor)
+
+    def test_cursor_pages_match_offset_order(self, storage):
+        add_chain(storage, 7)
+        expected, _ = storage.get_explorer_blocks(sort_by='work_score', limit=10)
+        assert page_through(storage, 'work_score', 'desc', 3) == [b['height'] for b in expected]
+        assert page_through(storage, 'height', 'asc', 2) == list(range(7))
+
+    @pytest.mark.parametrize("sort_order", ["asc", "desc"])
+    def test_null_sort_values(self, storage, sort_order):
+        add_chain(storage, 6)
+        conn = sqlite3.connect(storage.db_path)
+        conn.execute('UPDATE blocks SET timestamp = NULL WHERE height IN (1, 4)')
+        conn.commit()
+        conn.close()
+
+        blocks, cursor = storage.get_explorer_blocks(sort_by='timestamp', sort_order=sort_order, limit=1)
+        heights = page_through(storage, 'timestamp', sort_order, 1)
+        assert sorted(heights) == list(range(6))
+        null_first = [1, 4, 0, 2, 3, 5]
+        assert heights == (null_first if sort_order == 'asc' else null_first[::-1])
+        assert cursor is not None and not cursor.startswith('None')
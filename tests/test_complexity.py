@@ -0,0 +1,110 @@
+"""
+Unit Tests for compiled complexity expressions
+Tests parity with the original parser, caching and batch evaluation
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core import complexity
+from dataclasses import replace
+
+from core.blockchain import (
+    EnergyMetrics, PROBLEM_REGISTRY, ProblemTier, ProblemType,
+    complexity_to_operations, verify_complexity_metrics
+)
+from metrics_engine import MetricsEngine
+
+
+class TestParse:
+    """Compiled forms give the same values as the original string parser."""
+
+    @pytest.mark.parametrize("expr,n,expected", [
+        ("O(1)", 50, 1),
+        ("O(log n)", 1, 0),
+        ("Theta(log n)", 1024, 10.0),
+        ("O(n log n)", 8, 24.0),
+        ("O(n^2)", 100, 10000),
+        ("Omega(2^n)", 20, 2 ** 20),
+        ("O(n!)", 10, 3628800),
+        ("O(n^n)", 4, 256),
+        ("O(n^2.5)", 4, 32.0),
+        ("O(1.5^n)", 2, 2.25),
+        ("O(3^2)", 99, 9.0),
+    ])
+    def test_values(self, expr, n, expected):
+        assert complexity_to_operations(expr, n) == expected
+        assert type(complexity_to_operations(expr, n)) is type(expected)
+
+    def test_unknown_form_raises_every_time(self):
+        for _ in range(2):
+            with pytest.raises(ValueError, match="Unknown or unparseable complexity: n \\* target"):
+                complexity_to_operations("O(n * target)", 10)
+
+    def test_parse_and_results_are_cached(self):
+        complexity.clear_caches()
+        assert complexity.parse_complexity("O(n^3)") is complexity.parse_complexity("O(n^3)")
+        complexity_to_operations("O(n^3)", 7)
+        complexity_to_operations("O(n^3)", 7)
+        assert complexity.operations.cache_info().hits == 1
+
+
+class TestEvaluateMany:
+    def test_matches_scalar(self):
+        sizes = list(range(1, 200))
+        for expr in ("O(1)", "O(log n)", "O(n log n)", "O(n^2)", "O(n^1.5)", "O(2^n)"):
+            batch = complexity.evaluate_many(expr, sizes)
+            assert batch == pytest.approx([complexity_to_operations(expr, n) for n in sizes])
+
+    def test_asymptotic_form(self):
+        assert complexity.has_asymptotic_form("O(n)")
+        assert complexity.has_asymptotic_form("Theta(n log n)")
+        assert complexity.has_asymptotic_form(None)
+        assert not complexity.has_asymptotic_form("n^2")
+
+
+class TestVerifyComplexityMetrics:
+    """Claimed bounds must be O(...)/Omega(...)/Theta(...) wrapped expressions."""
+
+    @pytest.fixture
+    def claimed(self):
+        problem = PROBLEM_REGISTRY.generate(ProblemType.SUBSET_SUM, seed="claims", tier=ProblemTier.TIER_1_MOBILE)
+        energy = EnergyMetrics(1.0, 0.1, 100, 1, 0.01, 0.001, 80.0, 50.0, 0.0)
+        return PROBLEM_REGISTRY.build_complexity(
+            problem=problem, solution=PROBLEM_REGISTRY.solve(problem), solve_time=0.01, verify_time=0.001,
+            solve_memory=0, verify_memory=0, energy_metrics=energy
+        )
+
+    def test_accepts_registry_complexity(self, claimed):
+        assert claimed.time_solve_O == "O(2^n)"
+        assert verify_complexity_metrics(claimed)
+        assert verify_complexity_metrics(replace(claimed, time_solve_Theta=None, space_solve_Theta="Theta(n)"))
+
+    @pytest.mark.parametrize("field,value", [
+        ("time_solve_O", "2^n"),
+        ("time_verify_O", "O(n"),
+        ("space_solve_Omega", "Big(n)"),
+        ("time_verify_Theta", ""),
+    ])
+    def test_rejects_malformed_bounds(self, claimed, field, value):
+        assert not verify_complexity_metrics(replace(claimed, **{field: value}))
+
+
+class TestBatchRewards:
+    def test_matches_single_block_rewards(self):
+        engine = MetricsEngine()
+        state = engine.network_state
+        scores = [0.5, 3.0, 120.0, 1.0, 0.0, 9000.0]
+
+        expected, cumulative = [], 0.0
+        for score in scores:
+            state.cumulative_work = cumulative
+            expected.append(engine.calculate_block_reward(score, state))
+            cumulative += score
+
+        assert engine.calculate_block_rewards(scores, state) == expected
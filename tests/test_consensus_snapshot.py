@@ -0,0 +1,160 @@
+"""
+Unit Tests for consensus snapshots
+Tests signed snapshot files and restoring the consensus tree from one
+"""
+
+import json
+import sys
+import os
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.blockchain import Block, ProblemTier
+from consensus import ConsensusConfig, ConsensusEngine
+from consensus_snapshot import SnapshotStore
+from pow import ProblemRegistry
+from storage import NodeRole, PruningMode, StorageConfig, StorageManager
+from tokenomics.wallet import Wallet
+
+
+def make_block(index, previous_hash, block_hash):
+    return Block(
+        index=index,
+        timestamp=1000.0 + index,
+        previous_hash=previous_hash,
+        transactions=[],
+        merkle_root="0" * 64,
+        problem={},
+        solution=[],
+        complexity=None,
+        mining_capacity=ProblemTier.TIER_1_MOBILE,
+        cumulative_work_score=0.0,
+        block_hash=block_hash
+    )
+
+
+def extend(engine, parent_hash, length, prefix):
+    parent = engine.block_tree[parent_hash]
+    hashes = []
+    for i in range(length):
+        block_hash = f"{prefix}-{i}"
+        engine._add_block_to_tree(make_block(parent.height + 1, parent.block.block_hash, block_hash), 1.0)
+        parent = engine.block_tree[block_hash]
+        hashes.append(block_hash)
+    return hashes
+
+
+def encode_block(block):
+    return {"index": block.index, "previous_hash": block.previous_hash, "block_hash": block.block_hash}
+
+
+def decode_block(record):
+    return make_block(record["index"], record["previous_hash"], record["block_hash"])
+
+
+@pytest.fixture
+def make_engine(tmp_path, monkeypatch):
+    def local_genesis(self):
+        self.genesis_block = make_block(0, "0" * 64, "genesis")
+        self._add_block_to_tree(self.genesis_block, receipt_time=0.0)
+        self._set_best_tip(self.block_tree["genesis"])
+
+    monkeypatch.setattr(ConsensusEngine, "_initialize_genesis", local_genesis)
+    storages = []
+
+    def factory(name):
+        storage = StorageManager(StorageConfig(
+            data_dir=str(tmp_path / name), role=NodeRole.FULL, pruning_mode=PruningMode.FULL
+        ))
+        storages.append(storage)
+        return ConsensusEngine(ConsensusConfig(max_reorg_depth=50), storage, ProblemRegistry())
+
+    yield factory
+    for storage in storages:
+        storage.close()
+
+
+class TestSnapshotStore:
+    """Only intact snapshots from trusted signers load; old ones are pruned."""
+
+    def test_write_load_and_prune(self, tmp_path):
+        directory = str(tmp_path / "snapshots")
+        store = SnapshotStore(directory, keep=2)
+        for height in (10, 20, 30):
+            assert store.write(height, f"tip-{height}", {"balances": {"a": float(height)}})
+        assert store.latest_height() == 30
+        assert not store.path_for(10).exists()
+
+        snapshot = store.load_latest()
+        assert snapshot["height"] == 30 and snapshot["sections"]["balances"] == {"a": 30.0}
+        assert store.load_latest(max_height=25)["tip_hash"] == "tip-20"
+
+        # The node key persists, so a restarted store trusts its own snapshots
+        assert SnapshotStore(directory).load_latest()["height"] == 30
+
+    def test_node_key_outside_snapshots(self, tmp_path):
+        directory = tmp_path / "snapshots"
+        store = SnapshotStore(str(directory))
+        assert store.node_key_path.parent == tmp_path
+        assert store.node_key_path.stat().st_mode & 0o777 == 0o600
+        assert not list(directory.iterdir())
+
+        # A key left in the snapshot directory by older versions is moved out
+        legacy = tmp_path / "legacy"
+        legacy.mkdir()
+        os.replace(store.node_key_path, legacy / "node_key.json")
+        moved = SnapshotStore(str(legacy), node_key_path=str(tmp_path / "keys" / "node.json"))
+        assert moved.public_key_hex == store.public_key_hex
+        assert not (legacy / "node_key.json").exists()
+
+    def test_tampered_and_foreign_snapshots_rejected(self, tmp_path):
+        directory = str(tmp_path / "snapshots")
+        store = SnapshotStore(directory)
+        store.write(10, "tip-10", {"balances": {"a": 1.0}})
+        path = store.write(20, "tip-20", {"balances": {"a": 2.0}})
+
+        header, payload = path.read_bytes().split(b"\n", 1)
+        path.write_bytes(header + b"\n" + payload.replace(b"2.0", b"9.0"))
+        assert store.load_latest()["height"] == 10
+
+        other = SnapshotStore(str(tmp_path / "other"), signer=Wallet.generate_new())
+        foreign = other.write(30, "tip-30", {})
+        os.replace(foreign, store.path_for(30))
+        assert store.load_latest()["height"] == 10
+
+        trusting = SnapshotStore(directory, trusted_keys=[other.public_key_hex])
+        assert trusting.load_latest()["height"] == 30
+
+
+class TestEngineRestore:
+    """A restored engine has the same tip and canonical index and keeps extending."""
+
+    def test_roundtrip_with_side_branch(self, make_engine, tmp_path):
+        engine = make_engine("source")
+        main = extend(engine, "genesis", 300, "main")
+        side = extend(engine, main[279], 5, "side")
+        engine.handle_reorg(main[-1])
+        state = engine.export_snapshot_state(encode_block)
+        assert set(state["tips"]) == {main[-1], side[-1]}
+        assert len(state["nodes"]) == 51 + 5  # Heights 250..300 plus the side branch
+
+        restored = make_engine("restored")
+        assert restored.restore_snapshot_state(json.loads(json.dumps(state)), decode_block)
+        assert restored.get_best_tip().block_hash == main[-1]
+        assert restored.get_canonical_hash(10) == main[9]
+        assert restored.is_canonical(main[-1]) and not restored.is_canonical(side[0])
+        assert [b.block_hash for b in restored.get_canonical_blocks(298)] == main[-3:]
+
+        # New blocks extend the restored tip; a reorg inside the window still works
+        restored.handle_reorg(extend(restored, main[-1], 2, "next")[-1])
+        assert restored.get_best_tip().block_hash == "next-1"
+        longer = extend(restored, side[-1], 30, "fork")
+        restored.handle_reorg(longer[-1])
+        assert restored.get_best_tip().block_hash == longer[-1]
+        assert restored.get_canonical_hash(281) == side[0]
+        assert restored.get_canonical_hash(100) == main[99]
@@ -0,0 +1,129 @@
+"""
+Unit Tests for the consensus block tree
+Tests skip-list ancestor lookup, fork points and the canonical height index
+"""
+
+import random
+import sys
+import os
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.blockchain import Block, ProblemTier, Transaction
+from consensus import ConsensusConfig, ConsensusEngine, HeaderValidationError, find_common_ancestor
+from pow import ProblemRegistry
+from storage import NodeRole, PruningMode, StorageConfig, StorageManager
+
+
+def make_block(index, previous_hash, block_hash):
+    return Block(
+        index=index,
+        timestamp=1000.0 + index,
+        previous_hash=previous_hash,
+        transactions=[],
+        merkle_root="0" * 64,
+        problem={},
+        solution=[],
+        complexity=None,
+        mining_capacity=ProblemTier.TIER_1_MOBILE,
+        cumulative_work_score=0.0,
+        block_hash=block_hash
+    )
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    def local_genesis(self):
+        self.genesis_block = make_block(0, "0" * 64, "genesis")
+        self._add_block_to_tree(self.genesis_block, receipt_time=0.0)
+        self._set_best_tip(self.block_tree["genesis"])
+
+    monkeypatch.setattr(ConsensusEngine, "_initialize_genesis", local_genesis)
+    storage = StorageManager(StorageConfig(
+        data_dir=str(tmp_path), role=NodeRole.FULL, pruning_mode=PruningMode.FULL
+    ))
+    yield ConsensusEngine(ConsensusConfig(max_reorg_depth=1000), storage, ProblemRegistry())
+    storage.close()
+
+
+def extend(engine, parent_hash, length, prefix):
+    parent = engine.block_tree[parent_hash]
+    hashes = []
+    for i in range(length):
+        block_hash = f"{prefix}-{i}"
+        engine._add_block_to_tree(make_block(parent.height + 1, parent.block.block_hash, block_hash), 1.0)
+        parent = engine.block_tree[block_hash]
+        hashes.append(block_hash)
+    return hashes
+
+
+class TestBlockTree:
+    """Skip-list walks must agree with plain parent walks."""
+
+    def test_get_ancestor_matches_parent_walk(self, engine):
+        main = extend(engine, "genesis", 600, "main")
+        tip = engine.block_tree[main[-1]]
+        rng = random.Random(3)
+        for height in [0, 1, 255, 256, 599, 600] + [rng.randrange(601) for _ in range(50)]:
+            walk = tip
+            while walk.height > height:
+                walk = walk.parent
+            assert tip.get_ancestor(height) is walk
+        assert tip.get_ancestor(601) is None
+
+    def test_common_ancestor_and_reorg(self, engine):
+        main = extend(engine, "genesis", 300, "main")
+        side = extend(engine, main[149], 200, "side")
+
+        fork = find_common_ancestor(engine.block_tree[main[-1]], engine.block_tree[side[-1]])
+        assert fork.block.block_hash == main[149]
+        assert engine.find_fork_point(main[10], side[0]).block_hash == main[10]
+
+        engine.handle_reorg(main[-1])
+        assert engine.get_canonical_hash(300) == main[-1]
+
+        removed, added = engine.handle_reorg(side[-1])
+        assert [b.block_hash for b in removed] == main[150:]
+        assert [b.block_hash for b in added] == side
+        assert engine.get_canonical_hash(151) == side[0]
+        assert engine.get_canonical_hash(350) == side[-1]
+        assert engine.get_canonical_hash(351) is None
+        assert engine.is_canonical(main[149]) and not engine.is_canonical(main[150])
+        assert [b.block_hash for b in engine.get_chain_from_genesis()] == ["genesis"] + main[:150] + side
+
+    def test_orphan_attached_when_parent_arrives(self, engine):
+        main = extend(engine, "genesis", 3, "main")
+        engine._add_block_to_tree(make_block(5, "late-4", "late-5"), 1.0)
+        assert engine.block_tree["late-5"].parent is None
+        engine._add_block_to_tree(make_block(4, main[-1], "late-4"), 1.0)
+        assert engine.block_tree["late-5"].parent is engine.block_tree["late-4"]
+        assert engine.find_fork_point("late-5", main[0]).block_hash == main[0]
+
+
+class TestHeaderValidation:
+    """validate_header() batch-verifies the block's transaction signatures."""
+
+    def test_transaction_signatures_checked(self, engine, monkeypatch):
+        ed25519 = pytest.importorskip("cryptography.hazmat.primitives.asymmetric.ed25519")
+        from cryptography.hazmat.primitives import serialization
+        monkeypatch.setattr(engine, "_validate_commitment_presence", lambda block: True)
+        monkeypatch.setattr(engine, "_validate_difficulty", lambda block: True)
+
+        key = ed25519.Ed25519PrivateKey.generate().private_bytes(
+            serialization.Encoding.Raw, serialization.PrivateFormat.Raw, serialization.NoEncryption())
+        signed = Transaction("alice", "bob", 5.0, timestamp=1000.0)
+        signed.sign(key)
+
+        block = make_block(1, "genesis", "signed")
+        block.transactions = [signed, signed.to_dict(), "memo"]
+        assert engine.validate_header(block)
+
+        tampered = dict(signed.to_dict(), amount=50.0)
+        forged = make_block(1, "genesis", "forged")
+        forged.transactions = [signed, tampered]
+        with pytest.raises(HeaderValidationError):
+            engine.validate_header(forged)
+        assert "forged" not in engine.block_tree
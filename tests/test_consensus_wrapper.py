@@ -585,6 +585,84 @@ def test_migration_workflow_simulation():
         assert consensus.stats["total_verifications"] == 4
 
 
+# ============================================================================
+# TEST: Batch Verification (Sync Path)
+# ============================================================================
+
+def enable_rust_batch(consensus, header_results, proof_results):
+    """Attach mocked Rust batch entry points to a consensus wrapper."""
+    consensus.rust_header_hashes = Mock(return_value=header_results)
+    consensus.rust_verify_subset_sum_batch = Mock(return_value=proof_results)
+    consensus.rust_batch_available = True
+
+
+def make_proof(elements, target, solution):
+    proof = Mock()
+    proof.tier = 1
+    proof.elements = elements
+    proof.target = target
+    proof.solution = solution
+    proof.timestamp = 1000
+    return proof
+
+
+def test_verify_blocks_uses_batch_calls():
+    """Test verify_blocks crosses into Rust once per batch, not per block."""
+    consensus = create_consensus_with_rust_enabled(ConsensusMode.REFACTORED_ONLY)
+    enable_rust_batch(
+        consensus,
+        header_results=[(b'\x00' * 32, None)] * 3,
+        proof_results=[(True, None), (False, None)],
+    )
+
+    blocks = [
+        MockBlock(index=1),
+        MockBlock(index=2, proof=make_proof([1, 2, 3], 3, [0, 1])),
+        MockBlock(index=3, proof=make_proof([1, 2, 3], 100, [0])),
+    ]
+
+    with patch.object(consensus, '_rust_verify_block_impl') as mock_single:
+        results = consensus.verify_blocks(blocks)
+        assert mock_single.call_count == 0
+
+    assert [valid for valid, _ in results] == [True, True, False]
+    assert all(result.mode_used == "rust" for _, result in results)
+    assert consensus.rust_header_hashes.call_count == 1
+    assert consensus.rust_verify_subset_sum_batch.call_count == 1
+    # Only blocks with proofs are sent for proof verification
+    problems = consensus.rust_verify_subset_sum_batch.call_args[0][0]
+    assert [p["target"] for p in problems] == [3, 100]
+    assert consensus.stats["total_verifications"] == 3
+
+
+def test_verify_blocks_item_error_falls_back_to_legacy():
+    """Test a per-item Rust error only sends that block to legacy."""
+    legacy_engine = MockLegacyEngine(return_value=True)
+    consensus = create_consensus_with_rust_enabled(ConsensusMode.REFACTORED_PRIMARY, legacy_engine)
+    enable_rust_batch(
+        consensus,
+        header_results=[(b'\x00' * 32, None), (None, "missing field: nonce")],
+        proof_results=[],
+    )
+
+    results = consensus.verify_blocks([MockBlock(index=1), MockBlock(index=2)])
+
+    assert [result.mode_used for _, result in results] == ["rust", "legacy"]
+    assert "missing field" in results[1][1].error
+    assert consensus.stats["fallback_to_legacy"] == 1
+
+
+def test_verify_blocks_without_batch_bindings():
+    """Test verify_blocks falls back to per-block calls on older builds."""
+    consensus = create_consensus_with_rust_enabled(ConsensusMode.REFACTORED_ONLY)
+
+    with patch.object(consensus, '_rust_verify_block_impl', return_value=True) as mock_single:
+        results = consensus.verify_blocks([MockBlock(index=1), MockBlock(index=2)])
+
+    assert [valid for valid, _ in results] == [True, True]
+    assert mock_single.call_count == 2
+
+
 # ============================================================================
 # TEST: Performance
 # ============================================================================
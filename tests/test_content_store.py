@@ -0,0 +1,150 @@
+"""
+Unit Tests for content addressing and the shared IPFS client
+Tests CIDv0 computation, the local blob store and client pooling
+"""
+
+import json
+import sys
+import os
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from content_store import LocalBlobStore, compute_cid, is_valid_cid
+from storage import IPFSClient, NodeRole, PruningMode, StorageConfig, StorageManager, get_ipfs_client
+
+
+class TestComputeCid:
+    """CIDs must match what `ipfs add --cid-version=0` produces."""
+
+    @pytest.mark.parametrize("data,cid", [
+        (b"", "QmbFMke1KXqnYyBBWxB74N4c5SBnJMVAiMNRcGu6x1AwQH"),
+        (b"hello world", "Qmf412jQZiuVUtdgnB36FXFX7xg5V6KEbSJ4dpQuhkLyfD"),
+        (b"hello world\n", "QmT78zSuBmuS4z925WZfrqQ1qHaJ56DQaTfyMUF7F8ff5o"),
+    ])
+    def test_known_cids(self, data, cid):
+        assert compute_cid(data) == cid
+
+    def test_multi_chunk_dag(self):
+        data = bytes(range(256)) * 4096  # 1 MiB -> 4 chunks
+        cid = compute_cid(data)
+        assert cid.startswith("Qm") and len(cid) == 46
+        assert cid == compute_cid(bytes(data))
+        assert cid != compute_cid(data[:-1])
+        # Deeper trees: 10 chunks with 3 links per node -> 3 levels
+        assert compute_cid(b"x" * 10, chunk_size=1, max_links=3) != compute_cid(b"x" * 10, chunk_size=1)
+
+
+class TestLocalBlobStore:
+    """Filesystem CAS with the IPFSClient interface."""
+
+    def test_round_trip_and_pin(self, tmp_path):
+        store = LocalBlobStore(str(tmp_path))
+        cid = store.add(b"proof bundle")
+        assert cid == compute_cid(b"proof bundle")
+        assert store.add(b"proof bundle") == cid
+        assert store.get(cid) == b"proof bundle"
+        assert store.health_check()
+        assert store.pin(cid) and store.is_pinned(cid)
+        assert not store.pin(compute_cid(b"absent"))
+        with pytest.raises(KeyError):
+            store.get(compute_cid(b"absent"))
+
+    def test_batch_and_verify(self, tmp_path):
+        store = LocalBlobStore(str(tmp_path), verify_reads=True)
+        blobs = [f"bundle-{i}".encode() for i in range(50)]
+        cids = store.add_many(blobs)
+        assert cids == [compute_cid(b) for b in blobs]
+        fetched = store.get_many(cids + [compute_cid(b"absent")])
+        assert [fetched[c] for c in cids] == blobs
+        assert fetched[compute_cid(b"absent")] is None
+
+        with open(store._path(cids[0]), "wb") as f:
+            f.write(b"tampered")
+        with pytest.raises(ValueError):
+            store.get(cids[0])
+        store.close()
+
+    def test_rejects_malformed_cids(self, tmp_path):
+        outside = tmp_path / "victim.txt"
+        outside.write_bytes(b"secret")
+        store = LocalBlobStore(str(tmp_path / "store"))
+        cid = store.add(b"proof bundle")
+        assert is_valid_cid(cid) and is_valid_cid("bafybeigdyrzt5sfp7udm7hu76uh7y26nf3efuylqabf3oclgtqy55fbzdi")
+        for bad in (str(outside), "../../victim.txt", "Qm/../x", "", "Qm0OIl"):
+            assert not is_valid_cid(bad)
+            with pytest.raises(ValueError):
+                store.get(bad)
+            assert not store.has(bad)
+            assert not store.pin(bad)
+            assert not store.is_pinned(bad)
+        assert outside.read_bytes() == b"secret"
+
+
+class FakeResponse:
+    def __init__(self, payload=None, content=b""):
+        self.payload = payload
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class FakeSession:
+    """Records calls in place of requests.Session."""
+
+    def __init__(self):
+        self.calls = []
+
+    def post(self, url, files=None, params=None, data=None, timeout=None, **kwargs):
+        self.calls.append(url)
+        if url.endswith("/add"):
+            return FakeResponse({"Hash": compute_cid(files["file"][1])})
+        if url.endswith("/cat"):
+            return FakeResponse(content=b"data:" + files["arg"][1].encode())
+        return FakeResponse({}, content=b"{}")
+
+    def close(self):
+        pass
+
+
+class TestSharedIPFSClient:
+    """One pooled client per endpoint."""
+
+    def test_shared_per_endpoint(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("COINJECTURE_IPFS_LOCAL_DIR", raising=False)
+        assert get_ipfs_client("http://node-a:5001") is get_ipfs_client("http://node-a:5001")
+        assert get_ipfs_client("http://node-a:5001") is not get_ipfs_client("http://node-b:5001")
+
+        monkeypatch.setenv("COINJECTURE_IPFS_LOCAL_DIR", str(tmp_path))
+        assert isinstance(get_ipfs_client("http://node-a:5001"), LocalBlobStore)
+
+    def test_batch_calls_share_session(self):
+        client = IPFSClient("http://node:5001", pool_size=4)
+        client._session = FakeSession()
+        blobs = [f"b{i}".encode() for i in range(20)]
+        assert client.add_many(blobs) == [compute_cid(b) for b in blobs]
+        fetched = client.get_many(["QmA", "QmB"])
+        assert fetched == {"QmA": b"data:QmA", "QmB": b"data:QmB"}
+        assert client.pin("QmA")
+        assert client._session.calls[-1] == "http://node:5001/api/v0/pin/add?arg=QmA"
+        client.close()
+
+    def test_storage_manager_local_backend(self, tmp_path):
+        config = StorageConfig(data_dir=str(tmp_path / "db"), role=NodeRole.ARCHIVE,
+                               pruning_mode=PruningMode.ARCHIVE, write_behind=False,
+                               ipfs_local_dir=str(tmp_path / "ipfs"))
+        storage = StorageManager(config)
+        try:
+            bundle = json.dumps({"problem": {"type": "subset_sum"}, "solution": [1, 2]}).encode()
+            cid = storage.store_proof_bundle(bundle)
+            assert cid == compute_cid(bundle)
+            assert storage.ipfs_client.is_pinned(cid)
+            assert storage.get_proof_bundle(cid) == bundle
+        finally:
+            storage.close()
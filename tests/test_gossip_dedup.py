@@ -0,0 +1,109 @@
+"""
+Unit Tests for gossip dedup caches
+Tests capacity bounds, TTL expiry, Bloom false-positive rate and counters
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from gossip_dedup import DedupConfig, GossipDedup, RotatingBloomFilter
+from network import NetworkProtocol
+
+
+class MockComponent:
+    pass
+
+
+class TestLRUDedup:
+    """Exact backend: bounded by capacity and TTL."""
+
+    def test_hits_misses_and_capacity(self):
+        dedup = GossipDedup(DedupConfig(backend="lru", capacity=100, ttl=60))
+        assert not dedup.check_and_add("header", "a", now=0)
+        assert dedup.check_and_add("header", "a", now=1)
+        # Same key under another kind is independent
+        assert not dedup.check_and_add("cid", "a", now=1)
+
+        for i in range(1000):
+            dedup.check_and_add("cid", f"cid-{i}", now=2)
+        stats = dedup.get_stats()
+        assert stats["entries"] == 100
+        assert stats["evictions"] == 902
+        assert stats["hits"] == {"header": 1}
+        assert stats["misses"] == {"header": 1, "cid": 1001}
+
+    def test_ttl_expiry(self):
+        dedup = GossipDedup(DedupConfig(backend="lru", capacity=100, ttl=60))
+        dedup.check_and_add("reveal", "old", now=0)
+        dedup.check_and_add("reveal", "new", now=50)
+        assert not dedup.seen("reveal", "old", now=61)
+        assert dedup.expire(now=61) == 1
+        assert len(dedup) == 1
+        assert dedup.seen("reveal", "new", now=61)
+
+    def test_expired_entry_revived_before_cleanup(self):
+        dedup = GossipDedup(DedupConfig(backend="lru", capacity=100, ttl=60))
+        dedup.check_and_add("header", "h", now=0)
+        # Expired but not yet dropped by expire(): re-gossip re-records it
+        assert not dedup.check_and_add("header", "h", now=70)
+        assert dedup.check_and_add("header", "h", now=71)
+        assert dedup.expire(now=100) == 0
+        assert dedup.seen("header", "h", now=100)
+
+    def test_evicts_least_recently_seen(self):
+        dedup = GossipDedup(DedupConfig(backend="lru", capacity=3, ttl=60))
+        for key in ("a", "b", "c"):
+            dedup.check_and_add("cid", key, now=0)
+        assert dedup.check_and_add("cid", "a", now=1)  # Hit moves "a" to the back
+        dedup.check_and_add("cid", "d", now=2)
+        assert dedup.seen("cid", "a", now=2)
+        assert not dedup.seen("cid", "b", now=2)
+
+
+class TestBloomDedup:
+    """Approximate backend: fixed memory, bounded false positives."""
+
+    def test_false_positive_rate(self):
+        bloom = RotatingBloomFilter(capacity=20000, ttl=600, false_positive_rate=0.01)
+        for i in range(10000):
+            bloom.add(f"member-{i}", now=0)
+        assert all(bloom.contains(f"member-{i}", now=0) for i in range(10000))
+        false_positives = sum(bloom.contains(f"other-{i}", now=0) for i in range(10000))
+        assert false_positives / 10000 < 0.02
+
+    def test_memory_flat_and_rotation(self):
+        dedup = GossipDedup(DedupConfig(backend="bloom", capacity=1000, ttl=100))
+        memory = dedup.get_stats()["memory_bytes"]
+        for i in range(50000):
+            dedup.check_and_add("header", f"h-{i}", now=i * 0.01)
+        assert dedup.get_stats()["memory_bytes"] == memory
+        assert len(dedup) <= 1000
+        assert dedup.get_stats()["evictions"] > 0
+
+        dedup.check_and_add("cid", "x", now=1000)
+        dedup.expire(now=1051)
+        assert dedup.seen("cid", "x", now=1051)  # survives one rotation
+        dedup.expire(now=1102)
+        assert not dedup.seen("cid", "x", now=1102)
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            GossipDedup(DedupConfig(backend="set"))
+
+
+class TestNetworkDedup:
+    """NetworkProtocol routes CID gossip through the shared cache."""
+
+    def test_cid_gossiped_once(self):
+        net = NetworkProtocol(MockComponent(), MockComponent(), MockComponent(),
+                              dedup_config=DedupConfig(capacity=10, ttl=60))
+        net._gossip_cid("QmDup")
+        net._gossip_cid("QmDup")
+        stats = net.dedup.get_stats()
+        assert stats["hits"] == {"cid": 1}
+        assert stats["misses"] == {"cid": 1}
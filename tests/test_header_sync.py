@@ -0,0 +1,158 @@
+"""
+Unit Tests for headers-first sync
+Tests header chain validation, parallel body download, peer scoring and bans
+"""
+
+import sys
+import os
+import threading
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from header_sync import HeadersFirstSync, PeerError, PeerSet, check_header_link, header_from_block
+
+
+def make_chain(length, prefix="h"):
+    blocks = []
+    previous = "0" * 64
+    for height in range(length):
+        block_hash = f"{prefix}{height:063d}"
+        blocks.append({
+            'index': height,
+            'block_hash': block_hash,
+            'previous_hash': previous,
+            'cumulative_work_score': float(height * 10),
+            'timestamp': 1000.0 + height,
+        })
+        previous = block_hash
+    return blocks
+
+
+class FakeClient:
+    """Peers served from in-memory chains, with optional misbehaviour."""
+
+    def __init__(self, chains, failing=(), delay=0.0):
+        self.chains = chains  # peer -> list of blocks
+        self.failing = set(failing)
+        self.delay = delay
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def _log(self, peer, kind, height):
+        with self._lock:
+            self.requests.append((peer, kind, height))
+        if peer in self.failing:
+            raise PeerError(f"{peer} unreachable")
+        time.sleep(self.delay)
+
+    def get_tip_height(self, peer):
+        self._log(peer, 'tip', None)
+        return len(self.chains[peer]) - 1
+
+    def get_headers(self, peer, start, count):
+        self._log(peer, 'headers', start)
+        return [header_from_block(b) for b in self.chains[peer][start:start + count]]
+
+    def get_block(self, peer, height):
+        self._log(peer, 'block', height)
+        chain = self.chains[peer]
+        return dict(chain[height]) if height < len(chain) else None
+
+    def get_proof(self, peer, height):
+        return {'cid': f"cid-{height}"}
+
+
+class TestHeaderChain:
+    """Headers must link by hash, height and non-decreasing work."""
+
+    def test_links(self):
+        chain = [header_from_block(b) for b in make_chain(3)]
+        assert check_header_link(None, chain[0]) is None
+        assert check_header_link(chain[0], chain[1]) is None
+        assert "height" in check_header_link(chain[0], chain[2])
+        forged = dict(chain[1], previous_hash="f" * 64)
+        assert "link" in check_header_link(chain[0], forged)
+        lighter = dict(chain[2], cumulative_work=1.0)
+        assert "work" in check_header_link(chain[1], lighter)
+
+
+class TestSync:
+    """Bodies come from many peers, are checked against headers and applied in order."""
+
+    def test_parallel_sync_applies_in_order(self):
+        chain = make_chain(300)
+        peers = ["a:5000", "b:5000", "c:5000"]
+        client = FakeClient({p: chain for p in peers}, delay=0.001)
+        applied = []
+        sync = HeadersFirstSync(client, PeerSet(peers), lambda block, proof: applied.append((block, proof)) or True,
+                                window=64, workers=6, header_batch=100, fetch_proofs=True)
+        result = sync.sync(0)
+
+        assert result['complete'] and result['applied'] == 300 and result['height'] == 299
+        assert [b['index'] for b, _ in applied] == list(range(300))
+        assert applied[5][1] == {'cid': 'cid-5'}
+        body_peers = {peer for peer, kind, _ in client.requests if kind == 'block'}
+        assert body_peers == set(peers)
+
+    def test_unreachable_peer_is_banned_and_work_moves(self):
+        chain = make_chain(50)
+        peers = PeerSet(["good:1", "down:1"], max_failures=2, backoff_base=0.001)
+        client = FakeClient({"good:1": chain, "down:1": chain}, failing={"down:1"})
+        applied = []
+        result = HeadersFirstSync(client, peers, lambda b, p: applied.append(b) or True, workers=4).sync(0)
+        assert result['complete'] and len(applied) == 50
+        assert peers.is_banned("down:1")
+        assert not peers.is_banned("good:1")
+
+    def test_removed_peer_not_used(self):
+        chain = make_chain(20)
+        peers = PeerSet(["gone:1", "kept:1"])
+        peers.remove("gone:1")
+        assert list(peers) == ["kept:1"] and "gone:1" not in peers
+        client = FakeClient({"kept:1": chain})
+        result = HeadersFirstSync(client, peers, lambda b, p: True, workers=2).sync(0)
+        assert result['complete']
+        assert {peer for peer, _, _ in client.requests} == {"kept:1"}
+
+    def test_body_not_matching_header_bans_peer(self):
+        chain = make_chain(40)
+        forked = make_chain(40, prefix="x")
+        peers = PeerSet(["honest:1", "forked:1"])
+        client = FakeClient({"honest:1": chain, "forked:1": forked})
+        # Headers come from the honest peer; the forked peer only serves bodies
+        peers.record_success("honest:1", 0.001)
+        applied = []
+        sync = HeadersFirstSync(client, peers, lambda b, p: applied.append(b) or True, workers=4)
+        headers = sync.download_headers(0, 39)
+        assert [h['block_hash'] for h in headers] == [b['block_hash'] for b in chain]
+
+        count, error = sync.download_bodies(headers)
+        assert error is None and count == 40
+        assert [b['block_hash'] for b in applied] == [b['block_hash'] for b in chain]
+        assert peers.is_banned("forked:1")
+
+    def test_invalid_headers_ban_peer_and_resume_from_parent(self):
+        chain = make_chain(30)
+        broken = [dict(b) for b in chain]
+        broken[20]['previous_hash'] = "e" * 64
+        peers = PeerSet(["liar:1", "honest:1"])
+        peers.record_success("liar:1", 0.0001)  # Asked first
+        client = FakeClient({"liar:1": broken, "honest:1": chain})
+        sync = HeadersFirstSync(client, peers, lambda b, p: True, header_batch=10)
+        headers = sync.download_headers(0, 29)
+        assert len(headers) == 30 and headers[20]['previous_hash'] == chain[19]['block_hash']
+        assert peers.is_banned("liar:1")
+
+    def test_rejected_block_stops_sync(self):
+        chain = make_chain(20)
+        client = FakeClient({"a:1": chain})
+        sync = HeadersFirstSync(client, PeerSet(["a:1"]), lambda b, p: b['index'] < 12, window=4)
+        result = sync.sync(0)
+        assert not result['complete']
+        assert result['height'] == 11 and "12" in result['error']
+
+        # The next round continues from the last applied header
+        sync.apply_block = lambda b, p: True
+        assert sync.sync(12)['complete']
@@ -0,0 +1,142 @@
+"""
+Unit Tests for the transaction mempool
+Tests indexing, replace-by-fee, eviction under caps and template selection
+"""
+
+import random
+import sys
+import os
+import time
+
+# Add src/tokenomics to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'tokenomics'))
+
+from blockchain_state import BlockchainState, Transaction
+from mempool import Mempool, estimate_size
+
+
+ALICE = "CJ" + "a" * 40
+BOB = "CJ" + "b" * 40
+
+
+def tx(sender=ALICE, fee=0.0, nonce=None, amount=1.0, timestamp=1000.0):
+    return Transaction(sender=sender, recipient=BOB, amount=amount,
+                       timestamp=timestamp, fee=fee, nonce=nonce)
+
+
+class TestIndexes:
+    """Lookups by id and sender; duplicates are rejected."""
+
+    def test_add_get_remove(self):
+        pool = Mempool()
+        first, second = tx(nonce=0), tx(nonce=1)
+        assert pool.add(first) and pool.add(second)
+        assert not pool.add(first)
+        assert pool.get(second.transaction_id) is second
+        assert pool.get_by_sender(ALICE) == [first, second]
+        assert pool.remove(first.transaction_id) is first
+        assert first.transaction_id not in pool
+        assert pool.remove_many([second.transaction_id, "missing"]) == 1
+        assert len(pool) == 0 and pool.get_stats()["bytes"] == 0
+
+    def test_legacy_ids_unchanged(self):
+        legacy = Transaction(sender=ALICE, recipient=BOB, amount=1.0, timestamp=1000.0)
+        assert legacy.signing_data() == f"{ALICE}{BOB}1.01000.0".encode()
+        assert tx(fee=0.5).transaction_id != legacy.transaction_id
+
+
+class TestReplaceByFee:
+    """Same sender and nonce: only a sufficiently higher fee replaces."""
+
+    def test_replacement(self):
+        pool = Mempool(min_fee_bump=0.10)
+        original = tx(fee=1.0, nonce=3)
+        assert pool.add(original)
+        assert not pool.add(tx(fee=1.05, nonce=3))
+        replacement = tx(fee=1.2, nonce=3)
+        assert pool.add(replacement)
+        assert original.transaction_id not in pool
+        assert pool.get_by_sender(ALICE) == [replacement]
+        assert pool.get_stats()["replaced"] == 1
+
+
+class TestEviction:
+    """Caps evict the lowest fee rate first, with dependent nonces."""
+
+    def test_count_cap(self):
+        pool = Mempool(max_count=3)
+        low = tx(sender="CJ" + "c" * 40, fee=0.1)
+        assert pool.add(low)
+        for i in range(2):
+            assert pool.add(tx(fee=1.0 + i, amount=float(i)))
+        assert pool.add(tx(fee=5.0, amount=9.0))
+        assert low.transaction_id not in pool
+        assert not pool.add(tx(fee=0.01, amount=7.0))  # Pool is full of better fees
+        assert len(pool) == 3
+
+    def test_byte_cap_evicts_descendants(self):
+        size = estimate_size(tx())
+        pool = Mempool(max_bytes=size * 3)
+        chain = [tx(fee=0.1, nonce=0), tx(fee=0.5, nonce=1)]
+        for t in chain:
+            assert pool.add(t)
+        rich = tx(sender="CJ" + "d" * 40, fee=9.0)
+        assert pool.add(rich)
+        # Nonce 0 is the cheapest entry; evicting it also drops nonce 1
+        assert pool.add(tx(sender="CJ" + "e" * 40, fee=1.0))
+        assert pool.get_by_sender(ALICE) == []
+        assert len(pool) == 2
+
+
+class TestSelection:
+    """Templates take the best fee rates while keeping nonce order."""
+
+    def test_fee_order_and_nonce_chain(self):
+        pool = Mempool()
+        a0, a1 = tx(fee=0.1, nonce=0), tx(fee=5.0, nonce=1)
+        b = tx(sender="CJ" + "f" * 40, fee=1.0)
+        for t in (a1, b, a0):
+            pool.add(t)
+        # a1 pays most but must wait for a0, then follows it immediately
+        assert pool.select(10) == [b, a0, a1]
+        assert pool.select(2) == [b, a0]
+        size = estimate_size(b)
+        assert pool.select(10, max_bytes=size) == [b]
+        pool.remove(a0.transaction_id)
+        assert pool.select(10) == [a1, b]
+
+    def test_blockchain_state_uses_mempool(self):
+        state = BlockchainState()
+        rewards = [state.create_coinbase_transaction(BOB, float(i + 1), timestamp=1000.0 + i)
+                   for i in range(5)]
+        for reward in rewards:
+            assert state.add_transaction(reward)
+        assert not state.add_transaction(rewards[0])
+        assert state.get_pending_transactions(3) == rewards[:3]
+
+        state.process_transactions(rewards[:2])
+        state.clear_pending_transactions(rewards[:2])
+        assert state.pending_transactions == rewards[2:]
+        assert state.get_transaction_by_id(rewards[0].transaction_id) is rewards[0]
+        assert state.get_transaction_by_id(rewards[4].transaction_id) is rewards[4]
+
+        restored = BlockchainState()
+        restored.from_dict(state.to_dict())
+        assert [t.transaction_id for t in restored.pending_transactions] == \
+            [t.transaction_id for t in rewards[2:]]
+        assert restored.get_transaction_by_id(rewards[1].transaction_id) is not None
+
+    def test_admission_and_selection_stay_fast(self):
+        rng = random.Random(7)
+        pool = Mempool()
+        txs = [tx(sender=f"CJ{i % 500:040d}", fee=rng.uniform(0, 10), nonce=i // 500,
+                  timestamp=float(i)) for i in range(30000)]
+        start = time.perf_counter()
+        for t in txs:
+            pool.add(t)
+        per_add = (time.perf_counter() - start) / len(txs)
+        start = time.perf_counter()
+        template = pool.select(500)
+        select_time = time.perf_counter() - start
+        assert len(template) == 500
+        assert per_add < 0.001 and select_time < 0.05
@@ -0,0 +1,93 @@
+"""
+Unit Tests for the consensus Merkle tree
+Tests root parity with the codec, incremental updates and inclusion proofs
+"""
+
+import hashlib
+import random
+import sys
+import os
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from coinjecture.consensus.codec import compute_merkle_root
+from coinjecture.consensus.merkle import MerkleProof, MerkleTree, merkle_root, verify_proof
+from core.blockchain import Block, ProblemTier, Transaction, build_merkle_root
+
+
+def leaves(count: int, seed: int = 3):
+    rng = random.Random(seed)
+    return [rng.randbytes(32).hex() for _ in range(count)]
+
+
+class TestRoot:
+    """Roots must equal codec.compute_merkle_root."""
+
+    @pytest.mark.parametrize("count", list(range(0, 18)) + [31, 32, 33, 100])
+    def test_matches_codec(self, count):
+        hashes = leaves(count)
+        assert merkle_root(hashes) == compute_merkle_root(hashes)
+
+    def test_incremental_append_matches_rebuild(self):
+        tree = MerkleTree()
+        hashes = leaves(70)
+        for i, h in enumerate(hashes):
+            assert tree.append(h) == i
+            assert tree.root_hex() == compute_merkle_root(hashes[:i + 1])
+        assert tree.levels == MerkleTree(hashes).levels
+
+    def test_update(self):
+        hashes = leaves(13)
+        tree = MerkleTree(hashes)
+        hashes[6] = hashlib.sha256(b"replaced").hexdigest()
+        tree.update(6, hashes[6])
+        assert tree.root_hex() == compute_merkle_root(hashes)
+
+
+class TestProofs:
+    """O(log n) inclusion proofs."""
+
+    @pytest.mark.parametrize("count", [1, 2, 3, 7, 8, 9, 33])
+    def test_every_leaf_verifies(self, count):
+        tree = MerkleTree(leaves(count))
+        for index in range(count):
+            proof = tree.proof(index)
+            assert len(proof.siblings) == len(tree.levels) - 1
+            assert verify_proof(proof, tree.root)
+            assert verify_proof(MerkleProof.from_dict(proof.to_dict()), tree.root_hex())
+
+    def test_tampered_proofs_fail(self):
+        tree = MerkleTree(leaves(9))
+        proof = tree.proof(4)
+        assert not verify_proof(MerkleProof(4, b"\x00" * 32, proof.siblings), tree.root)
+        assert not verify_proof(MerkleProof(5, proof.leaf, proof.siblings), tree.root)
+        bad_sibling = [proof.siblings[0][::-1]] + proof.siblings[1:]
+        assert not verify_proof(MerkleProof(4, proof.leaf, bad_sibling), tree.root)
+        with pytest.raises(IndexError):
+            tree.proof(9)
+
+
+class TestBlockMerkle:
+    """Blocks expose proofs against their merkle_root."""
+
+    def test_transaction_proof(self):
+        transactions = [Transaction(f"alice{i}", "bob", float(i), timestamp=1000.0 + i) for i in range(5)]
+        problem = {"type": "subset_sum", "numbers": [1, 2, 3], "target": 3}
+        solution = [1, 2]
+        items = [tx.to_dict() for tx in transactions] + [{"problem": problem, "solution": solution}]
+        block = Block(
+            index=1, timestamp=1000.0, previous_hash="0" * 64, transactions=transactions,
+            merkle_root=build_merkle_root(items), problem=problem, solution=solution,
+            complexity=None, mining_capacity=ProblemTier.TIER_1_MOBILE,
+            cumulative_work_score=1.0, block_hash="1" * 64,
+        )
+        assert block.merkle_tree().root_hex() == block.merkle_root
+
+        proof = block.transaction_proof(3)
+        assert Block.verify_transaction_proof(transactions[3], proof, block.merkle_root)
+        assert not Block.verify_transaction_proof(transactions[2], proof, block.merkle_root)
+        with pytest.raises(IndexError):
+            block.transaction_proof(5)
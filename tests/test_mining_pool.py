@@ -0,0 +1,63 @@
+"""
+Unit Tests for the multi-core MiningPool
+Tests result hand-off and stale-work handling on tip changes
+"""
+
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.blockchain import ProblemTier, verify_subset_sum
+from mining_pool import MiningPool, MiningJob, solve_mining_job
+
+
+def thread_executor(workers):
+    return ThreadPoolExecutor(max_workers=workers)
+
+
+class TestMiningJob:
+    """Worker function produces a verified, timed result."""
+
+    def test_solve_mining_job(self):
+        job = MiningJob(job_id=1, epoch=1, parent_hash="ab" * 32, parent_index=0,
+                        tier="mobile", problem_type="subset_sum", seed="seed-1")
+        result = solve_mining_job(job)
+        assert result.valid
+        assert verify_subset_sum(result.problem, result.solution)
+        assert result.solve_time >= 0 and result.verify_time >= 0
+
+
+class TestMiningPool:
+    """Pool keeps workers busy and drops stale work."""
+
+    def test_results_for_current_tip(self):
+        pool = MiningPool(workers=2, tiers=[ProblemTier.TIER_1_MOBILE, ProblemTier.TIER_2_DESKTOP],
+                          executor_factory=thread_executor)
+        pool.start("aa" * 32, 0)
+        try:
+            tiers = set()
+            for _ in range(6):
+                result = pool.next_result(timeout=5)
+                assert result is not None
+                assert result.job.parent_hash == "aa" * 32
+                tiers.add(result.job.tier)
+            assert tiers == {"mobile", "desktop"}
+        finally:
+            pool.stop()
+
+    def test_tip_change_discards_stale_results(self):
+        pool = MiningPool(workers=2, tiers=[ProblemTier.TIER_1_MOBILE], executor_factory=thread_executor)
+        pool.start("aa" * 32, 0)
+        try:
+            assert pool.next_result(timeout=5) is not None
+            pool.update_tip("bb" * 32, 1)
+            for _ in range(4):
+                result = pool.next_result(timeout=5)
+                assert result.job.parent_hash == "bb" * 32
+                assert result.job.epoch == pool.epoch
+        finally:
+            pool.stop()
+        assert pool.get_stats()['jobs_submitted'] >= 4
@@ -259,8 +259,8 @@ class TestEquilibriumLoops:
         net.stop_equilibrium_loops()
         assert not net._running, "Should not be running after stop"
     
-    def test_threads_created(self):
-        """Verify threads are created when loops start."""
+    def test_tasks_created(self):
+        """Verify loop tasks are created when loops start."""
         class MockConsensus:
             pass
         class MockStorage:
@@ -273,10 +273,10 @@ class TestEquilibriumLoops:
         # Start loops
         net.start_equilibrium_loops()
         
-        # Check threads exist
-        assert net._broadcast_thread is not None, "Broadcast thread should be created"
-        assert net._listen_thread is not None, "Listen thread should be created"
-        assert net._cleanup_thread is not None, "Cleanup thread should be created"
+        # Check tasks exist
+        assert net._broadcast_task is not None, "Broadcast task should be created"
+        assert net._listen_task is not None, "Listen task should be created"
+        assert net._cleanup_task is not None, "Cleanup task should be created"
         
         # Clean up
         net.stop_equilibrium_loops()
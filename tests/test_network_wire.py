@@ -0,0 +1,162 @@
+"""
+Unit Tests for the NetworkProtocol wire format
+Tests binary frames, legacy JSON envelopes and wire version negotiation
+"""
+
+import json
+import sys
+import os
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.blockchain import Block, ProblemTier
+from network import (
+    HeaderMsg, HelloMsg, NetworkProtocol, RequestKind, RequestMsg, ResponseMsg, RevealMsg,
+    WIRE_VERSION_BINARY, WIRE_VERSION_JSON, WireCodec,
+)
+
+
+class MockComponent:
+    pass
+
+
+@pytest.fixture
+def net():
+    return NetworkProtocol(MockComponent(), MockComponent(), MockComponent())
+
+
+MESSAGES = [
+    HeaderMsg(header_bytes=b"\xc7" * 172, tip_work=2 ** 70, peer_id="peer-a", timestamp=1.5),
+    HeaderMsg(header_bytes=b"h", tip_work=12345, peer_id="peer-b", timestamp=2.0),
+    RevealMsg(cid="Qm" + "a" * 44, commitment=b"\x01" * 32, problem_type=1, capacity=2, timestamp=3.0),
+    RequestMsg(kind=RequestKind.GET_HEADERS, params={"start_height": 5, "count": 10}, request_id="r1", timestamp=4.0),
+    ResponseMsg(status="success", payload=b"p" * 4096, request_id="r1", timestamp=5.0),
+    ResponseMsg(status="error", error_message="not found", timestamp=6.0),
+    HelloMsg(peer_id="peer-c", wire_versions=[WIRE_VERSION_JSON, WIRE_VERSION_BINARY], reply=True, timestamp=7.0),
+]
+
+
+class TestWireFormat:
+    """Both wire versions must round-trip every message type."""
+
+    @pytest.mark.parametrize("message", MESSAGES)
+    def test_round_trip(self, net, message):
+        for version in (WIRE_VERSION_JSON, WIRE_VERSION_BINARY):
+            encoded = net.encode_message(message, version=version)
+            assert WireCodec.is_frame(encoded) == (version == WIRE_VERSION_BINARY)
+            assert net.decode_message(encoded) == message
+
+    def test_binary_frame_is_smaller(self, net):
+        message = MESSAGES[0]
+        binary = net.encode_message(message, version=WIRE_VERSION_BINARY)
+        legacy = net.encode_message(message, version=WIRE_VERSION_JSON)
+        assert len(binary) < len(legacy)
+
+    def test_corrupt_frames_rejected(self, net):
+        frame = net.encode_message(MESSAGES[2], version=WIRE_VERSION_BINARY)
+
+        flipped = bytearray(frame)
+        flipped[-1] ^= 0xFF
+        with pytest.raises(ValueError, match="checksum"):
+            net.decode_message(bytes(flipped))
+        with pytest.raises(ValueError, match="length"):
+            net.decode_message(frame[:-1])
+
+    def test_legacy_envelope_decodes(self, net):
+        body = json.dumps(MESSAGES[2].to_dict()).encode()
+        envelope = json.dumps({"codec": "none", "data": body.hex()}).encode()
+        assert net.decode_message(envelope) == MESSAGES[2]
+
+
+class TestWireNegotiation:
+    """Peers get the newest wire version both sides speak."""
+
+    def test_negotiate(self, net):
+        assert net.negotiate_wire_version("new", [WIRE_VERSION_JSON, WIRE_VERSION_BINARY]) == WIRE_VERSION_BINARY
+        assert net.negotiate_wire_version("old", []) == WIRE_VERSION_JSON
+        assert net.get_peer_wire_version("unknown") == WIRE_VERSION_JSON
+
+        frame = net.encode_message(MESSAGES[1], peer_id="new")
+        assert WireCodec.is_frame(frame)
+        assert not WireCodec.is_frame(net.encode_message(MESSAGES[1], peer_id="old"))
+
+    def test_broadcast_uses_lowest_peer_version(self, net):
+        net.update_peer("new")
+        net.negotiate_wire_version("new", [WIRE_VERSION_BINARY])
+        assert net.broadcast_wire_version() == WIRE_VERSION_BINARY
+
+        net.update_peer("old")
+        assert net.broadcast_wire_version() == WIRE_VERSION_JSON
+
+    def test_binary_frame_upgrades_peer(self, net):
+        request = RequestMsg(kind=RequestKind.GET_HEADERS, params={"start_height": 0, "count": 1}, request_id="r2")
+        frame = net.encode_message(request, version=WIRE_VERSION_BINARY)
+        assert net.handle_message("sender", "/coinj/requests/1.0.0", frame)
+        assert net.get_peer_wire_version("sender") == WIRE_VERSION_BINARY
+
+
+def make_block(height: int = 7) -> Block:
+    return Block(
+        index=height,
+        timestamp=1_700_000_000.0 + height,
+        previous_hash=f"{height - 1:064x}",
+        transactions=[],
+        merkle_root=f"{height:064x}",
+        problem={'type': 'subset_sum', 'numbers': [1, 2, 3], 'target': 3, 'size': 3},
+        solution=[1, 2],
+        complexity=None,
+        mining_capacity=ProblemTier.TIER_1_MOBILE,
+        cumulative_work_score=float(height),
+        block_hash=f"{height:064x}"
+    )
+
+
+class RecordingTransport:
+    running = True
+
+    def __init__(self):
+        self.frames = []
+
+    def call_soon(self, callback, frames):
+        self.frames.extend(frames)
+
+
+class BlockStorage:
+    def __init__(self, block):
+        self.block = block
+
+    def get_block(self, block_hash):
+        return self.block if block_hash == self.block.block_hash else None
+
+
+class TestWirePayloads:
+    """Header and block bytes stay JSON for peers that did not negotiate binary."""
+
+    def test_announce_header_per_peer_version(self, net):
+        net.transport = RecordingTransport()
+        net.peer_addresses = {"old": ("10.0.0.1", 1), "new": ("10.0.0.2", 2)}
+        net.negotiate_wire_version("new", [WIRE_VERSION_BINARY])
+
+        net.announce_header(make_block())
+        frames = dict(net.transport.frames)
+        assert len(frames) == 2
+
+        legacy = net.decode_message(frames[("10.0.0.1", 1)])
+        assert json.loads(legacy.header_bytes)["block_hash"] == f"{7:064x}"
+
+        binary = net.decode_message(frames[("10.0.0.2", 2)])
+        assert binary.header_bytes[:1] == b"\xc7"
+
+    def test_block_by_hash_uses_requester_version(self):
+        block = make_block()
+        net = NetworkProtocol(MockComponent(), BlockStorage(block), MockComponent())
+        net.negotiate_wire_version("new", [WIRE_VERSION_BINARY])
+        params = {"hash": block.block_hash}
+
+        legacy = json.loads(net._handle_get_block_by_hash(params, "old"))
+        assert legacy["solution"] == [1, 2]
+        assert legacy["mining_capacity"] == ProblemTier.TIER_1_MOBILE.value
+        assert net._handle_get_block_by_hash(params, "new")[:1] == b"\xc7"
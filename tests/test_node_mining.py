@@ -0,0 +1,149 @@
+"""
+Unit Tests for Node mining from the MiningPool
+Tests that mined blocks reach consensus so mining continues on the new tip
+"""
+
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import core.blockchain
+from core.blockchain import Block, EnergyMetrics, ProblemTier, ProblemType, PROBLEM_REGISTRY
+from consensus import ConsensusConfig, ConsensusEngine
+from mining_pool import MiningPool
+from node import Node, NodeConfig, NodeRole
+from pow import ProblemRegistry
+from user_submissions.aggregation import AggregationStrategy
+from user_submissions.submission import ProblemSubmission
+from storage import PruningMode, StorageConfig, StorageManager
+
+
+def genesis_block():
+    return Block(
+        index=0,
+        timestamp=1000.0,
+        previous_hash="0" * 64,
+        transactions=[],
+        merkle_root="0" * 64,
+        problem={},
+        solution=[],
+        complexity=None,
+        mining_capacity=ProblemTier.TIER_1_MOBILE,
+        cumulative_work_score=0.0,
+        block_hash="ab" * 32
+    )
+
+
+def local_assemble_block(transactions, previous_block, capacity, problem, solution, *,
+                         solve_time, verify_time, solve_memory, verify_memory, **_):
+    """assemble_block without the IPFS proof bundle upload."""
+    energy = EnergyMetrics(solve_time * 100, verify_time, 100, 1, solve_time, verify_time, 80.0, 50.0, 0.0)
+    complexity = PROBLEM_REGISTRY.build_complexity(
+        problem=problem, solution=solution, solve_time=solve_time, verify_time=verify_time,
+        solve_memory=solve_memory, verify_memory=verify_memory, energy_metrics=energy
+    )
+    block = Block(
+        index=previous_block.index + 1,
+        timestamp=previous_block.timestamp + 1.0,
+        previous_hash=previous_block.block_hash,
+        transactions=transactions,
+        merkle_root="0" * 64,
+        problem=problem,
+        solution=solution,
+        complexity=complexity,
+        mining_capacity=capacity,
+        cumulative_work_score=previous_block.cumulative_work_score + 1.0,
+        block_hash=""
+    )
+    block.block_hash = block.calculate_hash()
+    return block
+
+
+@pytest.fixture
+def node(tmp_path, monkeypatch):
+    def local_genesis(self):
+        self.genesis_block = genesis_block()
+        self._add_block_to_tree(self.genesis_block, receipt_time=0.0)
+
+    monkeypatch.setattr(ConsensusEngine, "_initialize_genesis", local_genesis)
+    monkeypatch.setattr(core.blockchain, "assemble_block", local_assemble_block)
+    node = Node(NodeConfig(role=NodeRole.MINER, data_dir=str(tmp_path), mining_tiers=["mobile"]))
+    node.storage = StorageManager(StorageConfig(
+        data_dir=str(tmp_path), role=NodeRole.MINER, pruning_mode=PruningMode.FULL
+    ))
+    node.consensus = ConsensusEngine(ConsensusConfig(), node.storage, ProblemRegistry())
+    tip = node.consensus.get_best_tip()
+    node.best_tip_hash, node.current_block_height = tip.block_hash, tip.index
+    node.mining_pool = MiningPool(workers=1, tiers=[ProblemTier.TIER_1_MOBILE],
+                                  executor_factory=lambda workers: ThreadPoolExecutor(max_workers=workers))
+    node.mining_pool.start(node.best_tip_hash, node.current_block_height)
+    yield node
+    node.mining_pool.stop()
+    node.storage.close()
+
+
+class TestConsensusMining:
+    def test_mines_consecutive_blocks(self, node):
+        mined = []
+        for _ in range(50):
+            node._mine_consensus_block()
+            if node.current_block_height > len(mined):
+                mined.append(node.best_tip_hash)
+            if len(mined) == 2:
+                break
+
+        assert len(mined) == 2
+        second = node.consensus.get_best_tip()
+        assert second.block_hash == mined[1] and second.index == 2
+        assert second.previous_hash == mined[0]
+        assert node.storage.get_block(mined[0]) is not None
+        assert node.mining_pool._parent_hash == mined[1]
+
+    def test_follows_tip_moved_by_external_block(self, node):
+        # A peer's block moves the consensus tip behind the pool's back
+        genesis = node.consensus.get_best_tip()
+        problem = PROBLEM_REGISTRY.generate(ProblemType.SUBSET_SUM, seed="peer", tier=ProblemTier.TIER_1_MOBILE)
+        solution = PROBLEM_REGISTRY.solve(problem)
+        external = local_assemble_block([], genesis, ProblemTier.TIER_1_MOBILE, problem, solution,
+                                        solve_time=0.01, verify_time=0.001, solve_memory=0, verify_memory=0)
+        node.consensus.validate_header(external)
+        assert node.mining_pool._parent_hash == genesis.block_hash
+
+        for _ in range(50):
+            node._mine_consensus_block()
+            if node.current_block_height == 2:
+                break
+
+        tip = node.consensus.get_best_tip()
+        assert tip.index == 2 and tip.previous_hash == external.block_hash
+        assert node.best_tip_hash == tip.block_hash
+        assert node.mining_pool._parent_hash == tip.block_hash
+
+    def test_tip_moves_submission_pool_clock(self, node):
+        node.config.submission_timeout_hours = 1
+        node.config.target_block_interval_secs = 1800  # Two blocks
+        node.problem_pool = node._new_problem_pool()
+        assert node.problem_pool.max_age_blocks == 2
+        node.problem_pool.add_submission("s", ProblemSubmission(
+            problem_type="subset_sum", problem_template={}, seeding_strategy="template",
+            aggregation=AggregationStrategy.ANY, aggregation_params={}, bounty_per_solution=5.0,
+            min_quality=0.0))
+        assert node._get_problem_for_mining()["submission_id"] == "s"
+
+        # Peer blocks move the tip; the submission ages out of the prefetch queue
+        parent = node.consensus.get_best_tip()
+        for i in range(3):
+            problem = PROBLEM_REGISTRY.generate(ProblemType.SUBSET_SUM, seed=f"peer-{i}", tier=ProblemTier.TIER_1_MOBILE)
+            parent = local_assemble_block([], parent, ProblemTier.TIER_1_MOBILE, problem,
+                                          PROBLEM_REGISTRY.solve(problem), solve_time=0.01,
+                                          verify_time=0.001, solve_memory=0, verify_memory=0)
+            node.consensus.validate_header(parent)
+        node._sync_mining_tip()
+        assert node.problem_pool.current_block == 3
+        assert node._get_problem_for_mining() is None
+        assert node.problem_pool.get_submission("s").status == 'expired'
@@ -0,0 +1,126 @@
+"""
+Unit Tests for the user submission ProblemPool
+Tests heap selection against a full scan, re-scoring, tier eligibility, lazy expiry
+and stale-entry compaction
+"""
+
+import random
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.blockchain import ProblemTier
+from user_submissions.aggregation import AggregationStrategy
+from user_submissions.pool import ProblemPool, PrefetchQueue
+from user_submissions.submission import ProblemSubmission, SolutionRecord
+
+
+def make_submission(bounty, aggregation=AggregationStrategy.ANY, params=None, min_tier=None):
+    return ProblemSubmission(
+        problem_type="subset_sum",
+        problem_template={},
+        seeding_strategy="template",
+        aggregation=aggregation,
+        aggregation_params=params or {},
+        bounty_per_solution=bounty,
+        min_quality=0.0,
+        min_tier=min_tier,
+    )
+
+
+def make_record(block_number):
+    return SolutionRecord(block_number=block_number, block_hash=f"{block_number:064x}", miner_address="miner",
+                          problem_instance={}, solution=[], solution_quality=1.0, work_score=1.0,
+                          solve_time=0.1, energy_used=0.0, verified=True, verification_time=0.01)
+
+
+def scan_best(pool):
+    """Selection as a full scan: highest priority, earliest added on ties."""
+    scored = [(sid, pool.get_priority_score(p, pool.current_block))
+              for sid, p in pool.pending_problems.items() if p.is_accepting_solutions()]
+    return max(scored, key=lambda x: x[1])[0] if scored else None
+
+
+class TestSelection:
+    def test_matches_full_scan_as_solutions_arrive(self):
+        rng = random.Random(5)
+        pool = ProblemPool()
+        strategies = [
+            (AggregationStrategy.ANY, {}),
+            (AggregationStrategy.BEST, {'max_blocks': 3}),
+            (AggregationStrategy.MULTIPLE, {'target_count': 4}),
+            (AggregationStrategy.STATISTICAL, {'sample_size': 2}),
+        ]
+        for i in range(200):
+            aggregation, params = rng.choice(strategies)
+            pool.add_submission(f"s{i}", make_submission(rng.choice([10.0, 25.0, rng.uniform(1, 100)]),
+                                                         aggregation, params))
+        for block in range(600):
+            picked = pool.select_problem_for_mining(ProblemTier.TIER_2_DESKTOP, "CPU")
+            assert (picked[0] if picked else None) == scan_best(pool)
+            if picked is None:
+                break
+            pool.record_solution(picked[0], make_record(block))
+        assert pool.select_problem_for_mining(ProblemTier.TIER_2_DESKTOP, "CPU") is None
+
+    def test_tier_eligibility(self):
+        pool = ProblemPool()
+        pool.add_submission("cluster", make_submission(100.0, min_tier=ProblemTier.TIER_5_CLUSTER))
+        pool.add_submission("any", make_submission(5.0))
+        assert pool.select_problem_for_mining(ProblemTier.TIER_1_MOBILE, "CPU")[0] == "any"
+        assert pool.select_problem_for_mining(ProblemTier.TIER_5_CLUSTER, "CPU")[0] == "cluster"
+
+    def test_lazy_expiry_and_removal(self):
+        pool = ProblemPool(max_age_blocks=10)
+        pool.add_submission("old", make_submission(50.0))
+        pool.current_block = 5
+        pool.add_submission("new", make_submission(20.0))
+        pool.current_block = 12
+        assert pool.select_problem_for_mining(None, "CPU")[0] == "new"
+        assert pool.get_submission("old").status == 'expired'
+
+        pool.remove_submission("new")
+        pool.add_submission("new", make_submission(1.0))
+        assert pool.select_problem_for_mining(None, "CPU")[0] == "new"
+
+    def test_advance_block_expires_and_invalidates_prefetch(self):
+        pool = ProblemPool(max_age_blocks=10)
+        pool.add_submission("a", make_submission(50.0))
+        queue = PrefetchQueue(pool, ProblemTier.TIER_2_DESKTOP)
+        assert queue.next()[0] == "a"
+        revision = pool.revision
+        pool.advance_block(11)
+        assert pool.revision > revision
+        assert queue.next() is None
+        assert pool.get_submission("a").status == 'expired'
+
+    def test_stale_entries_bounded(self):
+        pool = ProblemPool()
+        for i in range(10):
+            pool.add_submission(f"keep{i}", make_submission(1.0))
+        # Low-scoring churn never reaches the top, but must not pile up
+        for i in range(500):
+            pool.add_submission(f"tmp{i}", make_submission(0.5, AggregationStrategy.STATISTICAL))
+            pool.remove_submission(f"tmp{i}")
+        for _ in range(200):
+            pool.refresh("keep9")
+        heap = pool._heaps[None]
+        assert len(heap) <= 2 * pool.open_count() + 1
+        assert pool.select_problem_for_mining(None, "CPU")[0] == "keep0"
+
+
+class TestPrefetch:
+    def test_queue_hands_out_best_first_and_refills_on_change(self):
+        pool = ProblemPool()
+        for i, bounty in enumerate([5.0, 40.0, 20.0, 30.0]):
+            pool.add_submission(f"s{i}", make_submission(bounty))
+        assert [sid for sid, _ in pool.prefetch(None, 3)] == ["s1", "s3", "s2"]
+
+        queue = PrefetchQueue(pool, ProblemTier.TIER_2_DESKTOP, batch_size=2)
+        assert queue.next()[0] == "s1"
+        pool.record_solution("s3", make_record(1))  # Closes s3 and invalidates the batch
+        assert queue.next()[0] == "s1"
+        assert queue.next()[0] == "s2"
+        assert len(queue) == 0
@@ -0,0 +1,172 @@
+"""
+Unit Tests for the proof bundle cache
+Tests byte-bounded LRU, disk spill, single-flight loading and metrics
+"""
+
+import sys
+import os
+import threading
+import time
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from content_store import LocalBlobStore, compute_cid
+from proof_cache import ProofBundleCache
+from storage import NodeRole, PruningMode, StorageConfig, StorageManager
+
+
+def blob(i: int, size: int = 100) -> bytes:
+    return bytes([i % 256]) * size
+
+
+def cid(i: int) -> str:
+    return compute_cid(str(i).encode())
+
+
+class TestTiers:
+    """Memory is bounded by bytes; evictions spill to disk."""
+
+    def test_memory_bound_and_spill(self, tmp_path):
+        cache = ProofBundleCache(max_memory_bytes=1000, disk_dir=str(tmp_path))
+        for i in range(30):
+            cache.put(cid(i), blob(i))
+        stats = cache.get_stats()
+        assert stats["memory_bytes"] <= 1000
+        assert stats["memory_entries"] == 10
+        assert stats["disk_entries"] == 20
+
+        # Spilled entry comes back from disk without calling the loader
+        assert cache.get(cid(0), loader=lambda: b"wrong") == blob(0)
+        assert cache.get_stats()["disk_hits"] == 1
+
+        # A fresh cache over the same directory still has the spilled entries
+        reopened = ProofBundleCache(max_memory_bytes=1000, disk_dir=str(tmp_path))
+        assert reopened.get(cid(1)) == blob(1)
+
+    def test_disk_bound(self, tmp_path):
+        cache = ProofBundleCache(max_memory_bytes=100, disk_dir=str(tmp_path), max_disk_bytes=500)
+        for i in range(20):
+            cache.put(cid(i), blob(i))
+        stats = cache.get_stats()
+        assert stats["disk_bytes"] <= 500
+        assert stats["disk_evictions"] > 0
+        assert cid(0) not in cache
+
+    def test_memory_only(self):
+        cache = ProofBundleCache(max_memory_bytes=250)
+        for i in range(5):
+            cache.put(cid(i), blob(i))
+        assert cid(0) not in cache
+        assert cache.get(cid(4)) == blob(4)
+
+
+class TestLoading:
+    """Misses go through the loader once; failures are not cached."""
+
+    def test_single_flight(self):
+        cache = ProofBundleCache()
+        calls = []
+        gate = threading.Event()
+
+        def loader():
+            calls.append(1)
+            gate.wait(2.0)
+            return b"bundle"
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get("QmX", loader))) for _ in range(8)]
+        for t in threads:
+            t.start()
+        time.sleep(0.1)
+        gate.set()
+        for t in threads:
+            t.join()
+        assert results == [b"bundle"] * 8
+        assert len(calls) == 1
+        assert cache.get_stats()["coalesced"] == 7
+
+    def test_failures_not_cached(self):
+        cache = ProofBundleCache()
+
+        def broken():
+            raise IOError("ipfs down")
+
+        assert cache.get("QmY", broken) is None
+        assert cache.get("QmY", lambda: None) is None
+        assert cache.get("QmY", lambda: b"ok") == b"ok"
+        stats = cache.get_stats()
+        assert stats["load_errors"] == 1
+        assert stats["loads"] == 3
+
+    def test_put_during_load_counted_once(self):
+        cache = ProofBundleCache()
+
+        def loader():
+            cache.put("QmP", b"bundle")  # Concurrent put() lands before the load finishes
+            return b"bundle"
+
+        assert cache.get("QmP", loader) == b"bundle"
+        stats = cache.get_stats()
+        assert stats["memory_entries"] == 1
+        assert stats["memory_bytes"] == len(b"bundle")
+
+    def test_disk_read_outside_lock(self, tmp_path, monkeypatch):
+        cache = ProofBundleCache(max_memory_bytes=10, disk_dir=str(tmp_path))
+        cache.put("QmA", b"a" * 8)
+        cache.put("QmB", b"b" * 8)  # Spills QmA
+        read_disk = cache._read_disk
+
+        def checked_read(key):
+            assert not cache._lock.locked()
+            return read_disk(key)
+
+        monkeypatch.setattr(cache, "_read_disk", checked_read)
+        assert cache.get("QmA") == b"a" * 8
+        assert cache.get_stats()["disk_hits"] == 1
+
+    def test_objects_and_hit_rate(self):
+        cache = ProofBundleCache()
+        first = cache.get_object("QmZ", lambda: b'{"problem": {"type": "subset_sum"}}')
+        assert cache.get_object("QmZ", lambda: b"never") is first
+        cache.get("QmZ")
+        stats = cache.get_stats()
+        assert stats["object_hits"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_rejects_traversal_keys(self, tmp_path):
+        victim = tmp_path / "victim.txt"
+        victim.write_bytes(b"keep me")
+        store = LocalBlobStore(str(tmp_path / "ipfs"))
+        cache = ProofBundleCache(max_memory_bytes=10, disk_dir=str(tmp_path / "cache"), max_disk_bytes=20)
+        for bad in (str(victim), "../victim.txt", "Qm/../../victim.txt"):
+            with pytest.raises(ValueError):
+                cache.get(bad, lambda: store.get(bad))
+            with pytest.raises(ValueError):
+                cache.put(bad, b"x" * 8)
+        for i in range(4):
+            cache.put(cid(i), b"x" * 8)  # Spill and evict through the disk tier
+        assert victim.read_bytes() == b"keep me"
+        assert cache.get_stats()["disk_evictions"] > 0
+
+
+class TestStorageIntegration:
+    """StorageManager serves repeated proof bundle reads from the cache."""
+
+    def test_get_proof_bundle_cached(self, tmp_path):
+        config = StorageConfig(data_dir=str(tmp_path / "db"), role=NodeRole.FULL,
+                               pruning_mode=PruningMode.FULL, write_behind=False,
+                               ipfs_local_dir=str(tmp_path / "ipfs"))
+        storage = StorageManager(config)
+        try:
+            cid = storage.ipfs_client.add(b"bundle bytes")
+            fetches = []
+            original_get = storage.ipfs_client.get
+            storage.ipfs_client.get = lambda c: fetches.append(c) or original_get(c)
+            for _ in range(5):
+                assert storage.get_proof_bundle(cid) == b"bundle bytes"
+            assert fetches == [cid]
+        finally:
+            storage.close()
@@ -0,0 +1,85 @@
+"""
+Unit Tests for RollingMetrics
+Tests sliding-window dashboard aggregates against direct recomputation
+"""
+
+import random
+import statistics
+import sys
+import os
+
+# Add src/api to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'api'))
+
+from rolling_metrics import RollingMetrics
+
+
+def make_chain(count, start=1000.0, seed=1):
+    rng = random.Random(seed)
+    blocks = []
+    timestamp = start
+    for height in range(count):
+        timestamp += rng.choice([0.0, rng.uniform(1, 30)])
+        blocks.append({
+            'index': height,
+            'timestamp': timestamp,
+            'work_score': rng.randint(1, 50),
+            'miner_address': f"miner-{rng.randint(0, 5)}",
+            'difficulty': rng.uniform(0.5, 2.0),
+        })
+    return blocks
+
+
+def positive_intervals(blocks, count):
+    recent = blocks[-(count + 1):]
+    diffs = [b['timestamp'] - a['timestamp'] for a, b in zip(recent, recent[1:])]
+    return [d for d in diffs if d > 0]
+
+
+class TestRollingMetrics:
+    """Rolling windows must match a full recomputation."""
+
+    def test_block_time_windows(self):
+        blocks = make_chain(250)
+        metrics = RollingMetrics()
+        for block in blocks:
+            metrics.record_block(block)
+
+        for intervals in (10, 99):
+            expected = positive_intervals(blocks, intervals)
+            assert abs(metrics.avg_block_time(intervals) - sum(expected) / len(expected)) < 1e-9
+        assert metrics.median_block_time() == statistics.median(positive_intervals(blocks, 19))
+        assert abs(metrics.avg_difficulty() - statistics.mean(b['difficulty'] for b in blocks[-10:])) < 1e-9
+        assert [b['height'] for b in metrics.recent_blocks()] == list(range(240, 250))
+        assert metrics.latest_block()['index'] == 249
+
+    def test_time_windows_expire(self):
+        blocks = make_chain(400)
+        metrics = RollingMetrics(time_windows=(60, 600))
+        for block in blocks:
+            metrics.record_block(block)
+
+        now = blocks[-1]['timestamp'] + 5
+        for seconds in (60, 600, 300):
+            window = [b for b in blocks if b['timestamp'] >= now - seconds]
+            assert metrics.block_count(seconds, now) == len(window)
+            assert metrics.work_score_sum(seconds, now) == sum(b['work_score'] for b in window)
+            assert metrics.unique_miners(seconds, now) == len({b['miner_address'] for b in window})
+        assert metrics.block_count(60, now + 10 ** 6) == 0
+
+    def test_time_windows_bounded_without_reads(self):
+        metrics = RollingMetrics(time_windows=(60, 600))
+        for height in range(5000):
+            metrics.record_block({'index': height, 'timestamp': 1000.0 + height * 10, 'work_score': 1})
+        assert len(metrics._time_windows[60].entries) == 7
+        assert len(metrics._time_windows[600].entries) == 61
+        assert metrics.work_score_sum(600, 1000.0 + 4999 * 10) == 61
+
+    def test_stale_and_gapped_heights(self):
+        metrics = RollingMetrics()
+        metrics.record_block({'index': 0, 'timestamp': 100.0})
+        metrics.record_block({'index': 1, 'timestamp': 110.0})
+        metrics.record_block({'index': 1, 'timestamp': 500.0})
+        metrics.record_block({'index': 3, 'timestamp': 900.0})
+        assert metrics.latest_height == 3
+        assert metrics.avg_block_time() == 10.0
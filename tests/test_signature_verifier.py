@@ -0,0 +1,124 @@
+"""
+Unit Tests for the batched signature verifier
+Tests batch verification, the verified-triple cache and its integrations
+"""
+
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("cryptography")
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import signature_verifier
+from signature_verifier import SignatureVerifier
+from core.blockchain import Transaction, verify_transaction_signatures
+from tokenomics.wallet import Wallet
+
+
+def make_items(count, keys=4):
+    private_keys = [ed25519.Ed25519PrivateKey.generate() for _ in range(keys)]
+    items = []
+    for i in range(count):
+        key = private_keys[i % keys]
+        message = f"message-{i}".encode()
+        public = key.public_key().public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+        items.append((public, message, key.sign(message)))
+    return items
+
+
+class TestBatches:
+    """Batch results match one-at-a-time verification."""
+
+    def test_batch_with_invalid_and_duplicates(self):
+        verifier = SignatureVerifier(workers=1)
+        items = make_items(10)
+        bad = (items[0][0], b"tampered", items[0][2])
+        results = verifier.verify_batch(items + [bad, items[3]])
+        assert results == [True] * 10 + [False, True]
+        stats = verifier.get_stats()
+        assert stats["verified"] == 11
+        assert stats["deduplicated"] == 1
+        assert stats["invalid"] == 1
+
+    def test_worker_pool(self):
+        verifier = SignatureVerifier(workers=3, min_parallel=1, executor_factory=ThreadPoolExecutor)
+        items = make_items(30)
+        items[7] = (items[7][0], items[7][1], bytes(64))
+        results = verifier.verify_batch(items)
+        assert results == [i != 7 for i in range(30)]
+        assert verifier.get_stats()["parallel_batches"] == 1
+        verifier.close()
+
+    def test_submit_resolves_futures(self):
+        verifier = SignatureVerifier(workers=1, batch_size=8, max_delay=0.01)
+        items = make_items(20)
+        futures = [verifier.submit(*item) for item in items]
+        futures.append(verifier.submit(items[0][0], b"wrong", items[0][2]))
+        assert [f.result(timeout=5) for f in futures] == [True] * 20 + [False]
+        assert verifier.get_stats()["batches"] >= 3
+        verifier.close()
+
+    def test_lone_submit_not_delayed(self):
+        verifier = SignatureVerifier(workers=1, max_delay=5.0)
+        for item in make_items(3):
+            assert verifier.submit(*item).result(timeout=1.0)
+        verifier.close()
+
+
+class TestCache:
+    """Verified triples are not verified again; failures are not cached."""
+
+    def test_cache_hits_and_bound(self):
+        verifier = SignatureVerifier(workers=1, cache_size=5)
+        items = make_items(8)
+        for item in items:
+            assert verifier.verify(*item)
+        assert verifier.verify(*items[-1])
+        assert verifier.get_stats()["cache_hits"] == 1
+        assert verifier.is_cached(*items[-1])
+        assert not verifier.is_cached(*items[0])
+        assert verifier.get_stats()["cache_entries"] == 5
+
+        assert not verifier.verify(items[0][0], b"x", items[0][2])
+        assert not verifier.is_cached(items[0][0], b"x", items[0][2])
+
+
+class TestIntegration:
+    """Transactions and block signatures go through the shared verifier."""
+
+    def test_transactions(self):
+        key = ed25519.Ed25519PrivateKey.generate()
+        private_bytes = key.private_bytes(serialization.Encoding.Raw, serialization.PrivateFormat.Raw,
+                                          serialization.NoEncryption())
+        transactions = [Transaction("alice", "bob", float(i + 1), timestamp=1000.0 + i) for i in range(4)]
+        for tx in transactions:
+            tx.sign(private_bytes)
+        assert all(tx.verify_signature() for tx in transactions)
+
+        transactions[2].amount = 999.0  # Tampered after signing
+        unsigned = Transaction("alice", "bob", 1.0, timestamp=1.0)
+        assert verify_transaction_signatures(transactions + [unsigned]) == [True, True, False, True, False]
+
+    def test_block_signature(self):
+        wallet = Wallet.generate_new()
+        block_data = {"index": 7, "previous_hash": "00" * 32}
+        signature = wallet.sign_block(block_data)
+        public_hex = wallet.get_public_key_bytes().hex()
+        assert Wallet.verify_block_signature(public_hex, block_data, signature)
+        assert not Wallet.verify_block_signature(public_hex, {"index": 8}, signature)
+        assert not Wallet.verify_block_signature("zz", block_data, signature)
+        assert not Wallet.verify_block_signature("", block_data, signature)
+
+    def test_any_backend_accepts(self, monkeypatch):
+        items = make_items(1)
+        monkeypatch.setattr(signature_verifier, "_backends", [lambda *item: False, lambda *item: True])
+        assert signature_verifier.verify_one(*items[0])
+        monkeypatch.setattr(signature_verifier, "_backends", [lambda *item: False])
+        assert not signature_verifier.verify_one(*items[0])
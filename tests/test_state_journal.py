@@ -0,0 +1,132 @@
+"""
+Unit Tests for the blockchain state journal
+Tests incremental publishing, tailing, reorg truncation, compaction and
+legacy files
+"""
+
+import json
+import sys
+import os
+
+# Add src/api to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'api'))
+
+from state_journal import StateJournalReader, StateJournalWriter, segments_dir_for
+
+
+def record(index, branch="main"):
+    return {"index": index, "block_hash": f"{branch}-{index}", "timestamp": 1000.0 + index}
+
+
+class TestStateJournal:
+    """Writer appends only new blocks; reader tails only new bytes."""
+
+    def test_publish_and_tail(self, tmp_path):
+        path = str(tmp_path / "blockchain_state.json")
+        writer = StateJournalWriter(path, segment_records=4)
+        reader = StateJournalReader(path)
+        assert not reader.poll()
+
+        writer.publish([record(i) for i in range(6)], record(5), consensus_version="test")
+        assert reader.poll()
+        assert [b["index"] for b in reader.blocks] == list(range(6))
+
+        writer.publish([record(6)], record(6))
+        reader.poll()
+        assert [b["index"] for b in reader.blocks] == list(range(7))
+        assert reader.latest_block["block_hash"] == "main-6"
+        assert reader.manifest["block_count"] == 7
+        assert reader.as_state()["consensus_version"] == "test"
+        assert len(writer.manifest["segments"]) == 2
+
+    def test_reorg_truncates_published_blocks(self, tmp_path):
+        path = str(tmp_path / "blockchain_state.json")
+        writer = StateJournalWriter(path)
+        reader = StateJournalReader(path)
+        writer.publish([record(i) for i in range(10)], record(9))
+        reader.poll()
+
+        writer.publish([record(i, "side") for i in range(7, 12)], record(11, "side"), truncate_to=6)
+        reader.poll()
+        assert [b["block_hash"] for b in reader.blocks[6:]] == ["main-6"] + [f"side-{i}" for i in range(7, 12)]
+        assert writer.block_count == 12
+
+        # A fresh reader replays the whole journal to the same state
+        fresh = StateJournalReader(path)
+        fresh.poll()
+        assert fresh.blocks == reader.blocks
+
+    def test_uncommitted_tail_discarded(self, tmp_path):
+        path = str(tmp_path / "blockchain_state.json")
+        writer = StateJournalWriter(path)
+        writer.publish([record(0), record(1)], record(1))
+
+        segment = segments_dir_for(path) / writer.manifest["segments"][0]["name"]
+        with open(segment, "ab") as f:
+            f.write(b'{"index": 2, "block_ha')
+
+        reader = StateJournalReader(path)
+        reader.poll()
+        assert len(reader.blocks) == 2
+
+        reopened = StateJournalWriter(path)
+        reopened.publish([record(2)], record(2))
+        reader.poll()
+        assert [b["index"] for b in reader.blocks] == [0, 1, 2]
+
+    def test_legacy_state_file(self, tmp_path):
+        path = tmp_path / "blockchain_state.json"
+        path.write_text(json.dumps({"latest_block": record(1), "blocks": [record(0), record(1)]}))
+
+        reader = StateJournalReader(str(path))
+        assert reader.poll()
+        assert len(reader.blocks) == 2
+
+        writer = StateJournalWriter(str(path))
+        assert writer.tip_hash is None
+        writer.publish([record(0), record(1)], record(1))
+        reader.poll()
+        assert [b["index"] for b in reader.blocks] == [0, 1]
+
+    def test_start_index_skips_old_segments(self, tmp_path):
+        path = str(tmp_path / "blockchain_state.json")
+        writer = StateJournalWriter(path, segment_records=4)
+        for start in (0, 4, 8):
+            writer.publish([record(i) for i in range(start, min(start + 4, 10))], record(min(start + 3, 9)))
+        writer.publish([record(i, "side") for i in range(9, 11)], record(10, "side"), truncate_to=8)
+
+        # Segments wholly below the start index are never opened
+        (segments_dir_for(path) / writer.manifest["segments"][0]["name"]).unlink()
+        reader = StateJournalReader(path, start_index=6)
+        assert reader.poll()
+        assert [b["block_hash"] for b in reader.blocks] == ["main-6", "main-7", "main-8", "side-9", "side-10"]
+
+    def test_compact_drops_replaced_blocks(self, tmp_path):
+        path = str(tmp_path / "blockchain_state.json")
+        writer = StateJournalWriter(path, segment_records=4)
+        assert not writer.compact()
+
+        tail = StateJournalReader(path)
+        writer.publish([record(i) for i in range(10)], record(9))
+        writer.publish([record(i, "side") for i in range(7, 12)], record(11, "side"), truncate_to=6)
+        tail.poll()
+        expected = list(tail.blocks)
+        old_files = set(p.name for p in segments_dir_for(path).iterdir())
+
+        assert writer.compact()
+        assert not any(segment.get("truncates") for segment in writer.manifest["segments"])
+        assert sum(segment["records"] for segment in writer.manifest["segments"]) == 12
+        assert not old_files & set(p.name for p in segments_dir_for(path).iterdir())
+
+        # Tailing readers start over once; later publishes append as before
+        tail.poll()
+        assert tail.blocks == expected
+        writer.publish([record(12, "side")], record(12, "side"))
+        tail.poll()
+        assert tail.blocks == expected + [record(12, "side")]
+
+        reopened = StateJournalWriter(path, segment_records=4)
+        assert reopened.block_count == 13
+        fresh = StateJournalReader(path)
+        fresh.poll()
+        assert fresh.blocks == tail.blocks
@@ -0,0 +1,226 @@
+"""
+Unit Tests for StorageManager
+Tests pooled connections and the explicit transaction API
+"""
+
+import json
+import sys
+import os
+import threading
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.blockchain import Block, ProblemTier
+from storage import StorageManager, StorageConfig, NodeRole, PruningMode
+
+
+def make_block(height: int) -> Block:
+    return Block(
+        index=height,
+        timestamp=1_700_000_000.0 + height,
+        previous_hash=f"{max(height - 1, 0):064x}",
+        transactions=[],
+        merkle_root=f"{height:064x}",
+        problem={'type': 'subset_sum', 'numbers': [1, 2, 3], 'target': 3, 'size': 3},
+        solution=[1, 2],
+        complexity=None,
+        mining_capacity=ProblemTier.TIER_1_MOBILE,
+        cumulative_work_score=float(height),
+        block_hash=f"{height:064x}"
+    )
+
+
+@pytest.fixture
+def storage(tmp_path):
+    manager = StorageManager(StorageConfig(
+        data_dir=str(tmp_path),
+        role=NodeRole.FULL,
+        pruning_mode=PruningMode.FULL
+    ))
+    yield manager
+    manager.close()
+
+
+class TestConnectionPool:
+    """Connections are reused per thread."""
+
+    def test_connection_reused_within_thread(self, storage):
+        assert storage._connection() is storage._connection()
+
+    def test_wal_enabled(self, storage):
+        mode = storage._connection().execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode.lower() == "wal"
+
+    def test_separate_connection_per_thread(self, storage):
+        main_conn = storage._connection()
+        other = []
+        thread = threading.Thread(target=lambda: other.append(storage._connection()))
+        thread.start()
+        thread.join()
+        assert other[0] is not main_conn
+
+
+class TestTransactions:
+    """Explicit transaction API."""
+
+    def test_nested_writes_commit_together(self, storage):
+        block = make_block(1)
+        with storage.transaction():
+            assert storage.store_header(block)
+            assert storage.store_work_index(1, 10, block.block_hash)
+            assert storage.store_tip(block.block_hash, 10)
+        assert storage.get_header(block.block_hash).index == 1
+        assert storage.get_work_at_height(1) == 10
+        assert storage.get_tips()[0] == (block.block_hash, 10)
+
+    def test_outer_failure_rolls_back(self, storage):
+        block = make_block(2)
+        with pytest.raises(RuntimeError):
+            with storage.transaction():
+                storage.store_header(block)
+                raise RuntimeError("abort")
+        assert storage.get_header(block.block_hash) is None
+
+
+    def test_inner_failure_rolls_back_outer(self, storage):
+        block = make_block(6)
+        with pytest.raises(AttributeError):
+            with storage.transaction():
+                assert storage.store_header(block)
+                storage.store_work_index(6, 60, None)
+        assert storage.get_header(block.block_hash) is None
+        assert storage._write_buffer == []
+
+    def test_failure_outside_transaction_returns_false(self, storage):
+        assert not storage.store_work_index(7, 70, None)
+
+    def test_batch_write_joins_transaction(self, storage):
+        with pytest.raises(RuntimeError):
+            with storage.transaction():
+                storage.batch_write([("tip", ("ee" * 32, 80))])
+                raise RuntimeError("abort")
+        assert storage.get_tips() == []
+
+
+class TestWriteBehind:
+    """Buffered writes flush on size, reads, batch_write and close."""
+
+    def test_writes_buffered_until_batch_size(self, tmp_path):
+        manager = StorageManager(StorageConfig(
+            data_dir=str(tmp_path), role=NodeRole.FULL, pruning_mode=PruningMode.FULL,
+            batch_size=3, flush_interval=60.0
+        ))
+        manager.store_tip("aa" * 32, 1)
+        manager.store_tip("bb" * 32, 2)
+        assert len(manager._write_buffer) == 2
+        manager.store_tip("cc" * 32, 3)
+        assert manager._write_buffer == []
+        manager.close()
+
+    def test_reads_see_buffered_writes(self, storage):
+        block = make_block(3)
+        storage.store_header(block)
+        storage.store_tip(block.block_hash, 30)
+        assert storage.get_header(block.block_hash).index == 3
+        assert storage.get_tips() == [(block.block_hash, 30)]
+
+    def test_rolled_back_transaction_not_queued(self, storage):
+        with pytest.raises(RuntimeError):
+            with storage.transaction():
+                storage.store_work_index(4, 40, "dd" * 32)
+                raise RuntimeError("abort")
+        assert storage._write_buffer == []
+        assert storage.get_work_at_height(4) is None
+
+    def test_batch_write_all_kinds(self, storage):
+        block = make_block(5)
+        storage.batch_write([
+            ("header", (block, storage._serialize_header(block))),
+            ("block", block),
+            ("tip", (block.block_hash, 50)),
+            ("work_index", (5, 50, block.block_hash)),
+            ("commitment", (b"c" * 32, "QmCid", 1, 2)),
+        ])
+        assert storage._write_buffer == []
+        assert storage.get_work_at_height(5) == 50
+        assert storage.get_commitment_cid(b"c" * 32) == "QmCid"
+
+    def test_close_flushes(self, tmp_path):
+        config = StorageConfig(data_dir=str(tmp_path), role=NodeRole.FULL,
+                               pruning_mode=PruningMode.FULL, flush_interval=60.0)
+        manager = StorageManager(config)
+        manager.store_work_index(6, 60, "ee" * 32)
+        manager.close()
+        reopened = StorageManager(config)
+        assert reopened.get_work_at_height(6) == 60
+        reopened.close()
+
+
+class TestBinaryRecords:
+    """Binary header/block records and JSON row migration."""
+
+    def test_header_roundtrip(self, storage):
+        block = make_block(7)
+        block.offchain_cid = "QmTestCid"
+        restored = storage._deserialize_header(storage._serialize_header(block))
+        assert restored.index == 7
+        assert restored.block_hash == block.block_hash
+        assert restored.previous_hash == block.previous_hash
+        assert restored.mining_capacity == ProblemTier.TIER_1_MOBILE
+        assert restored.offchain_cid == "QmTestCid"
+
+    def test_non_hex_hashes_roundtrip(self, storage):
+        block = make_block(8)
+        block.previous_hash = "genesis"
+        restored = storage._deserialize_header(storage._serialize_header(block))
+        assert restored.previous_hash == "genesis"
+
+    def test_block_roundtrip(self, storage):
+        block = make_block(9)
+        restored = storage._deserialize_block(storage._serialize_block(block))
+        assert restored.problem == block.problem
+        assert restored.solution == block.solution
+        assert restored.merkle_root == block.merkle_root
+
+    def test_header_record_smaller_than_json(self, storage):
+        block = make_block(10)
+        legacy = json.dumps({
+            'index': block.index, 'timestamp': block.timestamp,
+            'previous_hash': block.previous_hash, 'merkle_root': block.merkle_root,
+            'mining_capacity': block.mining_capacity.value,
+            'cumulative_work_score': block.cumulative_work_score,
+            'block_hash': block.block_hash, 'offchain_cid': None
+        }).encode()
+        assert len(storage._serialize_header(block)) * 2 < len(legacy)
+
+    def test_legacy_json_rows_migrated(self, tmp_path):
+        config = StorageConfig(data_dir=str(tmp_path), role=NodeRole.FULL, pruning_mode=PruningMode.FULL)
+        manager = StorageManager(config)
+        block = make_block(11)
+        legacy = json.dumps({
+            'index': 11, 'timestamp': block.timestamp, 'previous_hash': block.previous_hash,
+            'merkle_root': block.merkle_root, 'mining_capacity': 'mobile',
+            'cumulative_work_score': 11.0, 'block_hash': block.block_hash
+        }).encode()
+        with manager.transaction() as conn:
+            conn.execute("INSERT INTO headers (header_hash, header_bytes, height, timestamp) VALUES (?, ?, ?, ?)",
+                         (block.block_hash.encode(), legacy, 11, int(block.timestamp)))
+            conn.execute("PRAGMA user_version = 0")  # As written before binary records
+        assert manager.get_header(block.block_hash).index == 11
+        manager.close()
+
+        reopened = StorageManager(config)
+        raw = reopened._connection().execute("SELECT header_bytes FROM headers").fetchone()[0]
+        assert raw[:1] != b"{"
+        assert reopened.get_header(block.block_hash).cumulative_work_score == 11.0
+        assert reopened._connection().execute("PRAGMA user_version").fetchone()[0] == 1
+
+        # Marked as migrated: no further scans unless forced
+        with reopened.transaction() as conn:
+            conn.execute("UPDATE headers SET header_bytes = ?", (legacy,))
+        assert reopened.migrate_legacy_records() == 0
+        assert reopened.migrate_legacy_records(force=True) == 1
+        reopened.close()
@@ -0,0 +1,75 @@
+"""
+Unit Tests for streaming statistics
+Tests rolling windows against direct recomputation and their use by difficulty adjustment
+"""
+
+import json
+import random
+import statistics
+import sys
+import os
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from streaming_stats import RollingWindow
+from pow import DifficultyAdjuster
+
+
+class TestRollingWindow:
+    """Running statistics match statistics.* over the last `size` values."""
+
+    def test_matches_recomputation(self):
+        rng = random.Random(7)
+        window = RollingWindow(25, ordered=True)
+        history = []
+        for _ in range(500):
+            value = rng.choice([rng.uniform(0, 1e6), float(rng.randint(1, 5))])
+            history.append(value)
+            window.push(value)
+            recent = history[-25:]
+            assert window.values() == recent
+            assert window.mean() == pytest.approx(statistics.mean(recent))
+            assert window.median() == statistics.median(recent)
+            assert window.median_high() == statistics.median_high(recent)
+            if len(recent) > 1:
+                assert window.variance() == pytest.approx(statistics.variance(recent), rel=1e-6)
+
+    def test_bounded_and_evicts_oldest(self):
+        window = RollingWindow(3, values=[1.0, 2.0, 3.0])
+        assert window.push(4.0) == 1.0
+        assert len(window) == 3 and window.values() == [2.0, 3.0, 4.0]
+        assert window.last(2) == [3.0, 4.0]
+        assert window.total == 9.0
+
+    def test_percentile(self):
+        window = RollingWindow(101, ordered=True, values=range(101))
+        assert window.percentile(0) == 0
+        assert window.percentile(90) == 90
+        assert window.percentile(99.5) == pytest.approx(99.5)
+
+    def test_order_statistics_need_ordered_window(self):
+        with pytest.raises(ValueError):
+            RollingWindow(4, values=[1.0]).median()
+        with pytest.raises(ValueError):
+            RollingWindow(4, ordered=True).median()
+
+
+class TestDifficultyAdjuster:
+    def test_median_of_last_100_and_state_roundtrip(self):
+        rng = random.Random(3)
+        adjuster = DifficultyAdjuster()
+        scores = []
+        for _ in range(250):
+            score = rng.uniform(100, 5000)
+            scores.append(score)
+            adjuster.update(score, 30.0)
+        assert len(adjuster.observed_scores) == 100
+        assert adjuster.observed_scores.median_high() == sorted(scores[-100:])[50]
+
+        state = json.loads(json.dumps(adjuster.to_dict()))
+        restored = DifficultyAdjuster(**state)
+        assert restored.current_target == adjuster.current_target
+        assert restored.observed_scores.values() == adjuster.observed_scores.values()
@@ -0,0 +1,69 @@
+"""
+Unit Tests for Subset Sum solver backends
+Backends must return exactly the reference DP solution
+"""
+
+import random
+import sys
+import os
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.blockchain import (
+    PROBLEM_REGISTRY, SUBSET_SUM_ENGINE, ProblemTier, ProblemType,
+    generate_subset_sum_problem, verify_subset_sum
+)
+from core.subset_sum_engine import (
+    SubsetSumEngine, solve_bitset, solve_meet_in_middle, solve_numpy, solve_reference
+)
+
+
+class TestBackendParity:
+    """Fast backends must match the reference solver."""
+
+    @pytest.mark.parametrize("tier", list(ProblemTier))
+    def test_bitset_matches_reference(self, tier):
+        for i in range(20):
+            problem = generate_subset_sum_problem(seed=f"parity-{i}", tier=tier)
+            expected = solve_reference(problem['numbers'], problem['target'])
+            assert solve_bitset(problem['numbers'], problem['target']) == expected
+            assert solve_numpy(problem['numbers'], problem['target']) == expected
+
+    def test_unreachable_and_trivial_targets(self):
+        assert solve_bitset([2, 4, 6], 5) == solve_reference([2, 4, 6], 5) == []
+        assert solve_bitset([1, 2], 0) == []
+        assert solve_bitset([0, 3, 0, 3], 3) == solve_reference([0, 3, 0, 3], 3)
+
+    def test_meet_in_middle_large_target(self):
+        rng = random.Random(7)
+        numbers = [rng.randint(1, 10 ** 9) for _ in range(30)]
+        target = sum(rng.sample(numbers, 12))
+        solution = solve_meet_in_middle(numbers, target)
+        assert sum(solution) == target
+
+
+class TestEngineSelection:
+    """Backend selection per tier."""
+
+    def test_registry_uses_engine(self):
+        problem = PROBLEM_REGISTRY.generate(ProblemType.SUBSET_SUM, seed="abc", tier=ProblemTier.TIER_3_WORKSTATION)
+        solution = PROBLEM_REGISTRY.solve(problem)
+        assert verify_subset_sum(problem, solution)
+        assert solution == solve_reference(problem['numbers'], problem['target'])
+
+    def test_tier_backend_override(self):
+        engine = SubsetSumEngine(tier_resolver=lambda size: 'small' if size < 10 else 'large')
+        engine.set_tier_backend('large', 'reference')
+        assert engine.backend_for({'numbers': [1] * 5, 'target': 3}) == 'bitset'
+        assert engine.backend_for({'numbers': [1] * 12, 'target': 3}) == 'reference'
+
+    def test_fallbacks(self):
+        assert SUBSET_SUM_ENGINE.backend_for({'numbers': [-1, 2], 'target': 1}) == 'reference'
+        assert SUBSET_SUM_ENGINE.backend_for({'numbers': [1, 2], 'target': 1 << 40}) == 'mitm'
+
+    def test_unknown_backend_rejected(self):
+        with pytest.raises(ValueError):
+            SUBSET_SUM_ENGINE.set_tier_backend(ProblemTier.TIER_1_MOBILE, 'quantum')